@@ -18,7 +18,6 @@ from base_data_project.utils import create_components
 # Import project-specific components
 from src.settings.log_parameters import log_parameters
 from src.configuration_manager.instance import get_config
-from src.services.algoritmo_gd import AlgoritmoGDService
 
 config_manager = get_config()
 
@@ -33,7 +32,7 @@ setup_logger(
 # Then get the logger instance for use throughout the file
 logger = get_logger(config_manager.system.project_name)
 
-def run_batch_process(data_manager, process_manager, algorithm="example_algorithm", external_call_dict=None, external_raw_connection=None):
+def run_batch_process(data_manager, process_manager, algorithm="example_algorithm", external_call_dict=None, external_raw_connection=None, cancel_token=None):
     """
     Run the process in batch mode without user interaction.
     
@@ -42,6 +41,7 @@ def run_batch_process(data_manager, process_manager, algorithm="example_algorith
         process_manager: Process manager instance
         algorithm: Name of the algorithm to use
         external_call_dict: External call data dictionary
+        cancel_token: Optional CancellationToken (deadline) of this process
         
     Returns:
         True if successful, False otherwise
@@ -49,6 +49,10 @@ def run_batch_process(data_manager, process_manager, algorithm="example_algorith
     logger.info("Starting batch process")
     
     try:
+        # Imported here so the orchestrator (which imports this module) does not load
+        # the data models and algorithms before it needs them
+        from src.services.algoritmo_gd import AlgoritmoGDService
+
         # Create the service with data and process managers (same as main.py)
         service = AlgoritmoGDService(
             data_manager=data_manager,
@@ -56,7 +60,8 @@ def run_batch_process(data_manager, process_manager, algorithm="example_algorith
             external_call_dict=external_call_dict or {},
             external_raw_connection=external_raw_connection,
             config_manager=config_manager,
-            project_name=config_manager.system.project_name
+            project_name=config_manager.system.project_name,
+            cancel_token=cancel_token
         )
         
         # Initialize a new process
@@ -21,9 +21,9 @@ FROM wfm.CORE_PRO_EMP_HORARIO_DET  cpehd
 --and cpehd.EMPLOYEE_ID = cpea.EMPLOYEE_ID 
 --and cpehd.SCHEDULE_DAY = cpea.SCHEDULE_DAY  */
 JOIN wfm.esc_colaborador ec ON ec.CODIGO = cpehd.EMPLOYEE_ID
-WHERE cpehd.PROCESS_ID = {process_id}
-AND ec.CODIGO in ({colab90ciclo})
-AND cpehd.SCHEDULE_DAY BETWEEN to_date({start_date}, 'YYYY-MM-DD')  and to_date({end_date}, 'YYYY-MM-DD')
+WHERE cpehd.PROCESS_ID = :process_id
+AND ec.CODIGO in (:colab90ciclo)
+AND cpehd.SCHEDULE_DAY BETWEEN to_date(:start_date, 'YYYY-MM-DD')  and to_date(:end_date, 'YYYY-MM-DD')
 
 
 
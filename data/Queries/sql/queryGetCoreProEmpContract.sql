@@ -13,9 +13,9 @@ WITH contract_days AS (
             ORDER BY cpec.schedule_day
         ) AS period_grp
     FROM wfm.core_pro_emp_contract cpec
-    WHERE cpec.schedule_day BETWEEN to_date({start_date}, 'YYYY-MM-DD') AND to_date({end_date}, 'YYYY-MM-DD')
-        AND cpec.process_id = {process_id}
-        AND cpec.employee_id IN ({colabs_id})
+    WHERE cpec.schedule_day BETWEEN to_date(:start_date, 'YYYY-MM-DD') AND to_date(:end_date, 'YYYY-MM-DD')
+        AND cpec.process_id = :process_id
+        AND cpec.employee_id IN (:colabs_id)
 )
 SELECT
     cd.employee_id,
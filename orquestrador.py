@@ -44,6 +44,7 @@ logger.info("-------------------------------")
 from src.orquestrador_functions.WFM_Process.Getters import get_process_by_status, get_process_by_id, get_total_process_by_status
 from src.orquestrador_functions.WFM_Process.Setters import set_process_status, set_process_param_status
 from src.helpers import set_process_errors
+from src.cancellation import CancellationToken, compute_process_deadline
 from src.orquestrador_functions.Data_Handlers.GetGlobalData import get_all_params, get_gran_equi
 from src.orquestrador_functions.Logs.message_loader import (
     load_df_messages,
@@ -196,6 +197,14 @@ if not sec_to_proc.empty:
                                 # Add wfm-proc-colab - use empty string when NULL (valid business case)
                                 external_call_dict['wfm_proc_colab'] = str(wfm_proc_colab) if wfm_proc_colab is not None else ''
                                 
+                                # Same per-process deadline as the daemon children
+                                deadline_config = config_manager.system.orchestrator_config.get('deadline', {})
+                                cancel_token = CancellationToken(
+                                    compute_process_deadline(deadline_config.get('max_process_seconds'), deadline_config.get('deadline_time')),
+                                    label=f"process {wfm_proc_id}",
+                                    logger=logger
+                                )
+
                                 # Call the function directly - pass the orquestrador connection to avoid session limit
                                 with data_manager:
                                     success = run_batch_process(
@@ -203,7 +212,8 @@ if not sec_to_proc.empty:
                                         process_manager=process_manager,
                                         algorithm="example_algorithm",
                                         external_call_dict=external_call_dict,
-                                        external_raw_connection=connection
+                                        external_raw_connection=connection,
+                                        cancel_token=cancel_token
                                     )
                                 
                                 if success:
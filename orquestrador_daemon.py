@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Long-lived orchestrator service.
+
+Polls the WFM process queue on an interval and dispatches each process to a
+child in a WorkerPool sized from LOCAL_MAX_CONCURRENT_PROCESSES, while keeping
+the number of processes in status 'P' below GLOBAL_MAX_CONCURRENT_PROCESSES.
+Crashed children are restarted up to MAX_RETRIES times (waiting RETRY_WAIT_TIME
+seconds). SIGTERM/SIGINT stop the polling, wait ORCHESTRATOR_SHUTDOWN_GRACE
+seconds for running children and then terminate them.
+Each child gets a deadline from system_settings['orchestrator']['deadline']
+(maximum duration and/or an 'HH:MM' limit such as store opening): the child
+stops cooperatively at the deadline and is terminated if it is still running
+kill_grace_seconds later.
+
+orquestrador.py is kept for single-pass (cron) executions.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import warnings
+
+import pandas as pd
+
+from base_data_project.log_config import setup_logger, get_logger
+from src.cancellation import compute_process_deadline
+from src.configuration_manager.instance import get_config
+from src.helpers import set_process_errors
+from src.orquestrador_functions.Classes.AlgorithmPrepClasses.ConnectionHandler import ConnectionHandler
+from src.orquestrador_functions.Data_Handlers.GetGlobalData import get_all_params
+from src.orquestrador_functions.Logs.message_loader import load_df_messages, set_messages, set_runtime_message_lang
+from src.orquestrador_functions.Process_Pool.child_runner import run_child_process
+from src.orquestrador_functions.Process_Pool.scheduler import CostEstimator, SolveHistory, create_scheduler
+from src.orquestrador_functions.Process_Pool.worker_pool import (
+    PoolJob,
+    WorkerPool,
+    classify_exit,
+    compute_available_slots,
+    resolve_orchestrator_params,
+)
+from src.orquestrador_functions.WFM_Process.Getters import get_process_by_status, get_process_valid_emp, get_total_process_by_status
+from src.orquestrador_functions.WFM_Process.Setters import set_process_param_status, set_process_status
+
+PROC_COD = 'AlgoritmoHorariosPython_Pai'
+
+config_manager = get_config()
+logger = get_logger(config_manager.system.project_name)
+
+
+def build_payload(row: pd.Series, path: str, api_proc_id, api_user: str, child_number: int) -> dict:
+    """Build the child payload from a row of get_process_by_status."""
+    wfm_proc_id = int(row['CODIGO'])
+    wfm_proc_colab_raw = row['FK_COLABORADOR']
+    wfm_proc_colab = None if pd.isna(wfm_proc_colab_raw) else int(wfm_proc_colab_raw)
+    external_call_dict = {
+        'current_process_id': wfm_proc_id,
+        'api_proc_id': api_proc_id,
+        'wfm_proc_id': wfm_proc_id,
+        'wfm_user': str(row['USER_CRIACAO']),
+        'start_date': row['DATA_INI'].strftime('%Y-%m-%d'),
+        'end_date': row['DATA_FIM'].strftime('%Y-%m-%d'),
+        'child_number': child_number,
+        # Empty string when NULL (valid business case)
+        'wfm_proc_colab': str(wfm_proc_colab) if wfm_proc_colab is not None else '',
+    }
+    return {
+        'path': path,
+        'api_proc_id': api_proc_id,
+        'api_user': api_user,
+        'proc_cod': PROC_COD,
+        'external_call_dict': external_call_dict,
+    }
+
+
+class OrchestratorDaemon:
+    """Polling loop around WorkerPool."""
+
+    def __init__(self, path: str, api_proc_id, api_user: str):
+        self.path = path
+        self.api_proc_id = api_proc_id
+        self.api_user = api_user
+        self.stop_event = threading.Event()
+
+        self.connection_object = ConnectionHandler()
+        self.connection_object.connect_to_database()
+        self.connection = self.connection_object.ensure_connection()
+
+        set_runtime_message_lang(None)
+        self.df_msg = load_df_messages(path)
+        self.params = resolve_orchestrator_params(get_all_params(path, connection=self.connection))
+        logger.info(f"Orchestrator parameters: {self.params}")
+
+        self.pool = WorkerPool(
+            target=run_child_process,
+            max_workers=self.params['LOCAL_MAX_CONCURRENT_PROCESSES'],
+            logger=logger
+        )
+        self._global_limit_logged = False
+        self._deadline_logged = False
+
+        orchestrator_config = config_manager.system.orchestrator_config
+        self.deadline_config = orchestrator_config.get('deadline', {})
+        history_file = orchestrator_config.get('history_file')
+        if history_file and not os.path.isabs(history_file):
+            history_file = os.path.join(config_manager.system.project_root_dir, history_file)
+        self.history = SolveHistory(history_file)
+        self.estimator = CostEstimator(
+            history=self.history,
+            valid_emp_loader=lambda process_id: get_process_valid_emp(self.path, process_id, self.connection),
+            base_seconds=orchestrator_config.get('heuristic_base_seconds', 30),
+            seconds_per_unit=orchestrator_config.get('heuristic_seconds_per_employee_day', 0.5)
+        )
+        self.scheduler = create_scheduler(
+            orchestrator_config.get('scheduling_strategy', 'shortest_expected_first'),
+            aging_factor=orchestrator_config.get('aging_factor', 1.0)
+        )
+        logger.info(f"Scheduling strategy: {self.scheduler.name}")
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        """Signal handler: stop polling, running children are handled in shutdown()."""
+        logger.info(f"Received signal {signum}, stopping orchestrator")
+        self.stop_event.set()
+
+    def _log_process_error(self, fk_process, type_error: str, key: str, values: dict) -> None:
+        set_process_errors(
+            self.connection,
+            pathOS=self.path,
+            user=self.api_user,
+            fk_process=fk_process,
+            type_error=type_error,
+            process_type=PROC_COD,
+            error_code=None,
+            description=set_messages(self.df_msg, key, values),
+            employee_id=None,
+            schedule_day=None
+        )
+
+    def _mark_failed(self, job: PoolJob, reason: str) -> None:
+        set_process_param_status(self.connection, pathOS=self.path, user=self.api_user, process_id=job.wfm_proc_id, new_status='I')
+        self._log_process_error(job.wfm_proc_id, 'E', 'errCallSubProc', {'1': job.wfm_proc_id, '2': job.payload['external_call_dict']['child_number'], '3': reason})
+
+    def _process_deadline(self):
+        """Deadline (epoch seconds) of a process started now, None without limits."""
+        return compute_process_deadline(
+            self.deadline_config.get('max_process_seconds'),
+            self.deadline_config.get('deadline_time')
+        )
+
+    def terminate_overdue(self) -> None:
+        """Terminate children that kept running kill_grace_seconds past their deadline."""
+        grace = self.deadline_config.get('kill_grace_seconds', 300)
+        now = time.time()
+        for job in self.pool.running_jobs:
+            deadline = job.payload.get('deadline')
+            if deadline is None or now <= deadline + grace:
+                continue
+            if self.pool.terminate(job.wfm_proc_id) is not None:
+                logger.error(f"Process {job.wfm_proc_id} still running {now - deadline:.0f}s after its deadline, terminated")
+                self._mark_failed(job, 'deadline exceeded')
+
+    def reap_children(self) -> None:
+        """Handle children that finished since the last cycle."""
+        self.terminate_overdue()
+        for job, exitcode, elapsed in self.pool.reap():
+            outcome = classify_exit(exitcode)
+            cost_estimate = job.payload.get('cost_estimate') or {}
+            logger.info(f"Process {job.wfm_proc_id} finished with exit code {exitcode} ({outcome}) after {elapsed:.1f}s "
+                        f"(estimated {cost_estimate.get('estimated_seconds', 0):.1f}s from {cost_estimate.get('source')})")
+            if outcome == 'success':
+                self.history.record(
+                    cost_estimate.get('section_key'),
+                    elapsed,
+                    max(1, cost_estimate.get('n_employees', 0)) * max(1, cost_estimate.get('n_days', 0))
+                )
+            if outcome != 'crashed':
+                continue
+            if job.attempts < self.params['MAX_RETRIES']:
+                logger.warning(f"Process {job.wfm_proc_id} crashed, retry {job.attempts + 1}/{self.params['MAX_RETRIES']} in {self.params['RETRY_WAIT_TIME']}s")
+                self.pool.schedule_retry(job, self.params['RETRY_WAIT_TIME'])
+            else:
+                logger.error(f"Process {job.wfm_proc_id} crashed and exhausted MAX_RETRIES, setting status I")
+                self._mark_failed(job, f"child exit code {exitcode}")
+
+    def dispatch(self) -> None:
+        """Restart due retries, then start new processes from the queue."""
+        for job in self.pool.pop_due_retries(self.pool.capacity):
+            job.payload['deadline'] = self._process_deadline()
+            self.pool.submit(job)
+
+        if self.pool.capacity <= 0:
+            return
+
+        # Close to the wall-clock limit a new process could not finish: leave the queue for the next window
+        deadline_time = self.deadline_config.get('deadline_time')
+        if deadline_time:
+            seconds_left = compute_process_deadline(deadline_time=deadline_time) - time.time()
+            if seconds_left < self.deadline_config.get('min_start_seconds', 300):
+                if not self._deadline_logged:
+                    logger.info(f"{seconds_left:.0f}s left before the {deadline_time} deadline, not starting new processes")
+                    self._deadline_logged = True
+                return
+        self._deadline_logged = False
+
+        sec_to_proc = get_process_by_status(self.path, 'WFM', 'MPD', '2', 'N', self.connection, use_case=0)
+        # Processes that left the queue without being dispatched here (cancelled, deleted, taken by
+        # another orchestrator) are dropped from the estimate cache and the aging clock
+        pending_ids = set(sec_to_proc['CODIGO'].astype(int)) if not sec_to_proc.empty else set()
+        self.estimator.retain(pending_ids)
+        self.scheduler.retain(pending_ids)
+        if sec_to_proc.empty:
+            return
+        sec_to_proc = sec_to_proc[~sec_to_proc['CODIGO'].astype(int).map(self.pool.is_tracked)]
+
+        df_total = get_total_process_by_status(self.path, self.connection)
+        if df_total.empty:
+            logger.warning("Could not read the number of processes in status P, skipping cycle")
+            return
+        total_processing = int(df_total['TOTAL_P'].iloc[0])
+
+        processes_to_start = compute_available_slots(
+            global_max=self.params['GLOBAL_MAX_CONCURRENT_PROCESSES'],
+            total_processing=total_processing,
+            local_max=self.pool.max_workers,
+            local_running=self.pool.max_workers - self.pool.capacity,
+            pending=len(sec_to_proc)
+        )
+        if processes_to_start == 0 and total_processing >= self.params['GLOBAL_MAX_CONCURRENT_PROCESSES']:
+            # Only log the transition to avoid writing one row per poll
+            if not self._global_limit_logged:
+                self._log_process_error(self.api_proc_id, 'I', 'iniProc', {'1': '', '2': total_processing})
+                self._global_limit_logged = True
+            return
+        self._global_limit_logged = False
+
+        logger.info(f"Queue: {len(sec_to_proc)} new, {total_processing} processing globally, starting {processes_to_start}")
+        if processes_to_start == 0:
+            return
+
+        rows_by_id = {int(row['CODIGO']): row for _, row in sec_to_proc.iterrows()}
+        estimates = self.scheduler.order([self.estimator.estimate(row) for row in rows_by_id.values()])
+        for position, estimate in enumerate(estimates):
+            logger.info(f"Queue position {position + 1}: process {estimate.wfm_proc_id} section {estimate.section_key} "
+                        f"employees={estimate.n_employees} days={estimate.n_days} "
+                        f"estimated={estimate.estimated_seconds:.1f}s ({estimate.source})")
+
+        for i, estimate in enumerate(estimates[:processes_to_start]):
+            wfm_proc_id = estimate.wfm_proc_id
+            row = rows_by_id[wfm_proc_id]
+            self.estimator.forget(wfm_proc_id)
+            self.scheduler.forget(wfm_proc_id)
+            try:
+                payload = build_payload(row, self.path, self.api_proc_id, self.api_user, child_number=i + 1)
+                payload['cost_estimate'] = estimate.to_dict()
+                payload['deadline'] = self._process_deadline()
+                res = set_process_status(self.connection, self.path, payload['external_call_dict']['wfm_user'], wfm_proc_id, status='P')
+                if res != 1:
+                    self._log_process_error(wfm_proc_id, 'E', 'errCallSubProc', {'1': wfm_proc_id, '2': i + 1, '3': ''})
+                    continue
+                # Commit so other orchestrators see the P status before the child starts
+                self.connection.commit()
+                self.pool.submit(PoolJob(wfm_proc_id=wfm_proc_id, payload=payload))
+            except Exception as e:
+                logger.error(f"Error dispatching process {wfm_proc_id}: {e}", exc_info=True)
+                self._log_process_error(wfm_proc_id, 'E', 'errCallSubProc', {'1': wfm_proc_id, '2': i + 1, '3': str(e)})
+
+    def run(self) -> None:
+        """Main loop, returns after a stop was requested and children were handled."""
+        logger.info(f"Orchestrator started with pid {os.getpid()}")
+        while not self.stop_event.is_set():
+            try:
+                self.connection = self.connection_object.ensure_connection()
+                self.reap_children()
+                self.dispatch()
+            except Exception as e:
+                logger.error(f"Error in orchestrator cycle: {e}", exc_info=True)
+            self.stop_event.wait(self.params['ORCHESTRATOR_POLL_INTERVAL'])
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Wait for running children, then terminate whatever is still running."""
+        grace = self.params['ORCHESTRATOR_SHUTDOWN_GRACE']
+        logger.info(f"Waiting up to {grace}s for {len(self.pool.running_ids)} running processes")
+        self.connection = self.connection_object.ensure_connection()
+        if not self.pool.wait_all(grace):
+            for job in self.pool.terminate_all():
+                self._mark_failed(job, 'orchestrator shutdown')
+        self.reap_children()
+        for job in self.pool.drop_retries():
+            self._mark_failed(job, 'orchestrator shutdown')
+        self.connection_object.disconnect_database()
+        logger.info("Orchestrator stopped")
+
+
+def main() -> int:
+    setup_logger(
+        project_name=config_manager.system.project_name,
+        log_level=config_manager.system.get_log_level(),
+        log_dir=config_manager.system.logging_config.get('log_dir', 'logs'),
+        console_output=True
+    )
+    warnings.filterwarnings("ignore")
+
+    path = os.getcwd() + "/"
+    if len(sys.argv) > 2:
+        api_proc_id, api_user = sys.argv[1], sys.argv[2]
+    else:
+        api_proc_id, api_user = 999, 'WFM'
+
+    daemon = OrchestratorDaemon(path, api_proc_id, api_user)
+    signal.signal(signal.SIGTERM, daemon.request_stop)
+    signal.signal(signal.SIGINT, daemon.request_stop)
+    daemon.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """API routes for my_new_project."""
 
+import atexit
 import logging
 from datetime import datetime
 import os
 import json
+import time
 
 # Import Flask - we need to make this optional since it's not a required dependency
 try:
-    from flask import Flask, request, jsonify
+    from flask import Flask, Response, request, jsonify
 except ImportError:
     raise ImportError("Flask is required for API routes. Install with: pip install flask")
 
@@ -18,7 +20,7 @@ from base_data_project.utils import create_components
 
 # Import project-specific components
 from src.configuration_manager.instance import get_config
-from src.services.algoritmo_gd import AlgoritmoGDService
+from src.orquestrador_functions.Process_Pool.job_queue import FINAL_JOB_STATUSES, JOB_CANCELLED, JobQueue, JobStore
 
 # Get shared configuration manager instance
 config_manager = get_config()
@@ -29,20 +31,115 @@ logger = setup_logger(config_manager.system.project_name, log_level=logging.INFO
 # Create Flask app
 app = Flask(__name__)
 
-# Create data and process managers
-data_manager, process_manager = create_components(
-    use_db=config_manager.system.use_db,
-    no_tracking=False,
-    config=config_manager,
-    project_name=config_manager.system.project_name
-)
+# Jobs are queued in a local SQLite file and executed in child processes, so a
+# request never runs the algorithm and concurrent jobs never share service state
+api_config = config_manager.system.api_config
+
+
+def _api_path(key: str, default: str) -> str:
+    path = api_config.get(key, default)
+    return path if os.path.isabs(path) else os.path.join(config_manager.system.project_root_dir, path)
+
 
-# Create service
-service = AlgoritmoGDService(
-    data_manager=data_manager,
-    process_manager=process_manager
+job_store = JobStore(_api_path('jobs_db', 'data/output/api_jobs.sqlite3'))
+job_queue = JobQueue(
+    store=job_store,
+    results_dir=_api_path('results_dir', 'data/output/api_jobs'),
+    max_workers=api_config.get('max_workers', 1),
+    poll_interval=api_config.get('poll_interval_seconds', 1.0),
+    logger=logger
 )
 
+
+
+def _start_job_queue() -> None:
+    """Start the dispatcher with the app: WSGI servers import this module and never run __main__."""
+    job_queue.start()
+    atexit.register(job_queue.stop, api_config.get('shutdown_timeout_seconds', 60))
+
+
+_start_job_queue()
+
+REQUIRED_JOB_FIELDS = ('process_id', 'start_date', 'end_date')
+
+# Data manager for /data/<entity>, created on first use
+_data_manager = None
+
+
+def _get_data_manager():
+    global _data_manager
+    if _data_manager is None:
+        _data_manager, _ = create_components(
+            use_db=config_manager.system.use_db,
+            no_tracking=True,
+            config=config_manager,
+            project_name=config_manager.system.project_name
+        )
+    return _data_manager
+
+
+def _job_response(job: dict) -> dict:
+    """Public view of a job row."""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'params': job['params'],
+        'progress': job['progress'],
+        'result': job['result'],
+        'error': job['error'],
+        'cancel_requested': job['cancel_requested'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'schedule_url': f"/jobs/{job['job_id']}/schedule" if job['schedule_path'] else None,
+        'events_url': f"/jobs/{job['job_id']}/events",
+    }
+
+
+def _legacy_process_params(params: dict) -> dict:
+    """
+    POST /process used to take only algorithm and parameters and run with the configured
+    external_call_data; fields the caller does not send default to that configuration.
+    """
+    defaults = config_manager.parameters.external_call_data or {}
+    colaborador = defaults.get('wfm_proc_colab')
+    return {
+        'process_id': defaults.get('current_process_id'),
+        'start_date': defaults.get('start_date'),
+        'end_date': defaults.get('end_date'),
+        'user': defaults.get('wfm_user', 'API'),
+        'colaborador': colaborador,
+        **{key: value for key, value in params.items() if value not in (None, '')},
+    }
+
+
+def _enqueue(params: dict):
+    missing = [field for field in REQUIRED_JOB_FIELDS if params.get(field) in (None, '')]
+    if missing:
+        return jsonify({'status': 'error', 'error': f"Missing required fields: {missing}"}), 400
+    for field in ('start_date', 'end_date'):
+        try:
+            datetime.strptime(str(params[field]), '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'status': 'error', 'error': f"{field} must be YYYY-MM-DD"}), 400
+
+    job_params = {
+        'process_id': params['process_id'],
+        'start_date': params['start_date'],
+        'end_date': params['end_date'],
+        'posto_id': params.get('posto_id'),
+        'colaborador': params.get('colaborador'),
+        'user': params.get('user', 'API'),
+        'algorithm': params.get('algorithm', 'example_algorithm'),
+        'parameters': params.get('parameters'),
+    }
+    job_id = job_queue.submit(job_params)
+    logger.info(f"Queued job {job_id} for process {job_params['process_id']}")
+    response = jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/jobs/{job_id}'})
+    response.headers['Location'] = f'/jobs/{job_id}'
+    return response, 202
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -52,66 +149,126 @@ def health_check():
         'project': config_manager.system.project_name
     })
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a schedule generation.
+
+    Body: process_id, start_date, end_date (YYYY-MM-DD) and optionally posto_id,
+    colaborador, user, algorithm, parameters. Returns 202 with the job id.
+    """
+    try:
+        return _enqueue(request.json or {})
+    except Exception as e:
+        logger.error(f"Error queueing job: {str(e)}", exc_info=True)
+        return jsonify({'status': 'error', 'error': str(e)}), 500
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Most recent jobs."""
+    limit = request.args.get('limit', default=50, type=int)
+    return jsonify({'jobs': [_job_response(job) for job in job_store.list_jobs(limit)]})
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status, per-stage progress and result summary."""
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'error': f"Job {job_id} not found"}), 404
+    return jsonify(_job_response(job))
+
+@app.route('/jobs/<int:job_id>/schedule', methods=['GET'])
+def get_job_schedule(job_id):
+    """Stream the long-format schedule (CSV) of a completed job."""
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'error': f"Job {job_id} not found"}), 404
+    if job['status'] not in FINAL_JOB_STATUSES:
+        return jsonify({'job_id': job_id, 'status': job['status'], 'error': 'Job has not finished yet'}), 409
+    schedule_path = job['schedule_path']
+    if not schedule_path or not os.path.exists(schedule_path):
+        return jsonify({'job_id': job_id, 'status': job['status'], 'error': 'Job produced no schedule'}), 404
+
+    chunk_size = api_config.get('schedule_chunk_bytes', 65536)
+
+    def generate():
+        with open(schedule_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    return Response(
+        generate(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=job-{job_id}-schedule.csv'}
+    )
+
+@app.route('/jobs/<int:job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Server-Sent Events stream of the CP-SAT progress of a job.
+
+    Each event carries the solve label (posto), solution index, objective, bound,
+    gap, elapsed time, branches and conflicts. The stream resumes after the
+    Last-Event-ID header when the client reconnects and ends with an 'end' event
+    once the job has finished.
+    """
+    if job_store.get_job(job_id) is None:
+        return jsonify({'status': 'error', 'error': f"Job {job_id} not found"}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('after', 0), type=int) or 0
+    poll_seconds = api_config.get('events_poll_seconds', 0.5)
+    heartbeat_seconds = api_config.get('events_heartbeat_seconds', 15)
+
+    def generate():
+        after = last_event_id
+        last_sent = time.monotonic()
+        while True:
+            # Read the status before the events so nothing stored before the end is missed
+            job = job_store.get_job(job_id)
+            events = job_store.events_since(job_id, after)
+            for event in events:
+                after = event['event_id']
+                yield f"id: {after}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+            if events:
+                last_sent = time.monotonic()
+                continue
+            if job is None or job['status'] in FINAL_JOB_STATUSES:
+                status = job['status'] if job else 'unknown'
+                yield f"event: end\ndata: {json.dumps({'job_id': job_id, 'status': status})}\n\n"
+                return
+            if time.monotonic() - last_sent >= heartbeat_seconds:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(poll_seconds)
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """
+    Cancel a job. A queued job never starts; a running solve stops its search and
+    the job completes with the best solution found so far.
+    """
+    status = job_store.request_cancel(job_id)
+    if status is None:
+        return jsonify({'status': 'error', 'error': f"Job {job_id} not found"}), 404
+    if status in FINAL_JOB_STATUSES and status != JOB_CANCELLED:
+        return jsonify({'job_id': job_id, 'status': status, 'error': 'Job has already finished'}), 409
+    logger.info(f"Cancel requested for job {job_id} (status {status})")
+    return jsonify({'job_id': job_id, 'status': status, 'cancel_requested': True}), 202
+
 @app.route('/process', methods=['POST'])
 def start_process():
-    """Start a new process."""
+    """Kept for existing callers: queues a job like POST /jobs instead of running it in the request."""
     try:
-        # Get request parameters
-        params = request.json or {}
-        
-        # Get algorithm name from request or use default
-        algorithm = params.get('algorithm', 'default')
-        
-        logger.info(f"Starting new process with algorithm: {algorithm}")
-        
-        # Initialize process
-        with data_manager:
-            process_id = service.initialize_process(
-                "API Process Run",
-                f"Process started via API on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-            )
-            
-            # Run each stage
-            stages = ['data_loading', 'data_transformation', 'processing', 'result_analysis']
-            results = {}
-            
-            for stage in stages:
-                logger.info(f"Executing stage: {stage}")
-                
-                # Execute stage, using algorithm parameter for processing stage
-                if stage == 'processing':
-                    success = service.execute_stage(stage, algorithm_name=algorithm, algorithm_params=params.get('parameters'))
-                else:
-                    success = service.execute_stage(stage)
-                
-                results[stage] = success
-                
-                # Stop if stage fails
-                if not success:
-                    logger.error(f"Stage {stage} failed")
-                    break
-            
-            # Finalize process
-            service.finalize_process()
-            
-            # Get process summary
-            summary = service.get_process_summary()
-            
-            # Prepare response
-            response = {
-                'process_id': process_id,
-                'results': results,
-                'status': 'completed' if all(results.values()) else 'failed',
-                'completed_stages': len([s for s, r in results.items() if r]),
-                'total_stages': len(stages),
-                'summary': {
-                    'status_counts': summary.get('status_counts', {}),
-                    'progress': summary.get('progress', 0)
-                }
-            }
-            
-            return jsonify(response)
-            
+        return _enqueue(_legacy_process_params(request.json or {}))
     except Exception as e:
         logger.error(f"Error in process: {str(e)}", exc_info=True)
         return jsonify({
@@ -126,6 +283,7 @@ def get_data(entity):
         # Get query parameters
         limit = request.args.get('limit', type=int)
         
+        data_manager = _get_data_manager()
         with data_manager:
             # Load data
             data = data_manager.load_data(
@@ -153,6 +311,6 @@ if __name__ == '__main__':
     # Get port from environment variable or use default
     port = int(os.environ.get('PORT', 5000))
     
-    # Start Flask app
+    # The job dispatcher was started with the app and is stopped at exit
     logger.info(f"Starting API server on port {port}")
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -1,23 +1,63 @@
 """File containing the class AlgorithmFactory"""
 
 # Dependencies
+import importlib
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Type
 from base_data_project.algorithms.base import BaseAlgorithm
 from base_data_project.log_config import get_logger
-from base_data_project.storage.models import BaseDataModel
 
 # Local stuff
-from src.algorithms.alcampoAlgorithm import AlcampoAlgorithm
-from src.algorithms.salsaAlgorithm import SalsaAlgorithm
-from src.algorithms.soverOne import SolverOne
-from src.algorithms.example_algorithm import ExampleAlgorithm
 from src.configuration_manager import ConfigurationManager
 from src.configuration_manager.instance import get_config as get_config_manager
 
 # Initialize logger with project name from config
 logger = get_logger(get_config_manager().project_name)
 
+
+@dataclass(frozen=True)
+class AlgorithmEntry:
+    """Registered algorithm: 'module:ClassName' target, imported on first use."""
+    target: str
+    pass_config_manager: bool = False
+
+
+# Algorithm name -> entry. Algorithm modules (ortools, model builders, solver) are
+# only imported by create_algorithm, so processes that never build that algorithm
+# do not pay for its imports.
+ALGORITHM_REGISTRY: Dict[str, AlgorithmEntry] = {
+    'alcampo_algorithm': AlgorithmEntry('src.algorithms.alcampoAlgorithm:AlcampoAlgorithm', pass_config_manager=True),
+    'salsa_algorithm': AlgorithmEntry('src.algorithms.salsaAlgorithm:SalsaAlgorithm'),
+}
+
+_loaded_algorithms: Dict[str, Type[BaseAlgorithm]] = {}
+
+
+def register_algorithm(name: str, target: str, pass_config_manager: bool = False) -> None:
+    """
+    Register an algorithm under name without importing it.
+
+    Args:
+        name: Algorithm name as used in system_settings['available_algorithms']
+        target: 'package.module:ClassName'
+        pass_config_manager: Whether the constructor takes config_manager
+    """
+    ALGORITHM_REGISTRY[name.lower()] = AlgorithmEntry(target, pass_config_manager)
+    _loaded_algorithms.pop(name.lower(), None)
+
+
+def load_algorithm_class(name: str) -> Type[BaseAlgorithm]:
+    """Import (once) and return the class registered under name."""
+    key = name.lower()
+    if key not in _loaded_algorithms:
+        entry = ALGORITHM_REGISTRY.get(key)
+        if entry is None:
+            raise ValueError(f"Unsupported algorithm type: {name}. Registered algorithms: {list(ALGORITHM_REGISTRY)}")
+        module_name, class_name = entry.target.split(':')
+        _loaded_algorithms[key] = getattr(importlib.import_module(module_name), class_name)
+    return _loaded_algorithms[key]
+
 class AlgorithmFactory:
     """
     Factory class for creating algorithm instances
@@ -78,29 +118,23 @@ class AlgorithmFactory:
             merged_params = {**default_params, **parameters}
             parameters = merged_params
 
-        # Create algorithm instances based on decision
-        if decision.lower() == 'alcampo_algorithm':
-            logger.info(f"Creating AlcampoAlgorithm instance")
-            return AlcampoAlgorithm(
-                parameters=parameters,
-                algo_name=decision.lower(),
-                project_name=project_name,
-                process_id=process_id,
-                start_date=start_date,
-                end_date=end_date,
-                config_manager=config
-            )
-        elif decision.lower() == 'salsa_algorithm':
-            logger.info(f"Creating SalsaAlgorithm instance")
-            return SalsaAlgorithm(
-                parameters=parameters,
-                algo_name=decision.lower(),
-                project_name=project_name,
-                process_id=process_id,
-                start_date=start_date,
-                end_date=end_date
-            )
-        else:
+        # Create algorithm instance from the registry (imports the algorithm module on first use)
+        entry = ALGORITHM_REGISTRY.get(decision.lower())
+        if entry is None:
             error_msg = f"Unsupported algorithm type: {decision}. Available algorithms: {available_algorithms}"
             logger.error(error_msg)
-            raise ValueError(error_msg)
\ No newline at end of file
+            raise ValueError(error_msg)
+
+        algorithm_class = load_algorithm_class(decision)
+        logger.info(f"Creating {algorithm_class.__name__} instance")
+        kwargs = dict(
+            parameters=parameters,
+            algo_name=decision.lower(),
+            project_name=project_name,
+            process_id=process_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        if entry.pass_config_manager:
+            kwargs['config_manager'] = config
+        return algorithm_class(**kwargs)
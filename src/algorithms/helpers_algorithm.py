@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
@@ -5,6 +6,7 @@ from typing import  List, Dict, Any, Optional, Tuple
 
 # Local stuff
 from src.configuration_manager.instance import get_config
+from src.debug_artefacts import get_debug_writer
 from base_data_project.log_config import get_logger
 
 _config_manager = get_config()
@@ -401,249 +403,272 @@ def _create_empty_results(algo_name: str, process_id: int, start_date: str, end_
         }
     }
 
-def _calculate_comprehensive_stats(algorithm_results: pd.DataFrame, start_date: str, end_date: str, data_processed: Dict[str, Any] = None) -> Dict[str, Any]:
+_UNASSIGNED_SHIFTS = ('N', 'ERROR', '-')
+_WORKING_SHIFTS = ('M', 'T')
+_FREE_SHIFTS = ('L', 'LQ')
+_MAX_CONTINUOUS_WORK = 5  # Assume max 5 consecutive working days
+
+
+class _ScheduleMatrix:
+    """
+    Wide schedule (Worker + one column per day) encoded once as categorical shift codes.
+
+    codes has shape (workers, days) and holds -1 for missing cells. Categories are
+    numbered in order of first appearance scanning column by column, which is the
+    order the previous per-column implementation used.
+    """
+
+    def __init__(self, algorithm_results: pd.DataFrame):
+        self.day_columns = [col for col in algorithm_results.columns if col != 'Worker']
+        self.workers = algorithm_results['Worker'].to_numpy() if 'Worker' in algorithm_results.columns else np.array([])
+        values = algorithm_results[self.day_columns].to_numpy(dtype=object)
+        self.n_workers, self.n_days = values.shape
+
+        flat = pd.Series(values.T.ravel())
+        flat = flat.where(flat.isna(), flat.astype(str))
+        codes, categories = pd.factorize(flat)
+        self.categories = pd.Index(categories)
+        self.codes = codes.reshape(self.n_days, self.n_workers).T
+
+    @property
+    def missing(self) -> np.ndarray:
+        return self.codes < 0
+
+    def mask(self, shifts: Tuple[str, ...]) -> np.ndarray:
+        """Boolean (workers, days) matrix of cells whose shift is in shifts."""
+        wanted = [self.categories.get_loc(shift) for shift in shifts if shift in self.categories]
+        return np.isin(self.codes, wanted)
+
+    def counts(self) -> Dict[str, int]:
+        """Shift distribution sorted by count (ties keep first appearance)."""
+        if not len(self.categories):
+            return {}
+        counts = np.bincount(self.codes[~self.missing], minlength=len(self.categories))
+        order = np.argsort(-counts, kind='stable')
+        return {str(self.categories[i]): int(counts[i]) for i in order if counts[i] > 0}
+
+    def max_run(self, shifts: Tuple[str, ...]) -> np.ndarray:
+        """
+        Longest run per worker of consecutive cells in shifts.
+
+        Missing cells neither extend nor break a run, as they were skipped before.
+        """
+        if self.n_days == 0:
+            return np.zeros(self.n_workers, dtype=int)
+        hit = self.mask(shifts)
+        breaks = ~hit & ~self.missing
+        hits_so_far = np.cumsum(hit, axis=1)
+        hits_at_last_break = np.maximum.accumulate(np.where(breaks, hits_so_far, 0), axis=1)
+        return (hits_so_far - hits_at_last_break).max(axis=1)
+
+
+def _stats_from_matrix(matrix: _ScheduleMatrix, algorithm_results: pd.DataFrame, start_date: str, end_date: str, data_processed: Dict[str, Any] = None) -> Dict[str, Any]:
+    total_workers = len(algorithm_results) if not algorithm_results.empty else 0
+    total_days = len(matrix.day_columns)
+    if start_date and end_date:
+        total_days = len(pd.date_range(start=start_date, end=end_date, freq='D'))
+
+    shift_distribution = {}
+    total_assignments = 0
+    unassigned_slots = 0
+    if not algorithm_results.empty and matrix.day_columns:
+        shift_distribution = matrix.counts()
+        total_assignments = int((~matrix.missing).sum())
+        unassigned_slots = sum(shift_distribution.get(shift, 0) for shift in _UNASSIGNED_SHIFTS)
+
+    working_days_covered = 0
+    special_days_covered = 0
+    if data_processed:
+        working_days_covered = len(data_processed.get('working_days', []))
+        special_days_covered = len(data_processed.get('special_days', []))
+
+    return {
+        'workers': {
+            'total_workers': total_workers,
+            'workers_scheduled': total_workers,
+            'worker_list': [str(worker) for worker in matrix.workers]
+        },
+        'shifts': {
+            'shift_distribution': shift_distribution,
+            'total_assignments': total_assignments,
+            'shift_types_used': list(shift_distribution.keys()),
+            'unassigned_slots': unassigned_slots
+        },
+        'time_coverage': {
+            'total_days': total_days,
+            'working_days_covered': working_days_covered,
+            'special_days_covered': special_days_covered,
+            'coverage_percentage': 100.0 if total_days > 0 else 0
+        }
+    }
+
+
+def _constraints_from_matrix(matrix: _ScheduleMatrix, algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+    constraint_validation = {
+        'working_days': {
+            'violations': [],
+            'satisfied': True,
+            'details': 'All workers have proper working day assignments'
+        },
+        'continuous_working_days': {
+            'violations': [],
+            'max_continuous_exceeded': [],
+            'satisfied': True
+        },
+        'salsa_specific': {
+            'consecutive_free_days': {'satisfied': True, 'violations': []},
+            'quality_weekends': {'satisfied': True, 'violations': []},
+            'saturday_L_constraint': {'satisfied': True, 'violations': []}
+        },
+        'overall_satisfaction': 100
+    }
+
+    if algorithm_results.empty:
+        constraint_validation['working_days']['satisfied'] = False
+        constraint_validation['working_days']['violations'].append('No schedule data available')
+        constraint_validation['overall_satisfaction'] = 0
+        return constraint_validation
+
+    max_consecutive = matrix.max_run(_WORKING_SHIFTS)
+    exceeded = np.flatnonzero(max_consecutive > _MAX_CONTINUOUS_WORK)
+    if len(exceeded):
+        constraint_validation['continuous_working_days']['satisfied'] = False
+        constraint_validation['continuous_working_days']['violations'] = [
+            f"Worker {matrix.workers[i]}: {max_consecutive[i]} consecutive working days" for i in exceeded
+        ]
+        constraint_validation['overall_satisfaction'] -= 20
+
+    without_lq = np.flatnonzero(matrix.mask(('LQ',)).sum(axis=1) == 0)
+    if len(without_lq):
+        constraint_validation['salsa_specific']['quality_weekends']['satisfied'] = False
+        constraint_validation['salsa_specific']['quality_weekends']['violations'] = [
+            f"Worker {matrix.workers[i]}: No quality weekends assigned" for i in without_lq
+        ]
+        constraint_validation['overall_satisfaction'] -= 10
+
+    return constraint_validation
+
+
+def _quality_from_matrix(matrix: _ScheduleMatrix, algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+    two_day_quality_weekends = 0
+    consecutive_free_days_achieved = 0
+    saturday_L_assignments = 0
+
+    if not algorithm_results.empty and matrix.day_columns:
+        two_day_quality_weekends = int(matrix.mask(('LQ',)).sum())
+        saturday_L_assignments = int(matrix.mask(('L',)).sum())
+        consecutive_free_days_achieved = int((matrix.max_run(_FREE_SHIFTS) >= 2).sum())
+
+    return {
+        'salsa_specific_metrics': {
+            'two_day_quality_weekends': two_day_quality_weekends,
+            'consecutive_free_days_achieved': consecutive_free_days_achieved,
+            'saturday_L_assignments': saturday_L_assignments
+        }
+    }
+
+
+def _schedules_from_matrix(matrix: _ScheduleMatrix, algorithm_results: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    formatted_schedules = {
+        'database_format': pd.DataFrame(),
+        'wide_format': pd.DataFrame()
+    }
+    if algorithm_results.empty:
+        return formatted_schedules
+
+    formatted_schedules['wide_format'] = algorithm_results.copy()
+    if 'Worker' in algorithm_results.columns and matrix.day_columns:
+        # Same row order as pd.melt: day by day, workers in their original order.
+        # Day values are the date strings used as column names (e.g. '2025-12-22').
+        formatted_schedules['database_format'] = pd.DataFrame({
+            'colaborador': np.tile(matrix.workers, matrix.n_days),
+            'data': np.repeat(np.asarray(matrix.day_columns, dtype=object), matrix.n_workers),
+            'horario': algorithm_results[matrix.day_columns].to_numpy(dtype=object).T.ravel()
+        })
+        logger.info(f"Long format schedule built with shape {formatted_schedules['database_format'].shape}")
+    return formatted_schedules
+
+
+def _solution_validation_from_matrix(matrix: _ScheduleMatrix, algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+    validation_errors = []
+    warnings = []
+    recommendations = []
+
+    if algorithm_results.empty:
+        validation_errors.append("No schedule data available")
+    else:
+        if 'Worker' not in algorithm_results.columns:
+            validation_errors.append("Missing 'Worker' column")
+        if not matrix.day_columns:
+            validation_errors.append("No day columns found")
+        else:
+            unassigned_count = int(matrix.mask(_UNASSIGNED_SHIFTS).sum())
+            if unassigned_count > 0:
+                warnings.append(f"Found {unassigned_count} unassigned shifts")
+                recommendations.append("Review worker constraints and availability")
+
+            missing_count = int(matrix.missing.sum())
+            if missing_count > 0:
+                warnings.append(f"Found {missing_count} missing shift assignments")
+                recommendations.append("Verify data completeness")
+
+    return {
+        'is_valid_solution': len(validation_errors) == 0,
+        'validation_errors': validation_errors,
+        'warnings': warnings,
+        'recommendations': recommendations
+    }
+
+
+def _postprocess_schedule(algorithm_results: pd.DataFrame, start_date: str, end_date: str, data_processed: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Single columnar pass over the wide schedule producing everything format_results needs.
+
+    Returns:
+        Dictionary with stats, constraint_validation, quality_metrics, formatted_schedules and validation
+    """
+    try:
+        matrix = _ScheduleMatrix(algorithm_results)
+    except Exception as e:
+        logger.error(f"Error encoding schedule matrix: {e}")
+        matrix = None
+    return {
+        'stats': _calculate_comprehensive_stats(algorithm_results, start_date, end_date, data_processed, matrix=matrix),
+        'constraint_validation': _validate_constraints(algorithm_results, matrix=matrix),
+        'quality_metrics': _calculate_quality_metrics(algorithm_results, matrix=matrix),
+        'formatted_schedules': _format_schedules(algorithm_results, start_date, end_date, matrix=matrix),
+        'validation': _validate_solution(algorithm_results, matrix=matrix),
+    }
+
+
+def _calculate_comprehensive_stats(algorithm_results: pd.DataFrame, start_date: str, end_date: str, data_processed: Dict[str, Any] = None, matrix: Optional[_ScheduleMatrix] = None) -> Dict[str, Any]:
     """Calculate comprehensive statistics from algorithm results in wide format."""
     try:
-        # Basic counts
-        total_workers = len(algorithm_results) if not algorithm_results.empty else 0
-        
-        # Get day columns (all columns except 'Worker')
-        day_columns = [col for col in algorithm_results.columns if col != 'Worker']
-        total_days = len(day_columns)
-        
-        # Calculate date range
-        if start_date and end_date:
-            date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-            total_days = len(date_range)
-        
-        # Shift distribution - flatten all shift values
-        shift_distribution = {}
-        unassigned_slots = 0
-        total_assignments = 0
-        
-        if not algorithm_results.empty and day_columns:
-            # Get all shift values from the wide format
-            all_shifts = []
-            for col in day_columns:
-                all_shifts.extend(algorithm_results[col].dropna().astype(str).tolist())
-            
-            # Count shift types
-            shift_series = pd.Series(all_shifts)
-            shift_distribution = shift_series.value_counts().to_dict()
-            total_assignments = len(all_shifts)
-            unassigned_slots = shift_distribution.get('N', 0) + shift_distribution.get('ERROR', 0) + shift_distribution.get('-', 0)
-        
-        # Worker statistics
-        workers_scheduled = total_workers
-        worker_list = algorithm_results['Worker'].astype(str).tolist() if 'Worker' in algorithm_results.columns else []
-        
-        # Time coverage
-        scheduled_days = total_days
-        coverage_percentage = 100.0 if total_days > 0 else 0
-        
-        # Working days and special days coverage
-        working_days_covered = 0
-        special_days_covered = 0
-        
-        if data_processed:
-            working_days = data_processed.get('working_days', [])
-            special_days = data_processed.get('special_days', [])
-            working_days_covered = len(working_days)
-            special_days_covered = len(special_days)
-        
-        return {
-            'workers': {
-                'total_workers': total_workers,
-                'workers_scheduled': workers_scheduled,
-                'worker_list': worker_list
-            },
-            'shifts': {
-                'shift_distribution': shift_distribution,
-                'total_assignments': total_assignments,
-                'shift_types_used': list(shift_distribution.keys()),
-                'unassigned_slots': unassigned_slots
-            },
-            'time_coverage': {
-                'total_days': total_days,
-                'working_days_covered': working_days_covered,
-                'special_days_covered': special_days_covered,
-                'coverage_percentage': coverage_percentage
-            }
-        }
+        return _stats_from_matrix(matrix or _ScheduleMatrix(algorithm_results), algorithm_results, start_date, end_date, data_processed)
     except Exception as e:
         logger.error(f"Error calculating comprehensive stats: {e}")
         return {}
 
-def _validate_constraints(algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+def _validate_constraints(algorithm_results: pd.DataFrame, matrix: Optional[_ScheduleMatrix] = None) -> Dict[str, Any]:
     """Validate constraint satisfaction from wide format."""
     try:
-        constraint_validation = {
-            'working_days': {
-                'violations': [],
-                'satisfied': True,
-                'details': 'All workers have proper working day assignments'
-            },
-            'continuous_working_days': {
-                'violations': [],
-                'max_continuous_exceeded': [],
-                'satisfied': True
-            },
-            'salsa_specific': {
-                'consecutive_free_days': {'satisfied': True, 'violations': []},
-                'quality_weekends': {'satisfied': True, 'violations': []},
-                'saturday_L_constraint': {'satisfied': True, 'violations': []}
-            },
-            'overall_satisfaction': 100
-        }
-        
-        if algorithm_results.empty:
-            constraint_validation['working_days']['satisfied'] = False
-            constraint_validation['working_days']['violations'].append('No schedule data available')
-            constraint_validation['overall_satisfaction'] = 0
-            return constraint_validation
-        
-        # Get day columns
-        day_columns = [col for col in algorithm_results.columns if col != 'Worker']
-        
-        # Check for continuous working days violations
-        continuous_violations = []
-        max_continuous_work = 5  # Assume max 5 consecutive working days
-        
-        for idx, row in algorithm_results.iterrows():
-            worker = row['Worker']
-            worker_shifts = [str(row[col]) for col in day_columns if pd.notna(row[col])]
-            
-            consecutive_work = 0
-            max_consecutive = 0
-            
-            for shift in worker_shifts:
-                if shift in ['M', 'T']:  # Working shifts
-                    consecutive_work += 1
-                    max_consecutive = max(max_consecutive, consecutive_work)
-                else:
-                    consecutive_work = 0
-            
-            if max_consecutive > max_continuous_work:
-                continuous_violations.append(f"Worker {worker}: {max_consecutive} consecutive working days")
-        
-        if continuous_violations:
-            constraint_validation['continuous_working_days']['satisfied'] = False
-            constraint_validation['continuous_working_days']['violations'] = continuous_violations
-            constraint_validation['overall_satisfaction'] -= 20
-        
-        # Check SALSA-specific constraints
-        weekend_violations = []
-        for idx, row in algorithm_results.iterrows():
-            worker = row['Worker']
-            worker_shifts = [str(row[col]) for col in day_columns if pd.notna(row[col])]
-            
-            # Check for quality weekends (LQ should be followed by proper rest)
-            lq_count = worker_shifts.count('LQ')
-            if lq_count == 0:
-                weekend_violations.append(f"Worker {worker}: No quality weekends assigned")
-        
-        if weekend_violations:
-            constraint_validation['salsa_specific']['quality_weekends']['satisfied'] = False
-            constraint_validation['salsa_specific']['quality_weekends']['violations'] = weekend_violations
-            constraint_validation['overall_satisfaction'] -= 10
-        
-        return constraint_validation
+        return _constraints_from_matrix(matrix or _ScheduleMatrix(algorithm_results), algorithm_results)
     except Exception as e:
         logger.error(f"Error validating constraints: {e}")
         return {}
-    
-def _calculate_quality_metrics(algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+
+def _calculate_quality_metrics(algorithm_results: pd.DataFrame, matrix: Optional[_ScheduleMatrix] = None) -> Dict[str, Any]:
     """Calculate quality metrics for the solution from wide format."""
     try:
-        # Calculate basic metrics
-        total_workers = len(algorithm_results) if not algorithm_results.empty else 0
-        
-        # Get day columns
-        day_columns = [col for col in algorithm_results.columns if col != 'Worker']
-
-        
-        # SALSA-specific metrics
-        two_day_quality_weekends = 0
-        consecutive_free_days_achieved = 0
-        saturday_L_assignments = 0
-        
-        if not algorithm_results.empty and day_columns:
-            # Count LQ (two-day quality weekends)
-            for col in day_columns:
-                two_day_quality_weekends += (algorithm_results[col] == 'LQ').sum()
-            
-            # Count L assignments (including Saturday L)
-            for col in day_columns:
-                saturday_L_assignments += (algorithm_results[col] == 'L').sum()
-            
-            # Count consecutive free days (simplified - count sequences of L, LQ, F)
-            for idx, row in algorithm_results.iterrows():
-                worker_shifts = [str(row[col]) for col in day_columns if pd.notna(row[col])]
-                consecutive_count = 0
-                max_consecutive = 0
-                
-                for shift in worker_shifts:
-                    if shift in ['L', 'LQ']:
-                        consecutive_count += 1
-                        max_consecutive = max(max_consecutive, consecutive_count)
-                    else:
-                        consecutive_count = 0
-                
-                if max_consecutive >= 2:
-                    consecutive_free_days_achieved += 1
-        
-        
-        return {
-            'salsa_specific_metrics': {
-                'two_day_quality_weekends': two_day_quality_weekends,
-                'consecutive_free_days_achieved': consecutive_free_days_achieved,
-                'saturday_L_assignments': saturday_L_assignments
-            }
-        }
+        return _quality_from_matrix(matrix or _ScheduleMatrix(algorithm_results), algorithm_results)
     except Exception as e:
         logger.error(f"Error calculating quality metrics: {e}")
         return {}
-    
-def _format_schedules(algorithm_results: pd.DataFrame, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+
+def _format_schedules(algorithm_results: pd.DataFrame, start_date: str, end_date: str, matrix: Optional[_ScheduleMatrix] = None) -> Dict[str, pd.DataFrame]:
     """Format schedule for different output types from wide format."""
     try:
-        formatted_schedules = {
-            'database_format': pd.DataFrame(),
-            'wide_format': pd.DataFrame()
-        }
-        
-        if algorithm_results.empty:
-            return formatted_schedules
-        
-        # Wide format is already available (the input format)
-        formatted_schedules['wide_format'] = algorithm_results.copy()
-        
-        # Database format (long format) - convert from wide to long
-        if 'Worker' in algorithm_results.columns:
-            day_columns = [col for col in algorithm_results.columns if col != 'Worker']
-            
-            if day_columns:
-                # Melt the DataFrame to long format
-                # Note: 'Day' column will contain the date strings from column names (e.g., '2025-12-22')
-                melted_df = pd.melt(
-                    algorithm_results,
-                    id_vars=['Worker'],
-                    value_vars=day_columns,
-                    var_name='Day',
-                    value_name='Shift'
-                )
-                
-                logger.info(f"DEBUG: melted_df columns: {melted_df.columns.tolist()}, shape: {melted_df.shape}")
-                
-                # Select relevant columns and rename to expected format
-                formatted_schedules['database_format'] = melted_df[['Worker', 'Day', 'Shift']].copy()
-                formatted_schedules['database_format'].rename(columns={
-                    'Worker': 'colaborador',
-                    'Day': 'data',
-                    'Shift': 'horario'
-                }, inplace=True)
-
-        return formatted_schedules
+        return _schedules_from_matrix(matrix or _ScheduleMatrix(algorithm_results), algorithm_results)
     except Exception as e:
         logger.error(f"Error formatting schedules: {e}", exc_info=True)
         return {'database_format': pd.DataFrame(), 'wide_format': pd.DataFrame()}
@@ -669,53 +694,10 @@ def _create_metadata(algo_name: str, process_id: int, start_date: str, end_date:
         }
     }
 
-def _validate_solution(algorithm_results: pd.DataFrame) -> Dict[str, Any]:
+def _validate_solution(algorithm_results: pd.DataFrame, matrix: Optional[_ScheduleMatrix] = None) -> Dict[str, Any]:
     """Validate the solution and return validation results for wide format."""
     try:
-        validation_errors = []
-        warnings = []
-        recommendations = []
-        
-        # Check if solution is valid
-        if algorithm_results.empty:
-            validation_errors.append("No schedule data available")
-        else:
-            # Check for required columns
-            if 'Worker' not in algorithm_results.columns:
-                validation_errors.append("Missing 'Worker' column")
-            
-            # Check for day columns
-            day_columns = [col for col in algorithm_results.columns if col != 'Worker']
-            if not day_columns:
-                validation_errors.append("No day columns found")
-            
-            # Check for unassigned days
-            if day_columns:
-                unassigned_count = 0
-                for col in day_columns:
-                    unassigned_count += (algorithm_results[col].isin(['N', 'ERROR', '-'])).sum()
-                
-                if unassigned_count > 0:
-                    warnings.append(f"Found {unassigned_count} unassigned shifts")
-                    recommendations.append("Review worker constraints and availability")
-                
-                # Check for missing data
-                missing_count = 0
-                for col in day_columns:
-                    missing_count += algorithm_results[col].isna().sum()
-                
-                if missing_count > 0:
-                    warnings.append(f"Found {missing_count} missing shift assignments")
-                    recommendations.append("Verify data completeness")
-        
-        is_valid_solution = len(validation_errors) == 0
-        
-        return {
-            'is_valid_solution': is_valid_solution,
-            'validation_errors': validation_errors,
-            'warnings': warnings,
-            'recommendations': recommendations
-        }
+        return _solution_validation_from_matrix(matrix or _ScheduleMatrix(algorithm_results), algorithm_results)
     except Exception as e:
         logger.error(f"Error validating solution: {e}")
         return {
@@ -728,17 +710,19 @@ def _validate_solution(algorithm_results: pd.DataFrame) -> Dict[str, Any]:
 def _create_export_info(process_id: int, project_root_dir: str) -> Dict[str, Any]:
     """Create export information."""
     try:
-        # Get output filename from project_root_dir
-        output_filename = os.path.join(project_root_dir, 'data', 'output', f'salsa_schedule_{process_id}.xlsx')
+        # Get output filename from project_root_dir, extension depends on the debug artefact mode
+        debug_writer = get_debug_writer()
+        output_filename = debug_writer.artefact_path(os.path.join(project_root_dir, 'data', 'output', f'salsa_schedule_{process_id}.xlsx'))
         
         return {
             'export_files': {
-                'excel_file': output_filename,
-                'csv_file': None,
+                'excel_file': output_filename if debug_writer.mode == 'excel' else None,
+                'csv_file': output_filename if debug_writer.mode == 'csv' else None,
+                'parquet_file': output_filename if debug_writer.mode == 'parquet' else None,
                 'json_file': None
             },
             'export_timestamp': datetime.now().isoformat(),
-            'export_status': 'completed'
+            'export_status': 'completed' if debug_writer.enabled else 'disabled'
         }
     except Exception as e:
         logger.error(f"Error creating export info: {e}")
@@ -377,6 +377,19 @@ def group_creator(workers, grouper):
         groups[grouper.get(w, 0)].append(w)
 
     return list(groups.values())
+
+def fixed_semester_LQs(shift, w, parts):
+    """
+    LQ count of worker w in each part (days d whose Saturday d-1 has an LQ cell) when all
+    of those cells are fixed, e.g. a past worker of a partial generation; None otherwise.
+    """
+    counts = []
+    for part in parts:
+        free, n_fixed = shift.split(w, [d - 1 for d in part], 'LQ')
+        if free:
+            return None
+        counts.append(n_fixed)
+    return counts
  
  #solver
 
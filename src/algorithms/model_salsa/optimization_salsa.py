@@ -8,7 +8,7 @@ _config_manager = get_config()
 logger = get_logger(_config_manager.project_name)
 import numpy as np
 import math
-from src.algorithms.model_salsa.auxiliar_functions_salsa import group_creator
+from src.algorithms.model_salsa.auxiliar_functions_salsa import group_creator, fixed_semester_LQs
 
 
 
@@ -216,11 +216,7 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
 
     for d in days_of_year_working:
         for s in real_working_shift:
-                eligible_keys = [
-                    shift[(w, d, s)]
-                    for w in workers_with_key
-                    if (w, d, s) in shift
-                ]
+                eligible_keys = shift.day_vars(d, s, workers_with_key)
 
                 if eligible_keys:
                     no_key = model.NewBoolVar(f"no_key_{d}_{s}")
@@ -242,12 +238,7 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
         free_manager = model.NewIntVar(0, len(managers), f"free_managers_{d}")
         model.Add(
             free_manager ==
-            sum(
-                shift[(w, d, s)]
-                for w in managers
-                for s in ['L', 'LQ', 'LD']
-                if (w, d, s) in shift
-            )
+            shift.total(managers, [d], ['L', 'LQ', 'LD'])
         )
 
         extra_free_managers = model.NewIntVar(
@@ -265,12 +256,7 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
         free_keyholders = model.NewIntVar(0, len(keyholders), f"free_keyholders_{d}")
         model.Add(
             free_keyholders ==
-            sum(
-                shift[(w, d, s)]
-                for w in keyholders
-                for s in ['L', 'LQ', 'LD']
-                if (w, d, s) in shift
-            )
+            shift.total(keyholders, [d], ['L', 'LQ', 'LD'])
         )
 
         extra_free_keyholders = model.NewIntVar(
@@ -299,9 +285,9 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
     for d in days_of_year:
         for s in real_working_shift:
             target = pessObj.get((d, s), 0)
-            assigned_workers = sum(
-                shift[(w, d, s)] * work_day_hours[w].get(d, 8)
-                for w in all_workers if (w, d, s) in shift
+            # Fixed cells (absences, the published schedule of past workers) are a constant offset
+            assigned_workers = shift.weighted_total(
+                all_workers, d, s, weight=lambda key: work_day_hours[key[0]].get(key[1], 8)
             )
 
             excess  = model.NewIntVar(0, len(all_workers)*80, f'excess_{d}_{s}')
@@ -561,7 +547,7 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
     for d in days_of_year_working:
         for s in real_working_shift:  
             target = pessObj.get((d,s), 0)
-            assigned_workers = sum(shift[(w,d,s)] for w in all_workers if (w,d,s) in shift)
+            assigned_workers = shift.total(all_workers, [d], s)
 
             if target > 0:
                 zero_assigned = model.NewBoolVar(f'zero_assigned_{d}_{s}')
@@ -585,7 +571,7 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
             if -2 < h_plus_d <= 0:
                 target = sum(pessObj.get((d,s), 0) for s in real_working_shift)
                 if target > 0:
-                    assigned_workers = sum(shift[(w,d,s)] for w in all_workers for s in real_working_shift if (w,d,s) in shift)
+                    assigned_workers = shift.total(all_workers, [d], real_working_shift)
                     zero_assigned = model.NewBoolVar(f'zero_assigned_in_other_eci_section_{d}_{s}')
                     model.Add(assigned_workers == 0).OnlyEnforceIf(zero_assigned)
                     model.Add(assigned_workers >= 1).OnlyEnforceIf(zero_assigned.Not())
@@ -1090,6 +1076,12 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
 
     if workers_not_complete_exist:
         for w in all_workers_not_complete:
+            # Workers whose LQs are all fixed (past workers) add a constant term
+            fixed_LQs_per_semester = fixed_semester_LQs(shift, w, parts)
+            if fixed_LQs_per_semester is not None:
+                objective_terms.append((max(fixed_LQs_per_semester) - min(fixed_LQs_per_semester))*LQ_imbalance_weight_average)
+                continue
+
             list_of_free_LQs_per_semester=[]
             for part in parts:   
                 LQs_semester = sum(shift[(w, d-1, 'LQ')] for d in part if (w, d-1, 'LQ') in shift)
@@ -1113,6 +1105,11 @@ def salsa_optimization(model, days_of_year, workers, workers_complete_cycle, rea
 
     if workers_not_complete_exist:
         for w in all_workers_not_complete:
+            fixed_LQs_per_semester = fixed_semester_LQs(shift, w, parts)
+            if fixed_LQs_per_semester is not None:
+                diff_per_worker_LQ.append(max(fixed_LQs_per_semester) - min(fixed_LQs_per_semester))
+                continue
+
             list_of_free_LQs_per_semester = []
 
             for part_index, part in enumerate(parts):
@@ -4,15 +4,15 @@ import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import date, datetime
 import logging
-from base_data_project.log_config import get_logger
-from src.configuration_manager.instance import get_config as get_config_manager
+from src.structured_logging import get_module_logger, summarize
 from collections import defaultdict
+from src.cancellation import get_cancellation_token
 from src.algorithms.model_salsa.auxiliar_functions_salsa import (days_off_atributtion, populate_week_template, populate_week_fixed_days_off, joining_template_with_contract_per_week,
                                                                 check_5_6_pattern_consistency, absences_to_empty, fixed_to_dynamic, first_not_A_value)
 
 
 # Set up logger
-logger = get_logger(get_config_manager().system.project_name)
+logger = get_module_logger(__name__)
 
 def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatment_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
@@ -30,11 +30,12 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
     """
     try:
         logger.info("Starting enhanced data reading for salsa algorithm")
+        cancel_token = get_cancellation_token()
 
         # =================================================================
         # 1. VALIDATE INPUT data
         # =================================================================
-        logger.info(f"algorithm_treatment_params: {algorithm_treatment_params}")
+        logger.info("algorithm_treatment_params: %s", summarize(algorithm_treatment_params))
         
         matriz_colaborador_gd = medium_dataframes['df_colaborador'].copy()
         matriz_estimativas_gd = medium_dataframes['df_estimativas'].copy()
@@ -93,6 +94,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 3. PROCESS CALENDARIO data
         # =================================================================
         logger.info("Processing calendario data")
+        cancel_token.check("read_data_salsa: calendario data")
         
         # Ensure colaborador column is numeric
         matriz_calendario_gd['employee_id'] = pd.to_numeric(matriz_calendario_gd['employee_id'], errors='coerce')
@@ -113,6 +115,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 5. IDENTIFY VALID WORKERS (PRESENT IN ALL DATAFRAMES)
         # =================================================================
         logger.info("Identifying valid workers present in all DataFrames")
+        cancel_token.check("read_data_salsa: valid workers")
         
         # Get unique workers from each DataFrame
         workers_colaborador_complete = set(matriz_colaborador_gd['employee_id'].dropna().astype(int))
@@ -186,6 +189,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 6. EXTRACT DAYS AND DATE INFORMATION
         # =================================================================
         logger.info("Extracting days and date information")
+        cancel_token.check("read_data_salsa: days and dates")
         
         days_of_year = sorted(matriz_calendario_gd['index'].unique().tolist())
         max_day = max(days_of_year)
@@ -211,7 +215,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         logger.info(f"Special days identified:")
         logger.info(f"  - Sundays: {len(sundays)} days")
         logger.info(f"  - Holidays (non-Sunday): {len(holidays)} days")
-        logger.info(f"  - Holidays: {holidays} days")
+        logger.info("  - Holidays: %s days", summarize(holidays))
         logger.info(f"  - Closed holidays: {len(closed_holidays)} days")
         logger.info(f"  - Total special days: {len(special_days)} days")
 
@@ -219,6 +223,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 8. CALCULATE ADDITIONAL PARAMETERS
         # =================================================================
         logger.info("Calculating additional parameters")
+        cancel_token.check("read_data_salsa: additional parameters")
         
         # Working days (non-special days)
         non_holidays = [d for d in days_of_year if d not in closed_holidays]  # Alias for compatibility
@@ -287,7 +292,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                         
             logger.info(f"Week to days mapping created using calendar data:")
             logger.info(f"  - Start weekday (from first date): {start_weekday}")
-            logger.info(f"  - Weeks found: {sorted(week_to_days.keys())}")
+            logger.info("  - Weeks found: %s", summarize(sorted(week_to_days.keys())))
             logger.info(f"  - Total weeks: {len(week_to_days)}")
             #logger.info(f"  - Sample weeks: {dict(list(week_to_days.items())[:])}")
                 
@@ -307,6 +312,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 9. PROCESS WORKER-SPECIFIC data
         # =================================================================
         logger.info("Processing worker-specific data")
+        cancel_token.check("read_data_salsa: worker data")
 
         # Get the date range from matriz_calendario for validation
         min_calendar_date = matriz_calendario_gd['schedule_day'].min()
@@ -391,9 +397,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                 week_compensation_limit[w] = int(worker_row.get('n_sem_a_folga', 0))
                 # MODIFIED: Fix date handling - don't convert Timestamp to datetime
                 admissao_value = worker_row.get('data_admissao', None)
-                logger.info(f"Processing worker {w} with data_admissao: {admissao_value}")
+                logger.debug("Processing worker %s with data_admissao: %s", w, admissao_value)
                 demissao_value = worker_row.get('data_demissao', None)
-                logger.info(f"Processing worker {w} with data_demissao: {demissao_value}")
+                logger.debug("Processing worker %s with data_demissao: %s", w, demissao_value)
 
                 # Convert data_admissao to day of year
                 data_admissao[w] = 0
@@ -410,9 +416,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                         if min_calendar_date <= admissao_date <= max_calendar_date:
                             admissao_day_of_year = worker_calendar.loc[worker_calendar['schedule_day'] == admissao_date, 'index'].iloc[0]
                             data_admissao[w] = int(admissao_day_of_year)
-                            logger.info(f"Worker {w} data_admissao: {admissao_date.date()} -> day of year {admissao_day_of_year}")
+                            logger.debug("Worker %s data_admissao: %s -> day of year %s", w, admissao_date.date(), admissao_day_of_year)
                         else:
-                            logger.info(f"Worker {w} data_admissao {admissao_date.date()} is outside calendar range ({min_calendar_date.date()} to {max_calendar_date.date()}), set to 0")
+                            logger.debug("Worker %s data_admissao %s is outside calendar range (%s to %s), set to 0", w, admissao_date.date(), min_calendar_date.date(), max_calendar_date.date())
 
                 # Convert data_demissao to day of year
                 data_demissao[w] = max_day + 1
@@ -428,16 +434,16 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                         if min_calendar_date <= demissao_date <= max_calendar_date:
                             demissao_day_of_year = worker_calendar.loc[worker_calendar['schedule_day'] == demissao_date, 'index'].iloc[0]
                             data_demissao[w] = int(demissao_day_of_year)
-                            logger.info(f"Worker {w} data_demissao: {demissao_date.date()} -> day of year {demissao_day_of_year}")
+                            logger.debug("Worker %s data_demissao: %s -> day of year %s", w, demissao_date.date(), demissao_day_of_year)
                         else:
-                            logger.info(f"Worker {w} data_demissao {demissao_date.date()} is outside calendar range ({min_calendar_date.date()} to {max_calendar_date.date()}), set to 0")
+                            logger.debug("Worker %s data_demissao %s is outside calendar range (%s to %s), set to 0", w, demissao_date.date(), min_calendar_date.date(), max_calendar_date.date())
 
                 # Track first and last registered days
                 if w in matriz_calendario_gd['employee_id'].values:
                     first_registered_day[w] = worker_calendar['index'].min()
                     if  first_registered_day[w] < data_admissao[w]:
                         first_registered_day[w] = data_admissao[w]
-                    logger.info(f"Worker {w} first registered day: {first_registered_day[w]}")
+                    logger.debug("Worker %s first registered day: %s", w, first_registered_day[w])
                 else:
                     first_registered_day[w] = 0
 
@@ -446,7 +452,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                     # Only adjust if there's an actual dismissal date (not 0)
                     if data_demissao[w] > 0 and last_registered_day[w] > data_demissao[w]:
                         last_registered_day[w] = data_demissao[w]
-                    logger.info(f"Worker {w} last registered day: {last_registered_day[w]}")
+                    logger.debug("Worker %s last registered day: %s", w, last_registered_day[w])
                 else:
                     last_registered_day[w] = 0
 
@@ -480,9 +486,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                         first_week_5_6[new_w] = int(worker_row.get('seed_5_6', 0))
                         week_compensation_limit[new_w] = int(worker_row.get('n_sem_a_folga', 0))
                         admissao_value = worker_row.get('begin_date', None)
-                        logger.info(f"Processing worker {new_w} with data_admissao: {admissao_value}")
+                        logger.debug("Processing worker %s with data_admissao: %s", new_w, admissao_value)
                         demissao_value = worker_row.get('end_date', None)
-                        logger.info(f"Processing worker {new_w} with data_demissao: {demissao_value}")
+                        logger.debug("Processing worker %s with data_demissao: %s", new_w, demissao_value)
                         # Convert data_admissao to day of year
                         data_admissao[new_w] = 0
                         if admissao_value is not None and not pd.isna(admissao_value):
@@ -498,9 +504,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                                 if min_calendar_date <= admissao_date <= max_calendar_date:
                                     admissao_day_of_year = worker_calendar.loc[worker_calendar['schedule_day'] == admissao_date, 'index'].iloc[0]
                                     data_admissao[new_w] = int(admissao_day_of_year)
-                                    logger.info(f"Worker {new_w} data_admissao: {admissao_date.date()} -> day of year {admissao_day_of_year}")
+                                    logger.debug("Worker %s data_admissao: %s -> day of year %s", new_w, admissao_date.date(), admissao_day_of_year)
                                 else:
-                                    logger.info(f"Worker {new_w} data_admissao {admissao_date.date()} is outside calendar range ({min_calendar_date.date()} to {max_calendar_date.date()}), set to 0")
+                                    logger.debug("Worker %s data_admissao %s is outside calendar range (%s to %s), set to 0", new_w, admissao_date.date(), min_calendar_date.date(), max_calendar_date.date())
 
                         # Convert data_demissao to day of year
                         data_demissao[new_w] = max_day + 1
@@ -516,9 +522,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                                 if min_calendar_date <= demissao_date <= max_calendar_date:
                                     demissao_day_of_year = worker_calendar.loc[worker_calendar['schedule_day'] == demissao_date, 'index'].iloc[0]
                                     data_demissao[new_w] = int(demissao_day_of_year)
-                                    logger.info(f"Worker {new_w} data_demissao: {demissao_date.date()} -> day of year {demissao_day_of_year}")
+                                    logger.debug("Worker %s data_demissao: %s -> day of year %s", new_w, demissao_date.date(), demissao_day_of_year)
                                 else:
-                                    logger.info(f"Worker {new_w} data_demissao {demissao_date.date()} is outside calendar range ({min_calendar_date.date()} to {max_calendar_date.date()}), set to 0")
+                                    logger.debug("Worker %s data_demissao %s is outside calendar range (%s to %s), set to 0", new_w, demissao_date.date(), min_calendar_date.date(), max_calendar_date.date())
 
                         if layer == nbr_of_contracts - 1:
                             data_demissao[new_w] = data_demissao[w]
@@ -531,7 +537,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                             first_registered_day[new_w] = worker_calendar['index'].min()
                             if  first_registered_day[new_w] < data_admissao[new_w]:
                                 first_registered_day[new_w] = data_admissao[new_w]
-                            logger.info(f"Worker {new_w} first registered day: {first_registered_day[new_w]}")
+                            logger.debug("Worker %s first registered day: %s", new_w, first_registered_day[new_w])
                         else:
                             first_registered_day[new_w] = 0
 
@@ -540,7 +546,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                             # Only adjust if there's an actual dismissal date (not 0)
                             if data_demissao[new_w] > 0 and last_registered_day[new_w] > data_demissao[new_w]:
                                 last_registered_day[new_w] = data_demissao[new_w]
-                            logger.info(f"Worker {new_w} last registered day: {last_registered_day[new_w]}")
+                            logger.debug("Worker %s last registered day: %s", new_w, last_registered_day[new_w])
                         else:
                             last_registered_day[new_w] = 0
                         workers_with_dummy[w][range(data_admissao[new_w], data_demissao[new_w] + 1)] = new_w
@@ -571,15 +577,22 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         week_template_temp = {}
         week_template = {}
 
+        # Published schedule of the past workers, split by worker once
+        past_calendars = {
+            w: worker_calendar
+            for w, worker_calendar in matriz_calendario_nao_alterada[
+                matriz_calendario_nao_alterada['employee_id'].isin(workers_past)
+            ].groupby('employee_id', sort=False)
+        }
         for w in workers_past:
-            worker_calendar = matriz_calendario_nao_alterada[matriz_calendario_nao_alterada['employee_id'] == w]
+            worker_calendar = past_calendars.get(w, matriz_calendario_nao_alterada.iloc[0:0])
             #logger.info(worker_calendar.to_string(index=False))
 
             if worker_calendar.empty:
                 logger.warning(f"PAST WORKERS: No calendar data found for worker {w}")
                 continue
             else:
-                logger.info(f"PAST WORKERS: Calendar data found for worker {w}")
+                logger.debug("PAST WORKERS: Calendar data found for worker %s", w)
             shift_M[w] = set(worker_calendar[(worker_calendar['horario'] == 'M') | (worker_calendar['horario'] == 'MoT')]['index'].tolist())
             shift_T[w] = set(worker_calendar[(worker_calendar['horario'] == 'T') | (worker_calendar['horario'] == 'MoT')]['index'].tolist())
             fixed_LQs[w] = set(worker_calendar[worker_calendar['horario'] == 'LQ']['index'].tolist())
@@ -590,7 +603,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
             worker_absences[w] = set(worker_calendar[(worker_calendar['horario'] == 'A') | (worker_calendar['horario'] == 'AP')]['index'].tolist())
             work_day_hours[w] = (worker_calendar.drop_duplicates(subset='index').set_index('index')['carga_diaria'].fillna(8).astype(int).to_dict())
 
-            logger.info(f"worker hours {w},\n{work_day_hours[w]}\nlen {len(work_day_hours[w])}")
+            logger.debug("worker hours %s,\n%s\nlen %s", w, summarize(work_day_hours[w]), len(work_day_hours[w]))
 
             first_registered_day[w] = worker_calendar['index'].min()
             last_registered_day[w] = worker_calendar['index'].max()
@@ -736,7 +749,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         for w in workers_past:
             row = matriz_colaborador_nao_alterada.loc[matriz_colaborador_nao_alterada['employee_id'] == w]
             if row.empty:
-                logger.info(f"calendario vazio {w}")
+                logger.debug("calendario vazio %s", w)
                 role = "normal"
             else:
                 raw = row.iloc[0].get(role_col)
@@ -796,6 +809,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
         # 11. PROCESS ESTIMATIVAS data
         # =================================================================
         logger.info("Processing estimativas data")
+        cancel_token.check("read_data_salsa: estimativas data")
         
         # Extract optimization parameters from estimativas
         pess_obj = {}
@@ -884,9 +898,9 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
             f"Compensatory rules loaded for {len(holiday_rules)} employee(s) (holidays), "
             f"{len(sunday_rules)} employee(s) (sundays)"
         )
-        logger.info(f"holiday rules: {holiday_rules}")
-        logger.info(f"sunday rules: {sunday_rules}")
-        logger.info(f"override rules: {override_holiday_sunday}")
+        logger.info("holiday rules: %s", summarize(holiday_rules))
+        logger.info("sunday rules: %s", summarize(sunday_rules))
+        logger.info("override rules: %s", summarize(override_holiday_sunday))
 
         holiday_past_lds = {}
         sunday_past_lds = {}
@@ -931,8 +945,8 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                         for d in sunday_past_lds[w]["days_&_limit"]:
                             sunday_past_lds[w]["days_&_limit"][d] = sunday_past_lds[w]["days_&_limit"][d] - (pd.to_datetime(index_to_date[period[0]]) - pd.to_datetime(index_to_date[d])).days + 1
 
-            logger.info(f"past holiday : {holiday_past_lds}")
-            logger.info(f"past sunday : {sunday_past_lds}")
+            logger.info("past holiday : %s", summarize(holiday_past_lds))
+            logger.info("past sunday : %s", summarize(sunday_past_lds))
         # =================================================================
         # 14. ANNUAL VARIABLES
         # =================================================================
@@ -977,7 +991,7 @@ def read_data_salsa(medium_dataframes: Dict[str, pd.DataFrame], algorithm_treatm
                             "apply_l_sab": worker_row.get("apply_l_sab", True), 
                             "apply_l_dom_or_sab": worker_row.get("apply_l_dom_or_sab", True)
                         }
-        logger.info(f"annual variables: {annual_variables}")
+        logger.info("annual variables: %s", summarize(annual_variables))
 
         # =================================================================
         # 15. RETURN ALL PROCESSED data
@@ -62,7 +62,7 @@ def compensation_days(model, shift, workers, working_days, special_days, special
                 amount_lds[w][d] = special_day_rules[w]["amount"][d]
                 worked_special_day = model.NewBoolVar(f'worked_{day_type}_{w}_{d}')
                 worked_special_days[w][d] = worked_special_day
-                special_day_shift_vars = [shift.get((original, d, s)) for s in working_shift if (original, d, s) in shift]
+                special_day_shift_vars = shift.worker_vars(original, [d], working_shift)
 
                 # If there are shift variables for this day, add a constraint
                 if special_day_shift_vars:
@@ -235,13 +235,13 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
             else:
                 past_lds = len([d for d in fixed_lds[w] if d > period[0]])
             if w in total_lds_holidays_everyone and w in total_lds_sundays_everyone:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == total_lds_holidays_everyone[w] + total_lds_sundays_everyone[w] + past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + total_lds_sundays_everyone[w] + past_lds)
             elif w in total_lds_holidays_everyone:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == total_lds_holidays_everyone[w] + past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + past_lds)
             elif w in total_lds_sundays_everyone:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == total_lds_sundays_everyone[w] + past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == total_lds_sundays_everyone[w] + past_lds)
             else:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == past_lds)
     elif total_lds_holidays_everyone is not None:
         for w in workers_no_changes:
             if fixed_lds[w] == []:
@@ -249,9 +249,9 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
             else:
                 past_lds = len([d for d in fixed_lds[w] if d > period[0]])
             if w in total_lds_holidays_everyone:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == total_lds_holidays_everyone[w] + past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + past_lds)
             else:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == past_lds)
     elif total_lds_sundays_everyone is not None:
         for w in workers_no_changes:
             if fixed_lds[w] == []:
@@ -259,16 +259,16 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
             else:
                 past_lds = len([d for d in fixed_lds[w] if d > period[0]])
             if w in total_lds_sundays_everyone:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == total_lds_sundays_everyone[w] + past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == total_lds_sundays_everyone[w] + past_lds)
             else:
-                model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == past_lds)
+                model.Add(shift.total([w], range(period[0], 500), 'LD') == past_lds)
     else:
         for w in workers_no_changes:
             if fixed_lds[w] == []:
                 past_lds = 0
             else:
                 past_lds = len([d for d in fixed_lds[w] if d > period[0]])
-            model.Add(sum(shift[(w, d, 'LD')] for d in range(period[0], 500) if (w, d, 'LD') in shift) == past_lds)
+            model.Add(shift.total([w], range(period[0], 500), 'LD') == past_lds)
 
 
     if workers_no_changes != workers:
@@ -297,13 +297,13 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
                 else:
                     past_lds = len([d for d in fixed_lds[w] if d > period[0]])
                 if w in total_lds_holidays_everyone and w in total_lds_sundays_everyone:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == total_lds_holidays_everyone[w] + total_lds_sundays_everyone[w] + past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + total_lds_sundays_everyone[w] + past_lds)
                 elif w in total_lds_holidays_everyone:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == total_lds_holidays_everyone[w] + past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + past_lds)
                 elif w in total_lds_sundays_everyone:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == total_lds_sundays_everyone[w] + past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == total_lds_sundays_everyone[w] + past_lds)
                 else:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == past_lds)
         elif total_lds_holidays_everyone is not None:
             for w in workers_with_dummy:
                 if fixed_lds[w] == []:
@@ -311,9 +311,9 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
                 else:
                     past_lds = len([d for d in fixed_lds[w] if d > period[0]])
                 if w in total_lds_holidays_everyone:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == total_lds_holidays_everyone[w] + past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == total_lds_holidays_everyone[w] + past_lds)
                 else:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == past_lds)
         elif total_lds_sundays_everyone is not None:
             for w in workers_with_dummy:
                 if fixed_lds[w] == []:
@@ -321,28 +321,31 @@ def ld_restriction(model, shift, workers, period, total_lds_holidays_everyone, t
                 else:
                     past_lds = len([d for d in fixed_lds[w] if d > period[0]])
                 if w in total_lds_sundays_everyone:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == total_lds_sundays_everyone[w] + past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == total_lds_sundays_everyone[w] + past_lds)
                 else:
-                    model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == past_lds)
+                    model.Add(shift.total(dummies, range(period[0], 500), 'LD') == past_lds)
         else:
             for w in workers_with_dummy:
                 if fixed_lds[w] == []:
                     past_lds = 0
                 else:
                     past_lds = len([d for d in fixed_lds[w] if d > period[0]])
-                model.Add(sum(shift[(dum, d, 'LD')] for dum in dummies for d in range(period[0], 500) if (dum, d, 'LD') in shift) == past_lds)
+                model.Add(shift.total(dummies, range(period[0], 500), 'LD') == past_lds)
     
 
+def exactly_one_shift(model, free_shifts, fixed_shifts):
+    # A fixed cell already is the day's shift, so its alternatives only get the offset
+    # (none are created for it in decision_variables, so usually nothing is added)
+    if fixed_shifts:
+        if free_shifts or fixed_shifts > 1:
+            model.Add(sum(free_shifts) == 1 - fixed_shifts)
+    elif free_shifts:
+        model.add_exactly_one(free_shifts)
+
 def shift_day_constraint(model, shift, days_of_year, workers_complete, shifts):
     # Constraint for workers having an assigned shift
-    for w in workers_complete:
-        for d in days_of_year:
-            total_shifts = []
-            for s in shifts:
-                if (w, d, s) in shift:
-                    total_shifts.append(shift[(w, d, s)])
-            if (total_shifts):
-                model.add_exactly_one(total_shifts)
+    for _, free_shifts, fixed_shifts in shift.cells(workers_complete, days_of_year, shifts):
+        exactly_one_shift(model, free_shifts, fixed_shifts)
 
 def week_working_days_constraint(model, shift, week_to_days, workers, working_shift, contract_type, work_days_per_week, period, complete_cycle_days):
     # Define working shifts
@@ -353,7 +356,7 @@ def week_working_days_constraint(model, shift, week_to_days, workers, working_sh
             if days_in_week[-1] < period[0] or days_in_week[0] > period[1] or any(d in complete_cycle_days[w] for d in days_in_week):
                 continue
             # Sum shifts across days and shift types
-            total_shifts = sum(shift[(w, d, s)] for d in days_in_week for s in working_shift if (w, d, s) in shift)
+            total_shifts = shift.total([w], days_in_week, working_shift)
             max_days = work_days_per_week[w][week - 1]
             model.Add(total_shifts <= max_days)
 
@@ -427,7 +430,7 @@ def LQ_attribution(model, shift, workers_no_contract_changes, working_days, c2d,
             continue
         worker_saturdays = [d - 1 for d in sundays if d - 1 in working_days[w] and year_range[0] <= d - 1 <= year_range[1] \
                             and get_annual_variables(annual_variables, w, d - 1, "c2d") == True and (w, d - 1, "LQ") in shift]
-        model.Add(sum(shift[(w, d, "LQ")] for d in worker_saturdays if (w, d, 'LQ') in shift) >= c2d.get(w, 0))
+        model.Add(shift.total([w], worker_saturdays, 'LQ') >= c2d.get(w, 0))
     for w in workers_with_dummy:
         if c2d.get(w, 0) == 0:
             continue
@@ -443,7 +446,6 @@ def working_day_shifts(model, shift, workers, working_days, check_shift, working
         for d in working_days[w]:
             if not (period[0] < d < period[1]):
                 continue
-            total_shifts = []
             if d not in complete_cycle_days[w]:
                 if contract_type.get(w, 0) > 4:
                     check = check_shift
@@ -452,11 +454,8 @@ def working_day_shifts(model, shift, workers, working_days, check_shift, working
             else:
                 check = working_shift
 
-            for s in check:
-                if (w, d, s) in shift:
-                    total_shifts.append(shift[(w, d, s)])
-            if total_shifts:
-                model.add_exactly_one(total_shifts)
+            free_shifts, fixed_shifts = shift.split([w], [d], check)
+            exactly_one_shift(model, free_shifts, fixed_shifts)
 
 def salsa_2_consecutive_free_days(model, shift, workers, working_days, contract_type, fixed_days, fixed_LQs, period, complete_cycle_days):
     for w in workers:
@@ -780,7 +779,7 @@ def free_days_sundays(model, shift, sundays, workers_no_contract_changes, workin
         # Only consider special days that are in this worker's working days
         worker_sundays = [d for d in sundays if d in working_days[w] and year_range[0] <= d <= year_range[1] and get_annual_variables(annual_variables, w, d, "l_dom") == True]
         logger.info(f"Worker {w}, Sundays {worker_sundays}, total {total_l_dom.get(w, 0)}")
-        model.Add(sum(shift[(w, d, "L")] for d in worker_sundays if (w, d, 'L') in shift) >= total_l_dom.get(w, 0))
+        model.Add(shift.total([w], worker_sundays, 'L') >= total_l_dom.get(w, 0))
     for w in workers_with_dummy:
         if total_l_dom.get(w, 0) == 0:
             continue
@@ -798,7 +797,7 @@ def free_days_saturdays(model, shift, sundays, workers_no_contract_changes, work
         worker_saturdays = [d - 1 for d in sundays if d - 1 in working_days[w] and year_range[0] <= d - 1 <= year_range[1]\
                             and get_annual_variables(annual_variables, w, d - 1, "l_sab") == True]
         logger.info(f"Worker {w}, saturdays {worker_saturdays}, total {total_l_sab.get(w, 0)}")
-        model.Add(sum(shift[(w, d, s)] for d in worker_saturdays for s in ["L", "LQ"] if (w, d, s) in shift) >= total_l_sab.get(w, 0))
+        model.Add(shift.total([w], worker_saturdays, ["L", "LQ"]) >= total_l_sab.get(w, 0))
     for w in workers_with_dummy:
         if total_l_sab.get(w, 0) == 0:
             continue
@@ -818,7 +817,7 @@ def free_days_special_days(model, shift, sundays, workers_no_contract_changes, w
                           and get_annual_variables(annual_variables, w, d, "l_dom_or_sab") == True]
         worker_saturdays.extend(worker_sundays)
         logger.info(f"Worker {w}, saturdays and sundays {worker_saturdays}, total {total_l_dom_or_sab.get(w, 0)}")
-        model.Add(sum(shift[(w, d, s)] for d in worker_saturdays for s in ["L", "LQ"] if (w, d, s) in shift) >= total_l_dom_or_sab.get(w, 0))
+        model.Add(shift.total([w], worker_saturdays, ["L", "LQ"]) >= total_l_dom_or_sab.get(w, 0))
     for w in workers_with_dummy:
         if total_l_dom_or_sab.get(w, 0) == 0:
             continue
@@ -840,7 +839,7 @@ def one_colab_min_constraint(model, shift, workers, working_shift, days_of_year,
                 if day in shift_M[w] or day in shift_T[w]:
                     available_workers += 1
             if available_workers > 1:
-                model.Add(sum(shift[(w, day, s)] for w in workers for s in working_shift if (w, day, s) in shift) >= 1)
+                model.Add(shift.total(workers, [day], working_shift) >= 1)
 
 def dynamic_empty_day(model, shift, workers, contract_type, week_to_days, empty_set, dynamic_empty_days, fixed_days_off, fixed_LQs,
                       data_admissao, data_demissao, period, admissao_proporcional, closed_days, complete_cycle_days, work_days_per_week):
@@ -852,7 +851,7 @@ def dynamic_empty_day(model, shift, workers, contract_type, week_to_days, empty_
             empty_days_week = 5 - work_days_per_week[w][week - 1]
             if empty_days_week <= 0:
                 continue
-            empty_shifts = sum(shift[(w, d, '-')] for d in days if (w, d, '-') in shift)
+            empty_shifts = shift.total([w], days, '-')
             if max(days) < period[0] or min(days) > period[1] or days[0] in complete_cycle_days[w]:
                 continue
             holidays_in_week = closed_days.intersection(days)
@@ -914,4 +913,4 @@ def dynamic_empty_day(model, shift, workers, contract_type, week_to_days, empty_
                             model.Add(sum(terms) + shift[(w, d2, '-')] <= 1)
             else:
                 days_set = set(days) - dynamic_empty_days[w]
-                model.Add(sum(shift[(w, d, '-')] for d in (days_set - set(empty_set[w])) if (w, d, '-') in shift) == 0)
+                model.Add(shift.total([w], days_set - set(empty_set[w]), '-') == 0)
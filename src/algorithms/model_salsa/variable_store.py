@@ -0,0 +1,291 @@
+"""
+Dense store of the SALSA decision variables.
+
+decision_variables() used to put every BoolVar in a dict keyed by (w, d, s) tuples,
+and the constraint builders probed it with `(w, d, s) in shift` in nested loops
+(e.g. every day up to 500 for each worker's LD sum). ShiftVarStore keeps the same
+mapping interface, so existing code keeps working, but stores:
+
+    - workers, days and shifts as integer ordinals
+    - a (workers × days × shifts) int32 array of variable indices, -1 for "no variable"
+    - the variables in a flat list
+
+The select()/vars() helpers slice that array with NumPy (all shifts of worker w on
+days D, all workers on day d, ...) and return only existing variables, in worker,
+day, shift order.
+
+Cells fixed before the solve (absences, vacations, fixed days off, ...) are stored
+with fix(): they hold the model's shared constant 1 instead of a BoolVar with an
+`== 1` constraint, and are flagged so that total() can count them as a constant
+offset instead of summing them as variables. On a partial generation (wfm_proc_colab)
+every cell of the workers that are not regenerated is fixed from the published
+schedule, so their coverage enters the model as constants only.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ShiftKey = Tuple[Hashable, int, str]
+
+_NO_VAR = -1
+
+
+class ShiftVarStore(MutableMapping):
+    """Mapping (worker, day, shift) -> variable backed by a dense index array."""
+
+    def __init__(self, workers: Iterable[Hashable] = (), shifts: Iterable[str] = (),
+                 first_day: int = 1, last_day: int = 0):
+        """
+        Args:
+            workers: Workers known up front (others are added on first assignment)
+            shifts: Shift codes known up front
+            first_day: First day of the dense day axis
+            last_day: Last day of the dense day axis (the axis grows if needed)
+        """
+        self._worker_ord: Dict[Hashable, int] = {}
+        self._shift_ord: Dict[str, int] = {}
+        self.workers: List[Hashable] = []
+        self.shifts: List[str] = []
+        for w in workers:
+            self._ordinal(self._worker_ord, self.workers, w)
+        for s in shifts:
+            self._ordinal(self._shift_ord, self.shifts, s)
+        self._day0 = int(first_day)
+        n_days = max(0, int(last_day) - int(first_day) + 1)
+        self._index = np.full((max(1, len(self.workers)), n_days, max(1, len(self.shifts))), _NO_VAR, dtype=np.int32)
+        self._fixed = np.zeros(self._index.shape, dtype=bool)
+        self._vars: List[Any] = []
+        self._count = 0
+
+    @staticmethod
+    def _ordinal(ordinals: Dict[Hashable, int], labels: List[Hashable], label: Hashable) -> int:
+        position = ordinals.get(label)
+        if position is None:
+            position = ordinals[label] = len(labels)
+            labels.append(label)
+        return position
+
+    def _grow(self, w_ord: int, day: int, s_ord: int) -> int:
+        """Grow the index array (amortised) so (w_ord, day, s_ord) fits and return the day ordinal."""
+        n_w, n_d, n_s = self._index.shape
+        if n_d == 0:
+            self._day0 = day
+            before, after = 0, 1
+        else:
+            d_ord = day - self._day0
+            before = max(0, -d_ord)
+            after = max(0, d_ord - n_d + 1)
+        extra_w = max(0, w_ord - n_w + 1)
+        extra_s = max(0, s_ord - n_s + 1)
+        if before or after or extra_w or extra_s:
+            pad = (
+                (0, max(extra_w, n_w // 2) if extra_w else 0),
+                (max(before, n_d // 4) if before else 0, max(after, n_d // 4) if after else 0),
+                (0, extra_s),
+            )
+            self._index = np.pad(self._index, pad, constant_values=_NO_VAR)
+            self._fixed = np.pad(self._fixed, pad, constant_values=False)
+            self._day0 -= pad[1][0]
+        return day - self._day0
+
+    def _position(self, key: ShiftKey) -> Optional[Tuple[int, int, int]]:
+        """Array position of key, None when a label is unknown or the day is outside the axis."""
+        w, d, s = key
+        w_ord = self._worker_ord.get(w)
+        s_ord = self._shift_ord.get(s)
+        if w_ord is None or s_ord is None:
+            return None
+        try:
+            d_ord = int(d) - self._day0
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= d_ord < self._index.shape[1] or w_ord >= self._index.shape[0] or s_ord >= self._index.shape[2]:
+            return None
+        return w_ord, d_ord, s_ord
+
+    # ------------------------------------------------------------------ mapping
+
+    def __getitem__(self, key: ShiftKey) -> Any:
+        position = self._position(key)
+        var_id = self._index[position] if position is not None else _NO_VAR
+        if var_id == _NO_VAR:
+            raise KeyError(key)
+        return self._vars[var_id]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 3:
+            return False
+        position = self._position(key)
+        return position is not None and self._index[position] != _NO_VAR
+
+    def __setitem__(self, key: ShiftKey, var: Any) -> None:
+        w, d, s = key
+        w_ord = self._ordinal(self._worker_ord, self.workers, w)
+        s_ord = self._ordinal(self._shift_ord, self.shifts, s)
+        d_ord = self._grow(w_ord, int(d), s_ord)
+        current = self._index[w_ord, d_ord, s_ord]
+        self._fixed[w_ord, d_ord, s_ord] = False
+        if current != _NO_VAR:
+            self._vars[current] = var
+            return
+        self._index[w_ord, d_ord, s_ord] = len(self._vars)
+        self._vars.append(var)
+        self._count += 1
+
+    def __delitem__(self, key: ShiftKey) -> None:
+        position = self._position(key)
+        if position is None or self._index[position] == _NO_VAR:
+            raise KeyError(key)
+        self._vars[self._index[position]] = None
+        self._index[position] = _NO_VAR
+        self._fixed[position] = False
+        self._count -= 1
+
+    def __iter__(self) -> Iterator[ShiftKey]:
+        for w_ord, d_ord, s_ord in np.argwhere(self._index != _NO_VAR):
+            yield self.workers[w_ord], int(d_ord) + self._day0, self.shifts[s_ord]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"ShiftVarStore({self._count} variables, shape={self._index.shape})"
+
+    # ------------------------------------------------------------------ fixed cells
+
+    def fix(self, key: ShiftKey, constant: Any) -> None:
+        """Store key as a fixed cell holding constant (the model's NewConstant(1))."""
+        self[key] = constant
+        self._fixed[self._position(key)] = True
+
+    def is_fixed(self, key: ShiftKey) -> bool:
+        """True when key was stored with fix()."""
+        position = self._position(key)
+        return position is not None and bool(self._fixed[position])
+
+    def fixed_count(self) -> int:
+        """Number of fixed cells."""
+        return int(np.count_nonzero(self._fixed))
+
+    # ------------------------------------------------------------------ slicing
+
+    def _axis(self, labels: Optional[Iterable[Hashable]], ordinals: Dict[Hashable, int], size: int) -> np.ndarray:
+        if labels is None:
+            return np.arange(size)
+        if isinstance(labels, (str, bytes)) or not isinstance(labels, Iterable):
+            labels = [labels]
+        found = [ordinals[label] for label in labels if label in ordinals]
+        return np.asarray([o for o in found if o < size], dtype=np.intp)
+
+    def _day_axis(self, days: Optional[Iterable[int]]) -> np.ndarray:
+        n_days = self._index.shape[1]
+        if days is None:
+            return np.arange(n_days)
+        if isinstance(days, range) and days.step == 1:
+            start, stop = max(days.start - self._day0, 0), min(days.stop - self._day0, n_days)
+            return np.arange(start, max(start, stop))
+        if not isinstance(days, Iterable):
+            days = [days]
+        ordinals = np.fromiter((int(d) for d in days), dtype=np.int64) - self._day0
+        return ordinals[(ordinals >= 0) & (ordinals < n_days)]
+
+    def _axes(self, workers, days, shifts) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            self._axis(workers, self._worker_ord, self._index.shape[0]),
+            self._day_axis(days),
+            self._axis(shifts, self._shift_ord, self._index.shape[2]),
+        )
+
+    def _select_ids(self, workers, days, shifts) -> Tuple[np.ndarray, Tuple[np.ndarray, ...]]:
+        w_axis, d_axis, s_axis = self._axes(workers, days, shifts)
+        if not (len(w_axis) and len(d_axis) and len(s_axis)):
+            empty = np.empty(0, dtype=np.intp)
+            return empty, (empty, empty, empty)
+        block = self._index[np.ix_(w_axis, d_axis, s_axis)]
+        positions = np.nonzero(block != _NO_VAR)
+        return block[positions], (w_axis[positions[0]], d_axis[positions[1]], s_axis[positions[2]])
+
+    def split(self, workers=None, days=None, shifts=None) -> Tuple[List[Any], int]:
+        """(variables, number of fixed cells) of workers × days × shifts, see vars()."""
+        var_ids, positions = self._select_ids(workers, days, shifts)
+        fixed = self._fixed[positions]
+        return [self._vars[i] for i in var_ids[~fixed].tolist()], int(np.count_nonzero(fixed))
+
+    def total(self, workers=None, days=None, shifts=None) -> Any:
+        """
+        sum(vars(...)) with the fixed cells folded into a constant term.
+
+        The returned expression has the same value as sum(vars(...)), but fixed cells do
+        not appear as terms: the constraint built on it gets them as a right-hand-side offset.
+        """
+        free, n_fixed = self.split(workers, days, shifts)
+        return sum(free) + n_fixed
+
+    def weighted_total(self, workers=None, days=None, shifts=None, weight=None) -> Any:
+        """
+        sum(var * weight(w, d, s) for each selected cell) with the fixed cells folded into a
+        constant term, like total(). weight is called with the cell key.
+        """
+        var_ids, (w_ords, d_ords, s_ords) = self._select_ids(workers, days, shifts)
+        fixed = self._fixed[(w_ords, d_ords, s_ords)]
+        expression, offset = 0, 0
+        for i, w, d, s, is_fixed in zip(var_ids.tolist(), w_ords.tolist(), d_ords.tolist(),
+                                        s_ords.tolist(), fixed.tolist()):
+            coefficient = weight((self.workers[w], d + self._day0, self.shifts[s]))
+            if is_fixed:
+                offset += coefficient
+            else:
+                expression += self._vars[i] * coefficient
+        return expression + offset
+
+    def vars(self, workers=None, days=None, shifts=None) -> List[Any]:
+        """
+        Existing variables of workers × days × shifts, in worker, day, shift order.
+
+        Each argument is a single label, an iterable of labels or None for the whole axis;
+        labels without variables are skipped, like `if (w, d, s) in shift` did.
+        """
+        var_ids, _ = self._select_ids(workers, days, shifts)
+        return [self._vars[i] for i in var_ids.tolist()]
+
+    def select(self, workers=None, days=None, shifts=None) -> List[Tuple[ShiftKey, Any]]:
+        """Like vars() but returns ((w, d, s), variable) pairs, for weighted sums."""
+        var_ids, (w_ords, d_ords, s_ords) = self._select_ids(workers, days, shifts)
+        return [
+            ((self.workers[w], d + self._day0, self.shifts[s]), self._vars[i])
+            for i, w, d, s in zip(var_ids.tolist(), w_ords.tolist(), d_ords.tolist(), s_ords.tolist())
+        ]
+
+    def cells(self, workers=None, days=None, shifts=None) -> Iterator[Tuple[Tuple[Hashable, int], List[Any], int]]:
+        """
+        ((w, d), variables, number of fixed cells) for every worker-day of the block that
+        has at least one variable, in worker, day order. The block is sliced once, for
+        per-day constraints over many workers and days.
+        """
+        w_axis, d_axis, s_axis = self._axes(workers, days, shifts)
+        if not (len(w_axis) and len(d_axis) and len(s_axis)):
+            return
+        block_ix = np.ix_(w_axis, d_axis, s_axis)
+        block = self._index[block_ix]
+        present = block != _NO_VAR
+        free = present & ~self._fixed[block_ix]
+        n_fixed = np.count_nonzero(present & ~free, axis=2)
+        for w, d in np.argwhere(present.any(axis=2)).tolist():
+            cell_vars = [self._vars[i] for i in block[w, d][free[w, d]].tolist()]
+            yield (self.workers[w_axis[w]], int(d_axis[d]) + self._day0), cell_vars, int(n_fixed[w, d])
+
+    def worker_vars(self, w: Hashable, days=None, shifts=None) -> List[Any]:
+        """All variables of worker w on days (all days when None) for shifts."""
+        return self.vars([w], days, shifts)
+
+    def day_vars(self, d: int, shifts=None, workers=None) -> List[Any]:
+        """All variables of day d for shifts and workers (all workers when None)."""
+        return self.vars(workers, [d], shifts)
+
+    def count_cells(self) -> int:
+        """Number of (worker, day) cells that have at least one variable."""
+        return int(np.count_nonzero((self._index != _NO_VAR).any(axis=2)))
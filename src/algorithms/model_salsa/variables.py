@@ -1,29 +1,35 @@
-from src.configuration_manager.instance import get_config
-from base_data_project.log_config import get_logger
+from src.algorithms.model_salsa.variable_store import ShiftVarStore
+from src.structured_logging import get_module_logger, summarize
 
-_config_manager = get_config()
-logger = get_logger(_config_manager.project_name)
+logger = get_module_logger(__name__)
 
 #----------------------------------------DECISION VARIABLES----------------------------------------
 
 def add_var(model, shift, w, days, code):
+    # Fixed cells share the model constant 1 instead of a BoolVar constrained to 1,
+    # and no alternative shifts are created for them
+    one = model.NewConstant(1)
     for d in days:
         if (code == 'L' and d % 7 == 6 and d + 1 in days):
-            shift[(w, d, 'LQ')] = model.NewBoolVar(f"{w}_Day{d}_LQ")
-            model.Add(shift[(w, d, 'LQ')] == 1)
+            shift.fix((w, d, 'LQ'), one)
         else:
-            shift[(w, d, code)] = model.NewBoolVar(f"{w}_Day{d}_{code}")
-            model.Add(shift[(w, d, code)] == 1)
+            shift.fix((w, d, code), one)
 
 
 def decision_variables(model, workers, shifts, first_day, last_day, absences, vacation_days, empty_days,
                        closed_holidays, fixed_days_off, fixed_LQs, shift_M, shift_T, past_workers, fixed_compensation_days,
                        locked_days, forced_work_days, contract_type, dynamic_empty, complete_cycle_days):
     # Create decision variables (binary: 1 if person is assigned to shift, 0 otherwise)
-    shift = {}
+    day_bounds = [first_day[w] for w in workers if w in first_day] + [last_day[w] for w in workers if w in last_day]
+    shift = ShiftVarStore(
+        workers=list(past_workers) + [w for w in workers if w not in past_workers],
+        shifts=shifts,
+        first_day=min(day_bounds, default=1),
+        last_day=max(day_bounds, default=0),
+    )
 
     closed_set = set(closed_holidays)
-    logger.info(f"\tDEBUG closed days (everyone) {sorted(closed_set)}")
+    logger.debug("\tDEBUG closed days (everyone) %s", summarize(closed_set))
     for w in past_workers:
         empty_set = empty_days[w]
         vacation = vacation_days[w]
@@ -44,16 +50,16 @@ def decision_variables(model, workers, shifts, first_day, last_day, absences, va
                 shift[(w, d, 'T')] = model.NewBoolVar(f"{w}_Day{d}_T")
                 model.add_exactly_one([shift[(w, d, 'M')], shift[(w, d, 'T')]])
 
-        logger.info(f"For PAST WORKER {w}:")
-        logger.info(f"\tDEBUG empty days {sorted(empty_set)}")
-        logger.info(f"\tDEBUG vacation {sorted(vacation)}")
-        logger.info(f"\tDEBUG fixed lqs {sorted(fixed_LQs_set)}")
-        logger.info(f"\tDEBUG fixed days {sorted(fixed_days_set)}")
-        logger.info(f"\tDEBUG absence {sorted(absence_set)}")
-        logger.info(f"\tDEBUG fixed M {sorted(shift_M_set)}")
-        logger.info(f"\tDEBUG fixed T {sorted(shift_T_set)}")
-        logger.info(f"\tDEBUG fixed MoT {sorted(mot)}")
-        logger.info(f"\tDEBUG fixed LDs {sorted(fixed_LD_set)}")
+        logger.debug("For PAST WORKER %s:", w)
+        logger.debug("\tDEBUG empty days %s", summarize(empty_set))
+        logger.debug("\tDEBUG vacation %s", summarize(vacation))
+        logger.debug("\tDEBUG fixed lqs %s", summarize(fixed_LQs_set))
+        logger.debug("\tDEBUG fixed days %s", summarize(fixed_days_set))
+        logger.debug("\tDEBUG absence %s", summarize(absence_set))
+        logger.debug("\tDEBUG fixed M %s", summarize(shift_M_set))
+        logger.debug("\tDEBUG fixed T %s", summarize(shift_T_set))
+        logger.debug("\tDEBUG fixed MoT %s", summarize(mot))
+        logger.debug("\tDEBUG fixed LDs %s", summarize(fixed_LD_set))
 
         add_var(model, shift, w, fixed_LD_set, 'LD')
         add_var(model, shift, w, shift_T_set, 'T')
@@ -97,24 +103,24 @@ def decision_variables(model, workers, shifts, first_day, last_day, absences, va
             ("M", shift_M_set),
             ("T", shift_T_set),
         ]
-        logger.info(f"For worker {w}:")
-        logger.info(f"\tDEBUG empty days {sorted(empty_set)}")
-        logger.info(f"\tDEBUG vacation {sorted(vacation)}")
-        logger.info(f"\tDEBUG fixed lqs {sorted(fixed_LQs_set)}")
-        logger.info(f"\tDEBUG fixed days {sorted(fixed_days_set)}")
-        logger.info(f"\tDEBUG absence {sorted(absence_set)}")
+        logger.debug("For worker %s:", w)
+        logger.debug("\tDEBUG empty days %s", summarize(empty_set))
+        logger.debug("\tDEBUG vacation %s", summarize(vacation))
+        logger.debug("\tDEBUG fixed lqs %s", summarize(fixed_LQs_set))
+        logger.debug("\tDEBUG fixed days %s", summarize(fixed_days_set))
+        logger.debug("\tDEBUG absence %s", summarize(absence_set))
         #logger.info(f"\tDEBUG M shift {sorted(shift_M_set)}")
         #logger.info(f"\tDEBUG T shift {sorted(shift_T_set)}\n")
-        logger.info(f"\tDEBUG forced work days {sorted(forced_set)}")
-        logger.info(f"\tDEBUG fixed lds {sorted(fixed_LD_set)}\n")
+        logger.debug("\tDEBUG forced work days %s", summarize(forced_set))
+        logger.debug("\tDEBUG fixed lds %s\n", summarize(fixed_LD_set))
         if len(locked_days[w]) > 0:
-            logger.info(f"\tDEBUG locked days {sorted(locked_days[w])}\n")
+            logger.debug("\tDEBUG locked days %s\n", summarize(locked_days[w]))
         if len(complete_set) > 0:
-            logger.info(f"\tDEBUG complete cycle days {sorted(complete_set)}\n")
+            logger.debug("\tDEBUG complete cycle days %s\n", summarize(complete_set))
  
         if contract_type.get(w, 0) <= 4 and w in dynamic_empty:
             fixed_dynamic_empty = dynamic_empty[w]
-            logger.info(f"\tDEBUG fixed dynamic empty days {sorted(fixed_dynamic_empty)}\n")
+            logger.debug("\tDEBUG fixed dynamic empty days %s\n", summarize(fixed_dynamic_empty))
             blocked_days = absence_set | vacation | empty_set | closed_holidays | fixed_days_set | fixed_LQs_set | absence_set | fixed_LD_set | fixed_dynamic_empty
             add_var(model, shift, w, fixed_dynamic_empty, '-')
         else:
@@ -125,8 +131,7 @@ def decision_variables(model, workers, shifts, first_day, last_day, absences, va
                 if d in locked_days[w]:
                     for code, shift_set in SET_CODE_PRIORITY:
                         if d in shift_set:
-                            shift[(w, d, code)] = model.NewBoolVar(f"{w}_Day{d}_{code}")
-                            model.Add(shift[(w, d, code)] == 1)
+                            shift.fix((w, d, code), model.NewConstant(1))
                             break
                     continue
                 if d in forced_set:
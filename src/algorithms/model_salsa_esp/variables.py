@@ -7,13 +7,13 @@ logger = get_logger(_config_manager.project_name)
 #----------------------------------------DECISION VARIABLES----------------------------------------
 
 def add_var(model, shift, w, days, code, start_weekday):
+    # Fixed cells share the model constant 1 instead of a BoolVar constrained to 1
+    one = model.NewConstant(1)
     for d in days:
         if (code == 'L' and (d + start_weekday - 2) % 7 == 5 and d + 1 in days):
-            shift[(w, d, 'LQ')] = model.NewBoolVar(f"{w}_Day{d}_'LQ'")
-            model.Add(shift[(w, d, 'LQ')] == 1)
+            shift[(w, d, 'LQ')] = one
         else:
-            shift[(w, d, code)] = model.NewBoolVar(f"{w}_Day{d}_{code}")
-            model.Add(shift[(w, d, code)] == 1)
+            shift[(w, d, code)] = one
 
 
 def decision_variables(model, days_of_year, workers, shifts, first_day, last_day, absences, missing_days, empty_days, closed_holidays, fixed_days_off, fixed_LQs, start_weekday):
@@ -23,12 +23,14 @@ from src.algorithms.model_salsa.salsa_constraints import (
     global_compensation_days, dynamic_empty_day, free_days_sundays, free_days_saturdays
 )
 from src.algorithms.model_salsa.optimization_salsa import salsa_optimization
-from src.algorithms.solver.solver import solve
+from src.algorithms.solver.core_budget import get_core_budget
+from src.algorithms.solver.infeasibility import ConstraintFamilies, diagnose_infeasibility
+from src.algorithms.solver.solver import SolveFailedError, solve
+from src.algorithms.solver.symmetry import add_lex_ordering, interchangeable_workers
+from src.cancellation import get_cancellation_token
 
-from src.algorithms.helpers_algorithm import (_convert_free_days, _create_empty_results, _calculate_comprehensive_stats, 
-                        _validate_constraints, _calculate_quality_metrics, 
-                        _format_schedules, _create_metadata, _validate_solution, 
-                        _create_export_info)
+from src.algorithms.helpers_algorithm import (_convert_free_days, _create_empty_results, _postprocess_schedule,
+                        _create_metadata, _create_export_info)
 
 
 # Set up logger
@@ -91,6 +93,9 @@ class SalsaAlgorithm(BaseAlgorithm):
         self.model = None
         self.final_schedule = None
         self.process_id = process_id
+        self.posto_id = None
+        # Conflicting constraint families when the model is infeasible (see _diagnose_infeasibility)
+        self.infeasibility_events: List[Dict[str, Any]] = []
         self.start_date = start_date
         self.end_date = end_date
         
@@ -118,6 +123,7 @@ class SalsaAlgorithm(BaseAlgorithm):
                 self.logger.debug("No algorithm treatment parameters provided, using empty dict")
             else:
                 self.logger.info(f"Using algorithm treatment parameters: {list(algorithm_treatment_params.keys())}")
+            self.posto_id = algorithm_treatment_params.get('posto_id')
             
             # =================================================================
             # 1. VALIDATE INPUT DATA STRUCTURE
@@ -352,9 +358,14 @@ class SalsaAlgorithm(BaseAlgorithm):
             # CREATE MODEL AND DECISION VARIABLES
             # =================================================================
             self.logger.info("Creating SALSA model and decision variables")
+            # Checked between constraint families so a cancelled or expired run stops before the solve
+            cancel_token = get_cancellation_token()
+            cancel_token.check("decision variables")
             
             model = cp_model.CpModel()
             self.model = model
+            # Constraint ranges of each family, used to diagnose an infeasible model
+            constraint_families = ConstraintFamilies(model)
 
             # Create decision variables
             shift = decision_variables(model, workers_complete, shifts, first_day, last_day, worker_absences, vacation_days, 
@@ -374,6 +385,8 @@ class SalsaAlgorithm(BaseAlgorithm):
             # Basic constraint: each worker has exactly one shift per day
             if constraint_selections.get("shift_day_constraint", {}).get("enabled", True):
                 self.logger.info("Applying constraint: shift_day_constraint")
+                cancel_token.check("constraint shift_day_constraint")
+                constraint_families.start("shift_day_constraint")
                 shift_day_constraint(model, shift, days_of_year, workers_complete, shifts)
             else:
                 self.logger.warning("Skipping constraint: shift_day_constraint (disabled in config)")
@@ -381,12 +394,16 @@ class SalsaAlgorithm(BaseAlgorithm):
             # Working day shifts constraint
             if constraint_selections.get("working_day_shifts", {}).get("enabled", True):
                 self.logger.info("Applying constraint: working_day_shifts")
+                cancel_token.check("constraint working_day_shifts")
+                constraint_families.start("working_day_shifts")
                 working_day_shifts(model, shift, workers, working_days, check_shift, working_shift, period, contract_type, complete_cycle_days)
             else:
                 self.logger.warning("Skipping constraint: working_day_shifts (disabled in config)")
 
             if constraint_selections.get("compensation_days", {}).get("enabled", True) and country == "Espanha":
                 self.logger.info("Applying constraint: holiday_compensation_days (Espanha-specific)")
+                cancel_token.check("constraint holiday_compensation_days")
+                constraint_families.start("holiday_compensation_days")
                 contingente_f, contingente_d = global_compensation_days(model, shift, workers_complete, working_days, holidays, sundays, week_to_days, real_working_shift, holiday_rules, sunday_rules, 
                                                                         fixed_days_off, fixed_LQs, worker_absences, vacation_days, period, override_holiday_sunday, fixed_compensation_days, holiday_past_lds,
                                                                         sunday_past_lds, closed_holidays, dummy_workers, workers_with_dummy)
@@ -399,6 +416,8 @@ class SalsaAlgorithm(BaseAlgorithm):
                 # Week working days constraint based on contract type
                 if constraint_selections.get("week_working_days_constraint", {}).get("enabled", True):
                     self.logger.info("Applying constraint: week_working_days_constraint")
+                    cancel_token.check("constraint week_working_days_constraint")
+                    constraint_families.start("week_working_days_constraint")
                     week_working_days_constraint(model, shift, week_to_days_salsa, workers, working_shift, contract_type, work_days_per_week, period, complete_cycle_days)
                 else:
                     self.logger.warning("Skipping constraint: week_working_days_constraint (disabled in config)")
@@ -406,6 +425,8 @@ class SalsaAlgorithm(BaseAlgorithm):
                 # Maximum continuous working days constraint
                 if constraint_selections.get("maximum_continuous_working_days", {}).get("enabled", True):
                     self.logger.info("Applying constraint: maximum_continuous_working_days")
+                    cancel_token.check("constraint maximum_continuous_working_days")
+                    constraint_families.start("maximum_continuous_working_days")
                     maximum_continuous_working_days(model, shift, days_of_year, workers, working_shift, max_continuous_days, period, dummy_workers, workers_with_dummy, complete_cycle_days)
                 else:
                     self.logger.warning("Skipping constraint: maximum_continuous_working_days (disabled in config)")
@@ -413,87 +434,138 @@ class SalsaAlgorithm(BaseAlgorithm):
                 # LQ attribution constraint
                 if constraint_selections.get("LQ_attribution", {}).get("enabled", True):
                     self.logger.info("Applying constraint: LQ_attribution")
+                    cancel_token.check("constraint LQ_attribution")
+                    constraint_families.start("LQ_attribution")
                     LQ_attribution(model, shift, workers_no_contract_changes, working_days, c2d, year_range, annual_variables, workers_with_dummy, sundays)
                 else:
                     self.logger.warning("Skipping constraint: LQ_attribution (disabled in config)")
                             
                 if constraint_selections.get("salsa_2_consecutive_free_days", {}).get("enabled", True):
                     self.logger.info("Applying constraint: salsa_2_consecutive_free_days")
+                    cancel_token.check("constraint salsa_2_consecutive_free_days")
+                    constraint_families.start("salsa_2_consecutive_free_days")
                     salsa_2_consecutive_free_days(model, shift, workers, working_days, contract_type, fixed_days_off, fixed_LQs, period, complete_cycle_days)
                 else:
                     self.logger.warning("Skipping constraint: salsa_2_consecutive_free_days (disabled in config)")
                 
                 if constraint_selections.get("salsa_2_day_quality_weekend", {}).get("enabled", True):
                     self.logger.info(f"Applying constraint: salsa_2_day_quality_weekend (workers: {len(workers)}, c2d configured)")
+                    cancel_token.check("constraint salsa_2_day_quality_weekend")
+                    constraint_families.start("salsa_2_day_quality_weekend")
                     salsa_2_day_quality_weekend(model, shift, workers, contract_type, working_days, sundays, F_special_day, days_of_year, year_range)
                 else:
                     self.logger.warning("Skipping constraint: salsa_2_day_quality_weekend (disabled in config)")
                 
                 if constraint_selections.get("salsa_saturday_L_constraint", {}).get("enabled", True):
                     self.logger.info("Applying constraint: salsa_saturday_L_constraint")
+                    cancel_token.check("constraint salsa_saturday_L_constraint")
+                    constraint_families.start("salsa_saturday_L_constraint")
                     salsa_saturday_L_constraint(model, shift, workers, working_days, period)
                 else:
                     self.logger.warning("Skipping constraint: salsa_saturday_L_constraint (disabled in config)")
     
                 if constraint_selections.get("salsa_2_free_days_week", {}).get("enabled", True):
                     self.logger.info("Applying constraint: salsa_2_free_days_week")
+                    cancel_token.check("constraint salsa_2_free_days_week")
+                    constraint_families.start("salsa_2_free_days_week")
                     salsa_2_free_days_week(model, shift, workers, week_to_days_salsa, working_days, admissao_proporcional, data_admissao, data_demissao, fixed_days_off, fixed_LQs, contract_type, work_days_per_week, period, complete_cycle_days)
                 else:
                     self.logger.warning("Skipping constraint: salsa_2_free_days_week (disabled in config)")
                 if constraint_selections.get("first_day_not_free", {}).get("enabled", True):
                     self.logger.info("Applying constraint: first_day_not_free")
+                    cancel_token.check("constraint first_day_not_free")
+                    constraint_families.start("first_day_not_free")
                     first_day_not_free(model, shift, workers, working_days, first_day, working_shift, fixed_days_off, period)
                 else:
                     self.logger.warning("Skipping constraint: first_day_not_free (disabled in config)")
     
                 if constraint_selections.get("free_days_special_days", {}).get("enabled", True):
                     self.logger.info("Applying constraint: free_days_special_days")
+                    cancel_token.check("constraint free_days_special_days")
+                    constraint_families.start("free_days_special_days")
                     free_days_special_days(model, shift, sundays, workers_no_contract_changes, working_days, total_l_dom_or_sab, year_range, annual_variables, workers_with_dummy)
                 else:
                     self.logger.warning("Skipping constraint: free_days_special_days (disabled in config)")
 
                 if constraint_selections.get("free_days_sundays", {}).get("enabled", True):
                     self.logger.info("Applying constraint: free_days_sundays")
+                    cancel_token.check("constraint free_days_sundays")
+                    constraint_families.start("free_days_sundays")
                     free_days_sundays(model, shift, sundays, workers_no_contract_changes, working_days, total_l_dom, year_range, annual_variables, workers_with_dummy)
                 else:
                     self.logger.warning("Skipping constraint: free_days_sundays (disabled in config)")
                 
                 if constraint_selections.get("free_days_saturdays", {}).get("enabled", True):
                     self.logger.info("Applying constraint: free_days_saturdays")
+                    cancel_token.check("constraint free_days_saturdays")
+                    constraint_families.start("free_days_saturdays")
                     free_days_saturdays(model, shift, sundays, workers_no_contract_changes, working_days, total_l_sab, year_range, annual_variables, workers_with_dummy)
                 else:
                     self.logger.warning("Skipping constraint: free_days_saturdays (disabled in config)")
 
                 if constraint_selections.get("one_colab_min_constraint", {}).get("enabled", True):
                     self.logger.info("Applying constraint: one_colab_min_constraint")
+                    cancel_token.check("constraint one_colab_min_constraint")
+                    constraint_families.start("one_colab_min_constraint")
                     one_colab_min_constraint(model, shift, workers, real_working_shift, days_of_year, shift_M, shift_T, period, closed_holidays)
                 else:
                     self.logger.warning("Skipping constraint: one_colab_min_constraint (disabled in config)")
 
                 if constraint_selections.get("dynamic_empty_day", {}).get("enabled", True):
                     self.logger.info("Applying constraint: dynamic_empty_day")
+                    cancel_token.check("constraint dynamic_empty_day")
+                    constraint_families.start("dynamic_empty_day")
                     dynamic_empty_day(model, shift, workers, contract_type, week_to_days, empty_days, dynamic_empty, fixed_days_off, fixed_LQs, data_admissao, data_demissao, period, admissao_proporcional, closed_holidays, complete_cycle_days, work_days_per_week)
                 else:
                     self.logger.warning("Skipping constraint: dynamic_empty_day (disabled in config)")
+            constraint_families.finish()
             self.logger.info("All enabled SALSA constraints applied")
+
+            # Interchangeable workers (same contract and availability, no days of their own) get their
+            # schedules ordered, so the search does not revisit permutations of the same schedule
+            if constraint_selections.get("symmetry_breaking", {}).get("enabled", True):
+                cancel_token.check("symmetry breaking")
+                worker_classes = interchangeable_workers(workers_complete, adapted_data)
+                if worker_classes:
+                    self.logger.info(f"Interchangeable worker classes: {worker_classes}")
+                    add_lex_ordering(model, shift, worker_classes, days_of_year, shifts)
+            else:
+                self.logger.warning("Skipping symmetry breaking (disabled in config)")
             
             # =================================================================
             # SET UP OPTIMIZATION OBJECTIVE
             # =================================================================
             self.logger.info("Setting up SALSA optimization objective")
+            cancel_token.check("optimization objective")
 
+            constraint_families.start("salsa_optimization")
             salsa_optimization(model, days_of_year, workers_complete, workers_complete_cycle, real_working_shift, shift, pessObj, working_days,
                                closed_holidays, min_workers, max_workers, week_to_days, sundays, c2d, total_l_dom, total_l_sab, total_l_dom_or_sab, 
                                work_day_hours, workers_past, year_range, managers, keyholders, h_plus, eci_sibling_results_flag)
+            constraint_families.finish()
 
             # =================================================================
             # SOLVE THE MODEL
             # =================================================================
             self.logger.info("Solving SALSA model")
-            schedule_df, feriados_domingos_compensacao = solve(model, days_of_year, workers_complete, sundays, holidays, shift, shifts, work_day_hours, pessObj,
-                                         workers_past, h_plus, contingente_f, contingente_d, eci_sibling_results_flag, period, index_to_date, dummy_workers, workers_with_dummy,
-                                         pd.Series(['Worker'] + (unique_dates)),
-                                         output_filename=os.path.join(root_dir, 'data', 'output', f'salsa_schedule_{self.process_id}.xlsx'))
+            try:
+                schedule_df, feriados_domingos_compensacao = solve(model, days_of_year, workers_complete, sundays, holidays, shift, shifts, work_day_hours, pessObj,
+                                             workers_past, h_plus, contingente_f, contingente_d, eci_sibling_results_flag, period, index_to_date, dummy_workers, workers_with_dummy,
+                                             pd.Series(['Worker'] + (unique_dates)),
+                                             output_filename=os.path.join(root_dir, 'data', 'output', f'salsa_schedule_{self.process_id}.xlsx'),
+                                             algorithm_name=self.algo_name,
+                                             capture_metadata={
+                                                 'algorithm': self.algo_name,
+                                                 'process_id': self.process_id,
+                                                 'posto_id': self.posto_id,
+                                                 'start_date': self.start_date,
+                                                 'end_date': self.end_date,
+                                                 'country': country,
+                                             })
+            except SolveFailedError as e:
+                if e.status == cp_model.INFEASIBLE:
+                    self._diagnose_infeasibility(model, constraint_families, shift, index_to_date)
+                raise
             self.final_schedule = pd.DataFrame(schedule_df).copy()
             logger.info(f"Final schedule shape: {self.final_schedule.shape}")
             self.feriados_domingos_compensacao = feriados_domingos_compensacao
@@ -539,6 +611,33 @@ class SalsaAlgorithm(BaseAlgorithm):
         except Exception as e:
             self.logger.error(f"Error in SALSA algorithm execution: {e}", exc_info=True)
             raise
+
+    def _diagnose_infeasibility(self, model: cp_model.CpModel, constraint_families: ConstraintFamilies,
+                                shift, index_to_date: Dict[int, Any]) -> None:
+        """Find the constraint families behind an INFEASIBLE status and keep them in infeasibility_events."""
+        system = get_config_manager().system
+        diagnosis_config = system.infeasibility_diagnosis_config
+        if not diagnosis_config.get('enabled', True):
+            return
+        max_time_seconds = diagnosis_config.get('max_time_seconds', 120)
+        # Same reserve as the solve: the run must still report before the process deadline
+        remaining_seconds = get_cancellation_token().remaining()
+        if remaining_seconds is not None:
+            reserve_seconds = system.orchestrator_config.get('deadline', {}).get('solve_reserve_seconds', 60)
+            max_time_seconds = min(max_time_seconds, max(0.0, remaining_seconds - reserve_seconds))
+        if max_time_seconds <= 0:
+            self.logger.warning("No time left before the process deadline to diagnose the infeasible model")
+            return
+        core_lease = get_core_budget().acquire(requested_workers=8, label=f"diagnosis_{self.process_id}",
+                                               expected_seconds=max_time_seconds)
+        try:
+            diagnosis = diagnose_infeasibility(model, constraint_families, shift, max_time_seconds, core_lease.workers)
+            self.infeasibility_events = diagnosis.events(index_to_date)
+            self.logger.error(f"Infeasible SALSA model, {diagnosis.summary()}")
+        except Exception as e:
+            self.logger.warning(f"Could not diagnose the infeasible model: {e}", exc_info=True)
+        finally:
+            get_core_budget().release(core_lease)
    
 # Update the format_results method:
     def format_results(self, algorithm_results: pd.DataFrame = pd.DataFrame(), week_to_days_salsa : Dict[int, List[int]] = None) -> Dict[str, Any]:
@@ -560,23 +659,17 @@ class SalsaAlgorithm(BaseAlgorithm):
                 return _create_empty_results(self.algo_name, self.process_id, self.start_date, self.end_date, self.parameters)
             
 
-            # Calculate comprehensive statistics
-            stats = _calculate_comprehensive_stats(algorithm_results, self.start_date, self.end_date, self.data_processed)
-            
-            # Validate constraints
-            constraint_validation = _validate_constraints(algorithm_results)
-            
-            # Calculate quality metrics
-            quality_metrics = _calculate_quality_metrics(algorithm_results)
-
             # Convert free days codes in wfm codes FO and FC
             # TODO: Rewrite _convert_free_days to work with date columns instead of Day_* format
             # algorithm_results = _convert_free_days(algorithm_results, self.data_processed)
 
-            logger.info(f"DEBUG: schedule after convert: {algorithm_results.head(5)}")
-            
-            # Format schedule for different outputs
-            formatted_schedules = _format_schedules(algorithm_results, self.start_date, self.end_date)
+            # Statistics, constraint checks, quality metrics, long format and validation in one columnar pass
+            postprocessed = _postprocess_schedule(algorithm_results, self.start_date, self.end_date, self.data_processed)
+            stats = postprocessed['stats']
+            constraint_validation = postprocessed['constraint_validation']
+            quality_metrics = postprocessed['quality_metrics']
+            formatted_schedules = postprocessed['formatted_schedules']
+            logger.info(f"Schedule post-processed: {len(algorithm_results)} workers, shift distribution {stats.get('shifts', {}).get('shift_distribution', {})}")
 
             # Get solver status (if available)
             solver_status = getattr(self, 'solver_status', 'OPTIMAL')
@@ -601,7 +694,7 @@ class SalsaAlgorithm(BaseAlgorithm):
                 'scheduling_stats': stats,
                 'constraint_validation': constraint_validation,
                 'quality_metrics': quality_metrics,
-                'validation': _validate_solution(algorithm_results),
+                'validation': postprocessed['validation'],
                 'export_info': _create_export_info(self.process_id, root_dir),
                 'summary': {
                     'status': 'completed',
@@ -0,0 +1,218 @@
+"""
+Host-level CPU core budget shared by concurrent CP-SAT solves.
+
+Every orchestrator child runs its own solve() and, without coordination, each
+one asks CP-SAT for the same number of workers. CoreBudget keeps one lease file
+per running solve in a shared directory (protected by a file lock) and gives
+each new solve a fair share of the cores that are not leased by others. A solve
+that starts after others have finished (next posto / stage) gets a larger share.
+Every allocation is appended to allocations.jsonl in the lease directory; past
+allocation_log_max_bytes the file is rotated to allocations.jsonl.1 (one
+generation kept).
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import psutil
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines: allocation works without cross-process locking
+    fcntl = None
+
+ALLOCATION_LOG = 'allocations.jsonl'
+# Size past which allocations.jsonl is rotated
+ALLOCATION_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+
+@dataclass
+class CoreLease:
+    """Workers granted to one solve."""
+    lease_id: str
+    workers: int
+    requested_workers: int
+    active_solves: int
+    total_cores: int
+    label: str
+    hostname: str
+    pid: int
+    expires_at: float
+
+
+class CoreBudget:
+    """Allocator of CP-SAT search workers between the solves running on this host."""
+
+    def __init__(self, lease_dir: str, total_cores: Optional[int] = None, min_workers: int = 1, enabled: bool = True, logger=None,
+                 allocation_log_max_bytes: Optional[int] = ALLOCATION_LOG_MAX_BYTES):
+        """
+        Args:
+            lease_dir: Directory shared by every process of the host
+            total_cores: Cores available to the solvers, defaults to os.cpu_count()
+            min_workers: Minimum workers granted even when the host is saturated
+            enabled: When False lease() grants the requested workers unchanged
+            logger: Optional logger used to record allocations
+            allocation_log_max_bytes: Size past which allocations.jsonl is rotated, 0 or None disables the file
+        """
+        self.lease_dir = lease_dir
+        self.total_cores = int(total_cores or os.cpu_count() or 1)
+        self.min_workers = max(1, int(min_workers))
+        self.enabled = enabled
+        self.logger = logger
+        self.allocation_log_max_bytes = allocation_log_max_bytes
+        self.hostname = socket.gethostname()
+        self._counter = 0
+        self._counter_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        os.makedirs(self.lease_dir, exist_ok=True)
+        with open(os.path.join(self.lease_dir, '.lock'), 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _log_allocation(self, record: Dict[str, Any]) -> None:
+        """Append record to allocations.jsonl, rotating it past allocation_log_max_bytes. Caller must hold the lock."""
+        if not self.allocation_log_max_bytes:
+            return
+        log_path = os.path.join(self.lease_dir, ALLOCATION_LOG)
+        try:
+            if os.path.getsize(log_path) >= self.allocation_log_max_bytes:
+                os.replace(log_path, f"{log_path}.1")
+        except OSError:
+            pass
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def _is_stale(self, lease: Dict[str, Any]) -> bool:
+        if lease.get('expires_at', 0) < time.time():
+            return True
+        # PIDs are only meaningful on the host that wrote the lease
+        return lease.get('hostname') == self.hostname and not psutil.pid_exists(lease.get('pid', -1))
+
+    def active_leases(self) -> List[Dict[str, Any]]:
+        """Leases currently held, removing stale ones. Caller must hold the lock."""
+        leases = []
+        if not os.path.isdir(self.lease_dir):
+            return leases
+        for file_name in os.listdir(self.lease_dir):
+            if not file_name.endswith('.lease'):
+                continue
+            file_path = os.path.join(self.lease_dir, file_name)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    lease = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if self._is_stale(lease):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+                continue
+            leases.append(lease)
+        return leases
+
+    def compute_workers(self, requested_workers: int, leased_by_others: int, active_solves: int) -> int:
+        """
+        Workers for a new solve: fair share of the host, never more than the cores others leave free
+        (min_workers on a saturated host).
+
+        Args:
+            requested_workers: Workers the solve would use on an idle host
+            leased_by_others: Workers held by solves already running
+            active_solves: Number of solves already running
+        """
+        fair_share = self.total_cores // (active_solves + 1)
+        free_cores = self.total_cores - leased_by_others
+        workers = min(requested_workers, fair_share, free_cores)
+        return max(self.min_workers, workers)
+
+    def acquire(self, requested_workers: int, label: str = '', expected_seconds: float = 600) -> CoreLease:
+        """
+        Reserve workers for a solve. Must be paired with release().
+
+        Args:
+            requested_workers: Workers the solve would use on an idle host
+            label: Free text stored with the lease (e.g. process/posto)
+            expected_seconds: Time limit of the solve, used to expire leases of killed processes
+        """
+        with self._counter_lock:
+            self._counter += 1
+            lease_id = f"{self.hostname}-{os.getpid()}-{self._counter}"
+
+        requested_workers = max(1, int(requested_workers))
+        expires_at = time.time() + expected_seconds + 300
+        if not self.enabled:
+            return CoreLease(lease_id, requested_workers, requested_workers, 0, self.total_cores, label, self.hostname, os.getpid(), expires_at)
+
+        with self._locked():
+            leases = self.active_leases()
+            leased_by_others = sum(lease.get('workers', 0) for lease in leases)
+            workers = self.compute_workers(requested_workers, leased_by_others, len(leases))
+            lease = CoreLease(lease_id, workers, requested_workers, len(leases) + 1, self.total_cores, label, self.hostname, os.getpid(), expires_at)
+            with open(os.path.join(self.lease_dir, f"{lease_id}.lease"), 'w', encoding='utf-8') as f:
+                json.dump(asdict(lease), f)
+            self._log_allocation({**asdict(lease), 'event': 'acquire', 'leased_by_others': leased_by_others, 'time': time.time()})
+
+        if self.logger:
+            self.logger.info(f"Core budget: granted {workers}/{requested_workers} CP-SAT workers to '{label}' "
+                             f"({len(leases)} other solves holding {leased_by_others} of {self.total_cores} cores)")
+        return lease
+
+    def release(self, lease: CoreLease) -> None:
+        """Return the workers of a lease to the budget."""
+        if not self.enabled:
+            return
+        with self._locked():
+            try:
+                os.remove(os.path.join(self.lease_dir, f"{lease.lease_id}.lease"))
+            except OSError:
+                pass
+            self._log_allocation({'lease_id': lease.lease_id, 'event': 'release', 'time': time.time()})
+
+    @contextmanager
+    def lease(self, requested_workers: int, label: str = '', expected_seconds: float = 600) -> Iterator[CoreLease]:
+        """Context manager around acquire()/release()."""
+        core_lease = self.acquire(requested_workers, label=label, expected_seconds=expected_seconds)
+        try:
+            yield core_lease
+        finally:
+            self.release(core_lease)
+
+
+_core_budget: Optional[CoreBudget] = None
+
+
+def get_core_budget() -> CoreBudget:
+    """Process-wide CoreBudget built from system_settings['orchestrator']['core_budget']."""
+    global _core_budget
+    if _core_budget is None:
+        from base_data_project.log_config import get_logger
+        from src.configuration_manager.instance import get_config as get_config_manager
+
+        config_manager = get_config_manager()
+        budget_config = config_manager.system.orchestrator_config.get('core_budget', {})
+        lease_dir = budget_config.get('lease_dir', os.path.join('data', 'output', 'core_budget'))
+        if not os.path.isabs(lease_dir):
+            lease_dir = os.path.join(config_manager.system.project_root_dir, lease_dir)
+        _core_budget = CoreBudget(
+            lease_dir=lease_dir,
+            total_cores=budget_config.get('total_cores'),
+            min_workers=budget_config.get('min_workers', 1),
+            enabled=budget_config.get('enabled', True),
+            logger=get_logger(config_manager.system.project_name),
+            allocation_log_max_bytes=budget_config.get('allocation_log_max_bytes', ALLOCATION_LOG_MAX_BYTES)
+        )
+    return _core_budget
@@ -0,0 +1,275 @@
+"""
+Diagnosis of infeasible CP-SAT models by constraint family.
+
+When a posto came back INFEASIBLE the only answer was the status, and finding
+the cause meant rerunning it with families toggled in constraint_selections.
+execute_algorithm now records which constraints each family added
+(ConstraintFamilies), and diagnose_infeasibility() answers the question in
+one pass:
+
+    - on a copy of the model (no objective), the constraints of each family are
+      split by the worker they concern (or the day, for constraints over several
+      workers) and each group is guarded by an assumption literal
+    - the solver returns a set of assumptions sufficient for infeasibility, which
+      is shrunk to a minimal one by dropping one group at a time and solving again
+      (within a time budget)
+    - the remaining groups are mapped back to their family, workers and days
+
+Constraint types CP-SAT cannot enforce conditionally (products, max, element,
+...) are left unguarded; they define auxiliary variables rather than restrict
+the schedule.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from ortools.sat.python import cp_model
+
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# Constraint types that accept enforcement literals
+_ENFORCEABLE = ('linear', 'bool_or', 'bool_and', 'table')
+# Turned into linear constraints so they can be guarded
+_CARDINALITY = {'exactly_one': (1, 1), 'at_most_one': (0, 1)}
+_REFERENCE_FIELDS = ('vars', 'literals')
+
+
+class ConstraintFamilies:
+    """Ranges of model constraints added by each constraint family, recorded while the model is built."""
+
+    def __init__(self, model: cp_model.CpModel):
+        self.model = model
+        self.ranges: List[Tuple[str, int, int]] = []
+        self._current: Optional[Tuple[str, int]] = None
+
+    def _size(self) -> int:
+        return len(self.model.Proto().constraints)
+
+    def start(self, name: str) -> None:
+        """Constraints added from now on belong to name (closing the previous family)."""
+        self.finish()
+        self._current = (name, self._size())
+
+    def finish(self) -> None:
+        """Close the family being recorded."""
+        if self._current is not None:
+            name, first = self._current
+            if self._size() > first:
+                self.ranges.append((name, first, self._size()))
+            self._current = None
+
+    def names(self) -> List[str]:
+        return list(dict.fromkeys(name for name, _, _ in self.ranges))
+
+
+@dataclass
+class FamilyConflict:
+    """Part of a minimal conflict: constraints of family over workers and days."""
+    family: str
+    # worker -> days of its constraints in the conflict; None collects constraints over several workers
+    cells: Dict[Any, List[int]] = field(default_factory=dict)
+
+    @property
+    def workers(self) -> List[Any]:
+        return [w for w in self.cells if w is not None]
+
+    @property
+    def days(self) -> List[int]:
+        return sorted({d for days in self.cells.values() for d in days})
+
+
+@dataclass
+class InfeasibilityDiagnosis:
+    """Result of diagnose_infeasibility."""
+    status: str
+    conflicts: List[FamilyConflict] = field(default_factory=list)
+    # False when the time budget ran out before the conflict was proven minimal
+    minimal: bool = True
+    solves: int = 0
+
+    @property
+    def families(self) -> List[str]:
+        return [conflict.family for conflict in self.conflicts]
+
+    def events(self, index_to_date: Optional[Mapping[int, Any]] = None) -> List[Dict[str, Any]]:
+        """One dict per (family, worker) of the conflict, the form log_infeasibility_diagnosis persists."""
+        to_date = (lambda d: str(index_to_date.get(d, d))) if index_to_date else str
+        events = []
+        for conflict in self.conflicts:
+            for worker, days in conflict.cells.items():
+                days = sorted(days)
+                events.append({
+                    'constraint': conflict.family,
+                    'employee_id': worker,
+                    'days': [to_date(d) for d in days],
+                    'period_begin': to_date(days[0]) if days else None,
+                    'period_end': to_date(days[-1]) if days else None,
+                    'minimal': self.minimal,
+                })
+        return events
+
+    def summary(self) -> str:
+        if not self.conflicts:
+            return f"no conflicting constraint family found ({self.status})"
+        parts = []
+        for conflict in self.conflicts:
+            workers = conflict.workers
+            parts.append(f"{conflict.family} (workers {workers if workers else 'all'}, days {conflict.days})")
+        return ('minimal conflict: ' if self.minimal else 'conflict: ') + '; '.join(parts)
+
+
+def _references(message, refs: Set[int]) -> None:
+    """Variable indices referenced by a constraint (literals and linear expressions, at any depth)."""
+    for descriptor, value in message.ListFields():
+        if descriptor.name == 'enforcement_literal':
+            continue
+        if descriptor.message_type is not None:
+            for item in (value if descriptor.label == descriptor.LABEL_REPEATED else [value]):
+                _references(item, refs)
+        elif descriptor.name in _REFERENCE_FIELDS:
+            refs.update(ref if ref >= 0 else -ref - 1 for ref in value)
+
+
+def _as_linear(constraint) -> None:
+    """Rewrite an exactly_one / at_most_one constraint as the equivalent linear constraint."""
+    kind = constraint.WhichOneof('constraint')
+    low, high = _CARDINALITY[kind]
+    literals = list(getattr(constraint, kind).literals)
+    constraint.ClearField(kind)
+    offset = 0
+    for ref in literals:
+        if ref >= 0:
+            constraint.linear.vars.append(ref)
+            constraint.linear.coeffs.append(1)
+        else:
+            # not(x) = 1 - x
+            constraint.linear.vars.append(-ref - 1)
+            constraint.linear.coeffs.append(-1)
+            offset += 1
+    constraint.linear.domain.extend([low - offset, high - offset])
+
+
+def _cell_index(shift: Mapping) -> Dict[int, Tuple[Any, int]]:
+    """Variable index -> (worker, day) of the decision variables (fixed cells share constants and are skipped)."""
+    is_fixed = getattr(shift, 'is_fixed', None)
+    index = {}
+    for key in shift:
+        if is_fixed is not None and is_fixed(key):
+            continue
+        var = shift[key]
+        if hasattr(var, 'Index'):
+            index[var.Index()] = (key[0], key[1])
+    return index
+
+
+def _solve(model: cp_model.CpModel, assumptions: List[int], max_time_seconds: float, num_workers: int):
+    proto = model.Proto()
+    del proto.assumptions[:]
+    proto.assumptions.extend(assumptions)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max(0.1, max_time_seconds)
+    solver.parameters.num_search_workers = num_workers
+    status = solver.Solve(model)
+    return status, solver
+
+
+def diagnose_infeasibility(model: cp_model.CpModel, families: ConstraintFamilies, shift: Mapping,
+                           max_time_seconds: float = 120.0, num_workers: int = 8) -> InfeasibilityDiagnosis:
+    """
+    Find a minimal set of (family, worker / day) constraint groups that makes model infeasible.
+
+    Args:
+        model: The infeasible model (left unchanged)
+        families: Constraint ranges recorded while model was built
+        shift: Decision variables, (worker, day, shift) -> BoolVar
+        max_time_seconds: Time budget of the whole diagnosis
+        num_workers: Search workers of each solve
+
+    Returns:
+        InfeasibilityDiagnosis: The conflicting families mapped to workers and days
+    """
+    deadline = time.monotonic() + max_time_seconds
+    diagnosed = model.Clone()
+    proto = diagnosed.Proto()
+    proto.ClearField('objective')
+    proto.ClearField('solution_hint')
+    cells = _cell_index(shift)
+
+    # (family, worker or None, day or None) -> (assumption literal, cells of its constraints)
+    groups: Dict[Tuple[str, Any, Any], Tuple[int, Set[Tuple[Any, int]]]] = {}
+    for family, first, end in families.ranges:
+        for i in range(first, end):
+            constraint = proto.constraints[i]
+            kind = constraint.WhichOneof('constraint')
+            if kind in _CARDINALITY:
+                _as_linear(constraint)
+            elif kind not in _ENFORCEABLE:
+                continue
+            refs: Set[int] = set()
+            _references(constraint, refs)
+            constraint_cells = {cells[ref] for ref in refs if ref in cells}
+            workers = {w for w, _ in constraint_cells}
+            days = {d for _, d in constraint_cells}
+            if len(workers) == 1:
+                key = (family, next(iter(workers)), None)
+            elif len(days) == 1:
+                key = (family, None, next(iter(days)))
+            else:
+                key = (family, None, None)
+            if key not in groups:
+                groups[key] = (diagnosed.NewBoolVar(f"assume_{family}_{key[1]}_{key[2]}").Index(), set())
+            literal, group_cells = groups[key]
+            constraint.enforcement_literal.append(literal)
+            group_cells.update(constraint_cells)
+
+    by_literal = {literal: key for key, (literal, _) in groups.items()}
+    status, solver = _solve(diagnosed, list(by_literal), deadline - time.monotonic(), num_workers)
+    diagnosis = InfeasibilityDiagnosis(status=solver.status_name(status), solves=1)
+    if status != cp_model.INFEASIBLE:
+        logger.warning("Infeasibility diagnosis: model is %s with every constraint family guarded", diagnosis.status)
+        diagnosis.minimal = False
+        return diagnosis
+
+    core = [literal for literal in solver.SufficientAssumptionsForInfeasibility() if literal in by_literal]
+    if not core:
+        # Infeasible without any family: variable domains or unguarded constraints
+        logger.warning("Infeasibility diagnosis: model is infeasible without any constraint family")
+        return diagnosis
+
+    # Deletion: a group stays only if the others are feasible without it
+    for literal in list(core):
+        if literal not in core:
+            continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            diagnosis.minimal = False
+            break
+        trial = [other for other in core if other != literal]
+        status, solver = _solve(diagnosed, trial, remaining, num_workers)
+        diagnosis.solves += 1
+        if status == cp_model.INFEASIBLE:
+            sufficient = set(solver.SufficientAssumptionsForInfeasibility())
+            core = [other for other in trial if other in sufficient] or trial
+        elif status != cp_model.FEASIBLE and status != cp_model.OPTIMAL:
+            diagnosis.minimal = False
+
+    conflicts: Dict[str, FamilyConflict] = {}
+    for literal in core:
+        family, worker, day = by_literal[literal]
+        conflict = conflicts.setdefault(family, FamilyConflict(family))
+        group_cells = groups[(family, worker, day)][1]
+        if worker is not None:
+            conflict.cells.setdefault(worker, [])
+            conflict.cells[worker] = sorted(set(conflict.cells[worker]) | {d for w, d in group_cells if w == worker})
+        else:
+            days = {day} if day is not None else {d for _, d in group_cells}
+            conflict.cells[None] = sorted(set(conflict.cells.get(None, [])) | days)
+    order = {name: i for i, name in enumerate(families.names())}
+    diagnosis.conflicts = sorted(conflicts.values(), key=lambda conflict: order.get(conflict.family, len(order)))
+    logger.info("Infeasibility diagnosis after %d solves: %s", diagnosis.solves, diagnosis.summary())
+    return diagnosis
@@ -0,0 +1,256 @@
+"""
+Memory-capped CP-SAT solves in a child process.
+
+CP-SAT on a large posto can grow past the memory of the host, and when it runs
+in the orchestrator's process the allocation failure (or the OOM killer) takes
+every posto of that process down with it. With system_settings['solver_isolation']
+enabled, solve() runs the search in a spawned child process instead:
+
+    - the model and parameters are serialized and solved by solve_child(), the
+      same entry point the profile portfolio uses for its racers
+    - RssWatchdog samples the resident memory of the child from the parent; past
+      max_rss_mb it asks the child to stop, and the child reports the best
+      solution found so far, as on a time limit
+    - a child still alive kill_grace_seconds after that request is terminated,
+      and a child that dies (killed, aborted) only ends its own solve
+    - the solution is loaded back into the caller's CpSolver (portfolio.load_solution)
+      and the solve reports the memory limit as its stop reason
+
+Portfolio races are watched the same way, over the total memory of the racers.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence
+
+import psutil
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# Stop reason of a solve ended by the watchdog
+STOP_MEMORY_LIMIT = 'memory_limit'
+
+# Seconds the parent waits for the child past the time limit (process start, presolve, reporting)
+ISOLATION_GRACE_SECONDS = 30.0
+
+_SOLVED = (cp_model.OPTIMAL, cp_model.FEASIBLE)
+_MB = 1024 * 1024
+
+
+class _SolutionCounter(cp_model.CpSolverSolutionCallback):
+    """Counts the solutions of the child's search, reported back as 'solutions'."""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.count = 0
+
+    def on_solution_callback(self):
+        self.count += 1
+
+
+def solve_child(label: str, model_bytes: bytes, parameters_bytes: bytes, results, stop_flag) -> None:
+    """Child entry point: solve the model and put the outcome fields on results. Top-level for spawn."""
+    try:
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(model_bytes)
+        solver = cp_model.CpSolver()
+        solver.parameters.ParseFromString(parameters_bytes)
+        # The parent stops the search through stop_flag; the search ends keeping its best solution.
+        # The flag is polled: a child exiting while blocked on a multiprocessing.Event would
+        # leave the parent's set() waiting forever
+        done = threading.Event()
+
+        def watch_stop():
+            while not done.wait(0.2):
+                if stop_flag.value:
+                    solver.StopSearch()
+                    return
+
+        threading.Thread(target=watch_stop, daemon=True).start()
+        solutions = _SolutionCounter()
+        try:
+            status = solver.Solve(model, solutions)
+        finally:
+            done.set()
+        solved = status in _SOLVED
+        response = solver.ResponseProto()
+        results.put({
+            'profile': label, 'status': int(status),
+            'objective': solver.ObjectiveValue() if solved else None,
+            'best_bound': solver.BestObjectiveBound() if solved else None,
+            'wall_time': solver.WallTime(), 'branches': solver.NumBranches(), 'conflicts': solver.NumConflicts(),
+            'solutions': solutions.count,
+            'solution': list(response.solution) if solved else None,
+        })
+    except Exception as e:
+        results.put({'profile': label, 'status': int(cp_model.UNKNOWN), 'error': str(e)})
+
+
+def process_rss_mb(processes: Sequence[Any]) -> float:
+    """Resident memory of processes (multiprocessing.Process or pids) in MB; exited ones count 0."""
+    total = 0
+    for process in processes:
+        pid = getattr(process, 'pid', process)
+        if pid is None:
+            continue
+        try:
+            total += psutil.Process(pid).memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return total / _MB
+
+
+class RssWatchdog:
+    """Memory ceiling over solver processes, checked from the parent's wait loop."""
+
+    def __init__(self, processes: Sequence[Any], stop_flag, max_rss_mb: Optional[float],
+                 kill_grace_seconds: float = 30.0, label: str = 'solve'):
+        """
+        Args:
+            processes: Solver processes, their total RSS is compared to max_rss_mb
+            stop_flag: Shared flag the children poll to stop their search
+            max_rss_mb: Memory ceiling in MB, None or 0 only tracks the peak
+            kill_grace_seconds: Time left to the children to report after the stop request
+            label: Name used in the log messages
+        """
+        self.processes = list(processes)
+        self.stop_flag = stop_flag
+        self.max_rss_mb = max_rss_mb or None
+        self.kill_grace_seconds = kill_grace_seconds
+        self.label = label
+        self.peak_rss_mb = 0.0
+        self.tripped_at: Optional[float] = None
+        self.killed = False
+
+    @property
+    def limit_hit(self) -> bool:
+        return self.tripped_at is not None
+
+    def check(self) -> None:
+        """Sample the RSS; stop the search past the ceiling, terminate the children past the grace time."""
+        rss_mb = process_rss_mb(self.processes)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        if self.max_rss_mb is None:
+            return
+        if self.tripped_at is None:
+            if rss_mb > self.max_rss_mb:
+                self.tripped_at = time.monotonic()
+                self.stop_flag.value = 1
+                logger.warning("%s: solver RSS %.0f MB is over the %.0f MB ceiling, stopping the search",
+                               self.label, rss_mb, self.max_rss_mb)
+        elif not self.killed and time.monotonic() - self.tripped_at > self.kill_grace_seconds:
+            alive = [process for process in self.processes if process.is_alive()]
+            if alive:
+                logger.error("%s: %d solver process(es) still running %.0fs after the memory stop, terminating",
+                             self.label, len(alive), self.kill_grace_seconds)
+                for process in alive:
+                    process.terminate()
+            self.killed = True
+
+
+@dataclass
+class IsolatedResult:
+    """Outcome of solve_isolated."""
+    status: int
+    objective: Optional[float] = None
+    best_bound: Optional[float] = None
+    wall_time: float = 0.0
+    branches: int = 0
+    conflicts: int = 0
+    # Solutions found by the child's search
+    solutions: int = 0
+    solution: Optional[List[int]] = field(default=None, repr=False)
+    error: Optional[str] = None
+    peak_rss_mb: float = 0.0
+    # STOP_MEMORY_LIMIT when the watchdog stopped the search
+    stop_reason: Optional[str] = None
+
+    @property
+    def status_name(self) -> str:
+        return cp_model_pb2.CpSolverStatus.Name(self.status)
+
+    def summary(self) -> dict:
+        return {
+            'status': self.status_name, 'objective': self.objective, 'best_bound': self.best_bound,
+            'wall_time': round(self.wall_time, 3), 'solutions': self.solutions, 'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'stop_reason': self.stop_reason, 'error': self.error,
+        }
+
+
+def solve_isolated(model: cp_model.CpModel, parameters: sat_parameters_pb2.SatParameters,
+                   max_rss_mb: Optional[float] = None, sample_seconds: float = 0.5,
+                   kill_grace_seconds: float = 30.0, stop_requested: Optional[Callable[[], bool]] = None,
+                   start_method: str = 'spawn') -> IsolatedResult:
+    """
+    Solve model in a child process under an RSS ceiling.
+
+    Args:
+        model: Built model
+        parameters: Solver parameters (time limit, workers, profile, ...)
+        max_rss_mb: Memory ceiling of the child in MB, None for no ceiling
+        sample_seconds: Interval of the RSS samples
+        kill_grace_seconds: Time the child gets to report after a memory stop before it is terminated
+        stop_requested: Optional callable polled by the parent; when it returns True the search
+            stops and the best solution so far is kept (cancellation)
+        start_method: multiprocessing start method
+
+    Returns:
+        IsolatedResult: Status, best solution and memory use of the child
+    """
+    context = multiprocessing.get_context(start_method)
+    results = context.Queue()
+    stop_flag = context.RawValue('b', 0)
+    child_parameters = sat_parameters_pb2.SatParameters()
+    child_parameters.CopyFrom(parameters)
+    child_parameters.log_search_progress = False
+    process = context.Process(
+        target=solve_child,
+        args=('isolated', model.Proto().SerializeToString(), child_parameters.SerializeToString(), results, stop_flag),
+        name='cpsat-isolated',
+        daemon=True,
+    )
+    process.start()
+    watchdog = RssWatchdog([process], stop_flag, max_rss_mb, kill_grace_seconds, label='Isolated solve')
+
+    deadline = time.monotonic() + parameters.max_time_in_seconds + ISOLATION_GRACE_SECONDS
+    reported = None
+    try:
+        while reported is None:
+            if stop_requested is not None and stop_requested():
+                stop_flag.value = 1
+            watchdog.check()
+            try:
+                reported = results.get(timeout=sample_seconds)
+            except queue.Empty:
+                if not process.is_alive() and results.empty():
+                    break
+                if time.monotonic() > deadline:
+                    logger.warning("Isolated solve did not report %.0fs past its time limit", ISOLATION_GRACE_SECONDS)
+                    break
+    finally:
+        stop_flag.value = 1
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    if reported is None:
+        result = IsolatedResult(status=cp_model.UNKNOWN,
+                                error=f"solver process exited with code {process.exitcode} without a result")
+    else:
+        reported.pop('profile', None)
+        result = IsolatedResult(**reported)
+    result.peak_rss_mb = watchdog.peak_rss_mb
+    if watchdog.limit_hit:
+        result.stop_reason = STOP_MEMORY_LIMIT
+    logger.info("Isolated solve finished: %s", result.summary())
+    return result
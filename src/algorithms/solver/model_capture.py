@@ -0,0 +1,247 @@
+"""
+Capture of built CP-SAT models and standalone replay.
+
+solve() can export the model it is about to solve, its solver parameters and
+metadata about the posto into one file (system_settings['model_capture'], or an
+explicit capture_file). A capture is a zip archive holding
+
+    model.pb       - serialized CpModelProto
+    parameters.pb  - serialized SatParameters (time limit, workers, presolve, ...)
+    metadata.json  - process / posto ids, model size, OR-Tools version, ...
+
+The replay entrypoint loads captures and solves them with no database or
+pipeline, so slow solves can be reproduced and parameter changes measured on a
+corpus of real models:
+
+    python -m src.algorithms.solver.model_capture data/output/model_capture \\
+        --max-time 60 --workers 8 --set "linearization_level: 1"
+
+Each replayed model prints one JSON line with its status, objective, bound and
+search statistics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from google.protobuf import text_format
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+CAPTURE_FORMAT_VERSION = 1
+CAPTURE_EXTENSION = '.cpsat.zip'
+
+_MODEL_MEMBER = 'model.pb'
+_PARAMETERS_MEMBER = 'parameters.pb'
+_METADATA_MEMBER = 'metadata.json'
+
+
+@dataclass
+class CapturedModel:
+    """A capture loaded back into a CpModel and its SatParameters."""
+    path: str
+    model: cp_model.CpModel
+    parameters: sat_parameters_pb2.SatParameters
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _ortools_version() -> str:
+    try:
+        import ortools
+        return ortools.__version__
+    except Exception:
+        return 'unknown'
+
+
+def capture_model(model: cp_model.CpModel, parameters: sat_parameters_pb2.SatParameters, path: str,
+                  metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Write model, parameters and metadata to path (a CAPTURE_EXTENSION archive).
+
+    Args:
+        model: Built model
+        parameters: Solver parameters the model is solved with
+        path: Target file, its directory is created if needed
+        metadata: JSON-serializable information about the posto / process
+
+    Returns:
+        str: path
+    """
+    proto = model.Proto()
+    document = {
+        'format_version': CAPTURE_FORMAT_VERSION,
+        'captured_at': dt.datetime.now().isoformat(timespec='seconds'),
+        'ortools_version': _ortools_version(),
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+        **(metadata or {}),
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Written to a temporary name so a reader never sees a partial archive
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(temporary, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(_MODEL_MEMBER, proto.SerializeToString())
+        archive.writestr(_PARAMETERS_MEMBER, parameters.SerializeToString())
+        archive.writestr(_METADATA_MEMBER, json.dumps(document, indent=2, default=str))
+    os.replace(temporary, path)
+    logger.info("Captured CP-SAT model (%d variables, %d constraints) to %s",
+                document['variables'], document['constraints'], path)
+    return path
+
+
+def load_captured_model(path: str) -> CapturedModel:
+    """
+    Load a capture written by capture_model.
+
+    Raises:
+        ValueError: If the file is not a capture of a supported format version
+    """
+    if not zipfile.is_zipfile(path):
+        raise ValueError(f"{path} is not a CP-SAT model capture")
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        if not {_MODEL_MEMBER, _PARAMETERS_MEMBER, _METADATA_MEMBER} <= names:
+            raise ValueError(f"{path} is not a CP-SAT model capture")
+        metadata = json.loads(archive.read(_METADATA_MEMBER))
+        if metadata.get('format_version', 0) > CAPTURE_FORMAT_VERSION:
+            raise ValueError(f"{path} has capture format {metadata.get('format_version')}, "
+                             f"this version reads up to {CAPTURE_FORMAT_VERSION}")
+        proto = cp_model_pb2.CpModelProto.FromString(archive.read(_MODEL_MEMBER))
+        parameters = sat_parameters_pb2.SatParameters.FromString(archive.read(_PARAMETERS_MEMBER))
+    model = cp_model.CpModel()
+    model.Proto().CopyFrom(proto)
+    return CapturedModel(path=path, model=model, parameters=parameters, metadata=metadata)
+
+
+def replay(captured: CapturedModel, max_time_seconds: Optional[float] = None, num_workers: Optional[int] = None,
+           parameter_overrides: Sequence[str] = (), log_search_progress: bool = False) -> Dict[str, Any]:
+    """
+    Solve a captured model with its captured parameters and the given overrides.
+
+    Args:
+        captured: Loaded capture
+        max_time_seconds: Replaces the captured time limit
+        num_workers: Replaces the captured number of search workers
+        parameter_overrides: SatParameters in text format, e.g. "linearization_level: 1"
+        log_search_progress: Print the CP-SAT search log
+
+    Returns:
+        Dict[str, Any]: Status, objective, bound and search statistics of the replay
+    """
+    solver = cp_model.CpSolver()
+    solver.parameters.CopyFrom(captured.parameters)
+    if max_time_seconds is not None:
+        solver.parameters.max_time_in_seconds = max_time_seconds
+    if num_workers is not None:
+        solver.parameters.num_search_workers = num_workers
+    for override in parameter_overrides:
+        text_format.Merge(override, solver.parameters)
+    solver.parameters.log_search_progress = log_search_progress
+
+    started = time.perf_counter()
+    status = solver.Solve(captured.model)
+    elapsed = time.perf_counter() - started
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        'path': captured.path,
+        'label': captured.metadata.get('label'),
+        'status': solver.status_name(status),
+        'objective': solver.ObjectiveValue() if has_solution else None,
+        'best_bound': solver.BestObjectiveBound() if has_solution else None,
+        'wall_time': round(solver.WallTime(), 3),
+        'elapsed_seconds': round(elapsed, 3),
+        'branches': solver.NumBranches(),
+        'conflicts': solver.NumConflicts(),
+        'max_time_seconds': solver.parameters.max_time_in_seconds,
+        'num_workers': solver.parameters.num_search_workers,
+    }
+
+
+def capture_path(capture_dir: str, label: str) -> str:
+    """Timestamped capture file for label in capture_dir."""
+    safe_label = re.sub(r'[^\w.-]+', '_', label).strip('_') or 'model'
+    stamp = dt.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    return os.path.join(capture_dir, f"{safe_label}_{stamp}{CAPTURE_EXTENSION}")
+
+
+def prune_captures(capture_dir: str, max_files: int) -> None:
+    """Delete the oldest captures of capture_dir beyond max_files."""
+    if not max_files or max_files <= 0 or not os.path.isdir(capture_dir):
+        return
+    captures = sorted(
+        (entry for entry in os.scandir(capture_dir) if entry.name.endswith(CAPTURE_EXTENSION)),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in captures[:-max_files]:
+        try:
+            os.remove(entry.path)
+        except OSError as e:
+            logger.debug("Could not remove old capture %s: %s", entry.path, e)
+
+
+def get_capture_dir() -> Optional[str]:
+    """Capture directory from system_settings['model_capture'], None when capture is disabled."""
+    from src.configuration_manager.instance import get_config as get_config_manager
+
+    system = get_config_manager().system
+    capture_config = getattr(system, 'model_capture_config', {}) or {}
+    if not capture_config.get('enabled', False):
+        return None
+    capture_dir = capture_config.get('dir', 'data/output/model_capture')
+    if not os.path.isabs(capture_dir):
+        capture_dir = os.path.join(system.project_root_dir, capture_dir)
+    return capture_dir
+
+
+def _capture_files(paths: Iterable[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(CAPTURE_EXTENSION)
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Replay entrypoint: solve every capture given (files or directories) and print one JSON line each."""
+    parser = argparse.ArgumentParser(description="Replay captured CP-SAT models without the database pipeline")
+    parser.add_argument('paths', nargs='+', help=f"Capture files ({CAPTURE_EXTENSION}) or directories of captures")
+    parser.add_argument('--max-time', type=float, default=None, help="Time limit in seconds (default: captured)")
+    parser.add_argument('--workers', type=int, default=None, help="Search workers (default: captured)")
+    parser.add_argument('--set', dest='overrides', action='append', default=[],
+                        help='SatParameters override in text format, e.g. "symmetry_level: 2" (repeatable)')
+    parser.add_argument('--log-search', action='store_true', help="Print the CP-SAT search log")
+    args = parser.parse_args(argv)
+
+    files = _capture_files(args.paths)
+    if not files:
+        parser.error("no captures found")
+    failures = 0
+    for path in files:
+        try:
+            result = replay(load_captured_model(path), args.max_time, args.workers, args.overrides, args.log_search)
+        except Exception as e:
+            failures += 1
+            result = {'path': path, 'error': str(e)}
+        print(json.dumps(result), flush=True)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Parameter portfolio for CP-SAT solves.
+
+solve() used to run every model with one fixed set of presolve levels
+(probing 3, symmetry 4, linearization 2), but postos solve fastest under
+different settings. The settings are now named profiles (SOLVER_PROFILES), and
+portfolio mode (system_settings['solver_portfolio']) races several of them on
+the same model:
+
+    - the model and parameters are serialized once and every profile is solved
+      in its own spawned process, the core-budget lease of the solve being split
+      between them
+    - the first proven result (optimal or infeasible) stops the others, which
+      report their best solution; otherwise the best objective at the time limit wins
+    - the winner's solution is loaded back into the caller's CpSolver by solving
+      the model with every variable fixed to it (load_solution), so solve()
+      reads the schedule with solver.Value() as before
+
+Winners are recorded per algorithm and posto size (ProfileHistory). Later races
+start with the profile that won most often, and solves outside portfolio mode
+use it instead of 'default'.
+
+With solver_isolation enabled the racers are held to its memory ceiling as a
+whole (isolation.RssWatchdog).
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.isolation import RssWatchdog, STOP_MEMORY_LIMIT, solve_child
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines: the history is saved without cross-process locking
+    fcntl = None
+
+DEFAULT_PROFILE = 'default'
+
+# name -> SatParameters fields set on top of the solve's own parameters
+SOLVER_PROFILES: Dict[str, Dict[str, Any]] = {
+    # The settings solve() always used
+    DEFAULT_PROFILE: {'cp_model_probing_level': 3, 'symmetry_level': 4, 'linearization_level': 2},
+    # Cheaper presolve, for models where probing dominates the run time
+    'light_presolve': {'cp_model_probing_level': 1, 'symmetry_level': 2, 'linearization_level': 1},
+    # Core-based lower bounding, proves optimality faster on tight objectives
+    'core': {'cp_model_probing_level': 2, 'symmetry_level': 2, 'linearization_level': 2, 'optimize_with_core': True},
+    # No LP relaxation, leaves the workers to LNS and fixed search
+    'lns': {'cp_model_probing_level': 0, 'symmetry_level': 1, 'linearization_level': 0},
+}
+
+# Seconds the parent waits for the children past the time limit (process start, presolve, reporting)
+RACE_GRACE_SECONDS = 30.0
+
+_PROVEN = (cp_model.OPTIMAL, cp_model.INFEASIBLE, cp_model.MODEL_INVALID)
+
+
+def apply_profile(parameters: sat_parameters_pb2.SatParameters, profile: str) -> None:
+    """Set the fields of SOLVER_PROFILES[profile] on parameters (unknown names apply 'default')."""
+    settings = SOLVER_PROFILES.get(profile)
+    if settings is None:
+        logger.warning("Unknown solver profile '%s', using '%s'", profile, DEFAULT_PROFILE)
+        settings = SOLVER_PROFILES[DEFAULT_PROFILE]
+    for name, value in settings.items():
+        setattr(parameters, name, value)
+
+
+def size_bucket(n_workers: int) -> int:
+    """Posto size class used by ProfileHistory: the next power of two of the number of workers."""
+    return 1 << max(0, int(n_workers) - 1).bit_length()
+
+
+class ProfileHistory:
+    """Portfolio winners per (algorithm, posto size), persisted as a small JSON file."""
+
+    def __init__(self, file_path: Optional[str] = None):
+        """
+        Args:
+            file_path: JSON file used to persist the history, None keeps it in memory
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = self._load() if file_path else {}
+
+    @staticmethod
+    def key(algorithm: str, n_workers: int) -> str:
+        return f"{algorithm or 'unknown'}/{size_bucket(n_workers)}"
+
+    def preferred(self, algorithm: str, n_workers: int, default: str = DEFAULT_PROFILE) -> str:
+        """Profile that won most often for the algorithm and posto size (the latest winner on ties)."""
+        entry = self._data.get(self.key(algorithm, n_workers))
+        if not entry or not entry.get('wins'):
+            return default
+        wins = entry['wins']
+        best = max(wins.values())
+        leaders = [name for name, count in wins.items() if count == best and name in SOLVER_PROFILES]
+        if not leaders:
+            return default
+        return entry.get('last_winner') if entry.get('last_winner') in leaders else leaders[0]
+
+    def order(self, profiles: Sequence[str], algorithm: str, n_workers: int) -> List[str]:
+        """profiles with the preferred one first, so it is always raced."""
+        preferred = self.preferred(algorithm, n_workers, default=profiles[0] if profiles else DEFAULT_PROFILE)
+        return [preferred] + [name for name in profiles if name != preferred]
+
+    def record(self, algorithm: str, n_workers: int, profile: str) -> None:
+        """
+        Count a win of profile and persist the history.
+
+        Several worker processes share the file: the win is added to the history
+        re-read under the file lock, so wins recorded by the others are kept.
+        """
+        key = self.key(algorithm, n_workers)
+        with self._lock:
+            if not self.file_path:
+                self._add_win(self._data, key, profile)
+                return
+            with self._file_lock():
+                data = self._load()
+                self._add_win(data, key, profile)
+                self._save(data)
+            self._data = data
+
+    @staticmethod
+    def _add_win(data: Dict[str, Dict[str, Any]], key: str, profile: str) -> None:
+        entry = data.setdefault(key, {'wins': {}, 'runs': 0})
+        entry['wins'][profile] = entry['wins'].get(profile, 0) + 1
+        entry['runs'] = entry.get('runs', 0) + 1
+        entry['last_winner'] = profile
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """History in the file, empty when it is missing or unreadable."""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the history file across processes (fcntl.flock on a sidecar .lock file)."""
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        with open(f"{self.file_path}.lock", 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _save(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Write data through a temporary file of this process, replaced atomically. Call under _file_lock."""
+        tmp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.file_path) or '.',
+                                               prefix=f"{os.path.basename(self.file_path)}.", suffix='.tmp',
+                                               delete=False)
+        try:
+            with tmp_file:
+                json.dump(data, tmp_file, indent=2)
+            os.replace(tmp_file.name, self.file_path)
+        except BaseException:
+            if os.path.exists(tmp_file.name):
+                os.remove(tmp_file.name)
+            raise
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of one profile of a race."""
+    profile: str
+    status: int
+    objective: Optional[float] = None
+    best_bound: Optional[float] = None
+    wall_time: float = 0.0
+    branches: int = 0
+    conflicts: int = 0
+    # Solutions found by the profile's search
+    solutions: int = 0
+    solution: Optional[List[int]] = field(default=None, repr=False)
+    error: Optional[str] = None
+    # isolation.STOP_MEMORY_LIMIT when the watchdog stopped the race
+    stop_reason: Optional[str] = None
+
+    @property
+    def status_name(self) -> str:
+        return cp_model_pb2.CpSolverStatus.Name(self.status)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'profile': self.profile, 'status': self.status_name, 'objective': self.objective,
+            'best_bound': self.best_bound, 'wall_time': round(self.wall_time, 3), 'solutions': self.solutions,
+            'error': self.error,
+            'stop_reason': self.stop_reason,
+        }
+
+
+def _better(candidate: ProfileResult, current: Optional[ProfileResult], minimize: bool) -> bool:
+    if current is None:
+        return True
+    rank = {cp_model.OPTIMAL: 3, cp_model.INFEASIBLE: 3, cp_model.FEASIBLE: 2}
+    if rank.get(candidate.status, 0) != rank.get(current.status, 0):
+        return rank.get(candidate.status, 0) > rank.get(current.status, 0)
+    if candidate.status != cp_model.FEASIBLE:
+        return False
+    return candidate.objective < current.objective if minimize else candidate.objective > current.objective
+
+
+def race(model: cp_model.CpModel, parameters: sat_parameters_pb2.SatParameters, profiles: Sequence[str],
+         workers_per_profile: int, stop_requested=None, start_method: str = 'spawn',
+         max_rss_mb: Optional[float] = None, kill_grace_seconds: float = 30.0) -> tuple:
+    """
+    Solve model with every profile in parallel processes.
+
+    Args:
+        model: Built model
+        parameters: Base parameters (time limit, presolve, ...); each profile is applied on a copy
+        profiles: Names of SOLVER_PROFILES to race
+        workers_per_profile: num_search_workers of each profile
+        stop_requested: Optional callable polled by the parent; when it returns True the race stops
+            and the best solution so far is kept (cancellation)
+        start_method: multiprocessing start method
+        max_rss_mb: Memory ceiling of all racers together in MB (see isolation.RssWatchdog), None for none
+        kill_grace_seconds: Time the racers get to report after a memory stop before they are terminated
+
+    Returns:
+        Tuple[ProfileResult, List[ProfileResult]]: Winner and every profile's result
+    """
+    context = multiprocessing.get_context(start_method)
+    results = context.Queue()
+    stop_flag = context.RawValue('b', 0)
+    model_bytes = model.Proto().SerializeToString()
+    objective = model.Proto().objective
+    minimize = not (model.Proto().HasField('objective') and objective.scaling_factor < 0)
+
+    processes = []
+    for profile in profiles:
+        profile_parameters = sat_parameters_pb2.SatParameters()
+        profile_parameters.CopyFrom(parameters)
+        apply_profile(profile_parameters, profile)
+        profile_parameters.num_search_workers = max(1, int(workers_per_profile))
+        profile_parameters.log_search_progress = False
+        process = context.Process(
+            target=solve_child,
+            args=(profile, model_bytes, profile_parameters.SerializeToString(), results, stop_flag),
+            name=f"cpsat-profile-{profile}",
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+    watchdog = RssWatchdog(processes, stop_flag, max_rss_mb, kill_grace_seconds, label='Portfolio race')
+
+    deadline = time.monotonic() + parameters.max_time_in_seconds + RACE_GRACE_SECONDS
+    outcomes: List[ProfileResult] = []
+    winner: Optional[ProfileResult] = None
+    try:
+        while len(outcomes) < len(processes):
+            if stop_requested is not None and stop_requested():
+                stop_flag.value = 1
+            watchdog.check()
+            try:
+                outcome = ProfileResult(**results.get(timeout=0.5))
+            except queue.Empty:
+                if time.monotonic() > deadline or not any(p.is_alive() for p in processes) and results.empty():
+                    logger.warning("Portfolio race ended with %d of %d profiles reported", len(outcomes), len(processes))
+                    break
+                continue
+            outcomes.append(outcome)
+            logger.info("Portfolio profile %s finished: %s", outcome.profile, outcome.summary())
+            if _better(outcome, winner, minimize):
+                winner = outcome
+            if outcome.status in _PROVEN:
+                # A proof does not depend on the profile, the others can stop
+                stop_flag.value = 1
+    finally:
+        stop_flag.value = 1
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+    if winner is None:
+        winner = ProfileResult(profile=profiles[0] if profiles else DEFAULT_PROFILE, status=cp_model.UNKNOWN)
+    if watchdog.limit_hit:
+        winner.stop_reason = STOP_MEMORY_LIMIT
+    return winner, outcomes
+
+
+_history: Optional[ProfileHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_portfolio_config() -> Dict[str, Any]:
+    """system_settings['solver_portfolio'] ({} when absent)."""
+    from src.configuration_manager.instance import get_config as get_config_manager
+
+    return getattr(get_config_manager().system, 'solver_portfolio_config', {}) or {}
+
+
+def get_profile_history() -> ProfileHistory:
+    """Process-wide ProfileHistory on solver_portfolio.history_file (relative to the project root)."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            from src.configuration_manager.instance import get_config as get_config_manager
+
+            history_file = get_portfolio_config().get('history_file')
+            if history_file and not os.path.isabs(history_file):
+                history_file = os.path.join(get_config_manager().system.project_root_dir, history_file)
+            _history = ProfileHistory(history_file)
+        return _history
+
+
+def load_solution(model: cp_model.CpModel, solver: cp_model.CpSolver, solution: Sequence[int]) -> int:
+    """
+    Make solver hold solution for model, so solver.Value() works as after a normal solve.
+
+    The model is cloned, every variable is fixed to its value through a hint and the
+    clone is solved (presolve only); the variables of model keep their indices in the clone.
+    solver.parameters are restored afterwards, so a solve that follows a failed load runs
+    with the caller's workers and without hint fixing.
+
+    Returns:
+        int: Status of that solve (OPTIMAL unless solution is not a solution of model)
+    """
+    fixed = model.Clone()
+    fixed.ClearHints()
+    hint = fixed.Proto().solution_hint
+    hint.vars.extend(range(len(solution)))
+    hint.values.extend(solution)
+    saved_parameters = sat_parameters_pb2.SatParameters()
+    saved_parameters.CopyFrom(solver.parameters)
+    try:
+        solver.parameters.fix_variables_to_their_hinted_value = True
+        solver.parameters.num_search_workers = 1
+        return solver.Solve(fixed)
+    finally:
+        solver.parameters.CopyFrom(saved_parameters)
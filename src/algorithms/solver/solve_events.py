@@ -0,0 +1,124 @@
+"""
+In-process publish/subscribe of CP-SAT solve progress.
+
+solve() and SolutionCallback publish structured events (solve_started, solution,
+solve_finished) to the process-wide SolveEventBus. Subscribers decide what to do
+with them: the API job child stores them so GET /jobs/<id>/events can stream
+them, anything else in the process can subscribe the same way.
+
+The bus also carries the cancel flag. request_cancel() stops the running solves
+through CpSolver.stop_search() and SolutionCallback calls StopSearch() on the
+next solution, so a solve that is already good enough ends with its best
+solution instead of running until max_time_in_seconds.
+
+Only the standard library is imported so the bus can be used outside the solver.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+EVENT_SOLVE_STARTED = 'solve_started'
+EVENT_SOLUTION = 'solution'
+EVENT_SOLVE_FINISHED = 'solve_finished'
+
+SolveEvent = Dict[str, Any]
+
+
+class SolveEventBus:
+    """Thread-safe fan-out of solve events plus the cancel flag of the running solves."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            logger: Logger for subscriber errors and cancel requests
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Callable[[SolveEvent], None]] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self._solvers: List[Any] = []
+        self._cancel = threading.Event()
+        self._cancel_reason: Optional[str] = None
+
+    def subscribe(self, handler: Callable[[SolveEvent], None]) -> Callable[[], None]:
+        """Register handler for every published event. Returns the matching unsubscribe function."""
+        with self._lock:
+            subscription_id = next(self._ids)
+            self._subscribers[subscription_id] = handler
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers.pop(subscription_id, None)
+
+        return unsubscribe
+
+    def publish(self, event_type: str, **data: Any) -> SolveEvent:
+        """
+        Send an event to every subscriber, in the publishing thread.
+
+        Handlers run inside the CP-SAT callback for solution events, so they must be
+        quick; a failing handler is logged and never interrupts the solve.
+        """
+        event = {'type': event_type, 'seq': next(self._seq), 'time': time.time(), **data}
+        with self._lock:
+            handlers = list(self._subscribers.values())
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                self.logger.warning(f"Solve event subscriber failed on '{event_type}': {e}")
+        return event
+
+    def register_solver(self, solver: Any) -> None:
+        """Track a CpSolver while it runs so request_cancel() can stop it."""
+        with self._lock:
+            self._solvers.append(solver)
+        if self._cancel.is_set():
+            solver.stop_search()
+
+    def unregister_solver(self, solver: Any) -> None:
+        with self._lock:
+            if solver in self._solvers:
+                self._solvers.remove(solver)
+
+    def request_cancel(self, reason: str = 'Cancel requested') -> None:
+        """Raise the cancel flag and stop the solves currently running in this process."""
+        with self._lock:
+            if self._cancel.is_set():
+                return
+            self._cancel_reason = reason
+            self._cancel.set()
+            solvers = list(self._solvers)
+        self.logger.info(f"Solve cancel requested: {reason} ({len(solvers)} running solve(s))")
+        for solver in solvers:
+            solver.stop_search()
+
+    def clear_cancel(self) -> None:
+        with self._lock:
+            self._cancel.clear()
+            self._cancel_reason = None
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def cancel_reason(self) -> Optional[str]:
+        return self._cancel_reason
+
+
+_solve_events: Optional[SolveEventBus] = None
+_solve_events_lock = threading.Lock()
+
+
+def get_solve_events() -> SolveEventBus:
+    """Process-wide SolveEventBus."""
+    global _solve_events
+    with _solve_events_lock:
+        if _solve_events is None:
+            _solve_events = SolveEventBus()
+        return _solve_events
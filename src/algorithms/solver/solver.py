@@ -1,25 +1,42 @@
-from matplotlib import testing
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from ortools.sat.python import cp_model
 from datetime import datetime, timedelta
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
 import logging
-from typing import Dict, Any, List, Tuple, Optional, Callable
-from base_data_project.log_config import get_logger
+from typing import Dict, Any, List, Mapping, Tuple, Optional, Callable
 from src.configuration_manager.instance import get_config as get_config_manager
 import os
+import time
 import psutil
 from src.algorithms.solver.solver_callback import SolutionCallback
+from src.algorithms.solver.core_budget import get_core_budget
+from src.algorithms.solver.isolation import STOP_MEMORY_LIMIT, IsolatedResult, solve_isolated
+from src.algorithms.solver.model_capture import capture_model, capture_path, get_capture_dir, prune_captures
+from src.algorithms.solver.portfolio import (
+    ProfileResult, apply_profile, get_portfolio_config, get_profile_history, load_solution, race,
+)
+from src.algorithms.solver.solve_events import EVENT_SOLVE_FINISHED, EVENT_SOLVE_STARTED, get_solve_events
+from src.cancellation import get_cancellation_token
+from src.debug_artefacts import get_debug_writer
+from src.structured_logging import get_module_logger, summarize
 from src.algorithms.helpers_algorithm import analyze_optimization_results
 from src.algorithms.model_salsa.auxiliar_functions_salsa import get_dummy
 
 
 # Get project name and set up logger
 project_name = get_config_manager().system.project_name
-logger = get_logger(project_name)
+logger = get_module_logger(__name__)
+
+
+class SolveFailedError(RuntimeError):
+    """Raised by solve() when CP-SAT returns no solution; status is the CP-SAT status."""
+
+    def __init__(self, message: str, status: int, stop_reason: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        # isolation.STOP_MEMORY_LIMIT when the memory watchdog ended the search
+        self.stop_reason = stop_reason
+
 
 #----------------------------------------SOLVER-----------------------------------------------------------
 def solve(
@@ -28,7 +45,7 @@ def solve(
     workers: List[int], 
     sundays: List[int],    
     special_days: List[int],
-    shift: Dict[Tuple[int, int, str], cp_model.IntVar], 
+    shift: Mapping[Tuple[int, int, str], cp_model.IntVar], 
     shifts: List[str],
     work_day_hours: Dict[int, Dict[int, int]],
     pessOBJ: Dict[int, int],
@@ -49,6 +66,9 @@ def solve(
     log_callback: Optional[Callable[[str], None]] = None,
     output_filename: str = os.path.join(get_config_manager().paths.get_output_dir(), 'working_schedule.xlsx'),
     debug_vars: Optional[Dict[str, cp_model.IntVar]] = None,  # Add this parameter
+    capture_file: Optional[str] = None,
+    capture_metadata: Optional[Dict[str, Any]] = None,
+    algorithm_name: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Enhanced solver function with comprehensive logging and configurable parameters.
@@ -66,14 +86,20 @@ def solve(
         log_search_progress: Whether to log search progress (default: True)
         log_callback: Custom callback for logging (default: None, uses print)
         output_filename: Name of the output Excel file (default: 'worker_schedule.xlsx')
+        capture_file: Export the model and its parameters to this file before solving
+            (default: None, captures go to system_settings['model_capture'] when enabled)
+        capture_metadata: Posto / process information stored with the capture
+        algorithm_name: Algorithm of the model, keys the solver profile history (see portfolio)
     
     Returns:
         DataFrame containing the worker schedule
         
     Raises:
         ValueError: If input parameters are invalid
-        RuntimeError: If solver fails to find a solution
+        SolveFailedError: If solver fails to find a solution
     """
+    # Held from acquire() until the search ends; released in the finally below if anything fails in between
+    core_lease = None
     try:
         logger.info("Starting solver")
         
@@ -102,8 +128,8 @@ def solve(
             logger.error(error_msg)
             raise ValueError(error_msg)
         
-        if not isinstance(shift, dict):
-            error_msg = f"shift must be a dictionary. shift: {shift}, type: {type(shift)}"
+        if not isinstance(shift, Mapping):
+            error_msg = f"shift must be a mapping. shift: {shift}, type: {type(shift)}"
             logger.error(error_msg)
             raise ValueError(error_msg)
         
@@ -126,8 +152,24 @@ def solve(
         logger.info("=== ABOUT TO SOLVE ===")
 
         # Use only verified OR-Tools parameters
-        solver.parameters.num_search_workers = 8
-        solver.parameters.max_time_in_seconds = 600  # Short timeout for testing
+        solver.parameters.max_time_in_seconds = max_time_seconds
+        # Never run past the process deadline, keeping time to format and insert the results
+        cancel_token = get_cancellation_token()
+        cancel_token.check('solve')
+        remaining_seconds = cancel_token.remaining()
+        if remaining_seconds is not None:
+            reserve_seconds = get_config_manager().system.orchestrator_config.get('deadline', {}).get('solve_reserve_seconds', 60)
+            solve_budget = max(1.0, remaining_seconds - reserve_seconds)
+            if solve_budget < solver.parameters.max_time_in_seconds:
+                logger.info(f"Capping solve time to {solve_budget:.0f}s ({remaining_seconds:.0f}s left before the process deadline)")
+                solver.parameters.max_time_in_seconds = solve_budget
+        # Workers come from the host core budget so concurrent solves do not oversubscribe the CPU
+        core_lease = get_core_budget().acquire(
+            requested_workers=8,
+            label=os.path.basename(output_filename),
+            expected_seconds=solver.parameters.max_time_in_seconds
+        )
+        solver.parameters.num_search_workers = core_lease.workers
 
         logger.info(f"  - Days to schedule: {len(days_of_year)} days (from {min(days_of_year)} to {max(days_of_year)})")
         logger.info(f"  - Workers: {len(workers)} workers")
@@ -135,6 +177,7 @@ def solve(
         logger.info(f"  - Available shifts: {shifts}")
         logger.info(f"  - Decision variables: {len(shift)} variables")
         logger.info(f"  - Max solving time: {solver.parameters.max_time_in_seconds} seconds")
+        logger.info(f"  - Search workers: {solver.parameters.num_search_workers} (core lease {core_lease.lease_id})")
 
         solver.parameters.log_search_progress = log_search_progress
         solver.parameters.use_phase_saving = use_phase_saving
@@ -144,9 +187,11 @@ def solve(
         solver.parameters.cp_model_presolve = True
         # solver.parameters.interleave_search = True
         # solver.parameters.search_branching = cp_model.AUTOMATIC_SEARCH 
-        solver.parameters.cp_model_probing_level = 3
-        solver.parameters.symmetry_level = 4
-        solver.parameters.linearization_level = 2
+        # Presolve levels come from the profile that won most races on postos of this size
+        profile_history = get_profile_history()
+        solver_profile = profile_history.preferred(algorithm_name, len(workers))
+        apply_profile(solver.parameters, solver_profile)
+        logger.info(f"  - Solver profile: {solver_profile}")
 
         testing = False
         if testing == True:
@@ -160,11 +205,55 @@ def solve(
         import time
         solve_start = time.time()
 
-        solution_callback = SolutionCallback(logger, shift, workers, days_of_year)
-
-
-        status = solver.Solve(model, solution_callback)
-    
+        # Progress goes to the solve event bus; a cancel request stops the search and keeps the best solution
+        solve_events = get_solve_events()
+        cancel_token.on_cancel(solve_events.request_cancel)
+        solve_label = os.path.splitext(os.path.basename(output_filename))[0]
+        solution_callback = SolutionCallback(logger, shift, workers, days_of_year, events=solve_events, label=solve_label)
+        solve_events.publish(
+            EVENT_SOLVE_STARTED,
+            label=solve_label,
+            workers=len(workers),
+            days=len(days_of_year),
+            variables=len(shift),
+            max_time_seconds=solver.parameters.max_time_in_seconds,
+            search_workers=solver.parameters.num_search_workers,
+        )
+
+        _capture_solve(model, solver, capture_file, solve_label, {
+            'label': solve_label,
+            'workers': len(workers),
+            'workers_past': len(workers_past),
+            'first_day': min(days_of_year),
+            'last_day': max(days_of_year),
+            'decision_variables': len(shift),
+            'shifts': list(shifts),
+            'requested_max_time_seconds': max_time_seconds,
+            **(capture_metadata or {}),
+        })
+
+        stop_reason = None
+        solve_events.register_solver(solver)
+        try:
+            status, race_result = _solve_with_fallback(model, solver, solution_callback, core_lease.workers,
+                                                       algorithm_name, len(workers), solve_events)
+        finally:
+            solve_events.unregister_solver(solver)
+            get_core_budget().release(core_lease)
+            core_lease = None
+        if race_result is not None:
+            # solver only holds the re-solve that loaded the solution: the search statistics come from the child
+            status, stop_reason = race_result.status, race_result.stop_reason
+            objective_value, best_bound = race_result.objective, race_result.best_bound
+            solution_count, wall_time = race_result.solutions, race_result.wall_time
+            branches, conflicts = race_result.branches, race_result.conflicts
+        else:
+            if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+                objective_value, best_bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+            else:
+                objective_value = best_bound = None
+            solution_count, wall_time = solution_callback.solution_count, solver.WallTime()
+            branches, conflicts = solver.NumBranches(), solver.NumConflicts()
 
         solve_end = time.time()
         actual_duration = solve_end - solve_start
@@ -177,14 +266,33 @@ def solve(
 
         logger.info(f"Total time: {solve_duration:.2f} seconds")
         logger.info(f"Solver status: {solver.status_name(status)}")
+        if stop_reason == STOP_MEMORY_LIMIT:
+            logger.warning(f"Search stopped at the solver memory ceiling ({_isolation_config().get('max_rss_mb')} MB)")
         
         # Log solver statistics
         logger.info(f"Solver statistics:")
-        logger.info(f"  - Objective value: {solver.ObjectiveValue() if status in [cp_model.OPTIMAL, cp_model.FEASIBLE] else 'N/A'}")
-        logger.info(f"  - Best objective bound: {solver.BestObjectiveBound() if status in [cp_model.OPTIMAL, cp_model.FEASIBLE] else 'N/A'}")
-        logger.info(f"  - Number of branches: {solver.NumBranches()}")
-        logger.info(f"  - Number of conflicts: {solver.NumConflicts()}")
-        logger.info(f"  - Wall time: {solver.WallTime():.2f} seconds")
+        logger.info(f"  - Objective value: {objective_value if objective_value is not None else 'N/A'}")
+        logger.info(f"  - Best objective bound: {best_bound if best_bound is not None else 'N/A'}")
+        logger.info(f"  - Solutions found: {solution_count}")
+        logger.info(f"  - Number of branches: {branches}")
+        logger.info(f"  - Number of conflicts: {conflicts}")
+        logger.info(f"  - Wall time: {wall_time:.2f} seconds")
+
+        solve_events.publish(
+            EVENT_SOLVE_FINISHED,
+            label=solve_label,
+            status=solver.status_name(status),
+            objective=objective_value,
+            best_bound=best_bound,
+            solutions=solution_count,
+            elapsed_seconds=round(wall_time, 3),
+            branches=branches,
+            conflicts=conflicts,
+            cancelled=solve_events.cancel_requested,
+            stop_reason=stop_reason,
+        )
+        if solve_events.cancel_requested:
+            logger.info(f"Search stopped early: {solve_events.cancel_reason}")
 
 
 
@@ -193,16 +301,20 @@ def solve(
         # =================================================================
         if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
             error_msg = f"Solver failed to find a solution. Status: {solver.status_name(status)}"
+            if stop_reason is not None:
+                error_msg += f" (stopped: {stop_reason})"
             logger.error(error_msg)
             
             if status == cp_model.INFEASIBLE:
                 logger.error("Problem is infeasible - no solution exists with current constraints")
             elif status == cp_model.MODEL_INVALID:
                 logger.error("Model is invalid - check constraint definitions")
+            elif stop_reason == STOP_MEMORY_LIMIT:
+                logger.error("Solver reached its memory ceiling before finding a solution")
             elif status == cp_model.UNKNOWN:
                 logger.error("Solver timed out or encountered unknown status")
             
-            raise RuntimeError(error_msg)
+            raise SolveFailedError(error_msg, status, stop_reason)
         
         logger.info(f"[OK] Solution found! Status: {solver.status_name(status)}")
 
@@ -216,7 +328,7 @@ def solve(
                 if "could_be_quality_weekend" in var_name:
                     try:
                         var_value = solver.Value(var)
-                        logger.info(f"  {var_name} = {var_value}")
+                        logger.debug("  %s = %s", var_name, var_value)
                     except Exception as e:
                         logger.warning(f"  Could not get value for {var_name}: {e}")
         else:
@@ -241,7 +353,7 @@ def solve(
             '-'     : '-'
         }
         
-        logger.info(f"Shift mapping: {shift_mapping}")
+        logger.info("Shift mapping: %s", shift_mapping)
         
         logger.info(f"Processing schedule for {len(workers)} workers across {len(days_of_year)} days")
         # Prepare the data for the DataFrame
@@ -271,7 +383,7 @@ def solve(
                 compensation_days_off[w] = []
 
 
-                logger.info(f"Processing worker {w}")
+                logger.debug("Processing worker %s", w)
 
                 for d in days_of_year_sorted:
                     day_assignment = None
@@ -310,8 +422,8 @@ def solve(
                         if d - 1 in time_worked_day_M:
                             time_worked_day_M[d - 1] += work_day_hours[w].get(d, 8)
 
-                logger.info(f"{w}: days worked: {special_days_worked[w]}"
-                            f"\n\t\t\t\t\tcompensation days off: {compensation_days_off[w]}")
+                logger.debug("%s: days worked: %s\n\t\t\t\t\tcompensation days off: %s",
+                             w, summarize(special_days_worked[w]), summarize(compensation_days_off[w]))
                 
                 # Store statistics for this worker
                 worker_stats[w] = {
@@ -365,7 +477,7 @@ def solve(
                     }
                 }
 
-                logger.info(f"Processing worker {w}")
+                logger.debug("Processing worker %s", w)
                 for d in days_of_year_sorted:
                     day_assignment = None
                     temp_w = get_dummy(worker_with_dummy, w, d)
@@ -438,11 +550,14 @@ def solve(
                                         feriados_domingos_compensacao[w]["domingos"]["worked_before_period"].append((index_to_date[d], index_to_date[comp_day]))
                                     feriados_domingos_compensacao[w]["domingos"]["ld_given"].append((index_to_date[d], index_to_date[comp_day]))
 
-                logger.info(f"\n\t\tholidays worked      : {len(special_days_worked[w])}, {special_days_worked[w]}"
-                            f"\n\t\tsundays worked       : {len(sun[w])}, {sun[w]}"
-                            f"\n\t\tcompensation days off: {len(compensation_days_off[w])}, {compensation_days_off[w]}\n")
-                logger.info(f"feriados e compensacoes: \n{w}: {feriados_domingos_compensacao[w]['feriados']}")
-                logger.info(f"domingos e compensacoes: \n{w}: {feriados_domingos_compensacao[w]['domingos']}")
+                logger.debug("\n\t\tholidays worked      : %s, %s"
+                             "\n\t\tsundays worked       : %s, %s"
+                             "\n\t\tcompensation days off: %s, %s\n",
+                             len(special_days_worked[w]), summarize(special_days_worked[w]),
+                             len(sun[w]), summarize(sun[w]),
+                             len(compensation_days_off[w]), summarize(compensation_days_off[w]))
+                logger.debug("feriados e compensacoes: \n%s: %s", w, summarize(feriados_domingos_compensacao[w]['feriados']))
+                logger.debug("domingos e compensacoes: \n%s: %s", w, summarize(feriados_domingos_compensacao[w]['domingos']))
                 
                 # Store statistics for this worker
                 worker_stats[w] = {
@@ -466,9 +581,9 @@ def solve(
         logger.info(f"Successfully processed {processed_workers} workers")
         
         # =================================================================
-        # 6. CREATE DATAFRAME AND SAVE TO EXCEL
+        # 6. CREATE DATAFRAME AND SAVE DEBUG SCHEDULE
         # =================================================================
-        logger.info("Creating DataFrame and saving to Excel")
+        logger.info("Creating DataFrame and saving debug schedule")
         
         # Create DataFrame
         columns = ['Worker'] + [f'Day_{d}' for d in sorted(days_of_year)]
@@ -477,46 +592,48 @@ def solve(
         logger.info(f"DataFrame created with shape: {df.shape}")
         logger.info(f"DataFrame columns: {len(df.columns)} columns")
         
-        # Save to Excel
-       
-        try:
-            os.makedirs(os.path.dirname(output_filename), exist_ok=True)
-            days_of_year_sorted = sorted(days_of_year)
-
-            time_worked_M_row_after = ["Time_Worked_M"] + [time_worked_day_M_after[i] for i in range(len(days_of_year_sorted))]
-            time_worked_T_row_after = ["Time_Worked_T"] + [time_worked_day_T_after[i] for i in range(len(days_of_year_sorted))]
-
-            # Append rows to DataFrame
-            if workers_past:
-                df_past = pd.DataFrame(table_data_past, columns=columns)
-                df2 = pd.concat([df, df_past], ignore_index=True)
-                time_worked_M_row = ["Original_M"] + [time_worked_day_M[i] for i in range(len(days_of_year_sorted))]
-                time_worked_T_row = ["Original_T"] + [time_worked_day_T[i] for i in range(len(days_of_year_sorted))]
-                df2.loc[len(df2)] = time_worked_M_row
-                df2.loc[len(df2)] = time_worked_T_row
-            else:
-                df2 = df.copy()
-            df2.loc[len(df2)] = time_worked_M_row_after
-            df2.loc[len(df2)] = time_worked_T_row_after
-
-            if eci_sibling_results_flag:
-                sister_eci_M = ["Sister_Section_M"] + [h_plus.get((i, 'M'), -1) for i in range(len(days_of_year_sorted))]
-                sister_eci_T = ["Sister_Section_T"] + [h_plus.get((i, 'T'), -1) for i in range(len(days_of_year_sorted))]
-
-                df2.loc[len(df2)] = sister_eci_M
-                df2.loc[len(df2)] = sister_eci_T
-
-            df2.to_excel(output_filename, index=False)
-            logger.info(f"Schedule saved to: {output_filename}")
-        except Exception as e:
-            logger.warning(f"Could not save to Excel: {str(e)}")
+        # Save debug schedule (format and background writing handled by the debug artefact writer)
+        debug_writer = get_debug_writer()
+        if debug_writer.enabled:
+            try:
+                days_of_year_sorted = sorted(days_of_year)
+
+                time_worked_M_row_after = ["Time_Worked_M"] + [time_worked_day_M_after[i] for i in range(len(days_of_year_sorted))]
+                time_worked_T_row_after = ["Time_Worked_T"] + [time_worked_day_T_after[i] for i in range(len(days_of_year_sorted))]
+
+                # Append rows to DataFrame
+                if workers_past:
+                    df_past = pd.DataFrame(table_data_past, columns=columns)
+                    df2 = pd.concat([df, df_past], ignore_index=True)
+                    time_worked_M_row = ["Original_M"] + [time_worked_day_M[i] for i in range(len(days_of_year_sorted))]
+                    time_worked_T_row = ["Original_T"] + [time_worked_day_T[i] for i in range(len(days_of_year_sorted))]
+                    df2.loc[len(df2)] = time_worked_M_row
+                    df2.loc[len(df2)] = time_worked_T_row
+                else:
+                    df2 = df.copy()
+                df2.loc[len(df2)] = time_worked_M_row_after
+                df2.loc[len(df2)] = time_worked_T_row_after
+
+                if eci_sibling_results_flag:
+                    sister_eci_M = ["Sister_Section_M"] + [h_plus.get((i, 'M'), -1) for i in range(len(days_of_year_sorted))]
+                    sister_eci_T = ["Sister_Section_T"] + [h_plus.get((i, 'T'), -1) for i in range(len(days_of_year_sorted))]
+
+                    df2.loc[len(df2)] = sister_eci_M
+                    df2.loc[len(df2)] = sister_eci_T
+
+                saved_path = debug_writer.submit(df2, output_filename, index=False)
+                logger.info(f"Schedule queued to be saved to: {saved_path}")
+            except Exception as e:
+                logger.warning(f"Could not save debug schedule: {str(e)}")
+        else:
+            logger.info("Debug artefacts disabled, schedule file not written")
         
         # =================================================================
         # 7. LOG FINAL STATISTICS
         # =================================================================
-        logger.info("Final worker statistics:")
+        logger.debug("Final worker statistics:")
         for worker_id, stats in worker_stats.items():
-            logger.info(f"  Worker {worker_id}: {stats}")
+            logger.debug("  Worker %s: %s", worker_id, summarize(stats))
         
         logger.info("[OK] Solver completed successfully")
         df.columns = unique_dates_row
@@ -524,4 +641,133 @@ def solve(
         
     except Exception as e:
         logger.error(f"Error in solver: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
+    finally:
+        if core_lease is not None:
+            get_core_budget().release(core_lease)
+
+
+def _isolation_config() -> Dict[str, Any]:
+    """system_settings['solver_isolation'] ({} when absent)."""
+    return getattr(get_config_manager().system, 'solver_isolation_config', {}) or {}
+
+
+def _solve_with_fallback(model: cp_model.CpModel, solver: cp_model.CpSolver, solution_callback: SolutionCallback,
+                         lease_workers: int, algorithm_name: Optional[str], n_workers: int,
+                         solve_events) -> Tuple[Optional[int], Optional[Any]]:
+    """
+    Solve model with the profile race, else in an isolated child, else in this process.
+
+    Each step only runs when the previous one is disabled or could not load its solution; it gets
+    the time left of solver.parameters.max_time_in_seconds, so the fallbacks never overrun it.
+
+    Returns:
+        Tuple: (status of the in-process solve, None when a race or isolated result is returned;
+        that result, None after an in-process solve)
+    """
+    time_limit = solver.parameters.max_time_in_seconds
+    started = time.monotonic()
+
+    def cap_to_remaining_time():
+        remaining = max(1.0, time_limit - (time.monotonic() - started))
+        if remaining < solver.parameters.max_time_in_seconds:
+            logger.info(f"Solving again with the {remaining:.0f}s left of the {time_limit:.0f}s time limit")
+            solver.parameters.max_time_in_seconds = remaining
+
+    race_result = _race_profiles(model, solver, lease_workers, algorithm_name, n_workers, solve_events)
+    if race_result is not None:
+        return None, race_result
+    cap_to_remaining_time()
+    race_result = _solve_isolated(model, solver, solve_events)
+    if race_result is not None:
+        return None, race_result
+    cap_to_remaining_time()
+    return solver.Solve(model, solution_callback), None
+
+
+def _race_profiles(model: cp_model.CpModel, solver: cp_model.CpSolver, lease_workers: int,
+                   algorithm_name: Optional[str], n_workers: int, solve_events) -> Optional[ProfileResult]:
+    """
+    Solve model with the solver profile portfolio when system_settings['solver_portfolio'] is enabled.
+
+    The winner's solution is loaded into solver. Returns the winner's result (status, objective, search
+    statistics, stop reason), or None when the portfolio is disabled or cannot run, for solve() to solve normally.
+    With solver_isolation enabled the racers share its memory ceiling.
+    """
+    portfolio_config = get_portfolio_config()
+    if not portfolio_config.get('enabled', False):
+        return None
+    history = get_profile_history()
+    profiles = history.order(portfolio_config.get('profiles', []), algorithm_name, n_workers)
+    n_profiles = min(len(profiles), int(portfolio_config.get('max_parallel', 3)), lease_workers)
+    if n_profiles < 2:
+        logger.info(f"Solver portfolio skipped: {lease_workers} search workers for {len(profiles)} profiles")
+        return None
+    profiles = profiles[:n_profiles]
+    logger.info(f"Racing solver profiles {profiles} with {lease_workers // n_profiles} search workers each")
+    isolation_config = _isolation_config()
+    isolated = isolation_config.get('enabled', False)
+    winner, outcomes = race(model, solver.parameters, profiles, lease_workers // n_profiles,
+                            stop_requested=lambda: solve_events.cancel_requested,
+                            max_rss_mb=isolation_config.get('max_rss_mb') if isolated else None,
+                            kill_grace_seconds=isolation_config.get('kill_grace_seconds', 30))
+    logger.info(f"Solver portfolio winner: {winner.summary()}")
+    if winner.status in [cp_model.OPTIMAL, cp_model.FEASIBLE, cp_model.INFEASIBLE]:
+        history.record(algorithm_name, n_workers, winner.profile)
+    if winner.solution is None:
+        winner.objective = winner.best_bound = None
+        return winner
+    load_status = load_solution(model, solver, winner.solution)
+    if load_status != cp_model.OPTIMAL:
+        logger.warning(f"Could not load the solution of profile {winner.profile} ({solver.status_name(load_status)}), solving again")
+        return None
+    return winner
+
+
+def _solve_isolated(model: cp_model.CpModel, solver: cp_model.CpSolver,
+                    solve_events) -> Optional[IsolatedResult]:
+    """
+    Solve model in a memory-capped child process when system_settings['solver_isolation'] is enabled.
+
+    The child's best solution is loaded into solver. Returns the child's result (status, objective, search
+    statistics, stop reason), or None when isolation is disabled, for solve() to solve in this process.
+    """
+    isolation_config = _isolation_config()
+    if not isolation_config.get('enabled', False):
+        return None
+    logger.info(f"Solving in a child process, RSS ceiling {isolation_config.get('max_rss_mb')} MB")
+    result = solve_isolated(
+        model, solver.parameters,
+        max_rss_mb=isolation_config.get('max_rss_mb'),
+        sample_seconds=isolation_config.get('sample_seconds', 0.5),
+        kill_grace_seconds=isolation_config.get('kill_grace_seconds', 30),
+        stop_requested=lambda: solve_events.cancel_requested,
+    )
+    if result.error:
+        logger.error(f"Isolated solve failed: {result.error}")
+    if result.solution is None:
+        result.objective = result.best_bound = None
+        return result
+    load_status = load_solution(model, solver, result.solution)
+    if load_status != cp_model.OPTIMAL:
+        logger.warning(f"Could not load the isolated solution ({solver.status_name(load_status)}), solving again")
+        return None
+    return result
+
+
+def _capture_solve(model: cp_model.CpModel, solver: cp_model.CpSolver, capture_file: Optional[str],
+                   label: str, metadata: Dict[str, Any]) -> None:
+    """Export the model about to be solved (see model_capture); a failed capture never stops the solve."""
+    try:
+        capture_dir = None
+        if capture_file is None:
+            capture_dir = get_capture_dir()
+            if capture_dir is None:
+                return
+            capture_file = capture_path(capture_dir, label)
+        metadata['project_version'] = get_config_manager().system.project_version
+        capture_model(model, solver.parameters, capture_file, metadata)
+        if capture_dir is not None:
+            prune_captures(capture_dir, get_config_manager().system.model_capture_config.get('max_files', 50))
+    except Exception as e:
+        logger.warning(f"Could not capture the CP-SAT model: {e}")
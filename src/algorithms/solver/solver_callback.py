@@ -1,11 +1,15 @@
 import time
 from ortools.sat.python import cp_model
+from src.algorithms.solver.solve_events import EVENT_SOLUTION, get_solve_events
 
 # Enhanced solution callback with more details
 class SolutionCallback(cp_model.CpSolverSolutionCallback):
-            def __init__(self, logger, shift_vars, workers, days_of_year):
+            def __init__(self, logger, shift_vars, workers, days_of_year, events=None, label=''):
                 cp_model.CpSolverSolutionCallback.__init__(self)
                 self.logger = logger
+                # Progress events go to the process-wide bus, which also carries the cancel flag
+                self.events = events or get_solve_events()
+                self.label = label
                 self.solution_count = 0
                 self.start_time = time.time()
                 self.shift_vars = shift_vars
@@ -38,6 +42,23 @@ class SolutionCallback(cp_model.CpSolverSolutionCallback):
                 self.logger.info(f"  - Gap: {gap_percent:.2f}%")
                 self.logger.info(f"  - Branches: {self.NumBranches()}")
                 self.logger.info(f"  - Conflicts: {self.NumConflicts()}")
+
+                self.events.publish(
+                    EVENT_SOLUTION,
+                    label=self.label,
+                    solution_index=self.solution_count,
+                    objective=current_objective,
+                    best_bound=best_bound,
+                    gap_percent=round(gap_percent, 4),
+                    elapsed_seconds=round(elapsed_time, 3),
+                    branches=self.NumBranches(),
+                    conflicts=self.NumConflicts(),
+                    is_better=is_better,
+                )
+                if self.events.cancel_requested:
+                    self.logger.info(f"Stopping search after solution #{self.solution_count}: {self.events.cancel_reason}")
+                    self.StopSearch()
+                    return
                 
                 # Optional: Log some solution details
                 if self.solution_count <= 3:  # Only for first few solutions to avoid spam
@@ -0,0 +1,188 @@
+"""
+Symmetry breaking between interchangeable workers.
+
+Workers of a posto with the same contract, the same availability and no days
+of their own (fixed days off, fixed LQs, locked or forced days, compensation
+days) only differ by their id: swapping two of their schedules gives another
+solution with the same objective, and CP-SAT explores every such permutation
+when proving optimality.
+
+interchangeable_workers() is a pass over the data the model is built from (the
+dict returned by read_data_salsa) that groups such workers into equivalence
+classes. Two workers are equivalent when every per-worker entry of the data
+(dicts keyed by worker, worker lists) holds the same value for both. Entries
+that only hold global data (days, estimates, settings) do not take part.
+
+add_lex_ordering() then orders the schedules inside each class: the sequence
+of per-day shift codes of a worker is lexicographically >= the one of the next
+worker of the class. Any solution can be permuted into that order, so the
+optimum is unchanged and the permutations are cut from the search.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# Per-worker entries that pin days of a worker individually; workers with any of them are never grouped
+INDIVIDUAL_DAY_KEYS = ('fixed_days_off', 'fixed_LQs', 'locked_days', 'forced_work_days', 'fixed_compensation_days')
+# Worker lists whose members keep their own (published / derived) schedule
+FROZEN_WORKER_KEYS = ('workers_past',)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable, order-independent form of a per-worker value, used to compare workers."""
+    if isinstance(value, Mapping):
+        return ('map', tuple(sorted(((_freeze(k), _freeze(v)) for k, v in value.items()), key=repr)))
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted((_freeze(v) for v in value), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return ('seq', tuple(_freeze(v) for v in value))
+    if isinstance(value, pd.DataFrame):
+        return ('frame', tuple(value.columns), tuple(map(tuple, value.itertuples(index=False))))
+    if isinstance(value, pd.Series):
+        return ('series', tuple(value.items()))
+    if isinstance(value, np.ndarray):
+        return ('array', tuple(value.tolist()))
+    if isinstance(value, np.generic):
+        return value.item()
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('repr', repr(value))
+
+
+def _is_individual(worker: Any, data: Mapping[str, Any]) -> bool:
+    for key in INDIVIDUAL_DAY_KEYS:
+        days = data.get(key)
+        if isinstance(days, Mapping) and days.get(worker):
+            return True
+    return any(worker in (data.get(key) or ()) for key in FROZEN_WORKER_KEYS)
+
+
+def worker_signatures(workers: Iterable[Any], data: Mapping[str, Any],
+                      ignore_keys: Sequence[str] = ()) -> Dict[Any, Optional[Tuple]]:
+    """
+    Signature of every worker: the values the data holds for it, None when the worker has days of its own.
+
+    Args:
+        workers: Worker ids
+        data: Model data (read_data_salsa output)
+        ignore_keys: Entries of data left out of the comparison
+
+    Returns:
+        Dict[Any, Optional[Tuple]]: worker -> signature
+    """
+    workers = list(workers)
+    worker_set = set(workers)
+    components: Dict[Any, List[Tuple]] = {w: [] for w in workers}
+    for name in sorted(data):
+        if name in ignore_keys:
+            continue
+        value = data[name]
+        if isinstance(value, Mapping):
+            if not worker_set.intersection(value.keys()):
+                continue
+            for w in workers:
+                components[w].append((name, _freeze(value.get(w))))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            members = worker_set.intersection(value)
+            if not members:
+                continue
+            for w in workers:
+                components[w].append((name, w in members))
+    return {w: None if _is_individual(w, data) else tuple(components[w]) for w in workers}
+
+
+def interchangeable_workers(workers: Iterable[Any], data: Mapping[str, Any],
+                            ignore_keys: Sequence[str] = ()) -> List[List[Any]]:
+    """
+    Equivalence classes (of two or more workers) of interchangeable workers, each in workers order.
+
+    Args:
+        workers: Worker ids
+        data: Model data (read_data_salsa output)
+        ignore_keys: Entries of data left out of the comparison
+
+    Returns:
+        List[List[Any]]: Classes with at least two workers
+    """
+    classes: Dict[Tuple, List[Any]] = defaultdict(list)
+    for w, signature in worker_signatures(workers, data, ignore_keys).items():
+        if signature is not None:
+            classes[signature].append(w)
+    return [members for members in classes.values() if len(members) > 1]
+
+
+def _cell_layout(shift: Mapping, w: Any, days: Sequence[int], shifts: Sequence[str]) -> frozenset:
+    """Cells of w's schedule that exist in shift, with whether they are fixed."""
+    is_fixed = getattr(shift, 'is_fixed', None)
+    return frozenset(
+        (d, s, bool(is_fixed((w, d, s))) if is_fixed else False)
+        for d in days for s in shifts if (w, d, s) in shift
+    )
+
+
+def _lex_greater_equal(model: cp_model.CpModel, a: Sequence, b: Sequence, name: str) -> None:
+    """a >= b lexicographically. prefix_equal[i] is true exactly when a[:i] == b[:i]."""
+    prefix_equal = model.NewConstant(1)
+    for i, (a_i, b_i) in enumerate(zip(a, b)):
+        model.Add(a_i >= b_i).OnlyEnforceIf(prefix_equal)
+        if i == len(a) - 1:
+            break
+        next_equal = model.NewBoolVar(f"{name}_eq_{i}")
+        model.AddImplication(next_equal, prefix_equal)
+        model.Add(a_i == b_i).OnlyEnforceIf(next_equal)
+        model.Add(next_equal + a_i - b_i >= 1).OnlyEnforceIf(prefix_equal)
+        prefix_equal = next_equal
+
+
+def add_lex_ordering(model: cp_model.CpModel, shift: Mapping, worker_classes: Iterable[Sequence[Any]],
+                     days: Sequence[int], shifts: Sequence[str]) -> int:
+    """
+    Order the schedules of the workers of each class lexicographically.
+
+    A worker's schedule is read as its shift code per day (index of the shift in shifts,
+    plus one). Workers whose decision variables do not cover the same cells as the first
+    worker of their class are left out of it.
+
+    Args:
+        model: Model being built
+        shift: Decision variables, (worker, day, shift) -> BoolVar
+        worker_classes: Output of interchangeable_workers
+        days: Days of the schedule, in order
+        shifts: Shift names
+
+    Returns:
+        int: Number of ordered worker pairs
+    """
+    days = sorted(days)
+    codes = {s: i + 1 for i, s in enumerate(shifts)}
+    pairs = n_classes = 0
+    for members in worker_classes:
+        layouts = defaultdict(list)
+        for w in members:
+            layouts[_cell_layout(shift, w, days, shifts)].append(w)
+        for layout, same_cells in layouts.items():
+            if len(same_cells) < 2:
+                continue
+            n_classes += 1
+            schedule_days = sorted({d for d, _, _ in layout})
+            sequences = [
+                [sum(codes[s] * shift[(w, d, s)] for s in shifts if (w, d, s) in shift) for d in schedule_days]
+                for w in same_cells
+            ]
+            for i in range(len(same_cells) - 1):
+                _lex_greater_equal(model, sequences[i], sequences[i + 1], f"lex_{same_cells[i]}_{same_cells[i + 1]}")
+                pairs += 1
+    logger.info("Symmetry breaking: %d ordered pairs in %d classes of interchangeable workers", pairs, n_classes)
+    return pairs
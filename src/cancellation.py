@@ -0,0 +1,159 @@
+"""
+Cooperative cancellation and deadline of one process run.
+
+A CancellationToken is created per WFM process (child_runner, API job child or
+batch run) and installed with set_cancellation_token(). The service, the data
+models and the algorithms call check() between substages, data reading steps
+and constraint families; check() raises ProcessCancelled once the token was
+cancelled or its deadline passed, and the existing error handling of each layer
+turns it into a failed stage.
+
+CP-SAT is wired in through solve(): max_time_in_seconds is capped to the
+remaining budget and cancel() stops a running search through the solve event
+bus (StopSearch), so the solver never runs past the deadline.
+
+Only the standard library is imported so the orchestrator can build tokens
+without loading the data stack.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+
+class ProcessCancelled(Exception):
+    """Raised by CancellationToken.check() when the run must stop."""
+
+
+class CancellationToken:
+    """Cancel flag plus an optional wall-clock deadline, shared by every layer of a run."""
+
+    def __init__(self, deadline: Optional[float] = None, label: str = '', logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            deadline: Epoch seconds after which the run is cancelled, None for no deadline
+            label: Free text used in messages (e.g. the WFM process id)
+            logger: Logger used when the token is cancelled
+        """
+        self.deadline = deadline
+        self.label = label
+        self.logger = logger or logging.getLogger(__name__)
+        self._cancelled = threading.Event()
+        self._reason: Optional[str] = None
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[str], None]] = []
+
+    @classmethod
+    def with_timeout(cls, seconds: Optional[float], label: str = '', logger: Optional[logging.Logger] = None) -> 'CancellationToken':
+        """Token whose deadline is seconds from now (no deadline when seconds is None)."""
+        return cls(None if seconds is None else time.time() + seconds, label=label, logger=logger)
+
+    def cancel(self, reason: str = 'Cancelled') -> None:
+        """Cancel the run and notify the registered callbacks (once)."""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._reason = reason
+            self._cancelled.set()
+            callbacks = list(self._callbacks)
+        self.logger.warning(f"Run{f' {self.label}' if self.label else ''} cancelled: {reason}")
+        for callback in callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                self.logger.warning(f"Cancellation callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[str], None]) -> None:
+        """Call callback(reason) on cancel, immediately if already cancelled. Duplicates are ignored."""
+        with self._lock:
+            if not self._cancelled.is_set():
+                if callback not in self._callbacks:
+                    self._callbacks.append(callback)
+                return
+        callback(self._reason or 'Cancelled')
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (never negative), None without deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.time() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() was called or the deadline has passed."""
+        if not self._cancelled.is_set() and self.expired:
+            self.cancel(f"Deadline {datetime.fromtimestamp(self.deadline).isoformat(timespec='seconds')} reached")
+        return self._cancelled.is_set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def check(self, where: str = '') -> None:
+        """
+        Raise ProcessCancelled if the run was cancelled or the deadline passed.
+
+        Args:
+            where: Step about to start, included in the exception message
+        """
+        if self.cancelled:
+            raise ProcessCancelled(f"{self._reason} (before {where})" if where else self._reason)
+
+
+def compute_process_deadline(max_seconds: Optional[float] = None, deadline_time: Optional[str] = None,
+                             now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Deadline (epoch seconds) of a process starting now.
+
+    Args:
+        max_seconds: Maximum duration of one process, None for no limit
+        deadline_time: 'HH:MM' wall clock limit (e.g. store opening), the next occurrence is used
+        now: Start time, defaults to datetime.now()
+
+    Returns:
+        The earliest of both limits, None when neither is configured
+    """
+    now = now or datetime.now()
+    candidates = []
+    if max_seconds:
+        candidates.append(now + timedelta(seconds=float(max_seconds)))
+    if deadline_time:
+        hour, minute = (int(part) for part in str(deadline_time).split(':')[:2])
+        limit = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if limit <= now:
+            limit += timedelta(days=1)
+        candidates.append(limit)
+    return min(candidates).timestamp() if candidates else None
+
+
+_token = CancellationToken()
+_token_lock = threading.Lock()
+
+
+def get_cancellation_token() -> CancellationToken:
+    """Token of the run executing in this process (a never-cancelled token by default)."""
+    return _token
+
+
+def set_cancellation_token(token: Optional[CancellationToken]) -> CancellationToken:
+    """
+    Install token as the token of this process run and return it (None installs a fresh token).
+
+    The cancel flag of the solve event bus is cleared unless token is already cancelled.
+    """
+    global _token
+    with _token_lock:
+        _token = token if token is not None else CancellationToken()
+    # The solve event bus is process-wide: a cancel of the previous run (or its deadline) must not
+    # stop the searches of this one
+    from src.algorithms.solver.solve_events import get_solve_events
+
+    if not _token.cancelled:
+        get_solve_events().clear_cancel()
+    return _token
@@ -32,6 +32,13 @@ class SystemConfig:
         storage_strategy: Dict[str, Any] - Storage configuration options
         available_algorithms: List[str] - List of available algorithm names
         logging_config: Dict[str, Any] - Logging configuration settings
+        orchestrator_config: Dict[str, Any] - Orchestrator daemon settings
+        debug_artefacts_config: Dict[str, Any] - Debug artefact writer settings
+        model_capture_config: Dict[str, Any] - CP-SAT model capture settings
+        solver_portfolio_config: Dict[str, Any] - CP-SAT parameter portfolio settings
+        solver_isolation_config: Dict[str, Any] - Memory-capped child process solves
+        infeasibility_diagnosis_config: Dict[str, Any] - Diagnosis of infeasible models
+        api_config: Dict[str, Any] - Asynchronous job API settings
         
     Additional settings:
         override_parameter_defaults: bool - Whether to override parameter defaults
@@ -66,6 +73,13 @@ class SystemConfig:
         self.storage_strategy: Dict[str, Any] = self._config_data.get("storage_strategy", {})
         self.available_algorithms: List[str] = self._config_data.get("available_algorithms", [])
         self.logging_config: Dict[str, Any] = self._config_data.get("logging", {})
+        self.orchestrator_config: Dict[str, Any] = self._config_data.get("orchestrator", {})
+        self.debug_artefacts_config: Dict[str, Any] = self._config_data.get("debug_artefacts", {})
+        self.model_capture_config: Dict[str, Any] = self._config_data.get("model_capture", {})
+        self.solver_portfolio_config: Dict[str, Any] = self._config_data.get("solver_portfolio", {})
+        self.solver_isolation_config: Dict[str, Any] = self._config_data.get("solver_isolation", {})
+        self.infeasibility_diagnosis_config: Dict[str, Any] = self._config_data.get("infeasibility_diagnosis", {})
+        self.api_config: Dict[str, Any] = self._config_data.get("api", {})
         
         # Additional system settings
         self.override_parameter_defaults: bool = self._config_data.get("override_parameter_defaults", False)
@@ -10,19 +10,21 @@ import os
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from base_data_project.storage.containers import BaseDataContainer
-from base_data_project.log_config import get_logger
 from base_data_project.data_manager.managers.base import BaseDataManager
 from base_data_project.data_manager.managers.managers import CSVDataManager, DBDataManager
 
 # Local stuff
 from src.configuration_manager.instance import get_config
-from src.helpers import calcular_max
+from src.helpers import calcular_max, log_infeasibility_diagnosis
+from src.debug_artefacts import get_debug_writer
+from src.structured_logging import get_module_logger, summarize
 
 # Get configuration singleton
 _config = get_config()
 project_name = _config.project_name
 root_dir = _config.system.project_root_dir
 from src.data_models.functions.loading_functions import load_valid_emp_csv
+from src.data_models.functions.bound_queries import load_bound_query
 from src.data_models.functions.helper_functions import (
     count_dates_per_year,
     convert_types_out,
@@ -49,7 +51,7 @@ from src.algorithms.factory import AlgorithmFactory
 
 
 # Set up logger
-logger = get_logger(project_name)
+logger = get_module_logger(__name__)
 
 
 class BaseDescansosDataModel(ABC):
@@ -65,7 +67,7 @@ class BaseDescansosDataModel(ABC):
             project_name: Project name for logging
         """
         self.project_name = project_name
-        self.logger = get_logger(project_name)
+        self.logger = get_module_logger(type(self).__module__)
         
         ## Create default data container with project name if none provided
         #if data_container is None:
@@ -201,14 +203,13 @@ class BaseDescansosDataModel(ABC):
                 if query_path == '':
                     self.logger.warning("df_orcamento query path not found in config")
                 # Use extended date range (first_date_passado to last_date_passado) like df_calendario
-                start_date_quoted = "'" + first_date_passado + "'"
-                end_date_quoted = "'" + last_date_passado + "'"
-                df_orcamento = data_manager.load_data(
+                df_orcamento = load_bound_query(
+                    data_manager,
                     'df_orcamento', 
                     query_file=query_path, 
                     posto_id=posto_id, 
-                    start_date=start_date_quoted, 
-                    end_date=end_date_quoted
+                    start_date=first_date_passado, 
+                    end_date=last_date_passado
                 )
                 self.logger.info(f"df_orcamento shape (rows {df_orcamento.shape[0]}, columns {df_orcamento.shape[1]}): {df_orcamento.columns.tolist()}")
             except Exception as e:
@@ -246,13 +247,12 @@ class BaseDescansosDataModel(ABC):
                 if query_path == '':
                     self.logger.warning("df_granularidade query path not found in config")
                 # Use extended date range (first_date_passado to last_date_passado) like df_calendario
-                start_date_quoted = "'" + first_date_passado + "'"
-                end_date_quoted = "'" + last_date_passado + "'"
-                df_granularidade = data_manager.load_data(
+                df_granularidade = load_bound_query(
+                    data_manager,
                     'df_granularidade', 
                     query_file=query_path, 
-                    start_date=start_date_quoted, 
-                    end_date=end_date_quoted, 
+                    start_date=first_date_passado, 
+                    end_date=last_date_passado, 
                     posto_id=posto_id
                 )
                 self.logger.info(f"df_granularidade shape (rows {df_granularidade.shape[0]}, columns {df_granularidade.shape[1]}): {df_granularidade.columns.tolist()}")
@@ -454,7 +454,7 @@ class BaseDescansosDataModel(ABC):
             try:
                 if not df_estimativas.empty:
                     self.logger.info(f"DEBUG: df_estimativas columns: {df_estimativas.columns.tolist()}")
-                    self.logger.info(f"DEBUG: df_estimativas head:\n{df_estimativas.head()}")
+                    self.logger.debug("df_estimativas head:\n%s", summarize(df_estimativas))
                 success, df_estimativas, error_msg = filter_df_dates(
                     df=df_estimativas,
                     first_date_str=first_date_passado,
@@ -623,6 +623,7 @@ class BaseDescansosDataModel(ABC):
 
                 if results.get('summary', {}).get('status') == 'failed':  # Fixed: was checking for 'completed' which is wrong
                     self.logger.error(f"Algorithm {algorithm_name} failed to run. Status: {results.get('summary', {}).get('status')}")
+                    self._log_infeasibility_diagnosis(algorithm)
                     return False
 
                 #self.logger.info(f"DEBUG: results: {results}")
@@ -631,6 +632,7 @@ class BaseDescansosDataModel(ABC):
                 self.logger.info(f"Algorithm {algorithm_name} executed successfully with status: {results.get('status')}")
             except Exception as e:
                 self.logger.error(f"Error running algorithm {algorithm_name}: {e}", exc_info=True)
+                self._log_infeasibility_diagnosis(algorithm)
                 return False
             
             try:
@@ -660,10 +662,10 @@ class BaseDescansosDataModel(ABC):
                     
                     process_id = self.external_call_data.get("current_process_id", "")
                     posto_id = self.auxiliary_data.get("current_posto_id", "")
-                    self.rare_data['df_results'].to_csv(
+                    get_debug_writer().submit(
+                        self.rare_data['df_results'],
                         os.path.join(output_dir, f'df_results-{process_id}-{posto_id}.csv'),
-                        index=False,
-                        encoding='utf-8'
+                        index=False
                     )
                 except Exception as csv_error:
                     self.logger.warning(f"Failed to save df_results CSV file: {csv_error}")
@@ -688,6 +690,37 @@ class BaseDescansosDataModel(ABC):
             self.logger.error(f"Error in allocation_cycle method: {e}", exc_info=True)
             return False
 
+    def _log_infeasibility_diagnosis(self, algorithm) -> None:
+        """Write the conflicting constraint families of an infeasible run (algorithm.infeasibility_events) to esc_processo_erros."""
+        events = getattr(algorithm, 'infeasibility_events', None)
+        if not events:
+            return
+        self.auxiliary_data['infeasibility_events'] = events
+        connection = self.auxiliary_data.get('raw_connection')
+        df_messages = self.auxiliary_data.get('df_messages', pd.DataFrame())
+        if df_messages is None:
+            df_messages = pd.DataFrame()
+        if connection is None or df_messages.empty:
+            self.logger.warning(
+                f"{len(events)} infeasibility diagnosis event(s) not written to DB "
+                f"(connection={connection is not None}, messages={not df_messages.empty})"
+            )
+            return
+        try:
+            n_logged = log_infeasibility_diagnosis(
+                connection=connection,
+                path_os=root_dir,
+                fk_process=self.external_call_data.get('current_process_id'),
+                process_type='allocation_cycle',
+                df_messages=df_messages,
+                error_events=events,
+                child_num=str(self.external_call_data.get('child_number', 1)),
+                posto_id=self.auxiliary_data.get('current_posto_id'),
+            )
+            self.logger.info(f"Logged {n_logged}/{len(events)} infeasibility diagnosis event(s) to esc_processo_erros")
+        except Exception as e:
+            self.logger.error(f"Could not log the infeasibility diagnosis: {e}", exc_info=True)
+
     def validate_allocation_cycle(self) -> bool:
         """
         Validates func_inicializa operations. Validates data before running the allocation cycle.
@@ -710,7 +743,7 @@ class BaseDescansosDataModel(ABC):
             self.logger.info("Entered format_results method.")
             final_df = self.rare_data['df_results'].copy()
             df_colaborador = self.medium_data['df_colaborador'].copy()
-            self.logger.info(f"DEBUG: df_colaborador: {df_colaborador}")
+            self.logger.debug("df_colaborador: %s", summarize(df_colaborador))
             df_colaborador = collapse_df_colaborador_to_employee_level(
                 df_colaborador[['employee_id', 'matricula', 'data_admissao', 'data_demissao']],
                 employee_col='employee_id',
@@ -882,10 +915,10 @@ class BaseDescansosDataModel(ABC):
                 
                 process_id = self.external_call_data.get("current_process_id", "")
                 posto_id = self.auxiliary_data.get("current_posto_id", "")
-                final_df.to_csv(
+                get_debug_writer().submit(
+                    final_df,
                     os.path.join(output_dir, f'df_insert_results-{process_id}-{posto_id}.csv'),
-                    index=False,
-                    encoding='utf-8'
+                    index=False
                 )
             except Exception as csv_error:
                 self.logger.warning(f"Failed to save final_df CSV file: {csv_error}")
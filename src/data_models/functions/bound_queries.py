@@ -0,0 +1,257 @@
+"""
+Bind-variable execution of the data/Queries/sql files.
+
+The query files use {name} placeholders that DBDataManager.load_data fills by
+splicing quoted literals (process_id="'" + str(process_id) + "'", IN lists of
+quoted ids joined with commas). Every posto / process therefore sent Oracle a
+different SQL text and each one was hard-parsed.
+
+BoundQuery reads a file once and turns its placeholders into named binds:
+
+    WHERE process_id = {process_id}          ->  WHERE process_id = :process_id
+    AND employee_id IN ({colabs_id})         ->  AND employee_id IN (:colabs_id_0, ..., :colabs_id_7)
+
+Files may also be written with the binds themselves (:process_id, IN (:colabs_id));
+they are read the same way, so a converted file and a {name} one take the same
+params.
+
+IN-list placeholders take a list. On Oracle the list is bound as one
+SYS.ODCIVARCHAR2LIST collection,
+
+    AND employee_id IN ({colabs_id})         ->  AND employee_id IN (SELECT column_value FROM TABLE(:colabs_id))
+
+so the SQL text does not depend on the number of ids and the 1000-item limit of
+IN lists does not apply. Other databases get the list expanded to binds, padded
+(repeating its last value) up to the next power of two, so a query has a handful
+of distinct texts instead of one per list. The compiled statements are kept in a
+process-wide cache keyed by (file, mtime, list sizes), so the same SQL text, and
+with it the driver's statement cache and Oracle's shared cursor, is reused across
+postos and processes.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from src.structured_logging import get_module_logger
+
+logger = get_module_logger(__name__)
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_IN_LIST = re.compile(r"\bin\s*\(\s*\{(\w+)\}\s*\)", re.IGNORECASE)
+# Native :name binds (not the second colon of '::', not a time format like 'HH24:MI')
+_NATIVE_BIND = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+# Compiled statements kept per process, see BoundQuery.statement
+STATEMENT_CACHE_SIZE = 256
+# Minimum size of the oracledb statement cache (default 20) of the session's connection
+DRIVER_STATEMENT_CACHE_SIZE = 64
+# Collection type IN-list placeholders are bound as on Oracle (VARRAY(32767) OF VARCHAR2(4000))
+ORACLE_LIST_TYPE = 'SYS.ODCIVARCHAR2LIST'
+
+# list_sizes value of a list bound as a collection
+_COLLECTION = 0
+
+
+def _bind_value(value: Any) -> Any:
+    """Python value for a bind: numpy scalars unwrapped, dates as 'YYYY-MM-DD' (the files use to_date(..., 'YYYY-MM-DD'))."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (pd.Timestamp, dt.datetime)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if value is not None and not isinstance(value, str) and pd.isna(value):
+        return None
+    return value
+
+
+def _native_binds_to_placeholders(code: str) -> str:
+    """:name binds of a line of SQL as {name} placeholders, string literals left untouched."""
+    parts = code.split("'")
+    # Even parts are outside the quotes
+    parts[::2] = [_NATIVE_BIND.sub(r'{\1}', part) for part in parts[::2]]
+    return "'".join(parts)
+
+
+def _list_bucket(size: int) -> int:
+    """Number of binds used for an IN list of size values (next power of two, at least 1)."""
+    return 1 << max(0, size - 1).bit_length()
+
+
+class BoundQuery:
+    """A data/Queries/sql file with its {name} placeholders turned into named binds."""
+
+    def __init__(self, path: str, sql: str):
+        self.path = path
+        # Placeholders inside '--' comments are left untouched
+        lines = sql.splitlines(keepends=True)
+        self._segments: List[Tuple[str, str]] = []
+        names, list_names = [], set()
+        for line in lines:
+            code, sep, comment = line.partition('--')
+            code = _native_binds_to_placeholders(code)
+            list_names.update(_IN_LIST.findall(code))
+            names.extend(_PLACEHOLDER.findall(code))
+            self._segments.append((code, sep + comment))
+        self.bind_names: Tuple[str, ...] = tuple(dict.fromkeys(names))
+        self.list_names = frozenset(list_names)
+        self._statements: 'OrderedDict[Tuple[int, ...], Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'BoundQuery':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, f.read())
+
+    def sql(self, list_sizes: Dict[str, int]) -> str:
+        """SQL text with binds, IN-list placeholders expanded to list_sizes[name] binds (or a collection when 0)."""
+        def bind(match):
+            name = match.group(1)
+            if name in self.list_names:
+                size = list_sizes.get(name, 1)
+                if size == _COLLECTION:
+                    return f'SELECT column_value FROM TABLE(:{name})'
+                return ', '.join(f':{name}_{i}' for i in range(size))
+            return f':{name}'
+        return ''.join(_PLACEHOLDER.sub(bind, code) + comment for code, comment in self._segments)
+
+    def statement(self, list_sizes: Dict[str, int]):
+        """Compiled text() statement for list_sizes, cached per query."""
+        key = tuple(list_sizes.get(name, 1) for name in sorted(self.list_names))
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                statement = self._statements[key] = text(self.sql(list_sizes))
+                while len(self._statements) > STATEMENT_CACHE_SIZE:
+                    self._statements.popitem(last=False)
+            else:
+                self._statements.move_to_end(key)
+        return statement
+
+    def binds(self, params: Dict[str, Any], list_type=None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        """
+        (IN-list sizes, bind values) for params; every placeholder of the file must be given.
+
+        With list_type (the driver's ORACLE_LIST_TYPE object type) lists are bound as one
+        collection of strings, the values the quoted IN literals used to compare as.
+        """
+        missing = [name for name in self.bind_names if name not in params]
+        if missing:
+            raise KeyError(f"Missing bind values for {os.path.basename(self.path)}: {missing}")
+        list_sizes, values = {}, {}
+        for name in self.bind_names:
+            value = params[name]
+            if name not in self.list_names:
+                values[name] = _bind_value(value)
+                continue
+            if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+                value = [value]
+            # Blank ids are dropped, as the quoted IN lists did
+            items = [v for v in map(_bind_value, value) if v is not None and str(v).strip()]
+            if list_type is not None:
+                list_sizes[name] = _COLLECTION
+                values[name] = list_type.newobject([str(v).strip() for v in items])
+                continue
+            size = _list_bucket(len(items))
+            # An empty list binds NULL, which matches nothing
+            padding = items[-1] if items else None
+            items += [padding] * (size - len(items))
+            list_sizes[name] = size
+            values.update({f'{name}_{i}': v for i, v in enumerate(items)})
+        return list_sizes, values
+
+
+def _ensure_driver_statement_cache(session) -> None:
+    """Raise the oracledb statement cache of the session's connection so every bound query stays cached."""
+    try:
+        dbapi_connection = session.connection().connection.dbapi_connection
+        if getattr(dbapi_connection, 'stmtcachesize', DRIVER_STATEMENT_CACHE_SIZE) < DRIVER_STATEMENT_CACHE_SIZE:
+            dbapi_connection.stmtcachesize = DRIVER_STATEMENT_CACHE_SIZE
+    except Exception as e:
+        logger.debug("Could not resize the driver statement cache: %s", e)
+
+
+# dbapi connection -> ORACLE_LIST_TYPE (gettype is a round trip)
+_list_types: 'weakref.WeakKeyDictionary[Any, Any]' = weakref.WeakKeyDictionary()
+
+
+def _oracle_list_type(session):
+    """ORACLE_LIST_TYPE of the session's connection, None when the database is not Oracle."""
+    try:
+        if session.get_bind().dialect.name != 'oracle':
+            return None
+        dbapi_connection = session.connection().connection.dbapi_connection
+    except Exception as e:
+        logger.debug("Could not get the session's connection: %s", e)
+        return None
+    list_type = _list_types.get(dbapi_connection)
+    if list_type is None:
+        try:
+            list_type = dbapi_connection.gettype(ORACLE_LIST_TYPE)
+        except Exception as e:
+            logger.warning("Binding IN lists as expanded binds, %s is not available: %s", ORACLE_LIST_TYPE, e)
+            list_type = False
+        _list_types[dbapi_connection] = list_type
+    return list_type or None
+
+
+_queries: Dict[str, Tuple[float, BoundQuery]] = {}
+_queries_lock = threading.Lock()
+
+
+def get_bound_query(query_file: str) -> BoundQuery:
+    """BoundQuery of query_file, parsed once per process and re-read when the file changes."""
+    path = os.path.abspath(query_file)
+    mtime = os.path.getmtime(path)
+    with _queries_lock:
+        cached = _queries.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    query = BoundQuery.from_file(path)
+    with _queries_lock:
+        _queries[path] = (mtime, query)
+    return query
+
+
+def load_bound_query(data_manager, entity: str, query_file: str, **params) -> pd.DataFrame:
+    """
+    Run a data/Queries/sql file through the data manager's session with bind parameters.
+
+    Drop-in for data_manager.load_data(entity, query_file=..., **params) on a
+    DBDataManager, except that params are plain values (no quoting) and IN-list
+    placeholders take lists of ids (any length). Data managers without a session (CSVDataManager)
+    still go through load_data.
+
+    Args:
+        data_manager: DBDataManager with an open session
+        entity: Name of the loaded entity, for logging
+        query_file: Path of the SQL file
+        **params: Value of each {name} placeholder of the file
+
+    Returns:
+        pd.DataFrame: Query result
+
+    Raises:
+        KeyError: If a placeholder of the file has no value
+    """
+    session = getattr(data_manager, 'session', None)
+    if session is None:
+        return data_manager.load_data(entity, query_file=query_file, **params)
+    query = get_bound_query(query_file)
+    list_type = _oracle_list_type(session) if query.list_names else None
+    list_sizes, values = query.binds(params, list_type)
+    logger.debug("Loading %s from %s with binds %s", entity, os.path.basename(query.path), sorted(values))
+    _ensure_driver_statement_cache(session)
+    result = session.execute(query.statement(list_sizes), values)
+    return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
@@ -0,0 +1,405 @@
+"""
+Integer-keyed store behind the df_calendario layering functions.
+
+df_calendario is long format (employee × day × tipo_turno). The add_* layers used to
+copy it at every step and join sources through (str(employee_id), '%Y-%m-%d')
+MultiIndex lookups. CalendarStore encodes the keys once:
+
+    - employee_id -> ordinal into CalendarStore.employees (str labels)
+    - schedule_day -> ordinal into CalendarStore.days (normalised DatetimeIndex)
+    - horario -> small-int code into a code table
+
+Sources are joined through a dense (employee, day) grid and every layer is an
+in-place masked write on the code array, with precedence expressed as the set of
+codes a layer must preserve (e.g. 'F' closed holidays). to_frame() writes the
+columns back once.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+TIPOS_TURNO = ('M', 'T')
+
+# Shift codes bound to one tipo_turno row: the other row of the day gets '0'
+_SHIFT_CODE_OWN_TURNO = {'M': 'M', 'NLM': 'M', 'T': 'T', 'NLT': 'T'}
+
+# Values add_shift_info_from_ciclos never overwrites
+SHIFT_INFO_PREFILLED = ('F', 'V', 'L', 'LD', 'LQ', 'L_DOM', 'NL', 'NLM', 'NLT', 'A', 'P')
+
+
+def _employee_labels(values) -> pd.Index:
+    return pd.Index(values).astype(str)
+
+
+def _day_labels(values) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(pd.Index(values))).normalize()
+
+
+def _encode(values: pd.Series, labels: pd.Index, to_label) -> np.ndarray:
+    """Ordinal of every value in labels (-1 when absent), converting only the unique values."""
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return np.full(len(values), -1, dtype=np.int64)
+    return np.where(codes >= 0, labels.get_indexer(to_label(uniques))[codes], -1)
+
+
+def _dash_over(current: np.ndarray) -> np.ndarray:
+    """'-' written over 'A'/'V' keeps the absence: 'A-' / 'V-'."""
+    return np.where(current == 'A', 'A-', np.where(current == 'V', 'V-', '-'))
+
+
+class CalendarStore:
+    """Long-format calendar with integer employee/day keys and coded horario."""
+
+    def __init__(self, frame: pd.DataFrame, employee_col: str = 'employee_id'):
+        """
+        Args:
+            frame: df_calendario (employee_col, schedule_day, tipo_turno, horario, ...);
+                written back in place by to_frame()
+            employee_col: Employee key column of frame
+        """
+        self.frame = frame
+        self.employee_col = employee_col
+
+        employee_uniques = pd.unique(frame[employee_col].dropna())
+        self.employees = _employee_labels(employee_uniques).unique()
+        self.employee_codes = _encode(frame[employee_col], self.employees, _employee_labels)
+
+        day_uniques = pd.unique(frame['schedule_day'].dropna())
+        self.days = _day_labels(day_uniques).dropna().unique().sort_values()
+        self.day_codes = _encode(frame['schedule_day'], self.days, _day_labels)
+
+        self.tipo_turno = frame['tipo_turno'].to_numpy(dtype=object) if 'tipo_turno' in frame.columns else None
+
+        if 'horario' in frame.columns:
+            codes, table = pd.factorize(frame['horario'], use_na_sentinel=False)
+            self.code_table: List = list(table)
+            self.horario_codes = codes.astype(np.int16 if len(table) < 2 ** 15 else np.int32)
+        else:
+            self.code_table = ['']
+            self.horario_codes = np.zeros(len(frame), dtype=np.int16)
+        self._code_of: Dict = {value: i for i, value in enumerate(self.code_table) if isinstance(value, str)}
+        self._horario_dirty = False
+
+    @classmethod
+    def from_frame(cls, df_calendario: pd.DataFrame, copy: bool = True, employee_col: str = 'employee_id') -> 'CalendarStore':
+        """Encode df_calendario; with copy=False the caller's frame is updated by to_frame()."""
+        return cls(df_calendario.copy() if copy else df_calendario, employee_col=employee_col)
+
+    @classmethod
+    def create(cls, employee_id_matriculas_map: Dict, date_range: pd.DatetimeIndex, closed_days: Iterable = ()) -> 'CalendarStore':
+        """
+        Build the employees × days × tipo_turno grid directly from ordinals.
+
+        Rows are sorted by (employee_id as str, schedule_day, tipo_turno), horario is ''
+        except on closed_days where it is 'F'.
+        """
+        employees = sorted(((str(emp), str(mat)) for emp, mat in employee_id_matriculas_map.items()), key=lambda item: item[0])
+        employee_ids = np.array([emp for emp, _ in employees], dtype=object)
+        matriculas = np.array([mat for _, mat in employees], dtype=object)
+        n_employees, n_days, n_turnos = len(employees), len(date_range), len(TIPOS_TURNO)
+
+        day_strings = np.asarray(date_range.strftime('%Y-%m-%d'), dtype=object)
+        weekdays = np.asarray(date_range.weekday + 1)
+        per_employee = n_days * n_turnos
+        closed = _day_labels(list(closed_days)) if len(closed_days) else pd.DatetimeIndex([])
+        closed_day = np.asarray(date_range.normalize().isin(closed))
+
+        frame = pd.DataFrame({
+            'employee_id': np.repeat(employee_ids, per_employee),
+            'schedule_day': np.tile(np.repeat(day_strings, n_turnos), n_employees),
+            'tipo_turno': np.tile(np.array(TIPOS_TURNO, dtype=object), n_employees * n_days),
+            'horario': np.tile(np.repeat(np.where(closed_day, 'F', ''), n_turnos).astype(object), n_employees),
+            'wd': np.tile(np.repeat(weekdays, n_turnos), n_employees),
+            'dia_tipo': '',
+            'matricula': np.repeat(matriculas, per_employee),
+            'fixed': False,
+            'tipo_ciclo': False,
+        })
+        return cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # ------------------------------------------------------------------
+    # horario codes
+    # ------------------------------------------------------------------
+
+    def code(self, value) -> int:
+        """Code of a horario value, added to the code table if new."""
+        existing = self._code_of.get(value)
+        if existing is not None:
+            return existing
+        self.code_table.append(value)
+        new_code = len(self.code_table) - 1
+        if isinstance(value, str):
+            self._code_of[value] = new_code
+        if new_code >= np.iinfo(self.horario_codes.dtype).max:
+            self.horario_codes = self.horario_codes.astype(np.int32)
+        return new_code
+
+    def horario_is(self, values: Sequence[str]) -> np.ndarray:
+        """Row mask of horario in values."""
+        wanted = [self._code_of[value] for value in values if value in self._code_of]
+        if not wanted:
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.horario_codes, wanted)
+
+    def horario_values(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Decoded horario values (object array), optionally only for the rows in mask."""
+        codes = self.horario_codes if mask is None else self.horario_codes[mask]
+        return np.asarray(self.code_table, dtype=object)[codes]
+
+    def write(self, mask: np.ndarray, values, preserve: Sequence[str] = ()) -> int:
+        """
+        Masked in-place write of horario.
+
+        Args:
+            mask: Row mask to write
+            values: Scalar, or per-row array (len(self)) / per-masked-row array (mask.sum())
+            preserve: horario values that this write never overrides
+
+        Returns:
+            Number of rows written
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if preserve:
+            keep = self.horario_is(preserve)
+            if isinstance(values, np.ndarray) and len(values) == int(mask.sum()) and len(values) != len(self):
+                values = values[~keep[mask]]
+            mask = mask & ~keep
+        count = int(mask.sum())
+        if count == 0:
+            return 0
+        if isinstance(values, np.ndarray):
+            selected = values[mask] if len(values) == len(self) else values
+            value_codes, uniques = pd.factorize(pd.Series(selected, dtype=object), use_na_sentinel=False)
+            table_codes = np.array([self.code(value) for value in uniques], dtype=np.int32)
+            self.horario_codes[mask] = table_codes[value_codes]
+        else:
+            self.horario_codes[mask] = self.code(values)
+        self._horario_dirty = True
+        return count
+
+    # ------------------------------------------------------------------
+    # source joins
+    # ------------------------------------------------------------------
+
+    def lookup(self, source: pd.DataFrame, value_col: str, employee_col: str = 'employee_id', day_col: str = 'schedule_day') -> np.ndarray:
+        """
+        Value of source[value_col] for every calendar row, matched on (employee, day).
+
+        Keys are encoded on unique values only and joined through a dense
+        employees × days grid. Duplicated keys keep the first source row. Rows
+        without a match get NaN.
+        """
+        n_days = len(self.days)
+        if source is None or source.empty or n_days == 0 or len(self.employees) == 0:
+            return np.full(len(self), np.nan, dtype=object)
+
+        source_employee = _encode(source[employee_col], self.employees, _employee_labels)
+        source_day = _encode(source[day_col], self.days, _day_labels)
+
+        valid = (source_employee >= 0) & (source_day >= 0)
+        keys = source_employee[valid] * n_days + source_day[valid]
+        rows = np.flatnonzero(valid)
+        grid = np.full(len(self.employees) * n_days, -1, dtype=np.int64)
+        unique_keys, first_position = np.unique(keys, return_index=True)
+        grid[unique_keys] = rows[first_position]
+
+        row_valid = (self.employee_codes >= 0) & (self.day_codes >= 0)
+        source_rows = np.full(len(self), -1, dtype=np.int64)
+        source_rows[row_valid] = grid[self.employee_codes[row_valid] * n_days + self.day_codes[row_valid]]
+        return pd.api.extensions.take(source[value_col].to_numpy(), source_rows, allow_fill=True)
+
+    # ------------------------------------------------------------------
+    # layers
+    # ------------------------------------------------------------------
+
+    def apply_shift_info(self, df_ciclos: pd.DataFrame) -> int:
+        """
+        WORK_SHIFT layer: 'M'/'T' fill their own tipo_turno row and '0' the other,
+        'A' (or empty) gives 'MoT'; rows in SHIFT_INFO_PREFILLED are preserved.
+
+        Returns:
+            Number of rows with a WORK_SHIFT match
+        """
+        mapped = self.lookup(df_ciclos, 'work_shift')
+        has_shift = pd.notna(mapped)
+        upper = pd.Series(mapped, dtype=object).str.upper().fillna('').to_numpy(dtype=object)
+
+        self.write(has_shift & np.isin(upper, ['A', '']), 'MoT', preserve=SHIFT_INFO_PREFILLED)
+        for shift, other_turno in (('M', 'T'), ('T', 'M')):
+            shift_rows = has_shift & (upper == shift)
+            self.write(shift_rows & (self.tipo_turno == shift), shift, preserve=SHIFT_INFO_PREFILLED)
+            self.write(shift_rows & (self.tipo_turno == other_turno), '0', preserve=SHIFT_INFO_PREFILLED)
+        return int(has_shift.sum())
+
+    def apply_ausencias_ferias(self, df_ausencias_ferias: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Absence layer: tipo_ausencia overrides horario except 'F'.
+
+        Returns:
+            (matches found, rows written)
+        """
+        employee_col = 'employee_id' if 'employee_id' in df_ausencias_ferias.columns else 'fk_colaborador'
+        mapped = self.lookup(df_ausencias_ferias, 'tipo_ausencia', employee_col=employee_col, day_col='data')
+        matched = pd.notna(mapped)
+        valid = matched & (mapped != '') & (mapped != '-')
+        return int(matched.sum()), self.write(valid, mapped, preserve=('F',))
+
+    def apply_ciclos_completos(self, df_ciclos: pd.DataFrame, horario_col: str) -> Dict[str, int]:
+        """
+        Complete-cycle layer. 'F' is never overridden; '-' turns 'A'/'V' into 'A-'/'V-';
+        'L' overrides 'A'/'V'; M/T/NLM/NLT fill their own tipo_turno row and '0' the other;
+        MoT and any other code fill both rows unless the row holds 'A'/'V'.
+
+        Returns:
+            Counts per kind of write ('matches', '-', 'L', 'shift', 'other', 'preserved_av')
+        """
+        mapped = self.lookup(df_ciclos, horario_col)
+        valid = pd.notna(mapped) & (mapped != '')
+        preserve_av = self.horario_is(('A', 'V'))
+        writable = valid & ~self.horario_is(('F',))
+
+        dash = writable & (mapped == '-')
+        self.write(dash, _dash_over(self.horario_values(dash)))
+        l_rows = writable & (mapped == 'L')
+        self.write(l_rows, 'L')
+
+        shift_rows = writable & ~preserve_av & np.isin(mapped, ['M', 'T', 'MoT', 'NLM', 'NLT'])
+        self.write(shift_rows & (mapped == 'MoT'), 'MoT')
+        for shift_code, own_turno in _SHIFT_CODE_OWN_TURNO.items():
+            code_rows = shift_rows & (mapped == shift_code)
+            other_turno = 'T' if own_turno == 'M' else 'M'
+            self.write(code_rows & (self.tipo_turno == own_turno), shift_code)
+            self.write(code_rows & (self.tipo_turno == other_turno), '0')
+
+        other = writable & ~preserve_av & (mapped != '-') & (mapped != 'L') & ~np.isin(mapped, ['M', 'T', 'MoT', 'NLM', 'NLT'])
+        self.write(other, mapped)
+
+        return {
+            'matches': int(pd.notna(mapped).sum()),
+            '-': int(dash.sum()),
+            'L': int(l_rows.sum()),
+            'shift': int(shift_rows.sum()),
+            'other': int(other.sum()),
+            'preserved_av': int((preserve_av & valid & (mapped != '-') & (mapped != 'L')).sum()),
+            'NL': int((mapped == 'NL').sum()),
+            'NLM': int((mapped == 'NLM').sum()),
+            'NLT': int((mapped == 'NLT').sum()),
+        }
+
+    def apply_folgas_ciclos(self, df_dayoffs: pd.DataFrame) -> Dict[str, int]:
+        """
+        Fixed day-off layer (tipo_dia 'L' or '-'). 'L' preserves 'F', 'A' and 'V';
+        '-' preserves 'F' and turns 'A'/'V' into 'A-'/'V-'.
+
+        Returns:
+            Counts ('L', '-', 'preserved_f', 'preserved_av')
+        """
+        mapped = self.lookup(df_dayoffs, 'tipo_dia')
+        preserve_f = self.horario_is(('F',))
+        preserve_av = self.horario_is(('A', 'V'))
+
+        l_rows = (mapped == 'L') & ~preserve_f & ~preserve_av
+        self.write(l_rows, 'L')
+        dash = (mapped == '-') & ~preserve_f
+        self.write(dash, _dash_over(self.horario_values(dash)))
+
+        return {
+            'L': int(l_rows.sum()),
+            '-': int(dash.sum()),
+            'preserved_f': int((np.isin(mapped, ['L', '-']) & preserve_f).sum()),
+            'preserved_av': int(((mapped == 'L') & preserve_av).sum()),
+        }
+
+    def apply_calendario_passado(self, df_calendario_passado: pd.DataFrame) -> Dict[str, int]:
+        """
+        Historical layer: non-empty passado horario overrides everything except 'F'/'V'
+        and marks the row as fixed.
+
+        Returns:
+            Counts ('matches', 'filled', 'preserved', 'NL')
+        """
+        mapped = self.lookup(df_calendario_passado, 'horario')
+        matched = pd.notna(mapped)
+        preserve = self.horario_is(('F', 'V'))
+        fill = matched & (mapped != '') & ~preserve
+        self.write(fill, mapped)
+
+        fixed = self.frame['fixed'].to_numpy(dtype=bool, copy=True) if 'fixed' in self.frame.columns \
+            else np.zeros(len(self), dtype=bool)
+        fixed[fill] = True
+        self.frame['fixed'] = fixed
+        return {
+            'matches': int(matched.sum()),
+            'filled': int(fill.sum()),
+            'preserved': int(preserve.sum()),
+            'NL': int((mapped == 'NL').sum()),
+        }
+
+    def apply_tipo_ciclo(self, df_ciclos: pd.DataFrame) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Per employee-day tipo_ciclo (bool, DB 'S' = True) and workload_template columns.
+
+        Returns:
+            (rows matched for tipo_ciclo, rows with workload_template); None when the
+            source column is missing
+        """
+        tipo_ciclo = self.frame['tipo_ciclo'].to_numpy(dtype=bool, copy=True) if 'tipo_ciclo' in self.frame.columns \
+            else np.zeros(len(self), dtype=bool)
+        matched_count = None
+        if 'tipo_ciclo' in df_ciclos.columns:
+            source = df_ciclos[['employee_id', 'schedule_day', 'tipo_ciclo']].copy()
+            source['tipo_ciclo'] = source['tipo_ciclo'].apply(_db_tipo_ciclo_to_bool)
+            mapped = self.lookup(source, 'tipo_ciclo')
+            has_match = pd.notna(mapped)
+            tipo_ciclo[has_match] = mapped[has_match].astype(bool)
+            matched_count = int(has_match.sum())
+        self.frame['tipo_ciclo'] = tipo_ciclo
+
+        template_count = None
+        if 'workload_template' in df_ciclos.columns:
+            self.frame['workload_template'] = self.lookup(df_ciclos, 'workload_template')
+            template_count = int(self.frame['workload_template'].notna().sum())
+        return matched_count, template_count
+
+    # ------------------------------------------------------------------
+    # output
+    # ------------------------------------------------------------------
+
+    def horario_counts(self) -> Dict:
+        """horario value counts (same ordering as Series.value_counts)."""
+        return pd.Series(self.horario_values()).value_counts().to_dict()
+
+    def set_key_formats(self, schedule_day: Optional[str] = None) -> None:
+        """
+        Rewrite the key columns from their codes: employee_id as str and, optionally,
+        schedule_day as 'str' ('%Y-%m-%d') or 'datetime' (normalised Timestamp).
+        """
+        self.frame[self.employee_col] = self.employees.take(self.employee_codes, allow_fill=True, fill_value=np.nan).to_numpy(dtype=object)
+        if schedule_day == 'str':
+            day_strings = pd.Index(self.days.strftime('%Y-%m-%d'), dtype=object)
+            self.frame['schedule_day'] = day_strings.take(self.day_codes, allow_fill=True, fill_value=np.nan).to_numpy(dtype=object)
+        elif schedule_day == 'datetime':
+            self.frame['schedule_day'] = self.days.take(self.day_codes, allow_fill=True, fill_value=pd.NaT)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Write horario back into the frame (only if a layer changed it) and return the frame."""
+        if self._horario_dirty or 'horario' not in self.frame.columns:
+            self.frame['horario'] = self.horario_values()
+            self._horario_dirty = False
+        return self.frame
+
+
+def _db_tipo_ciclo_to_bool(raw) -> bool:
+    if isinstance(raw, (bool, np.bool_)):
+        return bool(raw)
+    if raw is None or (isinstance(raw, float) and pd.isna(raw)):
+        return False
+    return str(raw).strip().upper() == 'S'
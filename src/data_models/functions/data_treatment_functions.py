@@ -43,7 +43,7 @@ import datetime as dt
 import pandas as pd
 import numpy as np
 from typing import Callable, List, Tuple, Dict, Optional
-from base_data_project.log_config import get_logger
+from src.structured_logging import get_module_logger, summarize
 
 # Local stuff
 from src.configuration_manager.instance import get_config
@@ -64,13 +64,14 @@ from src.data_models.validations.load_process_data_validations import (
     validate_df_colaborador
 )
 from src.helpers import count_open_holidays
+from src.data_models.functions.calendar_store import CalendarStore
 from src.data_models.functions.read_salsa_calendar_mirror import (
     build_read_salsa_worker_calendar,
     build_salsa_day_week_date_maps,
 )
 
 # Set up logger
-logger = get_logger(PROJECT_NAME)
+logger = get_module_logger(__name__)
 
 
 def separate_df_ciclos_completos_folgas_ciclos(
@@ -209,7 +210,7 @@ def treat_df_valid_emp(df_valid_emp: pd.DataFrame) -> Tuple[bool, pd.DataFrame,
         if df_valid_emp.empty:
             return False, pd.DataFrame(), "Treatment resulted in empty DataFrame"
             
-        logger.info(f"valid_emp:\n{df_valid_emp}")
+        logger.debug("valid_emp:\n%s", summarize(df_valid_emp))
         return True, df_valid_emp, ""
         
     except Exception as e:
@@ -3366,74 +3367,27 @@ def create_df_calendario(
         
         # Generate sequence of dates
         date_range = pd.date_range(start=start_dt, end=end_dt, freq='D')
-        
-        # Create employee DataFrame
-        employees_df = pd.DataFrame(list(employee_id_matriculas_map.items()), 
-                                  columns=['employee_id', 'matricula'])
-        
-        # Create dates DataFrame with weekday calculation
-        dates_df = pd.DataFrame({
-            'schedule_day': date_range,
-            'wd': date_range.weekday + 1  # Convert to 1-7 (Monday-Sunday)
-        })
-        
-        # Create shifts DataFrame
-        shifts_df = pd.DataFrame({'tipo_turno': ['M', 'T']})
-        
-        # Create cartesian product using cross merge
-        try:
-            # First: employees × dates
-            emp_dates = employees_df.assign(key=1).merge(dates_df.assign(key=1), on='key').drop('key', axis=1)
-            
-            # Second: (employees × dates) × shifts
-            df_calendario = emp_dates.assign(key=1).merge(shifts_df.assign(key=1), on='key').drop('key', axis=1)
-        except Exception as e:
-            logger.warning(f"Cartesian product creation failed: {e}")
-            return False, pd.DataFrame(), "Calendar creation failed"
-        
-        # Vectorized operations for final formatting
-        try:
-            df_calendario['employee_id'] = df_calendario['employee_id'].astype(str)
-            df_calendario['matricula'] = df_calendario['matricula'].astype(str)
-            df_calendario['schedule_day'] = df_calendario['schedule_day'].dt.strftime('%Y-%m-%d')
-        except Exception as e:
-            logger.warning(f"Data formatting failed: {e}")
-            return False, pd.DataFrame(), "Data formatting failed"
-        
-        # Add empty columns
-        df_calendario['horario'] = ''
-        df_calendario['dia_tipo'] = ''
-        df_calendario['fixed'] = False
-        df_calendario['tipo_ciclo'] = False
-        df_calendario['tipo_ciclo'] = df_calendario['tipo_ciclo'].astype(bool)
 
-        # Flag closed holidays (tipo_feriado == 'F') upfront so later steps preserve them
+        # Closed holidays (tipo_feriado == 'F') are pre-filled with 'F' so later layers preserve them
+        closed_days = []
         try:
             if df_feriados is not None and not df_feriados.empty:
                 if {'schedule_day', 'tipo_feriado'}.issubset(df_feriados.columns):
-                    df_closed = df_feriados.copy()
-                    df_closed['tipo_feriado'] = df_closed['tipo_feriado'].astype(str).str.upper()
-                    df_closed = df_closed[df_closed['tipo_feriado'] == 'F']
-                    if not df_closed.empty:
-                        df_closed['schedule_day'] = pd.to_datetime(df_closed['schedule_day']).dt.strftime('%Y-%m-%d')
-                        closed_dates = df_closed['schedule_day'].unique()
-                        mask_closed = df_calendario['schedule_day'].isin(closed_dates)
-                        if mask_closed.any():
-                            df_calendario.loc[mask_closed, 'horario'] = 'F'
+                    tipo_feriado = df_feriados['tipo_feriado'].astype(str).str.upper()
+                    closed_days = pd.to_datetime(df_feriados.loc[tipo_feriado == 'F', 'schedule_day']).unique()
                 else:
                     logger.warning("df_feriados missing schedule_day or tipo_feriado columns; skipping closed-day flagging")
         except Exception as e:
             logger.warning(f"Failed to pre-fill closed holidays in df_calendario: {e}")
-        
-        # Reorder columns
-        column_order = [
-            'employee_id', 'schedule_day', 'tipo_turno', 'horario', 'wd', 'dia_tipo',
-            'matricula', 'fixed', 'tipo_ciclo',
-        ]
-        df_calendario = df_calendario[column_order]
-        
-        # Sort by employee_id, date, and shift type for consistent ordering
-        df_calendario = df_calendario.sort_values(['employee_id', 'schedule_day', 'tipo_turno']).reset_index(drop=True)
+            closed_days = []
+
+        # employees × dates × shifts built from ordinals, already sorted by
+        # employee_id, schedule_day and tipo_turno
+        try:
+            df_calendario = CalendarStore.create(employee_id_matriculas_map, date_range, closed_days).to_frame()
+        except Exception as e:
+            logger.warning(f"Calendar creation failed: {e}")
+            return False, pd.DataFrame(), "Calendar creation failed"
         
         # OUTPUT VALIDATION
         if df_calendario.empty:
@@ -3591,6 +3545,7 @@ def add_seq_turno(df_calendario: pd.DataFrame, df_colaborador: pd.DataFrame):
 def add_shift_info_from_ciclos(
     df_calendario: pd.DataFrame,
     df_ciclos_completos_folgas_ciclos: pd.DataFrame,
+    copy: bool = True,
 ) -> Tuple[bool, pd.DataFrame, str]:
     """
     Populate df_calendario's horario column using WORK_SHIFT from df_ciclos_completos_folgas_ciclos.
@@ -3610,6 +3565,7 @@ def add_shift_info_from_ciclos(
         df_calendario: Calendar DataFrame with columns [employee_id, schedule_day, tipo_turno, horario, ...]
         df_ciclos_completos_folgas_ciclos: Cycles DataFrame with columns
             [employee_id, schedule_day, work_shift, ...]
+        copy: False writes the mapped horario values into df_calendario itself instead of a copy
 
     Returns:
         Tuple[bool, pd.DataFrame, str]: (success, updated_calendario, error_message)
@@ -3623,7 +3579,7 @@ def add_shift_info_from_ciclos(
         if missing:
             return False, pd.DataFrame(), f"df_calendario missing required columns: {missing}"
 
-        df_result = df_calendario.copy()
+        df_result = df_calendario.copy() if copy else df_calendario
 
         if df_ciclos_completos_folgas_ciclos is None or df_ciclos_completos_folgas_ciclos.empty:
             logger.warning("add_shift_info_from_ciclos: df_ciclos_completos_folgas_ciclos is empty; horario unchanged")
@@ -3633,43 +3589,13 @@ def add_shift_info_from_ciclos(
             logger.warning("add_shift_info_from_ciclos: work_shift column not found in ciclos data; horario unchanged")
             return True, df_result, ""
 
-        # Build a lookup: (employee_id, schedule_day) -> work_shift
-        ciclos = df_ciclos_completos_folgas_ciclos[['employee_id', 'schedule_day', 'work_shift']].copy()
-        ciclos['employee_id'] = ciclos['employee_id'].astype(str)
-        ciclos['schedule_day'] = pd.to_datetime(ciclos['schedule_day']).dt.normalize()
-        ciclos = ciclos.drop_duplicates(subset=['employee_id', 'schedule_day'], keep='first')
-        shift_lookup = ciclos.set_index(['employee_id', 'schedule_day'])['work_shift']
-
-        df_result['employee_id'] = df_result['employee_id'].astype(str)
-        df_result['schedule_day'] = pd.to_datetime(df_result['schedule_day']).dt.normalize()
-
-        # Look up work_shift for each calendario row
-        idx = pd.MultiIndex.from_arrays([df_result['employee_id'], df_result['schedule_day']])
-        df_result['_work_shift'] = shift_lookup.reindex(idx).values
-
-        has_shift = df_result['_work_shift'].notna()
-        logger.info(f"add_shift_info_from_ciclos: {has_shift.sum()} / {len(df_result)} rows have a WORK_SHIFT match")
-
-        work_shift_upper = df_result['_work_shift'].str.upper().fillna('')
-        tipo_turno = df_result['tipo_turno']
-
-        # Preserve rows already set by earlier steps (F, V, L*, etc.) — only update '0' / empty
-        prefilled_mask = df_result['horario'].isin(['F', 'V', 'L', 'LD', 'LQ', 'L_DOM', 'NL', 'NLM', 'NLT', 'A', 'P'])
-
-        conditions = [
-            has_shift & (work_shift_upper.isin(['A', ''])) & ~prefilled_mask,
-            has_shift & (work_shift_upper == 'M') & (tipo_turno == 'M') & ~prefilled_mask,
-            has_shift & (work_shift_upper == 'M') & (tipo_turno == 'T') & ~prefilled_mask,
-            has_shift & (work_shift_upper == 'T') & (tipo_turno == 'T') & ~prefilled_mask,
-            has_shift & (work_shift_upper == 'T') & (tipo_turno == 'M') & ~prefilled_mask,
-        ]
-        choices = ['MoT', 'M', '0', 'T', '0']
-
-        df_result.loc[~prefilled_mask & has_shift, 'horario'] = np.select(
-            conditions, choices, default=df_result['horario']
-        )[~prefilled_mask & has_shift]
-
-        df_result = df_result.drop(columns=['_work_shift'], errors='ignore')
+        # (employee_id, schedule_day) -> work_shift joined on integer keys; rows already set by
+        # earlier steps (F, V, L*, etc.) are preserved
+        store = CalendarStore.from_frame(df_result, copy=False)
+        matched = store.apply_shift_info(df_ciclos_completos_folgas_ciclos)
+        logger.info(f"add_shift_info_from_ciclos: {matched} / {len(df_result)} rows have a WORK_SHIFT match")
+        store.set_key_formats(schedule_day='datetime')
+        df_result = store.to_frame()
 
         horario_counts = df_result['horario'].value_counts().to_dict()
         logger.info(f"add_shift_info_from_ciclos complete. horario distribution: {horario_counts}")
@@ -3683,6 +3609,7 @@ def add_shift_info_from_ciclos(
 def add_tipo_ciclo_to_calendario(
     df_calendario: pd.DataFrame,
     df_ciclos: pd.DataFrame,
+    copy: bool = True,
 ) -> Tuple[bool, pd.DataFrame, str]:
     """
     Populate df_calendario.tipo_ciclo and workload_template from CORE_PRO_EMP_HORARIO_DET
@@ -3698,14 +3625,9 @@ def add_tipo_ciclo_to_calendario(
     workload_template is per employee-day ('1'–'7' or 'A'; NaN otherwise), pre-normalised in
     treat_df_ciclos_completos — replaces legacy seed_5_6 from df_colaborador. 'A' means the
     algorithm decides the weekly working-day count from demand.
-    """
-    def _db_tipo_ciclo_to_bool(raw) -> bool:
-        if isinstance(raw, (bool, np.bool_)):
-            return bool(raw)
-        if raw is None or (isinstance(raw, float) and pd.isna(raw)):
-            return False
-        return str(raw).strip().upper() == 'S'
 
+    With copy=False the caller hands df_calendario over and it is updated in place.
+    """
     try:
         if df_calendario.empty:
             return False, pd.DataFrame(), "df_calendario is empty"
@@ -3715,7 +3637,7 @@ def add_tipo_ciclo_to_calendario(
         if missing:
             return False, pd.DataFrame(), f"df_calendario missing required columns: {missing}"
 
-        df_result = df_calendario.copy()
+        df_result = df_calendario.copy() if copy else df_calendario
         if 'tipo_ciclo' not in df_result.columns:
             df_result['tipo_ciclo'] = False
         df_result['tipo_ciclo'] = df_result['tipo_ciclo'].astype(bool)
@@ -3727,23 +3649,15 @@ def add_tipo_ciclo_to_calendario(
             )
             return True, df_result, ""
 
-        df_result['employee_id'] = df_result['employee_id'].astype(str)
-        df_result['schedule_day_dt'] = pd.to_datetime(df_result['schedule_day']).dt.normalize()
-        idx = pd.MultiIndex.from_arrays([df_result['employee_id'], df_result['schedule_day_dt']])
-
-        if 'tipo_ciclo' in df_ciclos.columns:
-            ciclos = df_ciclos[['employee_id', 'schedule_day', 'tipo_ciclo']].copy()
-            ciclos['employee_id'] = ciclos['employee_id'].astype(str)
-            ciclos['schedule_day'] = pd.to_datetime(ciclos['schedule_day']).dt.normalize()
-            ciclos['tipo_ciclo'] = ciclos['tipo_ciclo'].apply(_db_tipo_ciclo_to_bool)
-            ciclos = ciclos.drop_duplicates(subset=['employee_id', 'schedule_day'], keep='first')
-            tipo_ciclo_lookup = ciclos.set_index(['employee_id', 'schedule_day'])['tipo_ciclo']
-            mapped_values = tipo_ciclo_lookup.reindex(idx).values
-            has_match = pd.notna(mapped_values)
-            df_result.loc[has_match, 'tipo_ciclo'] = mapped_values[has_match].astype(bool)
+        store = CalendarStore.from_frame(df_result, copy=False)
+        matched_count, template_count = store.apply_tipo_ciclo(df_ciclos)
+        store.set_key_formats()
+        df_result = store.to_frame()
+
+        if matched_count is not None:
             n_true = int(df_result['tipo_ciclo'].sum())
             logger.info(
-                f"add_tipo_ciclo_to_calendario: {has_match.sum()} / {len(df_result)} rows matched; "
+                f"add_tipo_ciclo_to_calendario: {matched_count} / {len(df_result)} rows matched; "
                 f"{n_true} rows with tipo_ciclo=True"
             )
         else:
@@ -3752,20 +3666,12 @@ def add_tipo_ciclo_to_calendario(
                 "leaving default False on all calendar rows"
             )
 
-        if 'workload_template' in df_ciclos.columns:
-            wt_ciclos = df_ciclos[['employee_id', 'schedule_day', 'workload_template']].copy()
-            wt_ciclos['employee_id'] = wt_ciclos['employee_id'].astype(str)
-            wt_ciclos['schedule_day'] = pd.to_datetime(wt_ciclos['schedule_day']).dt.normalize()
-            wt_ciclos = wt_ciclos.drop_duplicates(subset=['employee_id', 'schedule_day'], keep='first')
-            wt_lookup = wt_ciclos.set_index(['employee_id', 'schedule_day'])['workload_template']
-            df_result['workload_template'] = wt_lookup.reindex(idx).values
-            n_valid = int(df_result['workload_template'].notna().sum())
+        if template_count is not None:
             logger.info(
                 f"add_tipo_ciclo_to_calendario: workload_template merged — "
-                f"{n_valid}/{len(df_result)} rows with value 1–7 or A"
+                f"{template_count}/{len(df_result)} rows with value 1–7 or A"
             )
 
-        df_result = df_result.drop(columns=['schedule_day_dt'], errors='ignore')
         return True, df_result, ""
 
     except Exception as e:
@@ -5196,7 +5102,7 @@ def apply_annual_dayoff_feasibility_cap(
         return False, pd.DataFrame(), [], str(e)
 
 
-def add_calendario_passado(df_calendario: pd.DataFrame, df_calendario_passado: pd.DataFrame, use_case: int = 1) -> Tuple[bool, pd.DataFrame, str]:
+def add_calendario_passado(df_calendario: pd.DataFrame, df_calendario_passado: pd.DataFrame, use_case: int = 1, copy: bool = True) -> Tuple[bool, pd.DataFrame, str]:
     """
     Populate calendar schedule gaps using historical shift data.
     
@@ -5226,6 +5132,7 @@ def add_calendario_passado(df_calendario: pd.DataFrame, df_calendario_passado: p
         df_calendario: Current calendar DataFrame with schedule data
         df_calendario_passado: Historical calendar DataFrame with past schedules
         use_case: Processing mode (0=disabled, 1=fill gaps)
+        copy: False fills the historical horario values into df_calendario itself instead of a copy
         
     Returns:
         Tuple containing:
@@ -5271,56 +5178,18 @@ def add_calendario_passado(df_calendario: pd.DataFrame, df_calendario_passado: p
                 if col not in df_calendario_passado.columns:
                     return False, pd.DataFrame(), f"Missing required column '{col}' in df_calendario_passado"
             
-            df_result = df_calendario.copy()
-            
-            # Ensure employee_id types match (convert to string for consistent matching)
-            df_result['employee_id'] = df_result['employee_id'].astype(str)
-            df_calendario_passado_temp = df_calendario_passado.copy()
-            df_calendario_passado_temp['employee_id'] = df_calendario_passado_temp['employee_id'].astype(str)
-            
-            # Ensure schedule_day is string format in both
-            if df_result['schedule_day'].dtype != 'object':
-                df_result['schedule_day'] = pd.to_datetime(df_result['schedule_day']).dt.strftime('%Y-%m-%d')
-            if df_calendario_passado_temp['schedule_day'].dtype != 'object':
-                df_calendario_passado_temp['schedule_day'] = pd.to_datetime(df_calendario_passado_temp['schedule_day']).dt.strftime('%Y-%m-%d')
-            
-            # Create lookup Series from df_calendario_passado using MultiIndex
-            passado_lookup = df_calendario_passado_temp.set_index(['employee_id', 'schedule_day'])['horario']
-            
-            # Create MultiIndex for df_result to enable vectorized lookup
-            result_index = df_result.set_index(['employee_id', 'schedule_day']).index
-            
-            # Vectorized lookup: map passado values to result positions
-            mapped_values = result_index.map(passado_lookup)
-            matches_found = mapped_values.notna().sum()
-            logger.info(f"Found {matches_found} matches from df_calendario_passado")
-            
-            # Create mask for valid values from passado (not empty/null)
-            # Note: Allow '-' values (from type='N' conversion) to override default '0' values
-            valid_passado_mask = mapped_values.notna() & (mapped_values != '')
-            
-            # Create mask to preserve F's (closed holidays) and V's (vacations)
-            preserve_f_mask = df_result['horario'] == 'F'
-            preserve_v_mask = df_result['horario'] == 'V'
-            preserve_mask = preserve_f_mask | preserve_v_mask
-            
-            # Combine masks: override everything except F's and V's where passado has valid data
-            fill_mask = valid_passado_mask & ~preserve_mask
-            
-            # Vectorized assignment
-            df_result.loc[fill_mask, 'horario'] = mapped_values[fill_mask]
-            df_result.loc[fill_mask, 'fixed'] = True
-            
-            filled_count = fill_mask.sum()
-            
-            # Log NL value statistics
-            nl_values_from_passado = (mapped_values == 'NL').sum() if mapped_values is not None else 0
-            nl_values_in_result = (df_result['horario'] == 'NL').sum()
-            horario_counts_after = df_result['horario'].value_counts()
-            
-            logger.info(f"Overridden {filled_count} horario values from df_calendario_passado (preserved {preserve_mask.sum()} F/V values)")
-            logger.info(f"add_calendario_passado: NL values from passado lookup: {nl_values_from_passado}, NL values in result after merge: {nl_values_in_result}")
-            logger.info(f"add_calendario_passado: horario value counts after merge: {horario_counts_after.to_dict()}")
+            # Override everything except F's (closed holidays) and V's (vacations) where passado
+            # has a valid value; '-' (from type='N' conversion) may override default '0' values
+            store = CalendarStore.from_frame(df_calendario, copy=copy)
+            counts = store.apply_calendario_passado(df_calendario_passado)
+            store.set_key_formats(schedule_day='str')
+            df_result = store.to_frame()
+            filled_count = counts['filled']
+            logger.info(f"Found {counts['matches']} matches from df_calendario_passado")
+
+            logger.info(f"Overridden {filled_count} horario values from df_calendario_passado (preserved {counts['preserved']} F/V values)")
+            logger.info(f"add_calendario_passado: NL values from passado lookup: {counts['NL']}, NL values in result after merge: {int(store.horario_is(('NL',)).sum())}")
+            logger.info(f"add_calendario_passado: horario value counts after merge: {store.horario_counts()}")
             
             # OUTPUT VALIDATION
             if df_result.empty:
@@ -5336,7 +5205,7 @@ def add_calendario_passado(df_calendario: pd.DataFrame, df_calendario_passado: p
         logger.error(f"Error in add_calendario_passado: {str(e)}", exc_info=True)
         return False, pd.DataFrame(), f"Error processing calendario data: {str(e)}"
 
-def add_ausencias_ferias(df_calendario: pd.DataFrame, df_ausencias_ferias: pd.DataFrame, use_case: int = 1) -> Tuple[bool, pd.DataFrame, str]:
+def add_ausencias_ferias(df_calendario: pd.DataFrame, df_ausencias_ferias: pd.DataFrame, use_case: int = 1, copy: bool = True) -> Tuple[bool, pd.DataFrame, str]:
     """
     Integrate employee absence and vacation records into calendar schedules.
     
@@ -5370,6 +5239,7 @@ def add_ausencias_ferias(df_calendario: pd.DataFrame, df_ausencias_ferias: pd.Da
         df_calendario: Calendar DataFrame with employee schedules
         df_ausencias_ferias: Absence/vacation DataFrame with tipo_ausencia codes
         use_case: Processing mode (0=disabled, 1=integrate absences)
+        copy: False writes the absence codes into df_calendario itself instead of a copy
         
     Returns:
         Tuple containing:
@@ -5404,40 +5274,13 @@ def add_ausencias_ferias(df_calendario: pd.DataFrame, df_ausencias_ferias: pd.Da
                 logger.info("df_ausencias_ferias is empty, returning original df_calendario")
                 return True, df_calendario, ""
             
-            df_result = df_calendario.copy()
-            
-            # Create lookup Series from df_ausencias_ferias using MultiIndex
-            employee_col = 'employee_id' if 'employee_id' in df_ausencias_ferias.columns else 'fk_colaborador'
-            
-            # Create a temporary mapping column in ausencias to match with schedule_day
-            df_ausencias_temp = df_ausencias_ferias.copy()
-            df_ausencias_temp[employee_col] = df_ausencias_temp[employee_col].astype(str)
-            df_ausencias_temp['_schedule_day_lookup'] = pd.to_datetime(df_ausencias_temp['data']).dt.strftime('%Y-%m-%d')
-            
-            ausencias_lookup = df_ausencias_temp.set_index([employee_col, '_schedule_day_lookup'])['tipo_ausencia']
-            
-            # Create MultiIndex for df_result to enable vectorized lookup
-            result_employee_col = 'employee_id' if 'employee_id' in df_result.columns else 'fk_colaborador'
-            cal_employee = df_result[result_employee_col].astype(str)
-            cal_schedule = pd.to_datetime(df_result['schedule_day']).dt.strftime('%Y-%m-%d')
-            result_index = pd.MultiIndex.from_arrays([cal_employee, cal_schedule])
-            
-            # Vectorized lookup: map ausencias values to result positions
-            mapped_values = result_index.map(ausencias_lookup)
-            matches_found = mapped_values.notna().sum()
+            # OVERRIDE LOGIC: Absences override shift assignments (except F=closed holidays),
+            # only with valid codes (not empty/null/'-')
+            employee_col = 'employee_id' if 'employee_id' in df_calendario.columns else 'fk_colaborador'
+            store = CalendarStore.from_frame(df_calendario, copy=copy, employee_col=employee_col)
+            matches_found, filled_count = store.apply_ausencias_ferias(df_ausencias_ferias)
+            df_result = store.to_frame()
             logger.info(f"Found {matches_found} matches from df_ausencias_ferias")
-            
-            # Create mask for valid values from ausencias (not empty/null)
-            valid_ausencias_mask = mapped_values.notna() & (mapped_values != '') & (mapped_values != '-')
-            
-            # OVERRIDE LOGIC: Absences should override shift assignments (except F=closed holidays)
-            preserve_f_mask = df_result['horario'] == 'F'
-            fill_mask = valid_ausencias_mask & ~preserve_f_mask
-            
-            # Vectorized assignment
-            df_result.loc[fill_mask, 'horario'] = mapped_values[fill_mask]
-            
-            filled_count = fill_mask.sum()
             logger.info(f"Filled {filled_count} empty horario values from df_ausencias_ferias")
             
             return True, df_result, f"Successfully filled {filled_count} horario values from ausencias data"
@@ -5452,7 +5295,7 @@ def add_ausencias_ferias(df_calendario: pd.DataFrame, df_ausencias_ferias: pd.Da
         return False, pd.DataFrame(), error_msg
 
 
-def add_folgas_ciclos(df_calendario: pd.DataFrame, df_core_pro_emp_horario_det: pd.DataFrame, use_case: int = 1) -> Tuple[bool, pd.DataFrame, str]:
+def add_folgas_ciclos(df_calendario: pd.DataFrame, df_core_pro_emp_horario_det: pd.DataFrame, use_case: int = 1, copy: bool = True) -> Tuple[bool, pd.DataFrame, str]:
     """
     Apply fixed day-off cycles to calendar schedules (override mode).
     
@@ -5501,6 +5344,7 @@ def add_folgas_ciclos(df_calendario: pd.DataFrame, df_core_pro_emp_horario_det:
         df_calendario: Calendar DataFrame with employee schedules
         df_core_pro_emp_horario_det: Cycle details with tipo_dia markers
         use_case: Processing mode (0=disabled, 1=apply overrides)
+        copy: False applies the day-off overrides to df_calendario itself instead of a copy
         
     Returns:
         Tuple containing:
@@ -5535,68 +5379,25 @@ def add_folgas_ciclos(df_calendario: pd.DataFrame, df_core_pro_emp_horario_det:
                 logger.info("df_core_pro_emp_horario_det is empty, returning original df_calendario")
                 return True, df_calendario, ""
             
-            df_result = df_calendario.copy()
-            
             # Filter for both day-offs (tipo_dia = 'L' after treatment) and no-work days (tipo_dia = '-' after treatment)
             # Note: treat_df_folgas_ciclos converts 'F' -> 'L' and 'S' -> '-'
             df_dayoffs = df_core_pro_emp_horario_det[
                 df_core_pro_emp_horario_det['tipo_dia'].isin(['L', '-'])
-            ].copy()
+            ]
             
             if df_dayoffs.empty:
                 logger.info("No day-off or no-work records found, returning original df_calendario")
-                return True, df_result, ""
-            
-            # Ensure employee_id types match (convert to string for consistent matching)
-            df_result['employee_id'] = df_result['employee_id'].astype(str)
-            df_dayoffs['employee_id'] = df_dayoffs['employee_id'].astype(str)
-            
-            # Ensure schedule_day is in string format for matching
-            if df_result['schedule_day'].dtype != 'object':
-                df_result['schedule_day'] = pd.to_datetime(df_result['schedule_day']).dt.strftime('%Y-%m-%d')
-            if df_dayoffs['schedule_day'].dtype != 'object':
-                df_dayoffs['schedule_day'] = pd.to_datetime(df_dayoffs['schedule_day']).dt.strftime('%Y-%m-%d')
-            
-            # Create lookup Series from day-offs using MultiIndex
-            dayoffs_lookup = df_dayoffs.set_index(['employee_id', 'schedule_day'])['tipo_dia']
-            
-            # Create MultiIndex for df_result to enable vectorized lookup
-            result_index = df_result.set_index(['employee_id', 'schedule_day']).index
+                return True, df_calendario.copy(), ""
             
-            # Vectorized lookup: map day-off values to result positions
-            mapped_values = result_index.map(dayoffs_lookup)
-            
-            # Create mask to preserve F's (closed holidays) - do not override closed holidays
-            preserve_f_mask = df_result['horario'] == 'F'
-            
-            # Create mask for A's and V's - these should only be modified by '-' (becoming A- or V-)
-            preserve_av_mask = df_result['horario'].isin(['A', 'V'])
-            
-            # Process 'L' values (day-offs): override with 'L', but preserve F's, A's and V's
-            dayoff_l_mask = (mapped_values == 'L') & ~preserve_f_mask & ~preserve_av_mask
-            if dayoff_l_mask.any():
-                df_result.loc[dayoff_l_mask, 'horario'] = 'L'
-            
-            # Process '-' values (no-work days): check if current horario is 'A' or 'V'
-            # If inserting '-' and current is 'A' -> 'A-', if current is 'V' -> 'V-', otherwise '-'
-            # Note: F's should never be overridden, even by '-'
-            dash_mask = (mapped_values == '-') & ~preserve_f_mask
-            if dash_mask.any():
-                # Get current horario values for rows where we're inserting '-'
-                current_horario = df_result.loc[dash_mask, 'horario']
-                
-                # Vectorized conditional assignment: A -> A-, V -> V-, otherwise -
-                df_result.loc[dash_mask, 'horario'] = np.where(
-                    current_horario == 'A',
-                    'A-',
-                    np.where(current_horario == 'V', 'V-', '-')
-                )
+            # 'L' overrides except F's, A's and V's; '-' overrides except F's and turns A/V into A-/V-
+            store = CalendarStore.from_frame(df_calendario, copy=copy)
+            counts = store.apply_folgas_ciclos(df_dayoffs)
+            store.set_key_formats(schedule_day='str')
+            df_result = store.to_frame()
             
             # Count overrides
-            filled_count = dayoff_l_mask.sum() + dash_mask.sum()
-            preserved_f_count = ((mapped_values == 'L') & preserve_f_mask).sum() + ((mapped_values == '-') & preserve_f_mask).sum()
-            preserved_av_count = ((mapped_values == 'L') & preserve_av_mask).sum()
-            logger.info(f"Applied {filled_count} day-off/no-work overrides from df_core_pro_emp_horario_det ({dayoff_l_mask.sum()} L, {dash_mask.sum()} -) (preserved {preserved_f_count} F values, {preserved_av_count} A/V values)")
+            filled_count = counts['L'] + counts['-']
+            logger.info(f"Applied {filled_count} day-off/no-work overrides from df_core_pro_emp_horario_det ({counts['L']} L, {counts['-']} -) (preserved {counts['preserved_f']} F values, {counts['preserved_av']} A/V values)")
             
             return True, df_result, f"Successfully applied {filled_count} day-off overrides"
         else:
@@ -5609,7 +5410,7 @@ def add_folgas_ciclos(df_calendario: pd.DataFrame, df_core_pro_emp_horario_det:
         logger.error(error_msg, exc_info=True)
         return False, pd.DataFrame(), error_msg
 
-def add_ciclos_completos(df_calendario: pd.DataFrame, df_ciclos_completos: pd.DataFrame, use_case: int = 1) -> Tuple[bool, pd.DataFrame, str]:
+def add_ciclos_completos(df_calendario: pd.DataFrame, df_ciclos_completos: pd.DataFrame, use_case: int = 1, copy: bool = True) -> Tuple[bool, pd.DataFrame, str]:
     """
     Integrate complete 90-day rotation cycle schedules into calendar.
     
@@ -5652,6 +5453,7 @@ def add_ciclos_completos(df_calendario: pd.DataFrame, df_ciclos_completos: pd.Da
         df_calendario: Calendar DataFrame with employee schedules
         df_ciclos_completos: Complete cycle DataFrame with 90-day schedules
         use_case: Processing mode (0=disabled, 1=fill with cycles)
+        copy: False writes the cycle codes into df_calendario itself instead of a copy
         
     Returns:
         Tuple containing:
@@ -5685,128 +5487,31 @@ def add_ciclos_completos(df_calendario: pd.DataFrame, df_ciclos_completos: pd.Da
                 logger.info("df_ciclos_completos is empty, returning original df_calendario")
                 return True, df_calendario, ""
             
-            df_result = df_calendario.copy()
-            
-            # Ensure schedule_day is in string format for matching
-            df_ciclos_mapped = df_ciclos_completos.copy()
-            
-            # Ensure employee_id types match (convert to string for consistent matching)
-            df_result['employee_id'] = df_result['employee_id'].astype(str)
-            df_ciclos_mapped['employee_id'] = df_ciclos_mapped['employee_id'].astype(str)
-            
-            if df_result['schedule_day'].dtype != 'object':
-                df_result['schedule_day'] = pd.to_datetime(df_result['schedule_day']).dt.strftime('%Y-%m-%d')
-            if df_ciclos_mapped['schedule_day'].dtype != 'object':
-                df_ciclos_mapped['schedule_day'] = pd.to_datetime(df_ciclos_mapped['schedule_day']).dt.strftime('%Y-%m-%d')
-            
             # Use horario (from convert_ciclos_to_horario) if available, then codigo_trads, otherwise horario_ind as fallback
-            if 'horario' in df_ciclos_mapped.columns:
+            if 'horario' in df_ciclos_completos.columns:
                 horario_col = 'horario'
-            elif 'codigo_trads' in df_ciclos_mapped.columns:
+            elif 'codigo_trads' in df_ciclos_completos.columns:
                 horario_col = 'codigo_trads'
             else:
                 horario_col = 'horario_ind'
             
-            # Create lookup Series from df_ciclos_90 using MultiIndex
-            ciclos_lookup = df_ciclos_mapped.set_index(['employee_id', 'schedule_day'])[horario_col]
-            
-            # Create MultiIndex for df_result to enable vectorized lookup
-            result_index = df_result.set_index(['employee_id', 'schedule_day']).index
-            
-            # Vectorized lookup: map ciclos values to result positions
-            mapped_values = result_index.map(ciclos_lookup)
-            matches_found = mapped_values.notna().sum()
-            logger.info(f"Found {matches_found} matches from df_ciclos_completos")
-            
-            # Create mask for valid values from ciclos (not empty/null)
-            # Note: Allow '-' values (skip days from tipo_dia='S') to override default '0' values
-            valid_ciclos_mask = mapped_values.notna() & (mapped_values != '')
-            
-            # Create mask to preserve F's (closed holidays) - F's should never be overridden
-            preserve_f_mask = df_result['horario'] == 'F'
-            
-            # Create mask for A's and V's - these should only be modified by '-' (becoming A- or V-)
-            preserve_av_mask = df_result['horario'].isin(['A', 'V'])
-            
-            # Special handling for '-' values: check if current horario is 'A' or 'V'
-            # If inserting '-' and current is 'A' -> 'A-', if current is 'V' -> 'V-', otherwise '-'
-            # Note: F's should never be overridden, even by '-'
-            dash_mask = valid_ciclos_mask & ~preserve_f_mask & (mapped_values == '-')
-            if dash_mask.any():
-                # Get current horario values for rows where we're inserting '-'
-                current_horario = df_result.loc[dash_mask, 'horario']
-                
-                # Vectorized conditional assignment: A -> A-, V -> V-, otherwise -
-                df_result.loc[dash_mask, 'horario'] = np.where(
-                    current_horario == 'A',
-                    'A-',
-                    np.where(current_horario == 'V', 'V-', '-')
-                )
-            
-            # Process 'L' values: L can override A's and V's (but not F's)
-            l_mask = valid_ciclos_mask & ~preserve_f_mask & (mapped_values == 'L')
-            if l_mask.any():
-                df_result.loc[l_mask, 'horario'] = 'L'
-
-            # M/T/MoT/NLM/NLT: assign per tipo_turno row (same rules as add_shift_info_from_ciclos)
-            shift_code_mask = (
-                valid_ciclos_mask & ~preserve_f_mask & ~preserve_av_mask
-                & mapped_values.isin(['M', 'T', 'MoT', 'NLM', 'NLT'])
-            )
-            if shift_code_mask.any():
-                mot_rows = shift_code_mask & (mapped_values == 'MoT')
-                if mot_rows.any():
-                    df_result.loc[mot_rows, 'horario'] = 'MoT'
-
-                m_rows = shift_code_mask & (mapped_values == 'M')
-                if m_rows.any():
-                    df_result.loc[m_rows & (df_result['tipo_turno'] == 'M'), 'horario'] = 'M'
-                    df_result.loc[m_rows & (df_result['tipo_turno'] == 'T'), 'horario'] = '0'
-
-                t_rows = shift_code_mask & (mapped_values == 'T')
-                if t_rows.any():
-                    df_result.loc[t_rows & (df_result['tipo_turno'] == 'T'), 'horario'] = 'T'
-                    df_result.loc[t_rows & (df_result['tipo_turno'] == 'M'), 'horario'] = '0'
-
-                nlm_rows = shift_code_mask & (mapped_values == 'NLM')
-                if nlm_rows.any():
-                    df_result.loc[nlm_rows & (df_result['tipo_turno'] == 'M'), 'horario'] = 'NLM'
-                    df_result.loc[nlm_rows & (df_result['tipo_turno'] == 'T'), 'horario'] = '0'
-
-                nlt_rows = shift_code_mask & (mapped_values == 'NLT')
-                if nlt_rows.any():
-                    df_result.loc[nlt_rows & (df_result['tipo_turno'] == 'T'), 'horario'] = 'NLT'
-                    df_result.loc[nlt_rows & (df_result['tipo_turno'] == 'M'), 'horario'] = '0'
-
-            # Other codes (P, NL, LD, …): same value on both tipo_turno rows
-            other_mask = (
-                valid_ciclos_mask & ~preserve_f_mask & ~preserve_av_mask
-                & (mapped_values != '-') & (mapped_values != 'L')
-                & ~mapped_values.isin(['M', 'T', 'MoT', 'NLM', 'NLT'])
-            )
-            if other_mask.any():
-                df_result.loc[other_mask, 'horario'] = mapped_values[other_mask]
-
-            # Calculate fill_mask for logging purposes (combines dash, L, and other updates)
-            fill_mask = dash_mask | l_mask | shift_code_mask | other_mask
-            
-            filled_count = fill_mask.sum()
+            # F's are never overridden; A's/V's only by '-' (A-/V-) and 'L'; M/T/NLM/NLT follow
+            # tipo_turno (same rules as add_shift_info_from_ciclos)
+            store = CalendarStore.from_frame(df_calendario, copy=copy)
+            counts = store.apply_ciclos_completos(df_ciclos_completos, horario_col)
+            store.set_key_formats(schedule_day='str')
+            df_result = store.to_frame()
+            logger.info(f"Found {counts['matches']} matches from df_ciclos_completos")
             
-            # Log NL value statistics
-            nl_values_from_ciclos = (mapped_values == 'NL').sum() if mapped_values is not None else 0
-            nl_values_in_result = (df_result['horario'] == 'NL').sum()
-            horario_counts_after = df_result['horario'].value_counts()
-            
-            # Count A/V values that were preserved (not overridden by regular shift codes, but may have been overridden by L or -)
-            preserved_av_from_shifts = (preserve_av_mask & valid_ciclos_mask & (mapped_values != '-') & (mapped_values != 'L')).sum()
-            logger.info(f"Overridden {filled_count} horario values from df_ciclos_completos ({dash_mask.sum()} -, {l_mask.sum()} L, {shift_code_mask.sum()} M/T/MoT/NLM/NLT, {other_mask.sum()} other) (preserved {preserve_f_mask.sum()} F values, {preserved_av_from_shifts} A/V from shift codes)")
+            filled_count = counts['-'] + counts['L'] + counts['shift'] + counts['other']
+            logger.info(f"Overridden {filled_count} horario values from df_ciclos_completos ({counts['-']} -, {counts['L']} L, {counts['shift']} M/T/MoT/NLM/NLT, {counts['other']} other) (preserved {int(store.horario_is(('F',)).sum())} F values, {counts['preserved_av']} A/V from shift codes)")
             logger.info(
-                f"add_ciclos_completos: forced-work from ciclos lookup NL={nl_values_from_ciclos}, "
-                f"NLM={(mapped_values == 'NLM').sum()}, NLT={(mapped_values == 'NLT').sum()}; "
-                f"result NL={nl_values_in_result}, NLM={(df_result['horario'] == 'NLM').sum()}, "
-                f"NLT={(df_result['horario'] == 'NLT').sum()}"
+                f"add_ciclos_completos: forced-work from ciclos lookup NL={counts['NL']}, "
+                f"NLM={counts['NLM']}, NLT={counts['NLT']}; "
+                f"result NL={int(store.horario_is(('NL',)).sum())}, NLM={int(store.horario_is(('NLM',)).sum())}, "
+                f"NLT={int(store.horario_is(('NLT',)).sum())}"
             )
-            logger.info(f"add_ciclos_completos: horario value counts after merge: {horario_counts_after.to_dict()}")
+            logger.info(f"add_ciclos_completos: horario value counts after merge: {store.horario_counts()}")
             
             return True, df_result, f"Successfully filled {filled_count} horario values from completos cycles"
         else:
@@ -6913,12 +6618,36 @@ def adjust_horario_for_admission_date(df_calendario: pd.DataFrame, df_colaborado
         return False, pd.DataFrame(), error_msg
 
 
+def count_allocated_employees(df_eci_section_results: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Count distinct working employees per day of the ECI sibling section schedule.
+
+    F (Folga/rest) and N (not scheduled) are days off; every other type is a working day.
+
+    Args:
+        df_eci_section_results: Sibling section schedule (columns employee_id, schedule_day, type)
+
+    Returns:
+        pd.DataFrame: schedule_day (datetime.date), allocated_employees_count; empty when there are no results
+    """
+    if df_eci_section_results is None or df_eci_section_results.empty:
+        return pd.DataFrame(columns=['schedule_day', 'allocated_employees_count'])
+    working = df_eci_section_results[
+        ~df_eci_section_results['type'].str.upper().isin(['F', 'N'])
+    ]
+    schedule_day = pd.to_datetime(working['schedule_day']).dt.date
+    counts = working['employee_id'].groupby(schedule_day).nunique().reset_index()
+    counts.columns = ['schedule_day', 'allocated_employees_count']
+    return counts
+
+
 def calculate_and_merge_allocated_employees(
     df_estimativas: pd.DataFrame, 
     df_eci_section_results: pd.DataFrame,
     date_col_est: str = 'schedule_day', 
     shift_col_est: str = 'turno', 
-    param_pess_obj: float = 0.5
+    param_pess_obj: float = 0.5,
+    eci_allocated_counts: Optional[pd.DataFrame] = None
 ) -> Tuple[bool, pd.DataFrame, str]:
     """
     Calculate staffing objective and merge with ECI sibling section allocated employees.
@@ -6942,6 +6671,8 @@ def calculate_and_merge_allocated_employees(
         date_col_est: Date column in estimativas (default: 'schedule_day')
         shift_col_est: Shift column in estimativas (default: 'turno')
         param_pess_obj: Volatility threshold for staffing objective (default: 0.5)
+        eci_allocated_counts: Per-day counts already computed from df_eci_section_results
+            (count_allocated_employees, computed once in load_process_data); computed here when None
         
     Returns:
         Tuple[bool, pd.DataFrame, str]: (success, estimativas with pess_obj/allocated_employees_count/diff, error)
@@ -6998,20 +6729,10 @@ def calculate_and_merge_allocated_employees(
         if df_eci_section_results is not None and not df_eci_section_results.empty:
             logger.info(f"Processing ECI sibling section results: {df_eci_section_results.shape[0]} rows")
             
-            df_eci_work = df_eci_section_results.copy()
-            
-            # Filter out day-off entries: F (Folga/rest) and N (not scheduled)
-            # Remaining entries are working days (T=Trabajo, R=closed holiday worked, etc.)
-            df_eci_work = df_eci_work[
-                ~df_eci_work['type'].str.upper().isin(['F', 'N'])
-            ].copy()
-            
-            # Convert schedule_day to date for consistent merge
-            df_eci_work['schedule_day'] = pd.to_datetime(df_eci_work['schedule_day']).dt.date
-            
-            # Group by schedule_day and count distinct working employees
-            eci_counts = df_eci_work.groupby('schedule_day')['employee_id'].nunique().reset_index()
-            eci_counts.columns = ['schedule_day', 'allocated_employees_count']
+            # Working days only (F and N are days off), distinct employees per day
+            eci_counts = eci_allocated_counts
+            if eci_counts is None:
+                eci_counts = count_allocated_employees(df_eci_section_results)
             
             logger.info(f"ECI sibling section: found working employees on {len(eci_counts)} distinct days")
             
@@ -8783,6 +8504,50 @@ def build_compensatory_output(
         return False, pd.DataFrame(), str(e)
 
 
+def _rest_day_type_lookups(rules: Optional[pd.DataFrame], drop_missing_types: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (by_day, by_employee) rest-day type lookups of apply_compensatory_sched_types.
+
+    by_day is keyed by (employee_id, rule_code, schedule_day), by_employee by
+    (employee_id, rule_code) and takes the first row of each key. Both carry
+    rest_day_type, rest_day_subtype and a _found marker, so that a matched row with
+    null types still counts as found. Empty frames when rules lacks the columns.
+    """
+    key_day = ['employee_id', 'rule_code', 'schedule_day']
+    value_cols = ['rest_day_type', 'rest_day_subtype', '_found']
+    by_day = pd.DataFrame({
+        'employee_id': pd.Series(dtype='int64'),
+        'rule_code': pd.Series(dtype=object),
+        'schedule_day': pd.Series(dtype='datetime64[ns]'),
+        **{column: pd.Series(dtype=object) for column in value_cols},
+    })
+    by_employee = by_day.drop(columns=['schedule_day'])
+    if rules is None or rules.empty:
+        return by_day, by_employee
+
+    rules = rules.copy()
+    rules.columns = [str(col).strip().lower() for col in rules.columns]
+    if not {'employee_id', 'rule_code', 'rest_day_type', 'rest_day_subtype'}.issubset(rules.columns):
+        return by_day, by_employee
+    if drop_missing_types:
+        rules = rules.dropna(subset=['rest_day_type', 'rest_day_subtype'])
+
+    rules['employee_id'] = pd.to_numeric(rules['employee_id'], errors='coerce')
+    rules = rules.dropna(subset=['employee_id'])
+    rules['employee_id'] = rules['employee_id'].astype('int64')
+    rules['_found'] = True
+    dedupe_cols = ['employee_id', 'rule_code']
+    if 'schedule_day' in rules.columns:
+        rules['schedule_day'] = pd.to_datetime(rules['schedule_day'], errors='coerce').dt.normalize()
+        dedupe_cols.append('schedule_day')
+    rules = rules.drop_duplicates(subset=dedupe_cols)
+
+    if 'schedule_day' in dedupe_cols:
+        by_day = rules.loc[rules['schedule_day'].notna(), key_day + value_cols]
+    by_employee = rules.drop_duplicates(subset=['employee_id', 'rule_code'])[key_day[:2] + value_cols]
+    return by_day.reset_index(drop=True), by_employee.reset_index(drop=True)
+
+
 def apply_compensatory_sched_types(
     final_df: pd.DataFrame,
     compensatory_dict: Dict,
@@ -8827,103 +8592,62 @@ def apply_compensatory_sched_types(
             'domingos': 'ld_sunday',
         }
 
-        # Day-level lookup: (employee_id, rule_code, day) -> (REST_DAY_TYPE, REST_DAY_SUBTYPE)
+        # Day-level lookup: (employee_id, rule_code, schedule_day) -> (rest_day_type, rest_day_subtype)
         # Employee-level fallback when day is missing from merged rules.
-        type_lookup_by_day = {}
-        type_lookup_employee = {}
-        if df_process_rules is not None and not df_process_rules.empty:
-            rules_normalized = df_process_rules.copy()
-            rules_normalized.columns = [str(col).strip().lower() for col in rules_normalized.columns]
-            if (
-                'employee_id' in rules_normalized.columns
-                and 'rule_code' in rules_normalized.columns
-                and 'rest_day_type' in rules_normalized.columns
-                and 'rest_day_subtype' in rules_normalized.columns
-            ):
-                rules_normalized['employee_id'] = pd.to_numeric(
-                    rules_normalized['employee_id'], errors='coerce'
-                )
-                dedupe_cols = ['employee_id', 'rule_code']
-                if 'schedule_day' in rules_normalized.columns:
-                    rules_normalized['schedule_day'] = pd.to_datetime(
-                        rules_normalized['schedule_day'], errors='coerce'
-                    ).dt.normalize()
-                    dedupe_cols.append('schedule_day')
-                for _, row in rules_normalized.drop_duplicates(subset=dedupe_cols).iterrows():
-                    emp_key = int(row['employee_id'])
-                    rule_code = row['rule_code']
-                    types = (row['rest_day_type'], row['rest_day_subtype'])
-                    if 'schedule_day' in dedupe_cols and pd.notna(row['schedule_day']):
-                        type_lookup_by_day[(emp_key, rule_code, row['schedule_day'])] = types
-                    if (emp_key, rule_code) not in type_lookup_employee:
-                        type_lookup_employee[(emp_key, rule_code)] = types
+        type_lookup_by_day, type_lookup_employee = _rest_day_type_lookups(df_process_rules)
 
         # If merged employee-day rules are empty, adapt equivalent info from pending
         # movements (already enriched with rule params) to preserve prior behavior.
-        if not type_lookup_by_day and not type_lookup_employee and df_pro_emp_mov is not None and not df_pro_emp_mov.empty:
-            mov_rules = df_pro_emp_mov.copy()
-            mov_rules.columns = [str(col).strip().lower() for col in mov_rules.columns]
-            if (
-                'employee_id' in mov_rules.columns
-                and 'rule_code' in mov_rules.columns
-                and 'rest_day_type' in mov_rules.columns
-                and 'rest_day_subtype' in mov_rules.columns
-            ):
-                mov_rules = mov_rules.dropna(subset=['rest_day_type', 'rest_day_subtype'])
-                mov_rules['employee_id'] = pd.to_numeric(mov_rules['employee_id'], errors='coerce')
-                dedupe_cols = ['employee_id', 'rule_code']
-                if 'schedule_day' in mov_rules.columns:
-                    mov_rules['schedule_day'] = pd.to_datetime(
-                        mov_rules['schedule_day'], errors='coerce'
-                    ).dt.normalize()
-                    dedupe_cols.append('schedule_day')
-                for _, row in mov_rules.drop_duplicates(subset=dedupe_cols).iterrows():
-                    emp_key = int(row['employee_id'])
-                    rule_code = row['rule_code']
-                    types = (row['rest_day_type'], row['rest_day_subtype'])
-                    if 'schedule_day' in dedupe_cols and pd.notna(row['schedule_day']):
-                        type_lookup_by_day[(emp_key, rule_code, row['schedule_day'])] = types
-                    if (emp_key, rule_code) not in type_lookup_employee:
-                        type_lookup_employee[(emp_key, rule_code)] = types
-
-        if not type_lookup_by_day and not type_lookup_employee:
+        if type_lookup_by_day.empty and type_lookup_employee.empty and df_pro_emp_mov is not None and not df_pro_emp_mov.empty:
+            type_lookup_by_day, type_lookup_employee = _rest_day_type_lookups(df_pro_emp_mov, drop_missing_types=True)
+
+        if type_lookup_by_day.empty and type_lookup_employee.empty:
             logger.warning("apply_compensatory_sched_types: no type lookup available - skipping")
             return final_df
 
-        # Build set of compensatory day-off targets: (employee_id, day_off_date) -> (REST_DAY_TYPE, REST_DAY_SUBTYPE)
-        overrides = {}
-        for worker_id, groups in compensatory_dict.items():
-            worker_int = int(worker_id)
-            for group_key, rule_code in rule_code_map.items():
-                group_data = groups.get(group_key, {})
+        # Compensatory day-off targets, in solver order: (employee_id, rule_code, schedule_day)
+        targets = pd.DataFrame(
+            [
+                (int(worker_id), rule_code, day_off)
+                for worker_id, groups in compensatory_dict.items()
+                for group_key, rule_code in rule_code_map.items()
+                for _, day_off in groups.get(group_key, {}).get('ld_given', [])
+                if day_off is not None
+            ],
+            columns=['employee_id', 'rule_code', 'schedule_day'],
+        )
+        targets['schedule_day'] = pd.to_datetime(targets['schedule_day']).dt.normalize()
 
-                for worked_day, day_off in group_data.get('ld_given', []):
-                    if day_off is not None:
-                        day_off_normalized = pd.Timestamp(day_off).normalize()
-                        rule_types = type_lookup_by_day.get((worker_int, rule_code, day_off_normalized))
-                        if not rule_types:
-                            rule_types = type_lookup_employee.get((worker_int, rule_code))
-                        if not rule_types:
-                            continue
-                        overrides[(worker_int, day_off_normalized)] = rule_types
-
-        if not overrides:
+        # Day-level types first, employee-level types where the day has no rule
+        targets = targets.merge(type_lookup_by_day, on=['employee_id', 'rule_code', 'schedule_day'], how='left')
+        targets = targets.merge(
+            type_lookup_employee, on=['employee_id', 'rule_code'], how='left', suffixes=('', '_employee')
+        )
+        from_employee = targets['_found'].isna()
+        for column in ('rest_day_type', 'rest_day_subtype', '_found'):
+            targets[column] = targets[column].where(~from_employee, targets[f'{column}_employee'])
+        # The last resolved target of an (employee, day) wins, as the dict assignment did
+        overrides = (
+            targets[targets['_found'].notna()]
+            .drop_duplicates(subset=['employee_id', 'schedule_day'], keep='last')
+            .set_index(['employee_id', 'schedule_day'])
+        )
+
+        if overrides.empty:
             logger.info("apply_compensatory_sched_types: no compensatory day-off rows to override")
             return final_df
 
-        # Apply overrides to final_df
+        # Apply overrides to final_df through a keyed lookup on (employee, day)
         df_result = final_df.copy()
         df_result[date_col] = pd.to_datetime(df_result[date_col]).dt.normalize()
         df_result[employee_col] = df_result[employee_col].astype(int)
 
-        override_count = 0
-        for idx, row in df_result.iterrows():
-            key = (row[employee_col], row[date_col])
-            if key in overrides:
-                rest_day_type, rest_day_subtype = overrides[key]
-                df_result.at[idx, 'sched_type'] = rest_day_type
-                df_result.at[idx, 'sched_subtype'] = rest_day_subtype
-                override_count += 1
+        positions = overrides.index.get_indexer(pd.MultiIndex.from_arrays([df_result[employee_col], df_result[date_col]]))
+        matched = positions >= 0
+        override_count = int(matched.sum())
+        if override_count:
+            df_result.loc[matched, 'sched_type'] = overrides['rest_day_type'].to_numpy()[positions[matched]]
+            df_result.loc[matched, 'sched_subtype'] = overrides['rest_day_subtype'].to_numpy()[positions[matched]]
 
         logger.info(f"apply_compensatory_sched_types: overrode {override_count} rows with rule-specific types")
         return df_result
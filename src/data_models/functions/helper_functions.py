@@ -11,6 +11,7 @@ from base_data_project.data_manager.managers import DBDataManager
 
 # Local stuff
 from src.configuration_manager.instance import get_config
+from src.data_models.functions.parameter_index import get_parameter_index
 
 # Get configuration singleton
 _config = get_config()
@@ -119,127 +120,14 @@ def get_param_for_posto(df, posto_id, unit_id, secao_id, params_names_list=None)
         logger.error(f"params_names_list is None or empty")
         return None
 
-    posto_id = str(posto_id)
-    secao_id = str(secao_id)
-    unit_id = str(unit_id)
-    # Filter by parameter names only initially
-    df_filtered = df[df['sys_p_name'].isin(params_names_list)].copy()
-    
-    #logger.info(f"DEBUG: Input parameters - posto_id: {posto_id}, secao_id: {secao_id}, unit_id: {unit_id}")
-    #logger.info(f"DEBUG: df_filtered initial (after param names filter):\n {df_filtered}")
-    
-    # Keep all potentially relevant rows based on hierarchy rules
-    # Build conditions that match the hierarchy patterns
-    
-    conditions = []
-    
-    # 1. Posto-specific: fk_tipo_posto = posto_id (most specific)
-    if posto_id is not None:
-        posto_condition = (df_filtered['fk_tipo_posto'] == posto_id)
-        conditions.append(posto_condition)
-        #logger.info(f"DEBUG: Added posto condition for posto_id={posto_id}")
-    
-    # 2. Section-specific: fk_tipo_posto is null AND fk_secao = secao_id
-    if secao_id is not None:
-        section_condition = (
-            (df_filtered['fk_tipo_posto'].isna()) & 
-            (df_filtered['fk_secao'] == secao_id)
-        )
-        conditions.append(section_condition)
-        #logger.info(f"DEBUG: Added section condition for secao_id={secao_id}")
-        
-        # Debug: check which rows match this condition
-        matching_section = df_filtered[section_condition]
-        #logger.info(f"DEBUG: Rows matching section condition:\n {matching_section}")
-    
-    # 3. Unit-specific: fk_tipo_posto is null AND fk_secao is null AND fk_unidade = unit_id
-    if unit_id is not None and str(unit_id).strip():
-        unit_condition = (
-            (df_filtered['fk_tipo_posto'].isna()) & 
-            (df_filtered['fk_secao'].isna()) & 
-            (df_filtered['fk_unidade'].astype(str) == str(unit_id).strip())
-        )
-        conditions.append(unit_condition)
-        #logger.info(f"DEBUG: Added unit condition for unit_id={unit_id}")
-    
-    # 4. Default: all main FKs are null (fallback)
-    default_condition = (
-        (df_filtered['fk_tipo_posto'].isna()) & 
-        (df_filtered['fk_secao'].isna()) & 
-        (df_filtered['fk_unidade'].isna()) &
-        (df_filtered['fk_grupo'].isna())
-    )
-    conditions.append(default_condition)
-    #logger.info(f"DEBUG: Added default condition")
-    
-    # Combine all conditions with OR
-    if conditions:
-        final_condition = conditions[0]
-        for condition in conditions[1:]:
-            final_condition = final_condition | condition
-        df_filtered = df_filtered[final_condition]
-    
-    # Remove duplicates
-    df_filtered = df_filtered.drop_duplicates()
-
-    #logger.info(f"DEBUG: df_filtered after hierarchy filtering in helpers.py:\n {df_filtered}")
-    
-    # Now apply hierarchy for each parameter
+    # Indexed once per params DataFrame, see ParameterIndex
+    index = get_parameter_index(df)
     params_dict = {}
-    
     for param_name in params_names_list:
-        param_rows = df_filtered[df_filtered['sys_p_name'] == param_name]
-        
-        # Priority 1: Exact posto_id match (most specific)
-        if posto_id is not None:
-            posto_specific = param_rows[param_rows['fk_tipo_posto'] == posto_id]
-            if not posto_specific.empty:
-                value = get_value_from_row(posto_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    #logger.info(f"DEBUG: Found posto-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 2: Section-specific (fk_tipo_posto is null, fk_secao matches)
-        if secao_id is not None:
-            section_specific = param_rows[
-                (param_rows['fk_tipo_posto'].isna()) & 
-                (param_rows['fk_secao'] == secao_id)
-            ]
-            if not section_specific.empty:
-                value = get_value_from_row(section_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    #logger.info(f"DEBUG: Found section-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 3: Unit-specific (fk_tipo_posto and fk_secao are null, fk_unidade matches)
-        if unit_id is not None and str(unit_id).strip():
-            unit_specific = param_rows[
-                (param_rows['fk_tipo_posto'].isna()) & 
-                (param_rows['fk_secao'].isna()) & 
-                (param_rows['fk_unidade'].astype(str) == str(unit_id).strip())
-            ]
-            if not unit_specific.empty:
-                value = get_value_from_row(unit_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    #logger.info(f"DEBUG: Found unit-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 4: Default (all FKs are null)
-        default_rows = param_rows[
-            (param_rows['fk_tipo_posto'].isna()) & 
-            (param_rows['fk_secao'].isna()) & 
-            (param_rows['fk_unidade'].isna()) &
-            (param_rows['fk_grupo'].isna())
-        ]
-        if not default_rows.empty:
-            value = get_value_from_row(default_rows.iloc[0])
-            if value is not None:
-                params_dict[param_name] = value
-                #logger.info(f"DEBUG: Found default param {param_name}:{value}")
-    
+        level, value = index.lookup(param_name, posto_id, unit_id, secao_id)
+        if level is not None:
+            params_dict[param_name] = value
+            logger.debug("Found %s-level param %s:%s (posto_id=%s)", level, param_name, value, posto_id)
     return params_dict
 
 def get_value_from_row(row):
@@ -836,38 +724,6 @@ def get_sunday_of_next_week(date_str: str) -> str:
         logger.error(f"Error in get_sunday_of_next_week: {str(e)}")
         return ''
 
-def create_employee_query_string(employee_id_list: List[str]) -> str:
-    """
-    Creates a string with the employee_ids for query substitution.
-    Args:
-        employee_id_list (List[str]): List of employee ids - could be fk_colaborador or matricula
-    Returns:
-        str: String with the employee ids for query substitution (e.g., "'123','456','789'")
-    Raises:
-        Exception: If an error occurs
-    """
-    try:
-        if len(employee_id_list) == 0:
-            logger.warning("Empty employee_id_list provided to create_employee_query_string")
-            return ''
-        
-        # Convert all IDs to strings and filter out empty values
-        employee_ids = [str(x).strip() for x in employee_id_list if x is not None and str(x).strip()]
-        
-        if not employee_ids:
-            logger.warning("No valid employee IDs after filtering")
-            return ''
-        
-        # Create comma-separated string with each ID wrapped in single quotes
-        employee_str = ','.join(f"'{x}'" for x in employee_ids)
-        
-        logger.info(f"Employee ids string for query created: {employee_str} ({len(employee_ids)} IDs)")
-        return employee_str
-    except Exception as e:
-        logger.error(f"Error creating employee query string: {str(e)}")
-        logger.exception("Exception details:")
-        return ''
-
 def count_holidays_in_period(start_date_str: str, end_date_str: str, df_feriados: pd.DataFrame, use_case: int) -> Tuple[int, int]:
     """
     Count open and closed holidays within a date range for scheduling calculations.
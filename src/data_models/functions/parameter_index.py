@@ -0,0 +1,128 @@
+"""
+Hierarchical parameter index behind get_param_for_posto.
+
+params_df holds one row per (sys_p_name, level): posto (fk_tipo_posto), section
+(fk_secao), unit (fk_unidade) or default (all FKs null). get_param_for_posto used
+to filter the whole frame by name, build four boolean masks and cast fk_unidade
+with astype(str) on every call. ParameterIndex reads the frame once into
+
+    (sys_p_name, level, key) -> typed value (get_value_from_row of the first row)
+
+so resolving a parameter is at most four dict lookups in precedence order, and
+resolve_postos() resolves every posto of a section in one call. The matching
+rules are the ones of get_param_for_posto: keys are compared as the str() of the
+ids, only the first row of a level is considered and a null value falls through
+to the next level.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+LEVEL_POSTO = 'posto'
+LEVEL_SECAO = 'secao'
+LEVEL_UNIDADE = 'unidade'
+LEVEL_DEFAULT = 'default'
+
+PARAMETER_LEVELS = (LEVEL_POSTO, LEVEL_SECAO, LEVEL_UNIDADE, LEVEL_DEFAULT)
+
+_VALUE_COLUMNS = ('charvalue', 'numbervalue', 'datevalue')
+
+
+def _row_value(row: Dict[str, Any]) -> Any:
+    """get_value_from_row on a record dict: charvalue, then numbervalue, then datevalue."""
+    for column in _VALUE_COLUMNS:
+        value = row.get(column)
+        if value is not None and pd.notna(value):
+            return value
+    return None
+
+
+class ParameterIndex:
+    """params_df indexed by (sys_p_name, level, key) with precedence posto > section > unit > default."""
+
+    def __init__(self, entries: Dict[Tuple[str, str, Hashable], Any]):
+        self._entries = entries
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'ParameterIndex':
+        """Index every row of df (columns sys_p_name, fk_tipo_posto, fk_secao, fk_unidade, fk_grupo, *value)."""
+        entries: Dict[Tuple[str, str, Hashable], Any] = {}
+        if df is None or df.empty:
+            return cls(entries)
+        columns = ['sys_p_name', 'fk_tipo_posto', 'fk_secao', 'fk_unidade', 'fk_grupo']
+        columns += [column for column in _VALUE_COLUMNS if column in df.columns]
+        for row in df[columns].to_dict('records'):
+            name = row['sys_p_name']
+            posto, secao, unidade = row['fk_tipo_posto'], row['fk_secao'], row['fk_unidade']
+            keys = []
+            if pd.notna(posto):
+                keys.append((name, LEVEL_POSTO, posto))
+            elif pd.notna(secao):
+                keys.append((name, LEVEL_SECAO, secao))
+            else:
+                # get_param_for_posto compares fk_unidade.astype(str), nulls included
+                keys.append((name, LEVEL_UNIDADE, str(unidade)))
+                if pd.isna(unidade) and pd.isna(row['fk_grupo']):
+                    keys.append((name, LEVEL_DEFAULT, None))
+            value = _row_value(row)
+            for key in keys:
+                # The first row of a level wins, as iloc[0] did
+                entries.setdefault(key, value)
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, name: str, posto_id, unit_id, secao_id) -> Tuple[Optional[str], Any]:
+        """(level, value) of parameter name for the posto, (None, None) when no level has a value."""
+        unit_key = str(unit_id).strip()
+        candidates = [(LEVEL_POSTO, str(posto_id)), (LEVEL_SECAO, str(secao_id))]
+        if unit_key:
+            candidates.append((LEVEL_UNIDADE, unit_key))
+        candidates.append((LEVEL_DEFAULT, None))
+        for level, key in candidates:
+            value = self._entries.get((name, level, key))
+            if value is not None:
+                return level, value
+        return None, None
+
+    def resolve(self, posto_id, unit_id, secao_id, params_names_list: Iterable[str]) -> Dict[str, Any]:
+        """{name: value} of the parameters that have a value at some level for the posto."""
+        params_dict = {}
+        for name in params_names_list:
+            level, value = self.lookup(name, posto_id, unit_id, secao_id)
+            if level is not None:
+                params_dict[name] = value
+        return params_dict
+
+    def resolve_postos(self, posto_ids: Iterable, unit_id, secao_id,
+                       params_names_list: List[str]) -> Dict[Any, Dict[str, Any]]:
+        """resolve() for every posto of a section: {posto_id: {name: value}}."""
+        return {posto_id: self.resolve(posto_id, unit_id, secao_id, params_names_list) for posto_id in posto_ids}
+
+
+# id(df) -> (weakref to df, row count, index), see get_parameter_index
+_index_cache: Dict[int, tuple] = {}
+_index_lock = threading.Lock()
+
+
+def get_parameter_index(df: pd.DataFrame) -> ParameterIndex:
+    """ParameterIndex of df, built on first use and reused while df is alive (params_df is loaded once per process)."""
+    key = id(df)
+    with _index_lock:
+        cached = _index_cache.get(key)
+    if cached is not None and cached[0]() is df and cached[1] == len(df):
+        return cached[2]
+    index = ParameterIndex.from_frame(df)
+    try:
+        reference = weakref.ref(df, lambda _ref, key=key: _index_cache.pop(key, None))
+    except TypeError:
+        return index
+    with _index_lock:
+        _index_cache[key] = (reference, len(df), index)
+    return index
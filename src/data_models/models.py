@@ -28,6 +28,7 @@ from src.helpers import (
 )
 from src.load_csv_functions.load_valid_emp import load_valid_emp_csv
 from src.data_models.functions.helper_functions import collapse_df_colaborador_to_employee_level
+from src.data_models.functions.bound_queries import load_bound_query
 from src.algorithms.factory import AlgorithmFactory
 from src.configuration_manager.base import BaseConfig 
 from base_data_project.data_manager.managers.base import BaseDataManager
@@ -35,6 +36,7 @@ from base_data_project.data_manager.managers.managers import CSVDataManager, DBD
 from base_data_project.storage.models import BaseDataModel
 from base_data_project.storage.containers import BaseDataContainer
 from base_data_project.log_config import get_logger
+from src.structured_logging import get_module_logger, lazy, summarize
 
 #from src.services.example_service import AlgoritmoGDService
 
@@ -96,6 +98,7 @@ class DescansosDataModel(BaseDataModel):
         self.config_manager = config_manager
         
         super().__init__(data_container=data_container, project_name=project_name)
+        self.logger = get_module_logger(__name__)
         # Static data, doesn't change during the process run but are essential for data model treatments - See data lifecycle to understand what this data is
         self.auxiliary_data = {
             'df_messages': pd.DataFrame(), # df containing messages to set process errors
@@ -216,8 +219,7 @@ class DescansosDataModel(BaseDataModel):
                     query_path = entities_dict['valid_emp']
                     self.logger.info(f"DEBUGGING: external_call_data: {self.external_call_data}")
                     process_id = self.external_call_data['current_process_id']
-                    process_id_str = "'" + str(process_id) + "'"
-                    valid_emp = data_manager.load_data('valid_emp', query_file=query_path, process_id=process_id_str)
+                    valid_emp = load_bound_query(data_manager, 'valid_emp', query_file=query_path, process_id=process_id)
                 else:
                     self.logger.error(f"No instance found for data_manager: {data_manager.__name__}")
 
@@ -240,7 +242,7 @@ class DescansosDataModel(BaseDataModel):
                     '0': 'normal'
                 })
                 valid_emp['prioridade_folgas'] = valid_emp['prioridade_folgas'].fillna('')
-                self.logger.info(f"valid_emp:\n{valid_emp}")
+                self.logger.debug("valid_emp:\n%s", summarize(valid_emp))
 
                 self.logger.info(f"valid_emp shape (rows {valid_emp.shape[0]}, columns {valid_emp.shape[1]}): {valid_emp.columns.tolist()}")
             except Exception as e:
@@ -250,8 +252,7 @@ class DescansosDataModel(BaseDataModel):
             # Get new valid employees from new service
             try:
                 query_path = entities_dict['df_mpd_valid_employees']
-                process_id_str = "'" + str(self.external_call_data['current_process_id']) + "'"
-                df_mpd_valid_employees = data_manager.load_data('df_mpd_valid_employees', query_file=query_path, process_id=process_id_str)
+                df_mpd_valid_employees = load_bound_query(data_manager, 'df_mpd_valid_employees', query_file=query_path, process_id=self.external_call_data['current_process_id'])
 
                 # Use data treatment function to get colabs list
                 pass
@@ -307,8 +308,7 @@ class DescansosDataModel(BaseDataModel):
                 self.logger.info(f"Loading df_festivos from data manager")
                 # TODO: join the other query and make only one df
                 query_path = entities_dict['df_festivos']
-                unit_id_str = "'" + str(unit_id) + "'"
-                df_festivos = data_manager.load_data('df_festivos', query_file=query_path, unit_id=unit_id_str)
+                df_festivos = load_bound_query(data_manager, 'df_festivos', query_file=query_path, unit_id=unit_id)
                 self.logger.info(f"df_festivos shape (rows {df_festivos.shape[0]}, columns {df_festivos.shape[1]}): {df_festivos.columns.tolist()}")
             except Exception as e:
                 self.logger.error(f"Error loading df_festivos: {e}", exc_info=True)
@@ -338,8 +338,7 @@ class DescansosDataModel(BaseDataModel):
             try:
                 self.logger.info(f"Loading df_closed_days from data manager")
                 query_path = entities_dict['df_closed_days']
-                unit_id_str = "'" + str(unit_id) + "'"
-                df_closed_days = data_manager.load_data('df_closed_days', query_file=query_path, unit_id=unit_id_str)
+                df_closed_days = load_bound_query(data_manager, 'df_closed_days', query_file=query_path, unit_id=unit_id)
                 self.logger.info(f"df_closed_days shape (rows {df_closed_days.shape[0]}, columns {df_closed_days.shape[1]}): {df_closed_days.columns.tolist()}")
             except Exception as e:
                 self.logger.error(f"Error loading df_closed_days: {e}", exc_info=True)
@@ -363,10 +362,9 @@ class DescansosDataModel(BaseDataModel):
             try:
                 self.logger.info(f"Loading parameters from data manager")
                 query_path = entities_dict['params_df']
-                unit_id_str = "'" + str(unit_id) + "'"
-                params_df = data_manager.load_data('params_df', query_file=query_path, unit_id=unit_id_str)
+                params_df = load_bound_query(data_manager, 'params_df', query_file=query_path, unit_id=unit_id)
                 self.logger.info(f"params_df shape (rows {params_df.shape[0]}, columns {params_df.shape[1]}): {params_df.columns.tolist()}")
-                self.logger.info(f"DEBUG: params_df {params_df}")
+                self.logger.debug("params_df %s", summarize(params_df))
             except Exception as e:
                 self.logger.error(f"Error loading parameters: {e}", exc_info=True)
                 return False, "errSubproc", str(e)
@@ -458,13 +456,14 @@ class DescansosDataModel(BaseDataModel):
         try:
             # Treat params
             self.logger.info(f"Treating parameters in load_process_data")
-            params_df = self.auxiliary_data['params_df'].copy()
+            # Read-only: the parameter index is cached per params_df object
+            params_df = self.auxiliary_data['params_df']
             #params_names_list = CONFIG.get('parameters_names', [])
             #params_defaults = CONFIG.get('parameters_defaults', {})
             params_names_list = self.config_manager.parameters.get_parameter_names()
             params_defaults = self.config_manager.parameters.get_parameter_defaults()
             
-            self.logger.info(f"params_df before treatment:\n{params_df}")
+            self.logger.debug("params_df before treatment:\n%s", summarize(params_df))
 
             # Get all parameters in one call
             retrieved_params = get_param_for_posto(
@@ -540,27 +539,14 @@ class DescansosDataModel(BaseDataModel):
                 self.logger.error(f"Error loading colaborador info: {e}", exc_info=True)
                 return False
 
-            try:
-                self.logger.info(f"Creating colabs_str to be used in df_colaborador query.")
-                if len(colabs_id_list) == 0:
-                    self.logger.error(f"Error in load_colaborador_info method: colabs_id_list provided is empty (invalid): {colabs_id_list}")
-                    return False
-                elif len(colabs_id_list) == 1:
-                    self.logger.info(f"colabs_id_list has only one value: {colabs_id_list[0]}")
-                    colabs_str = str(colabs_id_list[0])
-                elif len(colabs_id_list) > 1:
-                    # Fix: Create a proper comma-separated list of numbers without any quotes
-                    self.logger.info(f"colabs_id_list has more than one value: {colabs_id_list}")
-                    colabs_str = ','.join(str(x) for x in colabs_id_list)
-                
-                self.logger.info(f"colabs_str: {colabs_str}, type: {type(colabs_str)}")
-            except Exception as e:
-                self.logger.error(f"Error creating colabs_str to be used in query: {e}", exc_info=True)
+            if len(colabs_id_list) == 0:
+                self.logger.error(f"Error in load_colaborador_info method: colabs_id_list provided is empty (invalid): {colabs_id_list}")
                 return False
             
             try:
+                # The employee ids are bound as a list (see bound_queries), so the IN list has no 1000 ids limit
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_contratos')
-                df_contratos = data_manager.load_data('df_contratos', query_file=query_path, colabs_id=colabs_str, start_date=start_date, end_date=end_date, process_id=process_id)
+                df_contratos = load_bound_query(data_manager, 'df_contratos', query_file=query_path, colabs_id=colabs_id_list, start_date=start_date, end_date=end_date, process_id=process_id)
                 self.logger.info(f"df_contratos shape (rows {df_contratos.shape[0]}, columns {df_contratos.shape[1]}): {df_contratos.columns.tolist()}")
                 self.logger.info(f"Saving df_contratos in auxiliary_data")
                 self.auxiliary_data['df_contratos'] = df_contratos.copy()
@@ -574,7 +560,7 @@ class DescansosDataModel(BaseDataModel):
                 #query_path = CONFIG.get('available_entities_raw', {}).get('df_colaborador')
                 query_path = self.config_manager.paths.sql_raw_paths.get('df_colaborador')
 
-                df_colaborador = data_manager.load_data('df_colaborador', query_file=query_path, colabs_id=colabs_str)
+                df_colaborador = load_bound_query(data_manager, 'df_colaborador', query_file=query_path, colabs_id=colabs_id_list, start_date=start_date, end_date=end_date, process_id=process_id)
                 df_colaborador = df_colaborador.rename(columns={'ec.codigo': 'fk_colaborador', 'codigo': 'fk_colaborador'})
                 self.logger.info(f"df_colaborador shape (rows {df_colaborador.shape[0]}, columns {df_colaborador.shape[1]}): {df_colaborador.columns.tolist()}")
                 
@@ -718,9 +704,7 @@ class DescansosDataModel(BaseDataModel):
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_orcamento', '')
                 if not query_path:
                     self.logger.warning("df_orcamento query path not found in config")
-                start_date_quoted = "'" + start_date + "'"
-                end_date_quoted = "'" + end_date + "'"
-                df_orcamento = data_manager.load_data('df_orcamento', query_file=query_path, posto_id=posto_id, start_date=start_date_quoted, end_date=end_date_quoted)
+                df_orcamento = load_bound_query(data_manager, 'df_orcamento', query_file=query_path, posto_id=posto_id, start_date=start_date, end_date=end_date)
                 self.logger.info(f"df_orcamento shape (rows {df_orcamento.shape[0]}, columns {df_orcamento.shape[1]}): {df_orcamento.columns.tolist()}")
             except Exception as e:
                 self.logger.error(f"Error loading df_orcamento: {e}", exc_info=True)
@@ -733,9 +717,7 @@ class DescansosDataModel(BaseDataModel):
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_granularidade', '')
                 if not query_path:
                     self.logger.warning("df_granularidade query path not found in config")
-                start_date_quoted = "'" + start_date + "'"
-                end_date_quoted = "'" + end_date + "'"
-                df_granularidade = data_manager.load_data('df_granularidade', query_file=query_path, start_date=start_date_quoted, end_date=end_date_quoted, posto_id=posto_id)
+                df_granularidade = load_bound_query(data_manager, 'df_granularidade', query_file=query_path, start_date=start_date, end_date=end_date, posto_id=posto_id)
                 self.logger.info(f"df_granularidade shape (rows {df_granularidade.shape[0]}, columns {df_granularidade.shape[1]}): {df_granularidade.columns.tolist()}")
             except Exception as e:
                 self.logger.error(f"Error loading df_granularidade: {e}", exc_info=True)
@@ -932,7 +914,7 @@ class DescansosDataModel(BaseDataModel):
                     colabs_passado = []
                     #self.logger.info(f"Found {len(colabs_passado)} employees with past admission dates: {colabs_passado}")
                 else:
-                    self.logger.info(f"wfm_proc_colab: {wfm_proc_colab}, df_mpd_valid_employees: {df_mpd_valid_employees}, fk_tipo_posto: {posto_id}")
+                    self.logger.debug("wfm_proc_colab: %s, df_mpd_valid_employees: %s, fk_tipo_posto: %s", wfm_proc_colab, summarize(df_mpd_valid_employees), posto_id)
                     success, colabs_passado, error_message = get_colabs_passado(wfm_proc_colab=wfm_proc_colab, df_mpd_valid_employees=df_mpd_valid_employees, fk_tipo_posto=posto_id)
                     if not success:
                         self.logger.error(f"Error getting colabs_passado: {error_message}")
@@ -941,25 +923,6 @@ class DescansosDataModel(BaseDataModel):
                 self.logger.error(f"Error filtering employees by admission date: {e}", exc_info=True)
                 colabs_passado = []
 
-            # Treat colabs_passado str
-            try:
-                self.logger.info("Treating colabs_passado str")
-                self.logger.info(f"Creating colabs_str to be used in df_colaborador query.")
-                #if len(colabs_passado) == 0:
-                #    self.logger.error(f"Error in load_colaborador_info method: colabs_passado provided is empty (invalid): {colabs_passado}")
-                #    return False
-                if len(colabs_passado) == 1:
-                    self.logger.info(f"colabs_passado has only one value: {colabs_passado[0]}")
-                    colabs_str = str(colabs_passado[0])
-                elif len(colabs_passado) > 1:
-                    # Fix: Create a proper comma-separated list of numbers without any quotes
-                    self.logger.info(f"colabs_passado has more than one value: {colabs_passado}")
-                    colabs_str = ','.join(str(x) for x in colabs_passado)
-                    self.logger.info(f"colabs_str: {colabs_str}")
-            except Exception as e:
-                self.logger.error(f"Error treating colabs_passado str: {e}", exc_info=True)
-                colabs_str = ''
-
             try:
                 # Only query if we have employees and the date range makes sense
                 self.logger.info(f"colabs_passado: {colabs_passado}, start_date_dt: {start_date_dt}, first_date_passado: {first_date_passado}, last_date_passado: {last_date_passado}")
@@ -971,19 +934,20 @@ class DescansosDataModel(BaseDataModel):
                         self.logger.warning("df_calendario_passado query path not found in config")
                         df_calendario_passado = pd.DataFrame()
                     else:
-                        df_calendario_passado = data_manager.load_data(
+                        df_calendario_passado = load_bound_query(
+                            data_manager,
                             'df_calendario_passado', 
                             query_file=query_path, 
                             start_date=first_date_passado, 
                             end_date=last_date_passado, 
-                            colabs=colabs_str
+                            colabs=list(colabs_passado)
                         )
                         self.logger.info(f"df_calendario_passado shape (rows {df_calendario_passado.shape[0]}, columns {df_calendario_passado.shape[1]}): {df_calendario_passado.columns.tolist()}")
-                        self.logger.info(f"df_calendario_passado RAW DATA (first 10 rows):\n{df_calendario_passado.head(10)}")
+                        self.logger.debug("df_calendario_passado RAW DATA:\n%s", summarize(df_calendario_passado, max_rows=10))
                         if 'TYPE' in df_calendario_passado.columns and 'SUBTYPE' in df_calendario_passado.columns:
-                            self.logger.info(f"TYPE/SUBTYPE combinations found in raw data:\n{df_calendario_passado[['TYPE', 'SUBTYPE']].value_counts().head(20)}")
+                            self.logger.debug("TYPE/SUBTYPE combinations found in raw data:\n%s", lazy(lambda: df_calendario_passado[['TYPE', 'SUBTYPE']].value_counts().head(20)))
                         elif 'type' in df_calendario_passado.columns and 'subtype' in df_calendario_passado.columns:
-                            self.logger.info(f"type/subtype combinations found in raw data:\n{df_calendario_passado[['type', 'subtype']].value_counts().head(20)}")
+                            self.logger.debug("type/subtype combinations found in raw data:\n%s", lazy(lambda: df_calendario_passado[['type', 'subtype']].value_counts().head(20)))
                 else:
                     self.logger.info("Conditions not met for loading df_calendario_passado")
                     df_calendario_passado = pd.DataFrame()
@@ -1007,7 +971,7 @@ class DescansosDataModel(BaseDataModel):
                         df_calendario_passado['employee_id'].unique().tolist()  # List of employee IDs
                     )
                     self.logger.info(f"Successfully processed historical calendar data - reshaped_final_3: {reshaped_final_3.shape}, emp_pre_ger: {len(emp_pre_ger)}, df_count: {df_count.shape}")
-                    self.logger.info(f"reshaped_final_3 AFTER load_wfm_scheds (first 5 rows, first 10 cols):\n{reshaped_final_3.iloc[:5, :10]}")
+                    self.logger.debug("reshaped_final_3 AFTER load_wfm_scheds (first 5 rows, first 10 cols):\n%s", summarize(reshaped_final_3.iloc[:5, :10]))
                     if reshaped_final_3.shape[0] > 1:
                         self.logger.info(f"TURNO row (row 1): {reshaped_final_3.iloc[1, :15].tolist()}")
                     if reshaped_final_3.shape[0] > 2:
@@ -1024,11 +988,11 @@ class DescansosDataModel(BaseDataModel):
                 #query_path = CONFIG.get('available_entities_aux', {}).get('df_ausencias_ferias', '')
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_ausencias_ferias', '')
                 if query_path:
-                    colabs_id="'" + "','".join([str(x) for x in colaborador_list]) + "'"
-                    df_ausencias_ferias = data_manager.load_data(
+                    df_ausencias_ferias = load_bound_query(
+                        data_manager,
                         'df_ausencias_ferias', 
                         query_file=query_path, 
-                        colabs_id=colabs_id
+                        colabs_id=[str(x) for x in colaborador_list]
                     )
                     self.logger.info(f"df_ausencias_ferias shape (rows {df_ausencias_ferias.shape[0]}, columns {df_ausencias_ferias.shape[1]}): {df_ausencias_ferias.columns.tolist()}")
                 else:
@@ -1043,7 +1007,8 @@ class DescansosDataModel(BaseDataModel):
                 self.logger.info("Loading df_core_pro_emp_horario_det from data manager")
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_core_pro_emp_horario_det', '')
                 if query_path:
-                    df_core_pro_emp_horario_det = data_manager.load_data(
+                    df_core_pro_emp_horario_det = load_bound_query(
+                        data_manager,
                         'df_core_pro_emp_horario_det', 
                         query_file=query_path, 
                         process_id=process_id, 
@@ -1051,7 +1016,7 @@ class DescansosDataModel(BaseDataModel):
                         end_date=end_date
                     )
                     self.logger.info(f"df_core_pro_emp_horario_det shape (rows {df_core_pro_emp_horario_det.shape[0]}, columns {df_core_pro_emp_horario_det.shape[1]}): {df_core_pro_emp_horario_det.columns.tolist()}")
-                    self.logger.info(f"DEBUG: df_core_pro_emp_horario_det: {df_core_pro_emp_horario_det}")
+                    self.logger.debug("df_core_pro_emp_horario_det: %s", summarize(df_core_pro_emp_horario_det))
             except Exception as e:
                 self.logger.error(f"Error loading df_core_pro_emp_horario_det: {e}", exc_info=True)
                 df_core_pro_emp_horario_det = pd.DataFrame()
@@ -1070,13 +1035,14 @@ class DescansosDataModel(BaseDataModel):
                     #query_path = CONFIG.get('available_entities_aux', {}).get('df_ciclos_90', '')
                     query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_ciclos_90', '')
                     if query_path:
-                        df_ciclos_90 = data_manager.load_data(
+                        df_ciclos_90 = load_bound_query(
+                            data_manager,
                             'df_ciclos_90', 
                             query_file=query_path, 
                             process_id=process_id, 
                             start_date=start_date, 
                             end_date=end_date, 
-                            colab90ciclo=','.join(map(str, colaborador_90_list))
+                            colab90ciclo=list(colaborador_90_list)
                         )
                         self.logger.info(f"df_ciclos_90 shape (rows {df_ciclos_90.shape[0]}, columns {df_ciclos_90.shape[1]}): {df_ciclos_90.columns.tolist()}")
                     else:
@@ -1094,11 +1060,11 @@ class DescansosDataModel(BaseDataModel):
                 #query_path = CONFIG.get('available_entities_aux', {}).get('df_days_off', '')
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_days_off', '')
                 if query_path:
-                    colabs_id="'" + "','".join([str(x) for x in colaborador_list]) + "'"
-                    df_days_off = data_manager.load_data(
+                    df_days_off = load_bound_query(
+                        data_manager,
                         'df_days_off', 
                         query_file=query_path, 
-                        colabs_id=colabs_id
+                        colabs_id=[str(x) for x in colaborador_list]
                     )
                     if df_days_off.empty:
                         df_days_off = pd.DataFrame(columns=pd.Index(['employee_id', 'schedule_dt', 'sched_type']))
@@ -1376,7 +1342,7 @@ class DescansosDataModel(BaseDataModel):
                 df_data = df_data.drop('tipo_dia', axis=1)
             
             # Process faixa_horario
-            self.logger.info(f"DEBUG: df_faixa_horario before filter:\n {df_faixa_horario}")
+            self.logger.debug("df_faixa_horario before filter:\n%s", summarize(df_faixa_horario))
             df_faixa_horario_filtered = df_faixa_horario[df_faixa_horario['fk_secao'] == fk_secao].copy()
             
             # Expand date ranges in faixa_horario
@@ -1398,19 +1364,19 @@ class DescansosDataModel(BaseDataModel):
                             "aber_qui", "fech_qui", "aber_sex", "fech_sex", "aber_sab", "fech_sab", 
                             "aber_dom", "fech_dom", "aber_fer", "fech_fer"]
 
-                self.logger.info(f"DEBUG: df_faixa_horario_expanded before melt:\n {df_faixa_horario_expanded}")
+                self.logger.debug("df_faixa_horario_expanded before melt:\n%s", summarize(df_faixa_horario_expanded))
                 
                 df_faixa_long = pd.melt(df_faixa_horario_expanded, 
                                     id_vars=['fk_secao', 'data', 'data_ini', 'data_fim'],
                                     value_vars=time_columns,
                                     var_name='wd_ab', value_name='value')
 
-                self.logger.info(f"DEBUG: df_faixa_long after melt:\n {df_faixa_long}")
+                self.logger.debug("df_faixa_long after melt:\n%s", summarize(df_faixa_long))
                 
                 # Split wd_ab into action (aber/fech) and weekday
                 df_faixa_long[['a_f', 'wd']] = df_faixa_long['wd_ab'].str.split('_', expand=True)
 
-                self.logger.info(f"DEBUG: df_faixa_long after split:\n {df_faixa_long}")
+                self.logger.debug("df_faixa_long after split:\n%s", summarize(df_faixa_long))
                 
                 # Pivot back to get aber and fech columns
                 df_faixa_wide = df_faixa_long.pivot_table(
@@ -1420,7 +1386,7 @@ class DescansosDataModel(BaseDataModel):
                     aggfunc='first'
                 ).reset_index()
 
-                self.logger.info(f"DEBUG: df_faixa_wide after pivot:\n {df_faixa_wide}")
+                self.logger.debug("df_faixa_wide after pivot:\n%s", summarize(df_faixa_wide))
                 
                 # Clean column names
                 df_faixa_wide.columns.name = None
@@ -1436,12 +1402,12 @@ class DescansosDataModel(BaseDataModel):
                 df_faixa_wide['wd_date'] = df_faixa_wide['wd_date'].str.replace('thursday', 'qui')
                 df_faixa_wide['wd_date'] = df_faixa_wide['wd_date'].str.replace('friday', 'sex')
 
-                self.logger.info(f"DEBUG: df_faixa_wide after weekday replacement:\n {df_faixa_wide}")
+                self.logger.debug("df_faixa_wide after weekday replacement:\n%s", summarize(df_faixa_wide))
                 
                 # Filter matching weekdays
                 df_faixa_horario_final = df_faixa_wide[df_faixa_wide['wd'] == df_faixa_wide['wd_date']].copy()
 
-                self.logger.info(f"DEBUG: df_faixa_horario_final after filter:\n {df_faixa_horario_final}")
+                self.logger.debug("df_faixa_horario_final after filter:\n%s", summarize(df_faixa_horario_final))
                 
                 # Convert time columns to datetime
                 df_faixa_horario_final['aber'] = pd.to_datetime(df_faixa_horario_final['aber'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
@@ -1451,7 +1417,7 @@ class DescansosDataModel(BaseDataModel):
             else:
                 df_faixa_horario_final = pd.DataFrame({col: [] for col in ['fk_secao', 'data', 'aber', 'fech']})
 
-            self.logger.info(f"DEBUG: df_faixa_horario_final:\n {df_faixa_horario_final}")
+            self.logger.debug("df_faixa_horario_final:\n%s", summarize(df_faixa_horario_final))
             
             # Merge all data together
             df_turnos = pd.merge(df_turnos, df_data, on=['fk_unidade'], how='left')
@@ -1898,7 +1864,7 @@ class DescansosDataModel(BaseDataModel):
 
             # Merge with valid_emp to get PRIORIDADE_FOLGAS
             matriz_ma = pd.merge(matriz_ma, valid_emp[['fk_colaborador', 'prioridade_folgas']], on='fk_colaborador', how='left')
-            self.logger.info(f"DEBUG:matriz_ma: {matriz_ma}")
+            self.logger.debug("matriz_ma: %s", summarize(matriz_ma))
             
             # Fill missing values (except date columns)
             date_columns = ['data_admissao', 'data_demissao']
@@ -1925,7 +1891,7 @@ class DescansosDataModel(BaseDataModel):
             
             # Calculate closed holidays (tipo == 3 and not Sunday)
             if len(matriz_festivos) > 0:
-                self.logger.info(f"matriz_festivos: {matriz_festivos}")
+                self.logger.debug("matriz_festivos: %s", summarize(matriz_festivos))
                 closed_festivos = matriz_festivos[
                     (matriz_festivos['tipo'] == 3) & 
                     (matriz_festivos['data'].dt.weekday != 6)  # Not Sunday
@@ -2117,7 +2083,7 @@ class DescansosDataModel(BaseDataModel):
                     0,
                     df_contratos['carga_diaria']
                 )
-                self.logger.info(f"DEBUG: df_contratos=\n{df_contratos}")
+                self.logger.debug("df_contratos=\n%s", summarize(df_contratos))
             except Exception as e:
                 self.logger.error(f"Error treating df_contratos: {e}", exc_info=True)
                 return False
@@ -2227,8 +2193,8 @@ class DescansosDataModel(BaseDataModel):
                 df_colaboradores.columns = ['matricula', 'fk_colaborador']
                 df_core_pro_emp_horario_det = df_core_pro_emp_horario_det.merge(df_colaboradores, left_on='employee_id', right_on='fk_colaborador', how='left')
                 df_contratos = df_contratos.merge(df_colaboradores, left_on='employee_id', right_on='fk_colaborador', how='left')
-                self.logger.info(f"DEBUG: df_core_pro_emp_horario_det={df_core_pro_emp_horario_det}")
-                self.logger.info(f"DEBUG: df_contratos={df_contratos}")
+                self.logger.debug("df_core_pro_emp_horario_det=%s", summarize(df_core_pro_emp_horario_det))
+                self.logger.debug("df_contratos=%s", summarize(df_contratos))
 
 
             except Exception as e:
@@ -2454,7 +2420,7 @@ class DescansosDataModel(BaseDataModel):
 
             if len(reshaped_final_3) > 0:
                 
-                self.logger.info(f"df_days_off {df_days_off}")
+                self.logger.debug("df_days_off %s", summarize(df_days_off))
                 df_days_off_filtered = pd.DataFrame(df_days_off[(df_days_off['schedule_dt'] >= start_date) & 
                                     (df_days_off['schedule_dt'] <= end_date)])
                 if len(df_days_off_filtered) > 0:
@@ -2584,15 +2550,15 @@ class DescansosDataModel(BaseDataModel):
                 empty_cells_original = matriz2_og.isnull().sum().sum()
                 if empty_cells_original > 0:
                     self.logger.warning(f"Original calendar data contains {empty_cells_original} empty/NaN values")
-                self.logger.info(f"Original calendar data sample:\n{matriz2_og.head()}")
+                self.logger.debug("Original calendar data sample:\n%s", summarize(matriz2_og))
 
                 # Integrate historical calendar data if available
                 try:
                     df_calendario_passado = self.auxiliary_data.get('df_calendario_passado', pd.DataFrame())
                     if not df_calendario_passado.empty:
                         self.logger.info(f"Integrating historical calendar data - shape: {df_calendario_passado.shape}")
-                        self.logger.info(f"Historical data sample (first 5 rows, first 10 cols):\n{df_calendario_passado.iloc[:5, :10]}")
-                        self.logger.info(f"matriz2_og BEFORE integration (first 5 rows, first 10 cols):\n{matriz2_og.iloc[:5, :10]}")
+                        self.logger.debug("Historical data sample (first 5 rows, first 10 cols):\n%s", summarize(df_calendario_passado.iloc[:5, :10]))
+                        self.logger.debug("matriz2_og BEFORE integration (first 5 rows, first 10 cols):\n%s", summarize(matriz2_og.iloc[:5, :10]))
                         
                         # Check for empty/NaN values in historical data
                         empty_cells = df_calendario_passado.isnull().sum().sum()
@@ -2608,7 +2574,7 @@ class DescansosDataModel(BaseDataModel):
                             self.logger.info(f"Column counts match ({matriz2_og.shape[1]} == {df_calendario_passado.shape[1]}), concatenating...")
                             matriz2_og = pd.concat([matriz2_og, df_calendario_passado], ignore_index=True)
                             self.logger.info(f"Successfully integrated historical calendar data - new shape: {matriz2_og.shape}")
-                            self.logger.info(f"matriz2_og AFTER integration (last 5 rows, first 10 cols):\n{matriz2_og.iloc[-5:, :10]}")
+                            self.logger.debug("matriz2_og AFTER integration (last 5 rows, first 10 cols):\n%s", summarize(matriz2_og.iloc[-5:, :10]))
                         else:
                             self.logger.warning(f"Historical calendar data has different structure - matriz2_og: {matriz2_og.shape[1]} cols, historical: {df_calendario_passado.shape[1]} cols")
                             self.logger.warning(f"matriz2_og column 0-5: {matriz2_og.iloc[0, :5].tolist()}")
@@ -2664,8 +2630,8 @@ class DescansosDataModel(BaseDataModel):
                 # TODO: Remove this debug code
                 # Debug: Check the structure of matriz2_og
                 self.logger.info(f"matriz2_og shape: {matriz2_og.shape}")
-                self.logger.info(f"matriz2_og first few rows:\n{matriz2_og.head()}")
-                self.logger.info(f"matriz2_og first column unique values: {matriz2_og.iloc[:, 0].unique()}")
+                self.logger.debug("matriz2_og first few rows:\n%s", summarize(matriz2_og))
+                self.logger.debug("matriz2_og first column unique values: %s", lazy(lambda: matriz2_og.iloc[:, 0].unique()))
                 
                 # Check if TURNO and Dia rows exist
                 turno_exists = (matriz2_og.iloc[:, 0] == 'TURNO').any()
@@ -3312,7 +3278,7 @@ class DescansosDataModel(BaseDataModel):
                 
                 # Keep ALL calendar entries (don't filter matriz2_3d)
                 self.logger.info(f"DEBUG: matriz2_3d before processing shape: {matriz2_3d.shape}")
-                self.logger.info(f"DEBUG: matriz2_3d HORARIO value counts:\n{matriz2_3d['HORARIO'].value_counts()}")
+                self.logger.debug("matriz2_3d HORARIO value counts:\n%s", lazy(lambda: matriz2_3d['HORARIO'].value_counts()))
                 
                 # But count only work days for NL2D/NL3D assignment
                 work_days_only = matriz2_3d[~matriz2_3d['HORARIO'].isin(['-', 'V', 'F'])].copy()
@@ -3324,7 +3290,7 @@ class DescansosDataModel(BaseDataModel):
                              .reset_index())
                 week_counts['count'] = week_counts['count'] / 2
                 self.logger.info(f"DEBUG: week_counts shape: {week_counts.shape}")
-                self.logger.info(f"DEBUG: week_counts sample:\n{week_counts.head(10)}")
+                self.logger.debug("week_counts sample:\n%s", summarize(week_counts))
 
                 # Apply NL2D/NL3D only to work days
                 def update_horario_3d(row):
@@ -3350,13 +3316,13 @@ class DescansosDataModel(BaseDataModel):
                 matriz2_3d['HORARIO'] = matriz2_3d.apply(update_horario_3d, axis=1)
                 
                 self.logger.info(f"DEBUG: matriz2_3d after HORARIO update shape: {matriz2_3d.shape}")
-                self.logger.info(f"DEBUG: matriz2_3d HORARIO value counts after update:\n{matriz2_3d['HORARIO'].value_counts()}")
+                self.logger.debug("matriz2_3d HORARIO value counts after update:\n%s", lazy(lambda: matriz2_3d['HORARIO'].value_counts()))
                 
                 # Log sample of NL2D/NL3D assignments
                 nl_assignments = matriz2_3d[matriz2_3d['HORARIO'].isin(['NL2D', 'NL3D'])]
                 if not nl_assignments.empty:
                     self.logger.info(f"DEBUG: NL2D/NL3D assignments count: {len(nl_assignments)}")
-                    self.logger.info(f"DEBUG: NL2D/NL3D sample:\n{nl_assignments[['COLABORADOR', 'DATA', 'HORARIO', 'tipo_contrato']].head(10)}")
+                    self.logger.debug("NL2D/NL3D sample:\n%s", summarize(nl_assignments[['COLABORADOR', 'DATA', 'HORARIO', 'tipo_contrato']]))
                 else:
                     self.logger.warning("DEBUG: No NL2D/NL3D assignments were made")
                 
@@ -3764,9 +3730,9 @@ class DescansosDataModel(BaseDataModel):
             matrizB_ini['turno'] = matrizB_ini['turno'].str.upper()
             
             # Merge +H with matrizB for morning
-            self.logger.info(f"matrizB_ini before filter:\n {matrizB_ini}")
+            self.logger.debug("matrizB_ini before filter:\n%s", summarize(matrizB_ini))
             matrizB_m = matrizB_ini[matrizB_ini['turno'] == 'M'].copy()
-            self.logger.info(f"matrizB_m after filter turno m:\n {matrizB_m}")
+            self.logger.debug("matrizB_m after filter turno m:\n%s", summarize(matrizB_m))
             
             # Convert dates to date objects
             # TODO: check if it does not need %Y-%m-%d
@@ -3778,12 +3744,12 @@ class DescansosDataModel(BaseDataModel):
             matrizB_m = matrizB_m.merge(trab_manha, left_on=['data', 'turno'], 
                                     right_on=['DATA', 'TURNO'], how='left')
             matrizB_m = matrizB_m.drop(['DATA', 'TURNO'], axis=1, errors='ignore')
-            self.logger.info(f"matrizB_m after merge with trab_manha:\n {matrizB_m}")
+            self.logger.debug("matrizB_m after merge with trab_manha:\n%s", summarize(matrizB_m))
             
             # Merge +H with matrizB for afternoon
-            self.logger.info(f"matrizB_ini before filter: {matrizB_ini}")
+            self.logger.debug("matrizB_ini before filter: %s", summarize(matrizB_ini))
             matrizB_t = matrizB_ini[matrizB_ini['turno'] == 'T'].copy()
-            self.logger.info(f"matrizB_t after filter turno t:\n {matrizB_t}")
+            self.logger.debug("matrizB_t after filter turno t:\n%s", summarize(matrizB_t))
             
             # Convert dates for afternoon merge to date objects
             matrizB_t['data'] = pd.to_datetime(matrizB_t['data']).dt.date
@@ -3792,11 +3758,11 @@ class DescansosDataModel(BaseDataModel):
             matrizB_t = matrizB_t.merge(trab_tarde, left_on=['data', 'turno'],
                                     right_on=['DATA', 'TURNO'], how='left')
             matrizB_t = matrizB_t.drop(['DATA', 'TURNO'], axis=1, errors='ignore')
-            self.logger.info(f"matrizB_t after merge with trab_tarde:\n {matrizB_t}")
+            self.logger.debug("matrizB_t after merge with trab_tarde:\n%s", summarize(matrizB_t))
             
             # Combine morning and afternoon
             matrizB_ini = pd.concat([matrizB_m, matrizB_t], ignore_index=True)
-            self.logger.info(f"matrizB_ini: {matrizB_ini}")
+            self.logger.debug("matrizB_ini: %s", summarize(matrizB_ini))
             
             # Get param_pess_obj from external data or set default
             param_pess_obj = self.external_call_data.get('param_pessoas_objetivo', 0.5)
@@ -3807,7 +3773,7 @@ class DescansosDataModel(BaseDataModel):
             matrizB_ini['sd_turno'] = pd.to_numeric(matrizB_ini['sd_turno'], errors='coerce')
             matrizB_ini['media_turno'] = pd.to_numeric(matrizB_ini['media_turno'], errors='coerce')
             matrizB_ini['+H'] = pd.Series(pd.to_numeric(matrizB_ini['+H'], errors='coerce')).fillna(0)
-            self.logger.info(f"matrizB_ini after merge with trab_tarde: {matrizB_ini}")
+            self.logger.debug("matrizB_ini after merge with trab_tarde: %s", summarize(matrizB_ini))
             
             # Calculate aux (coefficient of variation)
             matrizB_ini['aux'] = np.where(
@@ -3835,7 +3801,7 @@ class DescansosDataModel(BaseDataModel):
             # Add weekday
             matrizB['data'] = pd.to_datetime(matrizB['data'])
             matrizB['WDAY'] = matrizB['data'].dt.dayofweek + 1
-            self.logger.info(f"matrizB after adding WDAY: {matrizB}")
+            self.logger.debug("matrizB after adding WDAY: %s", summarize(matrizB))
             
             # Create backup
             matrizB_bk = matrizB.copy()
@@ -3908,7 +3874,7 @@ class DescansosDataModel(BaseDataModel):
             
             try:
                 self.logger.info("Storing final results in medium_data")
-                self.logger.info(f"DEBUG: matrizB_bk: {matrizB_bk}")
+                self.logger.debug("matrizB_bk: %s", summarize(matrizB_bk))
                 # Store final results in transformed_data
                 self.medium_data.update({
                     'df_colaborador': matrizA_bk.copy(),
@@ -4127,7 +4093,7 @@ class DescansosDataModel(BaseDataModel):
             self.logger.info("Entered format_results method.")
             final_df = self.rare_data['df_results'].copy()
             df_colaborador = self.medium_data['df_colaborador'].copy()
-            self.logger.info(f"DEBUG: df_colaborador: {df_colaborador}")
+            self.logger.debug("df_colaborador: %s", summarize(df_colaborador))
             df_colaborador = collapse_df_colaborador_to_employee_level(
                 df_colaborador[['fk_colaborador', 'matricula', 'data_admissao', 'data_demissao']],
                 employee_col='fk_colaborador',
@@ -10,7 +10,6 @@ import os
 from base_data_project.storage.containers import BaseDataContainer
 from base_data_project.data_manager.managers.managers import CSVDataManager, DBDataManager
 from base_data_project.data_manager.managers.base import BaseDataManager
-from base_data_project.log_config import get_logger
 from src.data_models.base import BaseDescansosDataModel
 from src.configuration_manager.base import BaseConfig
 from src.configuration_manager.instance import get_config
@@ -19,9 +18,9 @@ from src.helpers import (
     log_max_consecutive_working_days_errors,
     log_workload_template_contract_errors,
 )
+from src.data_models.functions.bound_queries import load_bound_query
 from src.data_models.functions.helper_functions import (
     count_dates_per_year, 
-    get_param_for_posto, 
     load_wfm_scheds, 
     get_valid_emp_info,
     get_first_and_last_day_passado_arguments,
@@ -31,7 +30,6 @@ from src.data_models.functions.helper_functions import (
     get_employee_id_matriculas_map_dict,
     restrict_employee_lists_to_contract_holders,
     get_df_estrutura_wfm_info,
-    create_employee_query_string,
     count_holidays_in_period,
     count_sundays_in_period,
     count_open_holidays,
@@ -78,6 +76,7 @@ from src.data_models.functions.data_treatment_functions import (
     handle_employee_edge_cases,
     adjust_horario_for_admission_date,
     calculate_and_merge_allocated_employees,
+    count_allocated_employees,
     treat_df_disponibilidade,
     restrict_turnos_by_disponibilidade,
     treat_df_process_rules,
@@ -90,6 +89,9 @@ from src.data_models.functions.data_treatment_functions import (
     sort_df_colaborador_by_contract_period,
 )
 from src.data_models.functions.loading_functions import load_valid_emp_csv
+from src.debug_artefacts import get_debug_writer
+from src.data_models.functions.parameter_index import get_parameter_index
+from src.structured_logging import summarize
 from src.data_models.validations.load_process_data_validations import (
     validate_parameters_cfg, 
     validate_employees_id_list, 
@@ -174,6 +176,7 @@ class SalsaDataModel(BaseDescansosDataModel):
             'df_closed_days': None, # closed days information dataframe
             'df_params': None, # algorithm parameters
             'parameters_cfg': None, # parameters configuration
+            'params_by_posto': None, # parameters resolved for every posto of the section (treat_params)
             'unit_id': None, # unit ID
             'secao_id': None, # section ID
             'posto_id_list': None, # list of posto IDs
@@ -283,10 +286,11 @@ class SalsaDataModel(BaseDescansosDataModel):
                     df_valid_emp = load_valid_emp_csv()
                 elif isinstance(data_manager, DBDataManager):
                     # valid emp info
-                    df_valid_emp = data_manager.load_data(
+                    df_valid_emp = load_bound_query(
+                        data_manager,
                         'valid_emp', 
                         query_file=self.config_manager.paths.sql_processing_paths['valid_emp'], 
-                        process_id="'" + str(self.external_call_data['current_process_id']) + "'"
+                        process_id=self.external_call_data['current_process_id']
                     )
                 else:
                     self.logger.error(f"No instance found for data_manager: {data_manager.__name__}")
@@ -319,7 +323,8 @@ class SalsaDataModel(BaseDescansosDataModel):
 
             # df_estrutura_wfm query and get info to store it in 
             try:
-                df_estrutura_wfm = data_manager.load_data(
+                df_estrutura_wfm = load_bound_query(
+                    data_manager,
                     entity='df_estrutura_wfm',
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_estrutura_wfm'],
                     secao_id=secao_id
@@ -348,6 +353,7 @@ class SalsaDataModel(BaseDescansosDataModel):
             # ECI Unit Detection: check if this is an ECI unit and load sibling section data
             eci_flag = is_eci_unit(df_estrutura_wfm)
             df_eci_section_results = pd.DataFrame()  # Empty by default (non-ECI path)
+            df_eci_allocated_counts = None  # Per-day sibling headcount, computed once with the sibling section
             eci_sibling_results_flag = False  # Set True only when ECI sibling section has results (see below)
 
             if eci_flag:
@@ -358,11 +364,12 @@ class SalsaDataModel(BaseDescansosDataModel):
                 if sibling_section_name:
                     try:
                         # Step 1: Resolve sibling section ID
-                        df_sibling_section = data_manager.load_data(
+                        df_sibling_section = load_bound_query(
+                            data_manager,
                             entity='df_eci_sibling_section',
                             query_file=self.config_manager.paths.sql_auxiliary_paths['df_eci_sibling_section'],
-                            unit_id="'" + str(unit_id) + "'",
-                            sibling_section_name="'" + sibling_section_name + "'"
+                            unit_id=unit_id,
+                            sibling_section_name=sibling_section_name
                         )
                         self.logger.info(f"df_sibling_section shape (rows {df_sibling_section.shape[0]}, columns {df_sibling_section.shape[1]}): {df_sibling_section.columns.tolist()}")
 
@@ -371,10 +378,11 @@ class SalsaDataModel(BaseDescansosDataModel):
                             self.logger.info(f"Sibling section resolved: secao_id={sibling_secao_id}, nome='{df_sibling_section['nome_secao'].iloc[0]}'")
 
                             # Step 2: Load sibling section employees from view
-                            df_eci_employees = data_manager.load_data(
+                            df_eci_employees = load_bound_query(
+                                data_manager,
                                 entity='df_eci_section_employees',
                                 query_file=self.config_manager.paths.sql_auxiliary_paths['df_eci_section_employees'],
-                                secao_id="'" + str(sibling_secao_id) + "'"
+                                secao_id=sibling_secao_id
                             )
                             self.logger.info(f"df_eci_employees shape (rows {df_eci_employees.shape[0]}, columns {df_eci_employees.shape[1]}): {df_eci_employees.columns.tolist()}")
                             
@@ -387,13 +395,16 @@ class SalsaDataModel(BaseDescansosDataModel):
                                 start_date_temp = self.external_call_data.get('start_date', '')
                                 end_date_temp = self.external_call_data.get('end_date', '')
                                 
-                                df_eci_section_results = data_manager.load_data(
+                                df_eci_section_results = load_bound_query(
+                                    data_manager,
                                     entity='df_eci_section_results',
                                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_calendario_passado'],
                                     start_date=start_date_temp,
                                     end_date=end_date_temp,
-                                    colabs=create_employee_query_string(eci_employee_ids)
+                                    colabs=eci_employee_ids
                                 )
+                                # Per-day sibling headcount, aggregated once for every posto's func_inicializa
+                                df_eci_allocated_counts = count_allocated_employees(df_eci_section_results)
                                 self.logger.info(f"df_eci_section_results shape (rows {df_eci_section_results.shape[0]}, columns {df_eci_section_results.shape[1]}): {df_eci_section_results.columns.tolist()}")
                             else:
                                 self.logger.info("No employees found in sibling ECI section - proceeding with empty df_eci_section_results")
@@ -402,6 +413,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                     except Exception as e:
                         self.logger.warning(f"Error loading ECI sibling section data: {e}. Proceeding with empty df_eci_section_results")
                         df_eci_section_results = pd.DataFrame()
+                        df_eci_allocated_counts = None
                 else:
                     self.logger.warning(f"Could not determine sibling section for '{nome_secao}' - proceeding with empty df_eci_section_results")
             else:
@@ -429,10 +441,11 @@ class SalsaDataModel(BaseDescansosDataModel):
 
             # Load employee ids from service 
             try:
-                df_mpd_valid_employees = data_manager.load_data(
+                df_mpd_valid_employees = load_bound_query(
+                    data_manager,
                     'df_mpd_valid_employees', 
                     query_file=self.config_manager.paths.sql_processing_paths['df_mpd_valid_employees'], 
-                    process_id="'" + str(self.external_call_data['current_process_id']) + "'"
+                    process_id=self.external_call_data['current_process_id']
                 )
                 self.logger.info(f"df_mpd_valid_employees shape (rows {df_mpd_valid_employees.shape[0]}, columns {df_mpd_valid_employees.shape[1]}): {df_mpd_valid_employees.columns.tolist()}")
             except Exception as e:
@@ -472,10 +485,11 @@ class SalsaDataModel(BaseDescansosDataModel):
             try:
                 self.logger.info(f"Loading fk_colaborador-matricula mapping from data manager")
 
-                df_fk_colaborador_matricula = data_manager.load_data(
+                df_fk_colaborador_matricula = load_bound_query(
+                    data_manager,
                     'df_fk_colaborador_matricula', 
                     query_file=self.config_manager.paths.sql_processing_paths['df_fk_colaborador_matricula'], 
-                    colabs_id=create_employee_query_string(section_employees_id_list),
+                    colabs_id=section_employees_id_list,
                 )
                 self.logger.info(f"df_fk_colaborador_matricula shape (rows {df_fk_colaborador_matricula.shape[0]}, columns {df_fk_colaborador_matricula.shape[1]}): {df_fk_colaborador_matricula.columns.tolist()}")
 
@@ -514,7 +528,8 @@ class SalsaDataModel(BaseDescansosDataModel):
                     df_params_lq = data_manager.load_data('params_lq')
                 elif isinstance(data_manager, DBDataManager):
                     self.logger.info(f"Loading df_params_lq from database")
-                    df_params_lq = data_manager.load_data(
+                    df_params_lq = load_bound_query(
+                        data_manager,
                         'params_lq', 
                         query_file=self.config_manager.paths.sql_processing_paths['params_lq'])
                 else:
@@ -529,10 +544,11 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.logger.info(f"Loading df_feriados from data manager")
                 # TODO: join the other query and make only one df
 
-                df_feriados = data_manager.load_data(
+                df_feriados = load_bound_query(
+                    data_manager,
                     'df_feriados', 
                     query_file=self.config_manager.paths.sql_processing_paths['df_feriados'], 
-                    unit_id="'" + str(unit_id) + "'", 
+                    unit_id=unit_id, 
                     start_date=first_day_passado, 
                     end_date=last_day_passado)
                 self.logger.info(f"df_feriados shape (rows {df_feriados.shape[0]}, columns {df_feriados.shape[1]}): {df_feriados.columns.tolist()}")
@@ -564,7 +580,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                 return False            
 
             if not validate_df_feriados(df_feriados):
-                self.logger.error(f"df_feriados is invalid: {df_feriados}")
+                self.logger.error("df_feriados is invalid: %s", summarize(df_feriados))
                 return False, "errSubproc", "df_feriados is invalid"
 
             num_feriados_abertos, num_feriados_fechados = count_holidays_in_period(
@@ -585,10 +601,11 @@ class SalsaDataModel(BaseDescansosDataModel):
             # Load closed days information
             try:
                 self.logger.info(f"Loading df_closed_days from data manager")
-                df_closed_days = data_manager.load_data(
+                df_closed_days = load_bound_query(
+                    data_manager,
                     'df_closed_days', 
                     query_file=self.config_manager.paths.sql_processing_paths['df_closed_days'], 
-                    unit_id="'" + str(unit_id) + "'"
+                    unit_id=unit_id
                 )
                 self.logger.info(f"df_closed_days shape (rows {df_closed_days.shape[0]}, columns {df_closed_days.shape[1]}): {df_closed_days.columns.tolist()}")
             except Exception as e:
@@ -609,14 +626,13 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.logger.info("Loading df_faixa_secao from data manager (queryGetEscFaixaHorario)")
                 query_path = self.config_manager.paths.sql_auxiliary_paths.get('df_faixa_horario', '')
                 if query_path:
-                    start_date_quoted = "'" + first_day_passado + "'"
-                    end_date_quoted = "'" + last_day_passado + "'"
-                    df_faixa_secao_wide = data_manager.load_data(
+                    df_faixa_secao_wide = load_bound_query(
+                        data_manager,
                         'df_faixa_secao',
                         query_file=query_path,
                         secao_id=secao_id,
-                        start_date=start_date_quoted,
-                        end_date=end_date_quoted,
+                        start_date=first_day_passado,
+                        end_date=last_day_passado,
                     )
                     self.logger.info(f"df_faixa_secao (wide) shape: {df_faixa_secao_wide.shape[0]} rows, {df_faixa_secao_wide.shape[1]} cols")
                     success, df_faixa_secao, error_msg = treat_df_faixa_secao_to_long(df_faixa_secao_wide)
@@ -636,10 +652,11 @@ class SalsaDataModel(BaseDescansosDataModel):
             try:
                 self.logger.info(f"Loading parameters from data manager")
 
-                df_params = data_manager.load_data(
+                df_params = load_bound_query(
+                    data_manager,
                     'df_params', 
                     query_file=self.config_manager.paths.sql_processing_paths['params_df'], 
-                    unit_id="'" + str(unit_id) + "'"
+                    unit_id=unit_id
                 )
                 self.logger.info(f"df_params shape (rows {df_params.shape[0]}, columns {df_params.shape[1]}): {df_params.columns.tolist()}")
 
@@ -650,7 +667,8 @@ class SalsaDataModel(BaseDescansosDataModel):
             # Load algorithm treatment params
             try:
                 self.logger.info(f"Loading algorithm treatment params from data manager")
-                parameters_cfg = data_manager.load_data(
+                parameters_cfg = load_bound_query(
+                    data_manager,
                     'parameters_cfg', 
                     query_file=self.config_manager.paths.sql_processing_paths['parameters_cfg']
                 )
@@ -677,10 +695,11 @@ class SalsaDataModel(BaseDescansosDataModel):
             df_process_rules_raw = pd.DataFrame()
             try:
                 self.logger.info("Loading df_process_rules from data manager")
-                df_process_rules = data_manager.load_data(
+                df_process_rules = load_bound_query(
+                    data_manager,
                     'df_process_rules',
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_process_rules'],
-                    process_id="'" + str(self.external_call_data['current_process_id']) + "'"
+                    process_id=self.external_call_data['current_process_id']
                 )
                 self.logger.info(f"df_process_rules shape (rows {df_process_rules.shape[0]}, columns {df_process_rules.shape[1]}): {df_process_rules.columns.tolist()}")
                 df_process_rules = filter_compensatory_labor_rules(df_process_rules)
@@ -725,6 +744,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.auxiliary_data['df_estrutura_wfm'] = df_estrutura_wfm.copy()
                 self.auxiliary_data['df_params_lq'] = df_params_lq.copy()
                 self.auxiliary_data['df_params'] = df_params.copy()
+                self.auxiliary_data['params_by_posto'] = None
                 self.auxiliary_data['df_feriados'] = df_feriados.copy()
                 self.auxiliary_data['df_closed_days'] = df_closed_days.copy()
                 self.auxiliary_data['df_faixa_secao'] = df_faixa_secao.copy()
@@ -745,6 +765,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.auxiliary_data['case_type'] = case_type
                 self.auxiliary_data['is_eci_unit'] = eci_flag
                 self.auxiliary_data['df_eci_section_results'] = df_eci_section_results.copy()
+                self.auxiliary_data['df_eci_allocated_counts'] = df_eci_allocated_counts
                 self.auxiliary_data['num_sundays_year'] = num_sundays_year
                 self.auxiliary_data['num_feriados_abertos'] = num_feriados_abertos
                 self.auxiliary_data['num_feriados_fechados'] = num_feriados_fechados
@@ -801,24 +822,32 @@ class SalsaDataModel(BaseDescansosDataModel):
         try:
             # Treat params
             self.logger.info(f"Treating parameters in load_process_data")
-            df_params = self.auxiliary_data['df_params'].copy()
+            # Read-only: the parameter index is cached per df_params object
+            df_params = self.auxiliary_data['df_params']
             algorithm_treatment_params = self.algorithm_treatment_params
             params_names_list = self.config_manager.parameters.get_parameter_names()
             params_defaults = self.config_manager.parameters.get_parameter_defaults()
             start_date = self.external_call_data['start_date']
             end_date = self.external_call_data['end_date']
-            self.logger.info(f"df_params before treatment:\n{df_params}")
-
-            # Get all parameters in one call
-            retrieved_params = get_param_for_posto(
-                df=df_params, 
-                posto_id=self.auxiliary_data['current_posto_id'], 
-                unit_id=self.auxiliary_data['unit_id'], 
-                secao_id=self.auxiliary_data['secao_id'], 
-                params_names_list=params_names_list
-            ) or {}
-
-            self.logger.info(f"Retrieved params after get_param_for_posto:\n{retrieved_params}")
+            self.logger.debug("df_params before treatment:\n%s", summarize(df_params))
+
+            # Parameters of every posto of the section are resolved in one call on the first posto
+            current_posto_id = self.auxiliary_data['current_posto_id']
+            params_by_posto = self.auxiliary_data.get('params_by_posto') or {}
+            if current_posto_id not in params_by_posto:
+                posto_ids = list(self.auxiliary_data.get('posto_id_list') or [])
+                if current_posto_id not in posto_ids:
+                    posto_ids.append(current_posto_id)
+                params_by_posto = get_parameter_index(df_params).resolve_postos(
+                    posto_ids,
+                    unit_id=self.auxiliary_data['unit_id'],
+                    secao_id=self.auxiliary_data['secao_id'],
+                    params_names_list=params_names_list,
+                )
+                self.auxiliary_data['params_by_posto'] = params_by_posto
+            retrieved_params = params_by_posto[current_posto_id]
+
+            self.logger.info("Retrieved params for posto %s:\n%s", current_posto_id, summarize(retrieved_params))
             # Merge with defaults (retrieved params take precedence)
             for param_name in params_names_list:
                 param_value = retrieved_params.get(param_name, params_defaults.get(param_name))
@@ -900,12 +929,13 @@ class SalsaDataModel(BaseDescansosDataModel):
             # Load df_colaborador info from data manager (wfm.core_pro_emp_contract)
             try:
                 self.logger.info("Loading df_colaborador info from data manager")
-                df_colaborador = data_manager.load_data(
+                df_colaborador = load_bound_query(
+                    data_manager,
                     entity='df_colaborador',
                     query_file=self.config_manager.paths.sql_raw_paths.get('df_colaborador'),
-                    colabs_id=create_employee_query_string(employee_id_list=past_employees_id_list),
-                    start_date="'" + str(first_date_passado) + "'",
-                    end_date="'" + str(last_date_passado) + "'",
+                    colabs_id=past_employees_id_list,
+                    start_date=first_date_passado,
+                    end_date=last_date_passado,
                     process_id=process_id,
                 )
                 self.logger.info(f"df_colaborador shape (rows {df_colaborador.shape[0]}, columns {df_colaborador.shape[1]}): {df_colaborador.columns.tolist()}")
@@ -934,7 +964,8 @@ class SalsaDataModel(BaseDescansosDataModel):
             df_core_pro_work_shift = pd.DataFrame()
             try:
                 self.logger.info("Loading df_core_pro_work_shift from data manager")
-                df_core_pro_work_shift = data_manager.load_data(
+                df_core_pro_work_shift = load_bound_query(
+                    data_manager,
                     entity='df_core_pro_work_shift',
                     query_file=self.config_manager.paths.sql_auxiliary_paths.get('df_core_pro_work_shift', ''),
                     process_id=process_id,
@@ -967,10 +998,11 @@ class SalsaDataModel(BaseDescansosDataModel):
             df_annual_variables = pd.DataFrame()
             try:
                 self.logger.info("Loading df_annual_variables from data manager")
-                df_annual_variables = data_manager.load_data(
+                df_annual_variables = load_bound_query(
+                    data_manager,
                     entity='df_annual_variables',
                     query_file=self.config_manager.paths.sql_auxiliary_paths.get('df_annual_variables', ''),
-                    colabs_id=create_employee_query_string(past_employees_id_list),
+                    colabs_id=past_employees_id_list,
                     process_id=process_id,
                 )
                 self.logger.info(f"df_annual_variables shape (rows {df_annual_variables.shape[0]}, columns {df_annual_variables.shape[1]}): {df_annual_variables.columns.tolist()}")
@@ -980,13 +1012,14 @@ class SalsaDataModel(BaseDescansosDataModel):
             df_disponibilidade = pd.DataFrame()
             try:
                 self.logger.info("Loading df_disponibilidade from data manager")
-                df_disponibilidade = data_manager.load_data(
+                df_disponibilidade = load_bound_query(
+                    data_manager,
                     entity='df_disponibilidade',
                     query_file=self.config_manager.paths.sql_auxiliary_paths.get('df_disponibilidade'),
-                    process_id="'" + str(process_id) + "'",
+                    process_id=process_id,
                     start_date=first_date_passado,
                     end_date=last_date_passado,
-                    colabs_id=create_employee_query_string(past_employees_id_list)
+                    colabs_id=past_employees_id_list
                 )
                 if df_disponibilidade.empty:
                     self.logger.info("df_disponibilidade is empty - no availability restrictions found")
@@ -1069,11 +1102,12 @@ class SalsaDataModel(BaseDescansosDataModel):
             df_pro_emp_mov_raw = pd.DataFrame()
             try:
                 self.logger.info("Loading df_pro_emp_mov from data manager")
-                df_pro_emp_mov_raw = data_manager.load_data(
+                df_pro_emp_mov_raw = load_bound_query(
+                    data_manager,
                     'df_pro_emp_mov',
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_pro_emp_mov'],
-                    process_id="'" + str(process_id) + "'",
-                    colabs_id=create_employee_query_string(past_employees_id_list)
+                    process_id=process_id,
+                    colabs_id=past_employees_id_list
                 )
                 self.logger.info(f"df_pro_emp_mov shape (rows {df_pro_emp_mov_raw.shape[0]}, columns {df_pro_emp_mov_raw.shape[1]}): {df_pro_emp_mov_raw.columns.tolist()}")
 
@@ -1139,6 +1173,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.auxiliary_data['employees_id_by_posto_dict'] = employees_id_by_posto_dict
 
                 # Save important information in algorithm_treatment_params
+                self.algorithm_treatment_params['posto_id'] = posto_id
                 self.algorithm_treatment_params['employees_id_list_for_posto'] = employees_id_list_for_posto
                 self.algorithm_treatment_params['employees_id_90_list'] = employees_id_90_list
                 self.algorithm_treatment_params['df_process_rules'] = df_process_rules_merged.copy()
@@ -1228,12 +1263,13 @@ class SalsaDataModel(BaseDescansosDataModel):
 
             try:
                 self.logger.info("Loading df_calendario_passado")
-                df_calendario_passado = data_manager.load_data(
+                df_calendario_passado = load_bound_query(
+                    data_manager,
                     'df_calendario_passado', 
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_calendario_passado'], 
                     start_date=first_date_passado, 
                     end_date=last_date_passado, 
-                    colabs=create_employee_query_string(past_employees_id_list)
+                    colabs=past_employees_id_list
                 )
                 self.logger.info(f"df_calendario_passado shape (rows {df_calendario_passado.shape[0]}, columns {df_calendario_passado.shape[1]}): {df_calendario_passado.columns.tolist()}")
             except Exception as e:
@@ -1277,10 +1313,11 @@ class SalsaDataModel(BaseDescansosDataModel):
                 self.logger.info(f"Retrieved {len(matriculas_for_posto)} matriculas for employees_id_list_for_posto")
                 
                 # Ausencias ferias information
-                df_ausencias_ferias = data_manager.load_data(
+                df_ausencias_ferias = load_bound_query(
+                    data_manager,
                     'df_ausencias_ferias', 
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_ausencias_ferias'], 
-                    colabs_id=create_employee_query_string(matriculas_for_posto),
+                    colabs_id=matriculas_for_posto,
                     start_date=first_date_passado,
                     end_date=last_date_passado
                 )
@@ -1329,18 +1366,19 @@ class SalsaDataModel(BaseDescansosDataModel):
                 return False, "errSubproc", "Error treating ausencias_ferias"
 
             if not df_ausencias_ferias.empty and not validate_df_ausencias_ferias(df_ausencias_ferias):
-                self.logger.error(f"df_ausencias_ferias not valid: {df_ausencias_ferias}")
+                self.logger.error("df_ausencias_ferias not valid: %s", summarize(df_ausencias_ferias))
                 return False, "errSubproc", "df_ausencias_ferias validation failed"
 
             try:
                 self.logger.info("Loading df_ciclos_completos_folgas_ciclos from data manager")
-                df_ciclos_completos_folgas_ciclos = data_manager.load_data(
+                df_ciclos_completos_folgas_ciclos = load_bound_query(
+                    data_manager,
                     'df_ciclos_completos_folgas_ciclos',
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_ciclos_completos_folgas_ciclos'],
                     process_id=process_id,
                     start_date=start_date_str,
                     end_date=end_date_str,
-                    colabs_id=create_employee_query_string(employees_id_list_for_posto),
+                    colabs_id=employees_id_list_for_posto,
                 )
                 self.logger.info(f"df_ciclos_completos_folgas_ciclos shape (rows {df_ciclos_completos_folgas_ciclos.shape[0]}, columns {df_ciclos_completos_folgas_ciclos.shape[1]}): {df_ciclos_completos_folgas_ciclos.columns.tolist()}")
             except Exception as e:
@@ -1378,10 +1416,11 @@ class SalsaDataModel(BaseDescansosDataModel):
                 
                 self.logger.info(f"Retrieved {len(matriculas_for_posto)} matriculas for employees_id_list_for_posto (df_days_off)")
                 
-                df_days_off = data_manager.load_data(
+                df_days_off = load_bound_query(
+                    data_manager,
                     'df_days_off', 
                     query_file=self.config_manager.paths.sql_auxiliary_paths['df_days_off'], 
-                    colabs_id=create_employee_query_string(matriculas_for_posto)
+                    colabs_id=matriculas_for_posto
                 )
                 if df_days_off.empty:
                     df_days_off = pd.DataFrame(columns=pd.Index(['employee_id', 'schedule_dt', 'sched_type']))
@@ -1519,24 +1558,26 @@ class SalsaDataModel(BaseDescansosDataModel):
                     self.logger.error(f"Failed to add date-related columns: {error_msg}")
                     return False, "errSubproc", error_msg
 
-                success, df_calendario, error_msg = add_shift_info_from_ciclos(df_calendario, df_ciclos)
+                # df_calendario is built above and only reassigned from here on, so the layers
+                # update it in place instead of copying it once per step
+                success, df_calendario, error_msg = add_shift_info_from_ciclos(df_calendario, df_ciclos, copy=False)
                 if not success:
                     self.logger.error(f"Adding shift info from ciclos failed: {error_msg}")
                     return False, "errSubproc", error_msg
 
-                success, df_calendario, error_msg = add_tipo_ciclo_to_calendario(df_calendario, df_ciclos)
+                success, df_calendario, error_msg = add_tipo_ciclo_to_calendario(df_calendario, df_ciclos, copy=False)
                 if not success:
                     self.logger.error(f"Adding tipo_ciclo to calendario failed: {error_msg}")
                     return False, "errSubproc", error_msg
 
                 # Add df_ausencias_ferias to df_calendario
-                success, df_calendario, error_msg = add_ausencias_ferias(df_calendario, df_ausencias_ferias)
+                success, df_calendario, error_msg = add_ausencias_ferias(df_calendario, df_ausencias_ferias, copy=False)
                 if not success:
                     self.logger.error(f"Adding ausencias ferias failed: {error_msg}")
                     return False, "errSubproc", error_msg
 
                 # Apply all cycle day-type horario codes to df_calendario
-                success, df_calendario, error_msg = add_ciclos_completos(df_calendario, df_ciclos)
+                success, df_calendario, error_msg = add_ciclos_completos(df_calendario, df_ciclos, copy=False)
                 if not success:
                     self.logger.error(f"Adding ciclos failed: {error_msg}")
                     return False, "errSubproc", error_msg
@@ -1548,7 +1589,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                     return False, "errSubproc", error_msg
                 
                 # Add df_calendario_passado to df_calendario
-                success, df_calendario, error_msg = add_calendario_passado(df_calendario, df_calendario_passado)
+                success, df_calendario, error_msg = add_calendario_passado(df_calendario, df_calendario_passado, copy=False)
                 if not success:
                     self.logger.error(f"Adding calendario passado failed: {error_msg}")
                     return False, "errSubproc", error_msg
@@ -1839,6 +1880,7 @@ class SalsaDataModel(BaseDescansosDataModel):
                 
                 # Load ECI sibling section results (empty df if non-ECI)
                 df_eci_section_results = self.auxiliary_data.get('df_eci_section_results', pd.DataFrame()).copy()
+                df_eci_allocated_counts = self.auxiliary_data.get('df_eci_allocated_counts')
 
                 main_year = self.auxiliary_data['main_year']
                 start_date = self.external_call_data.get('start_date')
@@ -1997,6 +2039,7 @@ class SalsaDataModel(BaseDescansosDataModel):
             success, df_estimativas, error_msg = calculate_and_merge_allocated_employees(
                 df_estimativas=df_estimativas,
                 df_eci_section_results=df_eci_section_results,
+                eci_allocated_counts=df_eci_allocated_counts,
                 date_col_est='schedule_day',
                 shift_col_est='turno',
                 param_pess_obj=param_pess_obj
@@ -2117,29 +2160,14 @@ class SalsaDataModel(BaseDescansosDataModel):
                 process_id = self.external_call_data.get("current_process_id", "")
                 posto_id = self.auxiliary_data.get("current_posto_id", "")
                 
-                df_colaborador.to_csv(
-                    os.path.join(output_dir, f'df_colaborador-{process_id}-{posto_id}.csv'),
-                    index=False,
-                    encoding='utf-8'
-                )
-                df_calendario.to_csv(
-                    os.path.join(output_dir, f'df_calendario-{process_id}-{posto_id}.csv'),
-                    index=False,
-                    encoding='utf-8'
-                )
-                df_estimativas.to_csv(
-                    os.path.join(output_dir, f'df_estimativas-{process_id}-{posto_id}.csv'),
-                    index=False,
-                    encoding='utf-8'
-                )
+                debug_writer = get_debug_writer()
+                debug_writer.submit(df_colaborador, os.path.join(output_dir, f'df_colaborador-{process_id}-{posto_id}.csv'))
+                debug_writer.submit(df_calendario, os.path.join(output_dir, f'df_calendario-{process_id}-{posto_id}.csv'))
+                debug_writer.submit(df_estimativas, os.path.join(output_dir, f'df_estimativas-{process_id}-{posto_id}.csv'))
                 df_annual_debug = self.auxiliary_data.get('df_annual_variables')
                 if df_annual_debug is not None and not df_annual_debug.empty:
-                    df_annual_debug.to_csv(
-                        os.path.join(output_dir, f'df_annual_variables-{process_id}-{posto_id}.csv'),
-                        index=False,
-                        encoding='utf-8',
-                    )
-                self.logger.info("CSV debug files saved successfully")
+                    debug_writer.submit(df_annual_debug, os.path.join(output_dir, f'df_annual_variables-{process_id}-{posto_id}.csv'))
+                self.logger.info(f"Debug files queued (mode: {debug_writer.mode})")
             except Exception as csv_error:
                 self.logger.warning(f"Failed to save CSV debug files: {csv_error}")
             
@@ -0,0 +1,177 @@
+"""
+Debug artefacts (intermediate DataFrames, solver schedules) written off the critical path.
+
+The mode comes from system_settings['debug_artefacts']:
+    off     - nothing is written
+    csv     - fast CSV files
+    parquet - Parquet files (falls back to CSV when pyarrow is not installed)
+    excel   - .xlsx files through openpyxl (slow, for local analysis)
+
+Writes are queued and executed by a single background thread so the pipeline
+never waits on disk or openpyxl. When the queue is full the artefact is
+dropped with a warning instead of blocking.
+"""
+
+import atexit
+import importlib.util
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+import pandas as pd
+
+DEBUG_ARTEFACT_MODES = ('off', 'csv', 'parquet', 'excel')
+
+_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'excel': '.xlsx'}
+
+
+class DebugArtefactWriter:
+    """Queue + background thread writing DataFrames in the configured format."""
+
+    def __init__(self, mode: str = 'csv', queue_size: int = 32, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            mode: One of DEBUG_ARTEFACT_MODES
+            queue_size: Maximum artefacts waiting to be written
+            logger: Logger used to report written/dropped artefacts
+        """
+        if mode not in DEBUG_ARTEFACT_MODES:
+            raise ValueError(f"Invalid debug artefact mode '{mode}'. Options: {DEBUG_ARTEFACT_MODES}")
+        self.mode = mode
+        self.logger = logger or logging.getLogger(__name__)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        if mode == 'parquet':
+            if importlib.util.find_spec('pyarrow') is None:
+                self.logger.warning("pyarrow not installed, debug artefacts will be written as CSV")
+                self.mode = 'csv'
+
+    @property
+    def enabled(self) -> bool:
+        """False when artefacts are disabled; callers can skip building them."""
+        return self.mode != 'off'
+
+    def artefact_path(self, path: str) -> str:
+        """Replace the extension of path with the one of the configured format."""
+        return os.path.splitext(path)[0] + _EXTENSIONS.get(self.mode, '')
+
+    def submit(self, df: pd.DataFrame, path: str, index: bool = False) -> Optional[str]:
+        """
+        Queue a DataFrame to be written. A copy is taken so the caller may keep mutating df.
+
+        Args:
+            df: DataFrame to write
+            path: Target file; the extension is replaced according to the mode
+            index: Whether to write the index
+
+        Returns:
+            Final file path, or None when disabled or dropped
+        """
+        if not self.enabled or df is None:
+            return None
+        target = self.artefact_path(path)
+        try:
+            self._queue.put_nowait((df.copy(), target, index))
+        except queue.Full:
+            self.logger.warning(f"Debug artefact queue full, dropping {target}")
+            return None
+        self._ensure_thread()
+        return target
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until queued artefacts are written.
+
+        Returns:
+            True if the queue was drained within the timeout
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        waiter = threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True)
+        waiter.start()
+        return done.wait(timeout)
+
+    def _ensure_thread(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='debug-artefact-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            df, target, index = self._queue.get()
+            try:
+                self._write(df, target, index)
+            except Exception as e:
+                self.logger.warning(f"Failed to write debug artefact {target}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, df: pd.DataFrame, target: str, index: bool) -> None:
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        if self.mode == 'csv':
+            df.to_csv(target, index=index, encoding='utf-8')
+        elif self.mode == 'parquet':
+            # Parquet needs string column names and homogeneous object columns
+            df = df.copy()
+            df.columns = [str(col) for col in df.columns]
+            for col in df.columns[df.dtypes == object]:
+                df[col] = df[col].astype(str)
+            df.to_parquet(target, index=index)
+        elif self.mode == 'excel':
+            df.to_excel(target, index=index)
+        self.logger.info(f"Debug artefact saved to: {target}")
+
+
+_debug_writer: Optional[DebugArtefactWriter] = None
+
+
+def get_debug_writer() -> DebugArtefactWriter:
+    """Process-wide writer built from system_settings['debug_artefacts']."""
+    global _debug_writer
+    if _debug_writer is None:
+        from base_data_project.log_config import get_logger
+        from src.configuration_manager.instance import get_config as get_config_manager
+
+        config_manager = get_config_manager()
+        artefacts_config = config_manager.system.debug_artefacts_config
+        mode = artefacts_config.get('mode', 'csv')
+        if config_manager.system.is_production_environment():
+            mode = artefacts_config.get('production_mode', mode)
+        _debug_writer = DebugArtefactWriter(
+            mode=mode,
+            queue_size=artefacts_config.get('queue_size', 32),
+            logger=get_logger(config_manager.system.project_name)
+        )
+        atexit.register(_debug_writer.flush, artefacts_config.get('flush_timeout_seconds', 30))
+    return _debug_writer
+
+
+def flush_debug_writer(timeout: Optional[float] = None) -> bool:
+    """
+    Write the artefacts still queued by this process's writer (if one was created).
+
+    The atexit flush only runs when a spawned child exits cleanly: a fork child ends with
+    os._exit() and a terminated one never gets there. Process entry points (child_runner,
+    the API job child) therefore call this before returning.
+
+    Args:
+        timeout: Seconds to wait, defaults to system_settings['debug_artefacts']['flush_timeout_seconds']
+
+    Returns:
+        True if the queue was drained within the timeout
+    """
+    if _debug_writer is None:
+        return True
+    if timeout is None:
+        from src.configuration_manager.instance import get_config as get_config_manager
+
+        timeout = get_config_manager().system.debug_artefacts_config.get('flush_timeout_seconds', 30)
+    drained = _debug_writer.flush(timeout)
+    if not drained:
+        _debug_writer.logger.warning(f"Debug artefacts still queued after {timeout}s, some files were not written")
+    return drained
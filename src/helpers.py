@@ -13,7 +13,9 @@ from typing import List, Dict, Any, Optional, Tuple
 # Local stuff
 from src.configuration_manager.instance import get_config as get_config_manager
 from src.orquestrador_functions.Classes.Connection.connect import ensure_connection_with_config
-from base_data_project.log_config import get_logger
+from src.debug_artefacts import get_debug_writer
+from src.structured_logging import get_module_logger, lazy, summarize
+from src.data_models.functions.parameter_index import get_parameter_index
 from base_data_project.data_manager.managers.managers import BaseDataManager, DBDataManager
 
 from src.orquestrador_functions.Logs.message_loader import set_messages, get_message_lang
@@ -40,7 +42,7 @@ def _feasibility_cap_dayoff_label(field: str, lang: str) -> str:
     return labels.get(lang, labels.get('EN', labels.get('ES', field)))
 
 # Set up logger
-logger = get_logger(get_config_manager().system.project_name)
+logger = get_module_logger(__name__)
 
 def log_process_event(message_key: str, df_messages: pd.DataFrame, data_manager: BaseDataManager, external_call_data: dict, values_replace_dict: dict, level: str = 'INFO'):
     """
@@ -349,6 +351,80 @@ def log_max_consecutive_working_days_errors(
     return logged
 
 
+# Rows written per infeasibility diagnosis, one per (constraint family, employee)
+MAX_INFEASIBILITY_EVENTS = 50
+
+_ALL_EMPLOYEES_LABEL = {'ES': 'todos', 'PT': 'todos', 'EN': 'all'}
+
+
+def log_infeasibility_diagnosis(
+    connection,
+    path_os: str,
+    fk_process,
+    process_type: str,
+    df_messages: pd.DataFrame,
+    error_events: List[dict],
+    *,
+    user: str = 'WFM',
+    child_num: str = '1',
+    posto_id=None,
+) -> int:
+    """
+    Persist the conflicting constraint families of an infeasible model to wfm.esc_processo_erros.
+
+    error_events come from InfeasibilityDiagnosis.events() (src/algorithms/solver/infeasibility.py):
+    one per (family, employee), employee None for constraints over several employees.
+    Each is logged as type_error='E', at most MAX_INFEASIBILITY_EVENTS of them.
+    """
+    if connection is None or not error_events or df_messages is None or df_messages.empty:
+        return 0
+
+    lang = get_message_lang().upper()
+    if len(error_events) > MAX_INFEASIBILITY_EVENTS:
+        logger.warning(
+            f"Infeasibility diagnosis has {len(error_events)} events, logging the first {MAX_INFEASIBILITY_EVENTS}"
+        )
+    logged = 0
+    for event in error_events[:MAX_INFEASIBILITY_EVENTS]:
+        emp_id = event.get('employee_id')
+        placeholder_values = {
+            '1': child_num,
+            '2': str(event.get('constraint', '')),
+            '3': str(emp_id) if emp_id is not None else _ALL_EMPLOYEES_LABEL.get(lang, 'all'),
+            '4': str(event.get('period_begin', '') or ''),
+            '5': str(event.get('period_end', '') or ''),
+            '6': str(posto_id or ''),
+        }
+        description = set_messages(df_messages, 'ERR_INFEASIBLE_CONSTRAINTS', placeholder_values)
+        if not description:
+            description = (
+                f"Subprocesso {child_num}: modelo infactivel pela restricao {event.get('constraint')} "
+                f"do colaborador {placeholder_values['3']} no periodo {event.get('period_begin')}-"
+                f"{event.get('period_end')}. Posto {posto_id or ''}"
+            )
+
+        try:
+            employee_id = int(emp_id) if emp_id is not None and str(emp_id).strip() != '' else None
+        except (TypeError, ValueError):
+            employee_id = None
+
+        ok = set_process_errors(
+            connection=connection,
+            pathOS=path_os,
+            user=user,
+            fk_process=fk_process,
+            type_error='E',
+            process_type=process_type,
+            error_code=None,
+            description=description,
+            employee_id=employee_id,
+            schedule_day=str(event.get('period_begin')) if event.get('period_begin') else None,
+        )
+        if ok:
+            logged += 1
+    return logged
+
+
 def replace_placeholders(template, values_dict):
     """
     Replaces placeholders in the template string with corresponding values from the values dictionary.
@@ -732,7 +808,7 @@ def create_mt_mtt_cycles(df_alg_variables_filtered: pd.DataFrame, reshaped_final
         logger.info(f"Initial reshaped_final_3 shape: {reshaped_final_3.shape}")
         logger.info(f"df_alg_variables_filtered shape: {df_alg_variables_filtered.shape}")
         logger.info(f"df_alg_variables_filtered columns: {df_alg_variables_filtered.columns.tolist()}")
-        logger.info(f"df_alg_variables_filtered:\n{df_alg_variables_filtered}")
+        logger.debug("df_alg_variables_filtered:\n%s", summarize(df_alg_variables_filtered))
         
         # Reset column names and row names
         reshaped_final_3.columns = range(reshaped_final_3.shape[1])
@@ -1379,7 +1455,7 @@ def load_wfm_scheds(df_pre_ger: pd.DataFrame, employees_tot_pad: List[str]) -> T
         # Basic processing
         df_pre_ger = df_pre_ger.copy()
         logger.info(f"load_wfm_scheds - Input df_pre_ger shape: {df_pre_ger.shape}, columns: {df_pre_ger.columns.tolist()}")
-        logger.info(f"load_wfm_scheds - First 5 rows BEFORE column rename:\n{df_pre_ger.head()}")
+        logger.debug("load_wfm_scheds - First rows BEFORE column rename:\n%s", summarize(df_pre_ger))
         
         df_pre_ger.columns = ['employee_id'] + list(df_pre_ger.columns[1:])
         
@@ -1387,15 +1463,15 @@ def load_wfm_scheds(df_pre_ger: pd.DataFrame, employees_tot_pad: List[str]) -> T
         if 'TYPE' in df_pre_ger.columns or 'type' in df_pre_ger.columns:
             logger.info(f"load_wfm_scheds - TYPE/SUBTYPE found, will convert via convert_types_in()")
             if 'TYPE' in df_pre_ger.columns:
-                logger.info(f"TYPE/SUBTYPE combinations:\n{df_pre_ger[['TYPE', 'SUBTYPE']].value_counts().head(20)}")
+                logger.debug("TYPE/SUBTYPE combinations:\n%s", lazy(lambda: df_pre_ger[['TYPE', 'SUBTYPE']].value_counts().head(20)))
             elif 'type' in df_pre_ger.columns:
-                logger.info(f"type/subtype combinations:\n{df_pre_ger[['type', 'subtype']].value_counts().head(20)}")
+                logger.debug("type/subtype combinations:\n%s", lazy(lambda: df_pre_ger[['type', 'subtype']].value_counts().head(20)))
         
         # Convert WFM types to TRADS and get unique employees
         df_pre_ger = convert_types_in(df_pre_ger)
-        logger.info(f"load_wfm_scheds - AFTER convert_types_in, first 5 rows:\n{df_pre_ger.head()}")
+        logger.debug("load_wfm_scheds - AFTER convert_types_in:\n%s", summarize(df_pre_ger))
         if 'sched_subtype' in df_pre_ger.columns:
-            logger.info(f"sched_subtype value counts after conversion:\n{df_pre_ger['sched_subtype'].value_counts()}")
+            logger.debug("sched_subtype value counts after conversion:\n%s", lazy(lambda: df_pre_ger['sched_subtype'].value_counts()))
         
         emp_pre_ger = df_pre_ger['employee_id'].unique().tolist()
         
@@ -1452,7 +1528,7 @@ def convert_types_in(df: pd.DataFrame) -> pd.DataFrame:
     )
     df['ind'] = 'P'
     
-    logger.info(f"convert_types_in - Conversion complete. sched_subtype value counts:\n{df['sched_subtype'].value_counts()}")
+    logger.debug("convert_types_in - Conversion complete. sched_subtype value counts:\n%s", lazy(lambda: df['sched_subtype'].value_counts()))
     
     return df
 
@@ -1825,127 +1901,15 @@ def get_param_for_posto(df, posto_id, unit_id, secao_id, params_names_list=None)
     if params_names_list is None or len(params_names_list) == 0 or not isinstance(params_names_list, list):
         logger.error(f"params_names_list is None or empty")
         return None
-    posto_id = str(posto_id)
-    secao_id = str(secao_id)
-    unit_id = str(unit_id)
-    # Filter by parameter names only initially
-    df_filtered = df[df['sys_p_name'].isin(params_names_list)].copy()
-    
-    logger.info(f"DEBUG: Input parameters - posto_id: {posto_id}, secao_id: {secao_id}, unit_id: {unit_id}")
-    logger.info(f"DEBUG: df_filtered initial (after param names filter):\n {df_filtered}")
-    
-    # Keep all potentially relevant rows based on hierarchy rules
-    # Build conditions that match the hierarchy patterns
-    
-    conditions = []
-    
-    # 1. Posto-specific: fk_tipo_posto = posto_id (most specific)
-    if posto_id is not None:
-        posto_condition = (df_filtered['fk_tipo_posto'] == posto_id)
-        conditions.append(posto_condition)
-        logger.info(f"DEBUG: Added posto condition for posto_id={posto_id}")
-    
-    # 2. Section-specific: fk_tipo_posto is null AND fk_secao = secao_id
-    if secao_id is not None:
-        section_condition = (
-            (df_filtered['fk_tipo_posto'].isna()) & 
-            (df_filtered['fk_secao'] == secao_id)
-        )
-        conditions.append(section_condition)
-        logger.info(f"DEBUG: Added section condition for secao_id={secao_id}")
-        
-        # Debug: check which rows match this condition
-        matching_section = df_filtered[section_condition]
-        logger.info(f"DEBUG: Rows matching section condition:\n {matching_section}")
-    
-    # 3. Unit-specific: fk_tipo_posto is null AND fk_secao is null AND fk_unidade = unit_id
-    if unit_id is not None and str(unit_id).strip():
-        unit_condition = (
-            (df_filtered['fk_tipo_posto'].isna()) & 
-            (df_filtered['fk_secao'].isna()) & 
-            (df_filtered['fk_unidade'].astype(str) == str(unit_id).strip())
-        )
-        conditions.append(unit_condition)
-        logger.info(f"DEBUG: Added unit condition for unit_id={unit_id}")
-    
-    # 4. Default: all main FKs are null (fallback)
-    default_condition = (
-        (df_filtered['fk_tipo_posto'].isna()) & 
-        (df_filtered['fk_secao'].isna()) & 
-        (df_filtered['fk_unidade'].isna()) &
-        (df_filtered['fk_grupo'].isna())
-    )
-    conditions.append(default_condition)
-    logger.info(f"DEBUG: Added default condition")
-    
-    # Combine all conditions with OR
-    if conditions:
-        final_condition = conditions[0]
-        for condition in conditions[1:]:
-            final_condition = final_condition | condition
-        df_filtered = df_filtered[final_condition]
-    
-    # Remove duplicates
-    df_filtered = df_filtered.drop_duplicates()
 
-    logger.info(f"DEBUG: df_filtered after hierarchy filtering in helpers.py:\n {df_filtered}")
-    
-    # Now apply hierarchy for each parameter
+    # Indexed once per params DataFrame, see ParameterIndex
+    index = get_parameter_index(df)
     params_dict = {}
-    
     for param_name in params_names_list:
-        param_rows = df_filtered[df_filtered['sys_p_name'] == param_name]
-        
-        # Priority 1: Exact posto_id match (most specific)
-        if posto_id is not None:
-            posto_specific = param_rows[param_rows['fk_tipo_posto'] == posto_id]
-            if not posto_specific.empty:
-                value = get_value_from_row(posto_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    logger.info(f"DEBUG: Found posto-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 2: Section-specific (fk_tipo_posto is null, fk_secao matches)
-        if secao_id is not None:
-            section_specific = param_rows[
-                (param_rows['fk_tipo_posto'].isna()) & 
-                (param_rows['fk_secao'] == secao_id)
-            ]
-            if not section_specific.empty:
-                value = get_value_from_row(section_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    logger.info(f"DEBUG: Found section-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 3: Unit-specific (fk_tipo_posto and fk_secao are null, fk_unidade matches)
-        if unit_id is not None and str(unit_id).strip():
-            unit_specific = param_rows[
-                (param_rows['fk_tipo_posto'].isna()) & 
-                (param_rows['fk_secao'].isna()) & 
-                (param_rows['fk_unidade'].astype(str) == str(unit_id).strip())
-            ]
-            if not unit_specific.empty:
-                value = get_value_from_row(unit_specific.iloc[0])
-                if value is not None:
-                    params_dict[param_name] = value
-                    logger.info(f"DEBUG: Found unit-specific param {param_name}:{value}")
-                    continue
-        
-        # Priority 4: Default (all FKs are null)
-        default_rows = param_rows[
-            (param_rows['fk_tipo_posto'].isna()) & 
-            (param_rows['fk_secao'].isna()) & 
-            (param_rows['fk_unidade'].isna()) &
-            (param_rows['fk_grupo'].isna())
-        ]
-        if not default_rows.empty:
-            value = get_value_from_row(default_rows.iloc[0])
-            if value is not None:
-                params_dict[param_name] = value
-                logger.info(f"DEBUG: Found default param {param_name}:{value}")
-    
+        level, value = index.lookup(param_name, posto_id, unit_id, secao_id)
+        if level is not None:
+            params_dict[param_name] = value
+            logger.debug("Found %s-level param %s:%s (posto_id=%s)", level, param_name, value, posto_id)
     return params_dict
 
 def get_value_from_row(row):
@@ -2414,8 +2378,7 @@ def _format_schedules(algorithm_results: pd.DataFrame, start_date: str, end_date
                 )
                 
                 # Clean up the Day column to extract day numbers
-                logger.info(f"DEBUG: melted_df['Day'] type: {type(melted_df['Day'])}")
-                logger.info(f"DEBUG: melted_df['Day'].str.replace('Day ', ''): {melted_df['Day'].str.replace('Day ', '')}")
+                logger.debug("melted_df['Day']: %s", summarize(melted_df['Day']))
                 melted_df['Day'] = melted_df['Day'].str.replace('Day_', '').astype(int)
                 
                 # Convert day numbers to actual dates if start_date is available
@@ -2520,17 +2483,19 @@ def _validate_solution(algorithm_results: pd.DataFrame) -> Dict[str, Any]:
 def _create_export_info(process_id: int, ROOT_DIR) -> Dict[str, Any]:
     """Create export information."""
     try:
-        # Get output filename from ROOT_DIR
-        output_filename = os.path.join(ROOT_DIR, 'data', 'output', f'salsa_schedule_{process_id}.xlsx')
+        # Get output filename from ROOT_DIR, extension depends on the debug artefact mode
+        debug_writer = get_debug_writer()
+        output_filename = debug_writer.artefact_path(os.path.join(ROOT_DIR, 'data', 'output', f'salsa_schedule_{process_id}'))
         
         return {
             'export_files': {
-                'excel_file': output_filename,
-                'csv_file': None,
+                'excel_file': output_filename if debug_writer.mode == 'excel' else None,
+                'csv_file': output_filename if debug_writer.mode == 'csv' else None,
+                'parquet_file': output_filename if debug_writer.mode == 'parquet' else None,
                 'json_file': None
             },
             'export_timestamp': datetime.now().isoformat(),
-            'export_status': 'completed'
+            'export_status': 'completed' if debug_writer.enabled else 'disabled'
         }
     except Exception as e:
         logger.error(f"Error creating export info: {e}")
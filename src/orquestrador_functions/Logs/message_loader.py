@@ -6,7 +6,10 @@ Created on Mon Oct 28 15:06:29 2024
 """
 
 import os
+import re
+import threading
 import unicodedata
+import weakref
 
 import pandas as pd
 
@@ -121,13 +124,27 @@ def get_df_messages_path(project_root_dir: str | None = None) -> str:
 
 
 def load_df_messages(project_root_dir: str | None = None) -> pd.DataFrame:
-    """Load df_messages from the path configured in system settings."""
+    """
+    Load df_messages from the path configured in system settings.
+
+    The file is read once per process (again only when its mtime changes) and its
+    MessageCatalog is compiled at the same time. The returned DataFrame is shared
+    between callers and must be treated as read-only.
+    """
     path = get_df_messages_path(project_root_dir)
     try:
+        mtime = os.path.getmtime(path)
+        with _messages_lock:
+            cached = _messages_cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
         df_msg = pd.read_csv(path, sep=',', encoding='utf-8')
         first_col = str(df_msg.columns[0])
         if first_col != 'VAR':
             df_msg.rename(columns={first_col: 'VAR'}, inplace=True)
+        get_message_catalog(df_msg)
+        with _messages_lock:
+            _messages_cache[path] = (mtime, df_msg)
         return df_msg
     except Exception as e:
         print(f"Error loading df_messages from {path}: {e}")
@@ -149,6 +166,108 @@ def _resolve_message_template(message_row: pd.Series, df_msg: pd.DataFrame, lang
     return ''
 
 
+_PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+# (mtime, df_msg) per df_messages path, see load_df_messages
+_messages_cache: dict[str, tuple[float, pd.DataFrame]] = {}
+# id(df_msg) -> (weakref to df_msg, row count, compiled catalogue), see get_message_catalog
+_catalog_cache: dict[int, tuple] = {}
+_messages_lock = threading.Lock()
+
+
+class MessageTemplate:
+    """Message template split once into literal text and placeholder names."""
+
+    __slots__ = ('text', '_parts', '_tail')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._parts: list[tuple[str, str]] = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(text):
+            self._parts.append((text[position:match.start()], match.group(1)))
+            position = match.end()
+        self._tail = text[position:]
+
+    def render(self, values: dict | None) -> str:
+        """Substitute {name} placeholders; placeholders without a value are kept as-is."""
+        if not self._parts:
+            return self.text
+        values = {str(name): value for name, value in (values or {}).items()}
+        pieces = []
+        for literal, name in self._parts:
+            pieces.append(literal)
+            pieces.append(str(values[name]) if name in values else f"{{{name}}}")
+        pieces.append(self._tail)
+        return ''.join(pieces)
+
+
+class MessageCatalog:
+    """
+    df_messages compiled into {(VAR, lang): MessageTemplate}.
+
+    The language fallback of set_messages (requested language, then EN, ES, PT,
+    then DESC) is resolved while compiling, so a lookup is a dict access.
+    """
+
+    # Key of the fallback chain used for languages that have no column
+    _ANY_LANG = '*'
+
+    def __init__(self, templates: dict[tuple[str, str], MessageTemplate]):
+        self._templates = templates
+
+    @classmethod
+    def from_frame(cls, df_msg: pd.DataFrame) -> 'MessageCatalog':
+        """Compile every VAR of df_msg (the first row wins for duplicated VARs)."""
+        templates: dict[tuple[str, str], MessageTemplate] = {}
+        if df_msg is None or df_msg.empty or 'VAR' not in df_msg.columns:
+            return cls(templates)
+        langs = [col for col in _SUPPORTED_MESSAGE_LANGS if col in df_msg.columns]
+        langs += [str(col) for col in df_msg.columns if col not in ('VAR', 'DESC') and col not in langs]
+        for row in df_msg.drop_duplicates('VAR', keep='first').to_dict('records'):
+            var = row['VAR']
+            for lang in langs + [cls._ANY_LANG]:
+                text = _resolve_message_template(row, df_msg, lang)
+                if not text and 'DESC' in df_msg.columns:
+                    desc = row.get('DESC')
+                    text = str(desc) if pd.notna(desc) and str(desc).strip() else ''
+                if text:
+                    templates[(var, lang)] = MessageTemplate(text)
+        return cls(templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, var, lang: str) -> MessageTemplate | None:
+        lang = str(lang).upper()
+        template = self._templates.get((var, lang))
+        if template is None:
+            template = self._templates.get((var, self._ANY_LANG))
+        return template
+
+    def render(self, var, values: dict | None, lang: str | None = None) -> str:
+        """Formatted message for var, '' when var is unknown."""
+        template = self.get(var, lang or get_message_lang())
+        return template.render(values) if template is not None else ""
+
+
+def get_message_catalog(df_msg: pd.DataFrame) -> MessageCatalog:
+    """MessageCatalog of df_msg, compiled on first use and reused while df_msg is alive."""
+    key = id(df_msg)
+    with _messages_lock:
+        cached = _catalog_cache.get(key)
+    if cached is not None and cached[0]() is df_msg and cached[1] == len(df_msg):
+        return cached[2]
+    catalog = MessageCatalog.from_frame(df_msg)
+    try:
+        reference = weakref.ref(df_msg, lambda _ref, key=key: _catalog_cache.pop(key, None))
+    except TypeError:
+        return catalog
+    with _messages_lock:
+        _catalog_cache[key] = (reference, len(df_msg), catalog)
+    return catalog
+
+
 def get_messages(path_os, lang=_DEFAULT_MESSAGE_LANG):
     """
     Reads df_messages and filters to the requested language column.
@@ -197,6 +316,8 @@ def set_messages(df_msg, var, values, lang=None):
     """
     Retrieves a message template from DataFrame, replaces placeholders, and returns the formatted message.
 
+    Templates come from the MessageCatalog compiled once per df_msg (see get_message_catalog).
+
     Parameters:
         df_msg (pd.DataFrame): DataFrame containing message templates (columns VAR, ES, PT, ...).
         var (str): The variable name to filter the message by.
@@ -212,16 +333,4 @@ def set_messages(df_msg, var, values, lang=None):
     if lang is None:
         lang = get_message_lang()
 
-    message_row = df_msg[df_msg['VAR'] == var]
-    if message_row.empty:
-        return ""
-
-    template = _resolve_message_template(message_row.iloc[0], df_msg, lang)
-    if template:
-        return replace_placeholders(template, values)
-
-    if 'DESC' in df_msg.columns:
-        desc = message_row.iloc[0].get('DESC')
-        if pd.notna(desc) and str(desc).strip():
-            return replace_placeholders(str(desc), values)
-    return ""
+    return get_message_catalog(df_msg).render(var, values, lang)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Entry point executed inside each orchestrator child process.
+
+The child opens its own database connection, runs the batch process and
+updates the WFM status. The exit code tells the daemon what happened
+(see worker_pool.EXIT_SUCCESS / EXIT_PROCESS_FAILED); any other exit code
+is treated as a crash and may be retried.
+"""
+
+import signal
+import sys
+from typing import Any, Dict
+
+from src.orquestrador_functions.Process_Pool.worker_pool import EXIT_PROCESS_FAILED, EXIT_SUCCESS
+
+
+def run_child_process(payload: Dict[str, Any]) -> None:
+    """
+    Run one WFM process. Must stay a top-level function so it can be pickled by the spawn start method.
+
+    Args:
+        payload: Dictionary with path, api_proc_id, api_user, proc_cod, the external_call_dict and
+            the optional process deadline (epoch seconds)
+    """
+    # Shutdown is driven by the parent: ignore Ctrl+C sent to the whole process group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Heavy imports happen here so the daemon module stays light
+    from base_data_project.log_config import get_logger
+    from base_data_project.utils import create_components
+    from batch_process import run_batch_process
+    from src.cancellation import CancellationToken
+    from src.configuration_manager.instance import get_config
+    from src.debug_artefacts import flush_debug_writer
+    from src.helpers import set_process_errors
+    from src.orquestrador_functions.Classes.AlgorithmPrepClasses.ConnectionHandler import ConnectionHandler
+    from src.orquestrador_functions.Logs.message_loader import load_df_messages, set_messages
+    from src.orquestrador_functions.WFM_Process.Setters import set_process_param_status
+
+    config_manager = get_config()
+    logger = get_logger(config_manager.system.project_name)
+
+    path = payload['path']
+    api_user = payload['api_user']
+    proc_cod = payload['proc_cod']
+    external_call_dict = payload['external_call_dict']
+    wfm_proc_id = external_call_dict['wfm_proc_id']
+    cancel_token = CancellationToken(payload.get('deadline'), label=f"process {wfm_proc_id}", logger=logger)
+
+    connection_object = ConnectionHandler()
+    connection_object.connect_to_database()
+    connection = connection_object.ensure_connection()
+    try:
+        df_msg = load_df_messages(path)
+        data_manager, process_manager = create_components(
+            use_db=True,
+            no_tracking=False,
+            config=config_manager,
+            project_name=config_manager.system.project_name
+        )
+        with data_manager:
+            success = run_batch_process(
+                data_manager=data_manager,
+                process_manager=process_manager,
+                algorithm="example_algorithm",
+                external_call_dict=external_call_dict,
+                external_raw_connection=connection,
+                cancel_token=cancel_token
+            )
+
+        connection = connection_object.ensure_connection()
+        if success:
+            logger.info(f"Child finished process {wfm_proc_id} successfully. Setting status G")
+            set_process_param_status(connection, pathOS=path, user=api_user, process_id=wfm_proc_id, new_status='G')
+            set_process_errors(
+                connection,
+                pathOS=path,
+                user=api_user,
+                fk_process=wfm_proc_id,
+                type_error='I',
+                process_type=proc_cod,
+                error_code=None,
+                description=set_messages(df_msg, 'endSubproc', {'1': wfm_proc_id, '2': ''}),
+                employee_id=None,
+                schedule_day=None
+            )
+            exit_code = EXIT_SUCCESS
+        else:
+            logger.info(f"Child failed process {wfm_proc_id}. Setting status I")
+            set_process_param_status(connection, pathOS=path, user=api_user, process_id=wfm_proc_id, new_status='I')
+            exit_code = EXIT_PROCESS_FAILED
+    finally:
+        try:
+            connection_object.disconnect_database()
+        except Exception as e:
+            logger.warning(f"Error closing child connection for process {wfm_proc_id}: {e}")
+        # Write the queued artefacts before exiting: atexit only runs on a clean spawn exit,
+        # not in a fork child (os._exit) nor in one the parent terminates
+        flush_debug_writer()
+
+    sys.exit(exit_code)
@@ -0,0 +1,536 @@
+"""
+Job queue behind the asynchronous API in routes.py.
+
+POST /jobs stores a job in a local SQLite file; a dispatcher thread starts one
+child process per job through the orchestrator WorkerPool. The child runs the
+AlgoritmoGDService stages, reports stage progress and result summaries to the
+same SQLite file and writes the long-format schedule to a CSV file that
+GET /jobs/<id>/schedule streams back. CP-SAT progress events published by the
+solver are stored in job_events for GET /jobs/<id>/events, and a cancel request
+stored on the job stops the running search through the solve event bus.
+
+Only the standard library is imported at module level so the API process stays
+light; the service stack is imported inside the child.
+"""
+
+import json
+import logging
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.orquestrador_functions.Process_Pool.worker_pool import (
+    EXIT_PROCESS_FAILED,
+    EXIT_SUCCESS,
+    PoolJob,
+    WorkerPool,
+    classify_exit,
+)
+
+JOB_QUEUED = 'queued'
+JOB_STARTING = 'starting'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINAL_JOB_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+JOB_STAGES = ('data_loading', 'processing')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    schedule_path TEXT,
+    pid INTEGER,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS job_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, event_id);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class JobStore:
+    """SQLite table of API jobs, shared by the API process and the job children."""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite file, created if missing
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'cancel_requested' not in columns:  # job files created before cancellation existed
+                conn.execute('ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across threads and processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['progress'] = json.loads(job['progress'] or '{}')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+    def create_job(self, params: Dict[str, Any]) -> int:
+        """Insert a queued job and return its id."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO jobs (status, params, created_at) VALUES (?, ?, ?)',
+                (JOB_QUEUED, json.dumps(params, default=str), _now()),
+            )
+            return int(cursor.lastrowid)
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM jobs ORDER BY job_id DESC LIMIT ?', (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def claim_queued(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Atomically move up to limit queued jobs (oldest first) to 'starting'.
+
+        The dispatcher pid is stored until the child replaces it with its own.
+        """
+        if limit <= 0:
+            return []
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? ORDER BY job_id LIMIT ?', (JOB_QUEUED, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE jobs SET status = ?, pid = ? WHERE job_id = ?',
+                [(JOB_STARTING, os.getpid(), row['job_id']) for row in rows]
+            )
+        return [self._to_dict(row) for row in rows]
+
+    def mark_running(self, job_id: int, pid: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, pid = ?, started_at = ? WHERE job_id = ?',
+                (JOB_RUNNING, pid, _now(), job_id),
+            )
+
+    def record_progress(self, job_id: int, stage_name: str, progress: Optional[float] = None,
+                        message: Optional[str] = None, substage: Optional[str] = None) -> None:
+        """Merge the latest progress of one stage into the job progress."""
+        with self._transaction() as conn:
+            row = conn.execute('SELECT progress FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row is None:
+                return
+            all_progress = json.loads(row['progress'] or '{}')
+            stage = all_progress.setdefault(stage_name, {})
+            if progress is not None:
+                stage['progress'] = round(float(progress), 4)
+            if message is not None:
+                stage['message'] = message
+            if substage is not None:
+                stage['substage'] = substage
+            stage['updated_at'] = _now()
+            conn.execute('UPDATE jobs SET progress = ? WHERE job_id = ?', (json.dumps(all_progress), job_id))
+
+    def finish(self, job_id: int, status: str, result: Optional[Dict[str, Any]] = None,
+               error: Optional[str] = None, schedule_path: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, schedule_path = ?, finished_at = ? WHERE job_id = ?',
+                (status, json.dumps(result, default=str) if result is not None else None, error, schedule_path, _now(), job_id),
+            )
+
+    def request_cancel(self, job_id: int) -> Optional[str]:
+        """
+        Cancel a job. A queued job is cancelled straight away; a starting/running job
+        gets its cancel flag set and its child stops the search, keeping the best
+        solution found so far.
+
+        Returns:
+            The job status after the request, None if the job does not exist
+        """
+        with self._transaction() as conn:
+            row = conn.execute('SELECT status FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row['status'] == JOB_QUEUED:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, cancel_requested = 1, error = ?, finished_at = ? WHERE job_id = ?',
+                    (JOB_CANCELLED, 'Cancelled before start', _now(), job_id),
+                )
+                return JOB_CANCELLED
+            if row['status'] not in FINAL_JOB_STATUSES:
+                conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?', (job_id,))
+            return row['status']
+
+    def is_cancel_requested(self, job_id: int) -> bool:
+        with self._connect() as conn:
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def append_event(self, job_id: int, event: Dict[str, Any]) -> int:
+        """Store one solve progress event of a job and return its event id."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO job_events (job_id, event, created_at) VALUES (?, ?, ?)',
+                (job_id, json.dumps(event, default=str), _now()),
+            )
+            return int(cursor.lastrowid)
+
+    def events_since(self, job_id: int, after_event_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Events of a job with event_id > after_event_id, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT event_id, event FROM job_events WHERE job_id = ? AND event_id > ? ORDER BY event_id LIMIT ?',
+                (job_id, after_event_id, limit),
+            ).fetchall()
+        return [{'event_id': row['event_id'], **json.loads(row['event'])} for row in rows]
+
+    def fail_orphaned(self, reason: str) -> int:
+        """Mark starting/running jobs whose process (dispatcher or child) is gone as failed."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT job_id, pid FROM jobs WHERE status IN (?, ?)', (JOB_STARTING, JOB_RUNNING)
+            ).fetchall()
+            orphaned = [row['job_id'] for row in rows if not _pid_alive(row['pid'])]
+            conn.executemany(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?',
+                [(JOB_FAILED, reason, _now(), job_id) for job_id in orphaned]
+            )
+        return len(orphaned)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Dispatcher thread feeding queued jobs to a WorkerPool."""
+
+    def __init__(self, store: JobStore, results_dir: str, max_workers: int = 1,
+                 poll_interval: float = 1.0, logger: Optional[logging.Logger] = None,
+                 target: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Args:
+            store: Job table
+            results_dir: Directory for the per-job schedule CSV files
+            max_workers: Jobs executed at the same time
+            poll_interval: Seconds between dispatcher iterations
+            logger: Logger used by the dispatcher
+            target: Child entry point, run_job by default
+        """
+        self.store = store
+        self.results_dir = results_dir
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.pool = WorkerPool(target or run_job, max_workers, self.logger)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Fail jobs orphaned by a previous API process and start the dispatcher thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        orphaned = self.store.fail_orphaned('Interrupted: the process running the job is gone')
+        if orphaned:
+            self.logger.warning(f"Marked {orphaned} orphaned job(s) as failed")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='api-job-dispatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, params: Dict[str, Any]) -> int:
+        """Queue a job and wake the dispatcher."""
+        job_id = self.store.create_job(params)
+        self._wake.set()
+        return job_id
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop dispatching; running jobs get timeout seconds before being terminated."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if not self.pool.wait_all(timeout):
+            for job in self.pool.terminate_all():
+                self.store.finish(job.wfm_proc_id, JOB_FAILED, error='Terminated on API shutdown')
+
+    def dispatch_once(self) -> None:
+        """Reap finished children and start queued jobs while there is capacity."""
+        for job, exitcode, elapsed in self.pool.reap():
+            self.logger.info(f"Job {job.wfm_proc_id} child exited with code {exitcode} after {elapsed:.1f}s")
+            if classify_exit(exitcode) == 'crashed':
+                current = self.store.get_job(job.wfm_proc_id)
+                if current and current['status'] not in FINAL_JOB_STATUSES:
+                    self.store.finish(job.wfm_proc_id, JOB_FAILED, error=f"Job process crashed (exit code {exitcode})")
+
+        for job in self.store.claim_queued(self.pool.capacity):
+            payload = {
+                'job_id': job['job_id'],
+                'db_path': self.store.db_path,
+                'results_dir': self.results_dir,
+                'poll_interval': self.poll_interval,
+                'params': job['params'],
+            }
+            if not self.pool.submit(PoolJob(wfm_proc_id=job['job_id'], payload=payload)):
+                self.store.finish(job['job_id'], JOB_FAILED, error='Could not start the job process')
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                self.logger.error(f"Error in job dispatcher: {e}", exc_info=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+def build_external_call_dict(job_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the POST /jobs body to the service external_call_dict."""
+    process_id = int(params['process_id'])
+    colaborador = params.get('colaborador')
+    return {
+        'current_process_id': process_id,
+        'api_proc_id': job_id,
+        'wfm_proc_id': process_id,
+        'wfm_user': str(params.get('user', 'API')),
+        'start_date': params['start_date'],
+        'end_date': params['end_date'],
+        'child_number': 1,
+        # Empty string means every colaborador of the section
+        'wfm_proc_colab': str(colaborador) if colaborador not in (None, '') else '',
+        'posto_id': params.get('posto_id'),
+    }
+
+
+def _report_progress(store: JobStore, job_id: int, stage_handler) -> None:
+    """Mirror the stage handler progress into the job table."""
+    track_progress = stage_handler.track_progress
+    start_substage = stage_handler.start_substage
+
+    def tracked_progress(*args, **kwargs):
+        names = ('stage_name', 'progress', 'message')
+        values = dict(zip(names, args), **{key: kwargs[key] for key in names if key in kwargs})
+        try:
+            store.record_progress(job_id, values.get('stage_name', 'unknown'), values.get('progress'), values.get('message'))
+        except sqlite3.Error:
+            pass
+        return track_progress(*args, **kwargs)
+
+    def tracked_substage(stage_name, substage_name, *args, **kwargs):
+        try:
+            store.record_progress(job_id, stage_name, substage=substage_name)
+        except sqlite3.Error:
+            pass
+        return start_substage(stage_name, substage_name, *args, **kwargs)
+
+    stage_handler.track_progress = tracked_progress
+    stage_handler.start_substage = tracked_substage
+
+
+def _stream_solve_events(store: JobStore, job_id: int, poll_interval: float) -> Callable[[], None]:
+    """
+    Store the solve events of this process under the job and forward an API cancel
+    request to the solve event bus. Returns the function that stops both.
+    """
+    from src.algorithms.solver.solve_events import get_solve_events
+
+    solve_events = get_solve_events()
+
+    def store_event(event: Dict[str, Any]) -> None:
+        try:
+            store.append_event(job_id, event)
+        except sqlite3.Error:
+            pass
+
+    unsubscribe = solve_events.subscribe(store_event)
+    stopped = threading.Event()
+
+    def watch_cancel() -> None:
+        while not stopped.wait(poll_interval):
+            try:
+                if store.is_cancel_requested(job_id):
+                    solve_events.request_cancel(f"Job {job_id} cancelled via API")
+                    return
+            except sqlite3.Error:
+                continue
+
+    threading.Thread(target=watch_cancel, name=f'job-{job_id}-cancel-watch', daemon=True).start()
+
+    def stop() -> None:
+        stopped.set()
+        unsubscribe()
+
+    return stop
+
+
+def run_job(payload: Dict[str, Any]) -> None:
+    """
+    Child entry point: run the service stages for one job. Top-level so it can be pickled by spawn.
+
+    Args:
+        payload: job_id, db_path, results_dir, poll_interval and the POST /jobs params
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    job_id = payload['job_id']
+    params = payload['params']
+    store = JobStore(payload['db_path'])
+    store.mark_running(job_id, os.getpid())
+
+    exit_code = EXIT_PROCESS_FAILED
+    stop_events = _stream_solve_events(store, job_id, payload.get('poll_interval', 1.0))
+    try:
+        import pandas as pd
+        from base_data_project.utils import create_components
+        from src.configuration_manager.instance import get_config
+        from src.services.algoritmo_gd import AlgoritmoGDService
+
+        config_manager = get_config()
+        project_name = config_manager.system.project_name
+        started = time.monotonic()
+
+        data_manager, process_manager = create_components(
+            use_db=True,
+            no_tracking=False,
+            config=config_manager,
+            project_name=project_name
+        )
+        service = AlgoritmoGDService(
+            data_manager=data_manager,
+            process_manager=process_manager,
+            external_call_dict=build_external_call_dict(job_id, params),
+            config_manager=config_manager,
+            project_name=project_name
+        )
+        if service.stage_handler:
+            _report_progress(store, job_id, service.stage_handler)
+
+        stage_results = {}
+        with data_manager:
+            service.initialize_process(
+                "API Job Run",
+                f"Job {job_id} started via API on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            )
+            for stage in JOB_STAGES:
+                store.record_progress(job_id, stage, 0.0, 'Stage started')
+                if stage == 'processing':
+                    success = service.execute_stage(
+                        stage,
+                        algorithm_name=params.get('algorithm', 'example_algorithm'),
+                        algorithm_params=params.get('parameters') or config_manager.parameters.get_parameter_defaults()
+                    )
+                else:
+                    success = service.execute_stage(stage)
+                stage_results[stage] = bool(success)
+                if not success:
+                    break
+            service.finalize_process()
+            summary = service.get_process_summary() if process_manager else {}
+
+        # Long-format schedule of every posto processed in this job
+        schedules = [df for df in service.algorithm_results.values() if df is not None and not df.empty]
+        schedule_path = None
+        schedule_rows = 0
+        if schedules:
+            df_schedule = pd.concat(schedules, ignore_index=True)
+            schedule_rows = len(df_schedule)
+            os.makedirs(payload['results_dir'], exist_ok=True)
+            schedule_path = os.path.join(payload['results_dir'], f'job-{job_id}-schedule.csv')
+            df_schedule.to_csv(schedule_path, index=False, encoding='utf-8')
+
+        completed = len(stage_results) == len(JOB_STAGES) and all(stage_results.values())
+        cancelled = store.is_cancel_requested(job_id)
+        result = {
+            'stages': stage_results,
+            'completed_stages': sum(stage_results.values()),
+            'total_stages': len(JOB_STAGES),
+            'postos': [str(posto_id) for posto_id in service.algorithm_results],
+            'schedule_rows': schedule_rows,
+            'stopped_early': cancelled,
+            'elapsed_seconds': round(time.monotonic() - started, 1),
+            'summary': {
+                'status_counts': summary.get('status_counts', {}),
+                'progress': summary.get('progress', 0),
+            },
+        }
+        if completed:
+            # A cancel during the solve keeps the best solution found, so the job still completes
+            store.finish(job_id, JOB_COMPLETED, result=result, schedule_path=schedule_path)
+        elif cancelled:
+            store.finish(job_id, JOB_CANCELLED, result=result, error='Cancelled via API', schedule_path=schedule_path)
+        else:
+            store.finish(job_id, JOB_FAILED, result=result, error='A stage failed, see the process errors', schedule_path=schedule_path)
+        exit_code = EXIT_SUCCESS if completed else EXIT_PROCESS_FAILED
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Job {job_id} failed: {e}", exc_info=True)
+        store.finish(job_id, JOB_CANCELLED if store.is_cancel_requested(job_id) else JOB_FAILED, error=str(e))
+    finally:
+        stop_events()
+        # Write the queued artefacts before exiting: atexit only runs on a clean spawn exit,
+        # not in a fork child (os._exit) nor in one the parent terminates
+        try:
+            from src.debug_artefacts import flush_debug_writer
+
+            flush_debug_writer()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not flush the debug artefacts of job {job_id}: {e}")
+
+    sys.exit(exit_code)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Cost-aware ordering of the WFM process queue.
+
+Each pending process gets an expected duration estimated from cheap signals
+(number of valid employees, length of the date range and the solve times of
+previous runs for the same section). A scheduling strategy then decides the
+dispatch order. Strategies are registered in SCHEDULING_STRATEGIES and chosen
+through system_settings['orchestrator']['scheduling_strategy'].
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+@dataclass
+class ProcessCostEstimate:
+    """Expected cost of one queued WFM process."""
+    wfm_proc_id: int
+    section_key: Optional[str]
+    n_employees: int
+    n_postos: int
+    n_days: int
+    estimated_seconds: float
+    source: str  # 'history' or 'heuristic'
+
+    @property
+    def size(self) -> int:
+        """Employee-days, the unit used to scale historical solve times."""
+        return max(1, self.n_employees) * max(1, self.n_days)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SolveHistory:
+    """
+    Solve times of previous runs per section, persisted as a small JSON file.
+
+    Stores an exponential moving average of seconds per employee-day so that a
+    section whose headcount changed is still estimated sensibly.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, smoothing: float = 0.3):
+        """
+        Args:
+            file_path: JSON file used to persist the history, None keeps it in memory
+            smoothing: Weight of the newest observation in the moving average
+        """
+        self.file_path = file_path
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, float]] = {}
+        if file_path and os.path.exists(file_path):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+
+    def seconds_per_unit(self, section_key: Optional[str]) -> Optional[float]:
+        """Average seconds per employee-day for the section, None if never seen."""
+        if section_key is None:
+            return None
+        entry = self._data.get(section_key)
+        return entry['seconds_per_unit'] if entry else None
+
+    def record(self, section_key: Optional[str], elapsed_seconds: float, size: int) -> None:
+        """Add an observation and persist the history."""
+        if section_key is None or elapsed_seconds <= 0:
+            return
+        observed = elapsed_seconds / max(1, size)
+        with self._lock:
+            entry = self._data.get(section_key)
+            if entry is None:
+                entry = {'seconds_per_unit': observed, 'runs': 0}
+            else:
+                entry['seconds_per_unit'] = (1 - self.smoothing) * entry['seconds_per_unit'] + self.smoothing * observed
+            entry['runs'] = entry.get('runs', 0) + 1
+            entry['last_seconds'] = elapsed_seconds
+            self._data[section_key] = entry
+            self._save()
+
+    def _save(self) -> None:
+        if not self.file_path:
+            return
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp_path, self.file_path)
+
+
+class CostEstimator:
+    """Estimates the cost of queue rows (get_process_by_status output)."""
+
+    def __init__(self, history: SolveHistory, valid_emp_loader: Callable[[int], pd.DataFrame],
+                 base_seconds: float = 30.0, seconds_per_unit: float = 0.5):
+        """
+        Args:
+            history: SolveHistory with previous solve times
+            valid_emp_loader: Function returning the valid employees of a process id (get_process_valid_emp)
+            base_seconds: Fixed overhead (data loading, inserts) used by the heuristic
+            seconds_per_unit: Heuristic seconds per employee-day when the section has no history
+        """
+        self.history = history
+        self.valid_emp_loader = valid_emp_loader
+        self.base_seconds = base_seconds
+        self.seconds_per_unit = seconds_per_unit
+        # Queue rows do not change while pending, so the employee lookup is done once per process
+        self._cache: Dict[int, ProcessCostEstimate] = {}
+
+    def estimate(self, row: pd.Series) -> ProcessCostEstimate:
+        """Estimate one queue row."""
+        wfm_proc_id = int(row['CODIGO'])
+        cached = self._cache.get(wfm_proc_id)
+        if cached is None:
+            cached = self._build_estimate(wfm_proc_id, row)
+            self._cache[wfm_proc_id] = cached
+        else:
+            # History may have been updated since the first estimate
+            cached = self._apply_history(cached)
+        return cached
+
+    def forget(self, wfm_proc_id: int) -> None:
+        """Drop the cached estimate of a process that left the queue."""
+        self._cache.pop(wfm_proc_id, None)
+
+    def retain(self, pending_ids: Iterable[int]) -> None:
+        """Drop the cached estimates of processes no longer pending (cancelled, deleted, started elsewhere)."""
+        pending = set(pending_ids)
+        for wfm_proc_id in [key for key in self._cache if key not in pending]:
+            del self._cache[wfm_proc_id]
+
+    def _build_estimate(self, wfm_proc_id: int, row: pd.Series) -> ProcessCostEstimate:
+        n_days = 1
+        try:
+            n_days = max(1, (pd.to_datetime(row['DATA_FIM']) - pd.to_datetime(row['DATA_INI'])).days + 1)
+        except Exception:
+            pass
+
+        section_key, n_employees, n_postos = None, 0, 0
+        try:
+            df_valid_emp = self.valid_emp_loader(wfm_proc_id)
+        except Exception:
+            df_valid_emp = pd.DataFrame()
+        if df_valid_emp is not None and not df_valid_emp.empty:
+            df_valid_emp = df_valid_emp.rename(columns=str.lower)
+            employee_col = 'fk_colaborador' if 'fk_colaborador' in df_valid_emp.columns else df_valid_emp.columns[0]
+            n_employees = int(df_valid_emp[employee_col].nunique())
+            if 'fk_tipo_posto' in df_valid_emp.columns:
+                n_postos = int(df_valid_emp['fk_tipo_posto'].nunique())
+            if {'fk_unidade', 'fk_secao'}.issubset(df_valid_emp.columns):
+                section_key = f"{df_valid_emp['fk_unidade'].iloc[0]}-{df_valid_emp['fk_secao'].iloc[0]}"
+
+        estimate = ProcessCostEstimate(
+            wfm_proc_id=wfm_proc_id,
+            section_key=section_key,
+            n_employees=n_employees,
+            n_postos=n_postos,
+            n_days=n_days,
+            estimated_seconds=0.0,
+            source='heuristic',
+        )
+        return self._apply_history(estimate)
+
+    def _apply_history(self, estimate: ProcessCostEstimate) -> ProcessCostEstimate:
+        seconds_per_unit = self.history.seconds_per_unit(estimate.section_key)
+        if seconds_per_unit is not None:
+            estimate.estimated_seconds = seconds_per_unit * estimate.size
+            estimate.source = 'history'
+        else:
+            estimate.estimated_seconds = self.base_seconds + self.seconds_per_unit * estimate.size
+            estimate.source = 'heuristic'
+        return estimate
+
+
+class BaseScheduler(ABC):
+    """Orders cost estimates. Subclasses implement order()."""
+
+    name = 'base'
+
+    def __init__(self, **kwargs):
+        self._first_seen: Dict[int, float] = {}
+
+    def waited_seconds(self, wfm_proc_id: int) -> float:
+        """Seconds since the process was first seen in the queue."""
+        now = time.monotonic()
+        return now - self._first_seen.setdefault(wfm_proc_id, now)
+
+    def forget(self, wfm_proc_id: int) -> None:
+        """Stop tracking a process that left the queue."""
+        self._first_seen.pop(wfm_proc_id, None)
+
+    def retain(self, pending_ids: Iterable[int]) -> None:
+        """Stop tracking the processes no longer pending (cancelled, deleted, started elsewhere)."""
+        pending = set(pending_ids)
+        for wfm_proc_id in [key for key in self._first_seen if key not in pending]:
+            del self._first_seen[wfm_proc_id]
+
+    @abstractmethod
+    def order(self, estimates: List[ProcessCostEstimate]) -> List[ProcessCostEstimate]:
+        """Estimates in dispatch order."""
+
+
+class FifoScheduler(BaseScheduler):
+    """Keeps the query order (previous orchestrator behaviour)."""
+
+    name = 'fifo'
+
+    def order(self, estimates: List[ProcessCostEstimate]) -> List[ProcessCostEstimate]:
+        return list(estimates)
+
+
+class ShortestExpectedFirstScheduler(BaseScheduler):
+    """
+    Shortest expected duration first, with aging so large sections are not starved.
+
+    The priority of a process is its estimated duration minus aging_factor times
+    the time it has been waiting.
+    """
+
+    name = 'shortest_expected_first'
+
+    def __init__(self, aging_factor: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.aging_factor = aging_factor
+
+    def order(self, estimates: List[ProcessCostEstimate]) -> List[ProcessCostEstimate]:
+        return sorted(
+            estimates,
+            key=lambda e: e.estimated_seconds - self.aging_factor * self.waited_seconds(e.wfm_proc_id)
+        )
+
+
+SCHEDULING_STRATEGIES = {
+    FifoScheduler.name: FifoScheduler,
+    ShortestExpectedFirstScheduler.name: ShortestExpectedFirstScheduler,
+}
+
+
+def create_scheduler(strategy: str, **kwargs) -> BaseScheduler:
+    """
+    Create a scheduler from SCHEDULING_STRATEGIES.
+
+    Raises:
+        ValueError: If the strategy is not registered
+    """
+    scheduler_class = SCHEDULING_STRATEGIES.get(strategy)
+    if scheduler_class is None:
+        raise ValueError(f"Unknown scheduling strategy '{strategy}'. Available: {list(SCHEDULING_STRATEGIES)}")
+    return scheduler_class(**kwargs)
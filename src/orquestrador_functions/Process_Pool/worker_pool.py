@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Worker pool used by the orchestrator daemon (orquestrador_daemon.py).
+
+Each WFM process runs in its own OS process so that CP-SAT, pandas and the
+Oracle session of one child never share state with the parent or its siblings.
+This module only depends on the standard library so it can be unit tested
+without a database.
+"""
+
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Exit codes agreed between the daemon and the child runner
+EXIT_SUCCESS = 0
+EXIT_PROCESS_FAILED = 2  # Batch process failed cleanly, status already set to 'I'
+
+# name -> (default, minimum). Values come from the WFM parameters table first,
+# then from the environment (docker-compose), then from these defaults.
+ORCHESTRATOR_PARAM_DEFAULTS: Dict[str, Tuple[int, int]] = {
+    'GLOBAL_MAX_CONCURRENT_PROCESSES': (3, 1),
+    'LOCAL_MAX_CONCURRENT_PROCESSES': (1, 1),
+    'MAX_RETRIES': (1, 0),
+    'RETRY_WAIT_TIME': (0, 0),
+    'ORCHESTRATOR_POLL_INTERVAL': (30, 1),
+    'ORCHESTRATOR_SHUTDOWN_GRACE': (60, 0),
+}
+
+
+def resolve_orchestrator_params(all_params: Any, environ: Optional[Mapping[str, str]] = None) -> Dict[str, int]:
+    """
+    Resolve the orchestrator limits from the output of get_all_params.
+
+    Args:
+        all_params: List of dicts with SYS_P_NAME/NUMBERVALUE (or 'Error')
+        environ: Environment mapping used as fallback, defaults to os.environ
+
+    Returns:
+        Dictionary with one integer value per key of ORCHESTRATOR_PARAM_DEFAULTS
+    """
+    environ = os.environ if environ is None else environ
+    db_values = {}
+    if isinstance(all_params, list):
+        db_values = {item.get('SYS_P_NAME'): item.get('NUMBERVALUE') for item in all_params}
+
+    resolved = {}
+    for name, (default, minimum) in ORCHESTRATOR_PARAM_DEFAULTS.items():
+        value = db_values.get(name)
+        if value is None:
+            value = environ.get(name)
+        try:
+            value = int(float(value)) if value not in (None, '') else default
+        except (TypeError, ValueError):
+            value = default
+        resolved[name] = max(value, minimum)
+    return resolved
+
+
+def compute_available_slots(global_max: int, total_processing: int, local_max: int, local_running: int, pending: int) -> int:
+    """
+    Number of new processes that can be started in this polling cycle.
+
+    Args:
+        global_max: GLOBAL_MAX_CONCURRENT_PROCESSES
+        total_processing: Processes in status 'P' across every orchestrator
+        local_max: LOCAL_MAX_CONCURRENT_PROCESSES
+        local_running: Children currently alive in this orchestrator
+        pending: Processes waiting in the WFM queue
+
+    Returns:
+        Non-negative number of processes to start
+    """
+    return max(0, min(global_max - total_processing, local_max - local_running, pending))
+
+
+def classify_exit(exitcode: Optional[int]) -> str:
+    """
+    Map a child exit code to 'success', 'failed' (handled) or 'crashed'.
+
+    Negative exit codes mean the child was killed by a signal (e.g. OOM killer).
+    """
+    if exitcode == EXIT_SUCCESS:
+        return 'success'
+    if exitcode == EXIT_PROCESS_FAILED:
+        return 'failed'
+    return 'crashed'
+
+
+@dataclass
+class PoolJob:
+    """A WFM process dispatched to the pool."""
+    wfm_proc_id: int
+    payload: Dict[str, Any]
+    attempts: int = 0
+    not_before: float = 0.0
+    started_at: Optional[float] = field(default=None, compare=False)
+
+
+class WorkerPool:
+    """
+    Fixed size pool of child processes, one WFM process per child.
+
+    Unlike concurrent.futures pools, a child that dies (segfault, OOM kill)
+    only affects its own job: it is reported by reap() and can be resubmitted.
+    """
+
+    def __init__(self, target: Callable[[Dict[str, Any]], Any], max_workers: int, logger, start_method: str = 'spawn'):
+        """
+        Args:
+            target: Top-level (picklable) function executed in the child with the job payload
+            max_workers: Maximum number of simultaneous children
+            logger: Logger used by the pool
+            start_method: multiprocessing start method, 'spawn' avoids inheriting the Oracle session
+        """
+        self.target = target
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger
+        self._context = multiprocessing.get_context(start_method)
+        self._running: Dict[int, Tuple[PoolJob, Any]] = {}
+        self._retries: List[PoolJob] = []
+
+    @property
+    def capacity(self) -> int:
+        """Number of children that can still be started."""
+        return max(0, self.max_workers - len(self._running))
+
+    @property
+    def running_ids(self) -> List[int]:
+        """WFM process ids currently running."""
+        return list(self._running.keys())
+
+    @property
+    def pending_retry_ids(self) -> List[int]:
+        """WFM process ids waiting to be restarted."""
+        return [job.wfm_proc_id for job in self._retries]
+
+    @property
+    def running_jobs(self) -> List[PoolJob]:
+        """Jobs whose child is currently running."""
+        return [job for job, _ in self._running.values()]
+
+    def is_tracked(self, wfm_proc_id: int) -> bool:
+        """True if the process is running or waiting for a retry."""
+        return wfm_proc_id in self._running or wfm_proc_id in self.pending_retry_ids
+
+    def submit(self, job: PoolJob) -> bool:
+        """
+        Start a child for the job.
+
+        Returns:
+            False if the pool is full or the job is already running
+        """
+        if self.capacity <= 0 or job.wfm_proc_id in self._running:
+            return False
+        process = self._context.Process(
+            target=self.target,
+            args=(job.payload,),
+            name=f"wfm-proc-{job.wfm_proc_id}",
+        )
+        process.start()
+        job.started_at = time.monotonic()
+        self._running[job.wfm_proc_id] = (job, process)
+        self.logger.info(f"Started child pid {process.pid} for process {job.wfm_proc_id} (attempt {job.attempts + 1})")
+        return True
+
+    def reap(self) -> List[Tuple[PoolJob, Optional[int], float]]:
+        """
+        Collect children that have finished.
+
+        Returns:
+            List of (job, exitcode, elapsed seconds)
+        """
+        finished = []
+        for wfm_proc_id, (job, process) in list(self._running.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            elapsed = time.monotonic() - (job.started_at or time.monotonic())
+            finished.append((job, process.exitcode, elapsed))
+            del self._running[wfm_proc_id]
+            try:
+                process.close()
+            except ValueError:
+                pass
+        return finished
+
+    def schedule_retry(self, job: PoolJob, wait_seconds: float) -> None:
+        """Queue a crashed job to be restarted after wait_seconds."""
+        job.attempts += 1
+        job.not_before = time.monotonic() + max(0.0, wait_seconds)
+        self._retries.append(job)
+
+    def pop_due_retries(self, limit: int) -> List[PoolJob]:
+        """Remove and return up to limit retries whose wait time has elapsed."""
+        now = time.monotonic()
+        due = [job for job in self._retries if job.not_before <= now][:max(0, limit)]
+        self._retries = [job for job in self._retries if job not in due]
+        return due
+
+    def drop_retries(self) -> List[PoolJob]:
+        """Remove and return every queued retry (used on shutdown)."""
+        dropped, self._retries = self._retries, []
+        return dropped
+
+    def wait_all(self, timeout: float) -> bool:
+        """
+        Wait for running children to finish.
+
+        Returns:
+            True if every child finished within the timeout
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        for _, process in list(self._running.values()):
+            process.join(max(0.0, deadline - time.monotonic()))
+        return all(not process.is_alive() for _, process in self._running.values())
+
+    def terminate(self, wfm_proc_id: int, timeout: float = 10.0) -> Optional[PoolJob]:
+        """
+        Terminate one running child. The job is no longer tracked, so reap() does not report it.
+
+        Returns:
+            The terminated job, None if it was not running
+        """
+        entry = self._running.pop(wfm_proc_id, None)
+        if entry is None:
+            return None
+        job, process = entry
+        self.logger.warning(f"Terminating child pid {process.pid} for process {wfm_proc_id}")
+        process.terminate()
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        return job
+
+    def terminate_all(self, timeout: float = 10.0) -> List[PoolJob]:
+        """
+        Send SIGTERM to every running child and wait for them to exit.
+
+        Returns:
+            Jobs that were terminated
+        """
+        terminated = []
+        for job, process in self._running.values():
+            if process.is_alive():
+                self.logger.warning(f"Terminating child pid {process.pid} for process {job.wfm_proc_id}")
+                process.terminate()
+                terminated.append(job)
+        for _, process in self._running.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._running.clear()
+        return terminated
@@ -26,6 +26,7 @@ from src.data_models.models import DescansosDataModel
 from src.algorithms.factory import AlgorithmFactory
 from src.data_models.factory import DataModelFactory
 from src.helpers import set_process_errors
+from src.cancellation import CancellationToken, get_cancellation_token, set_cancellation_token
 from src.orquestrador_functions.Logs.message_loader import set_messages
 
 class AlgoritmoGDService(BaseService):
@@ -40,13 +41,14 @@ class AlgoritmoGDService(BaseService):
     4. Result Analysis: Analyze and save the results
     """
 
-    def __init__(self, data_manager: BaseDataManager, project_name: str, process_manager: Optional[ProcessManager] = None, external_call_dict: Dict[str, Any] = {}, config_manager: ConfigurationManager = None, external_raw_connection=None):
+    def __init__(self, data_manager: BaseDataManager, project_name: str, process_manager: Optional[ProcessManager] = None, external_call_dict: Dict[str, Any] = {}, config_manager: ConfigurationManager = None, external_raw_connection=None, cancel_token: Optional[CancellationToken] = None):
         """
         Initialize the service with data and process managers.
         
         Args:
             data_manager: Data manager for data operations
             process_manager: Optional process manager for tracking
+            cancel_token: Cancellation/deadline of this run, installed as the process token read by the data models, algorithms and solver
         """
 
         # Use provided config_manager or get singleton instance
@@ -87,6 +89,7 @@ class AlgoritmoGDService(BaseService):
             'end_date': external_call_dict.get('end_date', 0),                       # arg5
             'wfm_proc_colab': external_call_dict.get('wfm_proc_colab', ''),          # arg6 - empty string is valid business case (all employees)
             'child_number': external_call_dict.get('child_number', 1),               # arg7
+            'posto_id': external_call_dict.get('posto_id'),                          # optional: run a single posto (API jobs)
         } if external_call_dict is not None else {}
 
         # Sync runtime values to data model's external_call_data
@@ -96,6 +99,9 @@ class AlgoritmoGDService(BaseService):
             self.data_model.external_call_data.update(self.external_data)
             self.logger.info(f"Synced runtime external_call_data to data model: current_process_id={self.external_data.get('current_process_id')}")
 
+        # Cooperative cancellation: checked between substages, data reading steps and constraint families
+        self.cancel_token = set_cancellation_token(cancel_token) if cancel_token is not None else get_cancellation_token()
+
         # Process tracking
         self.stage_handler = process_manager.get_stage_handler() if process_manager else None
         self.algorithm_results = {}
@@ -224,6 +230,9 @@ class AlgoritmoGDService(BaseService):
         Returns:
             True if successful, False otherwise
         """
+        if self.cancel_token.cancelled:
+            self.logger.warning(f"Skipping data loading stage: {self.cancel_token.reason}")
+            return False
         try:
             stage_name = 'data_loading'
             self.logger.info("Executing process data loading stage")
@@ -309,6 +318,8 @@ class AlgoritmoGDService(BaseService):
                     schedule_day=None,
                 )
 
+            self.cancel_token.check('validate_process_data')
+
             # Progress update
             if self.stage_handler:
                 self.stage_handler.track_progress(
@@ -501,6 +512,10 @@ class AlgoritmoGDService(BaseService):
             #    self.logger.info(f"DEBUG SERVICE: CONDITION FAILED - not calling set_process_errors")
 
             posto_id_list = self.data_model.auxiliary_data.get('posto_id_list', [])
+            only_posto_id = self.external_data.get('posto_id')
+            if only_posto_id not in (None, ''):
+                posto_id_list = [posto_id for posto_id in posto_id_list if str(posto_id) == str(only_posto_id)]
+                self.logger.info(f"Restricting processing to posto_id {only_posto_id}: {posto_id_list}")
             for posto_id in posto_id_list:
                 #if posto_id != 121: continue # TODO: remove this, just for testing purposes
                 # Save the current posto_id to the auxiliary data
@@ -533,6 +548,7 @@ class AlgoritmoGDService(BaseService):
                     )
 
                 # SUBSTAGE 1: treat_params
+                self.cancel_token.check(f"treat_params of posto {posto_id}")
                 valid_treat_params = self._execute_treatment_params_substage(stage_name)
                 if not valid_treat_params:
                     if self.stage_handler:
@@ -563,6 +579,7 @@ class AlgoritmoGDService(BaseService):
                     )
 
                 # SUBSTAGE 2: load_matrices
+                self.cancel_token.check(f"load_matrices of posto {posto_id}")
                 if self.stage_handler:
                     self.stage_handler.start_substage(stage_name, 'load_matrices')
                 valid_loading_matrices = self._execute_load_matrices_substage(stage_name, posto_id)
@@ -595,6 +612,7 @@ class AlgoritmoGDService(BaseService):
                     )
 
                 # SUBSTAGE 3: func_inicializa
+                self.cancel_token.check(f"func_inicializa of posto {posto_id}")
                 if self.stage_handler:
                     self.stage_handler.start_substage(stage_name, 'func_inicializa')
                 valid_func_inicializa = self._execute_func_inicializa_substage(stage_name)
@@ -627,6 +645,7 @@ class AlgoritmoGDService(BaseService):
                     )
 
                 # SUBSTAGE 4: allocation_cycle
+                self.cancel_token.check(f"allocation_cycle of posto {posto_id}")
                 if self.stage_handler:
                     self.stage_handler.start_substage(stage_name, 'allocation_cycle')
                 # Type assertions to help type checker
@@ -690,6 +709,8 @@ class AlgoritmoGDService(BaseService):
                             schedule_day=None
                         )
                     return False
+                # Long-format result of this posto, kept for callers such as the API jobs
+                self.algorithm_results[posto_id] = self.data_model.formatted_data.get('df_final')
                 if self.stage_handler:
                     self.stage_handler.track_progress(
                         stage_name=stage_name,
@@ -931,6 +952,7 @@ class AlgoritmoGDService(BaseService):
                 return False
 
             # Load colaborador info (df_colaborador)
+            self.cancel_token.check(f"colaborador info for posto {posto_id}")
             try:
                 self.logger.info(f"Loading colaborador info for posto_id: {posto_id}")
                 # Has to be in this order
@@ -1055,6 +1077,7 @@ class AlgoritmoGDService(BaseService):
 
             
             # Load estimativas info (df_estimativas)
+            self.cancel_token.check(f"estimativas info for posto {posto_id}")
             try:
                 self.logger.info(f"Loading estimativas info for posto_id: {posto_id}")
                 # Get estimativas info
@@ -1175,6 +1198,7 @@ class AlgoritmoGDService(BaseService):
                 return False
             
             # Load calendario info (df_calendario)
+            self.cancel_token.check(f"calendario info for posto {posto_id}")
             try:
                 self.logger.info(f"Loading calendario info for posto_id: {posto_id}")
                 # Get calendario info
@@ -1289,6 +1313,7 @@ class AlgoritmoGDService(BaseService):
                 )
                 return False
             
+            self.cancel_token.check(f"estimativas transformations for posto {posto_id}")
             try:
                 self.logger.info(f"Loading estimativas transformations for posto_id: {posto_id}")
                 # Do all the merges and data transformations
@@ -1346,6 +1371,7 @@ class AlgoritmoGDService(BaseService):
                     )
                 return False
 
+            self.cancel_token.check(f"colaborador transformations for posto {posto_id}")
             try:
                 self.logger.info(f"Loading colaborador transformations for posto_id: {posto_id}")
                 valid_colaborador_transformations = self.data_model.load_colaborador_transformations()
@@ -1403,6 +1429,7 @@ class AlgoritmoGDService(BaseService):
                     )
                 return False
             
+            self.cancel_token.check(f"calendario transformations for posto {posto_id}")
             try:
                 self.logger.info(f"Loading calendario transformations for posto_id: {posto_id}")
                 valid_calendario_transformations = self.data_model.load_calendario_transformations()
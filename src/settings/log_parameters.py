@@ -3,5 +3,20 @@ log_parameters = {
     "log_level": "INFO",
     "log_dir": "logs",
     "console_output": True,
-    "log_errors_db": True
-}
\ No newline at end of file
+    "log_errors_db": True,
+    # Levels of the module loggers (src.structured_logging.get_module_logger), keyed by
+    # module path without 'src.'. A package key applies to every module below it.
+    # Per-worker / per-DataFrame dumps are logged at DEBUG, set a module to "DEBUG" to see them.
+    "module_levels": {
+        "algorithms.model_salsa": "INFO",
+        "algorithms.solver": "INFO",
+        "data_models": "INFO",
+    },
+    # Rows / columns / items shown by summarize() for DataFrames and containers
+    "summary_max_rows": 5,
+    "summary_max_cols": 12,
+    "summary_max_items": 10,
+    # JSON-lines sink: False, True (log_dir/<project_name>.jsonl) or a file path
+    "json_lines": False,
+    "json_lines_level": "INFO",
+}
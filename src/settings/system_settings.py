@@ -51,6 +51,71 @@ system_configs = {
 
     },
 
+    "debug_artefacts": {
+        'mode': 'csv',  # Options: off, csv, parquet, excel (solver schedules and intermediate DataFrames)
+        'production_mode': 'off',  # Used instead of mode when the environment is production
+        'queue_size': 32,  # Artefacts waiting for the background writer, extra ones are dropped
+        'flush_timeout_seconds': 30,  # Wait at process exit for pending artefacts
+    },
+
+    "model_capture": {
+        'enabled': False,  # Export every built CP-SAT model for offline replay (python -m src.algorithms.solver.model_capture)
+        'dir': 'data/output/model_capture',
+        'max_files': 50,  # Oldest captures beyond this are deleted, 0 keeps everything
+    },
+
+    "solver_portfolio": {
+        'enabled': False,  # Race several solver profiles on each model (src/algorithms/solver/portfolio.py)
+        'profiles': ['default', 'light_presolve', 'core', 'lns'],
+        'max_parallel': 3,  # Profiles raced at once, the core lease of the solve is split between them
+        'history_file': 'data/output/solver_portfolio_history.json',  # Winners per algorithm and posto size
+    },
+
+    "solver_isolation": {
+        'enabled': False,  # Solve in a child process under a memory ceiling (src/algorithms/solver/isolation.py)
+        'max_rss_mb': 4096,  # RSS ceiling of the solver process(es), the search stops with its best solution past it
+        'sample_seconds': 0.5,  # Interval of the RSS samples
+        'kill_grace_seconds': 30,  # A solver still running this long after the memory stop is terminated
+    },
+
+    "infeasibility_diagnosis": {
+        'enabled': True,  # On INFEASIBLE, find the conflicting constraint families (src/algorithms/solver/infeasibility.py)
+        'max_time_seconds': 120,  # Budget of the diagnosis solves
+    },
+
+    "orchestrator": {
+        'scheduling_strategy': 'shortest_expected_first',  # Options: fifo, shortest_expected_first
+        'aging_factor': 1.0,  # Seconds of priority gained per second waiting in the queue
+        'history_file': 'data/output/orchestrator_solve_history.json',  # Solve times of previous runs per section
+        'heuristic_base_seconds': 30,  # Used while a section has no history
+        'heuristic_seconds_per_employee_day': 0.5,
+        'core_budget': {
+            'enabled': True,  # Share the host cores between concurrent CP-SAT solves
+            'total_cores': None,  # None uses os.cpu_count()
+            'min_workers': 1,
+            'lease_dir': 'data/output/core_budget',  # Must be shared by every orchestrator child of the host
+            'allocation_log_max_bytes': 5 * 1024 * 1024,  # allocations.jsonl is rotated past this size, 0 disables it
+        },
+        'deadline': {
+            'max_process_seconds': None,  # Maximum duration of one WFM process, None for no limit
+            'deadline_time': None,  # 'HH:MM' no process may run past (e.g. store opening), None for no limit
+            'solve_reserve_seconds': 60,  # Kept free after the solve to format and insert the results
+            'min_start_seconds': 300,  # Do not start new processes when less than this is left before the deadline
+            'kill_grace_seconds': 300,  # Children still running this long after their deadline are terminated
+        },
+    },
+
+    "api": {
+        'jobs_db': 'data/output/api_jobs.sqlite3',  # Local SQLite queue of POST /jobs requests
+        'results_dir': 'data/output/api_jobs',  # Long-format schedule CSV of each job
+        'max_workers': 1,  # Jobs executed at the same time (one child process each)
+        'poll_interval_seconds': 1.0,
+        'shutdown_timeout_seconds': 60,
+        'schedule_chunk_bytes': 65536,  # Chunk size used to stream GET /jobs/<id>/schedule
+        'events_poll_seconds': 0.5,  # How often GET /jobs/<id>/events checks for new solver events
+        'events_heartbeat_seconds': 15,  # SSE keep-alive comment interval while the solver is quiet
+    },
+
     "available_algorithms": [
         "alcampo_algorithm",
         "salsa_algorithm",
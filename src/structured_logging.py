@@ -0,0 +1,215 @@
+"""
+Level-gated, lazily formatted logging for the data and solver hot paths.
+
+Modules get a child of the project logger through get_module_logger(__name__)
+(e.g. 'algoritmo_GD.algorithms.solver.solver'), so records still reach the
+handlers installed by setup_logger() while each module can be given its own
+level in log_parameters['module_levels'].
+
+Large objects are never formatted eagerly. Instead of
+
+    logger.info(f"df_params:\\n{df_params}")
+
+write
+
+    logger.debug("df_params:\\n%s", summarize(df_params))
+
+summarize() only renders when a handler actually emits the record, and then
+only the shape, dtypes and the first rows of a DataFrame (or the first items
+of a dict/list/set), so a disabled debug line costs a function call.
+
+When log_parameters['json_lines'] is set, every record of the project logger
+is also written as one JSON object per line to log_dir/<project_name>.jsonl.
+"""
+
+import json
+import logging
+import os
+import reprlib
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.settings.log_parameters import log_parameters
+
+DEFAULT_MAX_ROWS = 5
+DEFAULT_MAX_COLS = 12
+DEFAULT_MAX_ITEMS = 10
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _limits() -> Dict[str, int]:
+    return {
+        'max_rows': int(log_parameters.get('summary_max_rows', DEFAULT_MAX_ROWS)),
+        'max_cols': int(log_parameters.get('summary_max_cols', DEFAULT_MAX_COLS)),
+        'max_items': int(log_parameters.get('summary_max_items', DEFAULT_MAX_ITEMS)),
+    }
+
+
+class Summary:
+    """Size-capped description of a DataFrame, Series, array or container, rendered on str()."""
+
+    __slots__ = ('obj', 'max_rows', 'max_cols', 'max_items')
+
+    def __init__(self, obj: Any, max_rows: Optional[int] = None, max_cols: Optional[int] = None,
+                 max_items: Optional[int] = None):
+        limits = _limits()
+        self.obj = obj
+        self.max_rows = limits['max_rows'] if max_rows is None else max_rows
+        self.max_cols = limits['max_cols'] if max_cols is None else max_cols
+        self.max_items = limits['max_items'] if max_items is None else max_items
+
+    def __str__(self) -> str:
+        try:
+            return self._render()
+        except Exception as e:
+            return f"<{type(self.obj).__name__}: summary failed: {e}>"
+
+    __repr__ = __str__
+
+    def _render(self) -> str:
+        obj = self.obj
+        kind = type(obj).__name__
+        if kind == 'DataFrame' and hasattr(obj, 'dtypes'):
+            rows, cols = obj.shape
+            dtypes = ', '.join(f"{col}:{dtype}" for col, dtype in list(obj.dtypes.items())[:self.max_cols])
+            if cols > self.max_cols:
+                dtypes += f", ... (+{cols - self.max_cols} columns)"
+            text = f"DataFrame rows={rows} cols={cols} [{dtypes}]"
+            if rows and self.max_rows > 0:
+                text += '\n' + obj.head(self.max_rows).to_string(max_cols=self.max_cols, max_colwidth=40)
+                if rows > self.max_rows:
+                    text += f"\n... ({rows - self.max_rows} more rows)"
+            return text
+        if kind == 'Series' and hasattr(obj, 'dtype'):
+            text = f"Series name={obj.name!r} len={len(obj)} dtype={obj.dtype}"
+            if len(obj) and self.max_rows > 0:
+                text += '\n' + obj.head(self.max_rows).to_string(max_rows=self.max_rows)
+                if len(obj) > self.max_rows:
+                    text += f"\n... ({len(obj) - self.max_rows} more)"
+            return text
+        if kind == 'ndarray' and hasattr(obj, 'shape'):
+            return f"ndarray shape={obj.shape} dtype={obj.dtype} {self._repr(obj.ravel()[:self.max_items].tolist())}"
+        if isinstance(obj, (dict, list, tuple, set, frozenset)):
+            return f"{kind} len={len(obj)} {self._repr(obj)}"
+        return self._repr(obj)
+
+    def _repr(self, obj: Any) -> str:
+        short = reprlib.Repr()
+        short.maxdict = short.maxlist = short.maxtuple = short.maxset = short.maxfrozenset = self.max_items
+        short.maxlevel = 3
+        short.maxstring = short.maxother = 200
+        return short.repr(obj)
+
+
+def summarize(obj: Any, max_rows: Optional[int] = None, max_cols: Optional[int] = None,
+              max_items: Optional[int] = None) -> Summary:
+    """
+    Lazy, size-capped log argument for obj.
+
+    Args:
+        obj: DataFrame, Series, numpy array, container or any other object
+        max_rows: Rows of the head shown for DataFrames/Series (log_parameters['summary_max_rows'])
+        max_cols: Columns shown for DataFrames (log_parameters['summary_max_cols'])
+        max_items: Items shown for containers and arrays (log_parameters['summary_max_items'])
+    """
+    return Summary(obj, max_rows=max_rows, max_cols=max_cols, max_items=max_items)
+
+
+class Lazy:
+    """Log argument calling fn() only when the record is formatted."""
+
+    __slots__ = ('fn',)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+
+def lazy(fn: Callable[[], Any]) -> Lazy:
+    """Defer an expensive log argument, e.g. lazy(lambda: df['horario'].value_counts().to_dict())."""
+    return Lazy(fn)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and source location."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'process': record.process,
+        }
+        fields = getattr(record, 'fields', None)
+        if isinstance(fields, dict):
+            entry['fields'] = fields
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class JsonLinesHandler(logging.FileHandler):
+    """Append-only JSON-lines file sink."""
+
+    def __init__(self, path: str, level: int = logging.NOTSET):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        super().__init__(path, mode='a', encoding='utf-8', delay=True)
+        self.setLevel(level)
+        self.setFormatter(JsonLinesFormatter())
+
+
+def _module_logger_name(module: str) -> str:
+    project_name = log_parameters.get('project_name', 'algoritmo_GD')
+    if module.startswith('src.'):
+        module = module[len('src.'):]
+    return f"{project_name}.{module}" if module else project_name
+
+
+def configure_logging(parameters: Optional[Dict[str, Any]] = None, force: bool = False) -> None:
+    """
+    Apply the per-module levels and the JSON-lines sink of log_parameters (once per process).
+
+    Args:
+        parameters: Overrides log_parameters (tests)
+        force: Re-apply even if logging was already configured
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        params = log_parameters if parameters is None else parameters
+        project_logger = logging.getLogger(params.get('project_name', 'algoritmo_GD'))
+
+        for module, level in (params.get('module_levels') or {}).items():
+            logging.getLogger(_module_logger_name(module)).setLevel(str(level).upper())
+
+        for handler in [h for h in project_logger.handlers if isinstance(h, JsonLinesHandler)]:
+            project_logger.removeHandler(handler)
+            handler.close()
+        json_lines = params.get('json_lines')
+        if json_lines:
+            path = json_lines if isinstance(json_lines, str) else os.path.join(
+                params.get('log_dir', 'logs'), f"{params.get('project_name', 'algoritmo_GD')}.jsonl")
+            project_logger.addHandler(JsonLinesHandler(path, level=params.get('json_lines_level', logging.NOTSET)))
+        _configured = True
+
+
+def get_module_logger(module: str) -> logging.Logger:
+    """
+    Child of the project logger for module (pass __name__).
+
+    'src.algorithms.solver.solver' becomes 'algoritmo_GD.algorithms.solver.solver';
+    its level comes from log_parameters['module_levels'] (a parent package key
+    such as 'algorithms' applies to every module below it).
+    """
+    configure_logging()
+    return logging.getLogger(_module_logger_name(module))
@@ -0,0 +1,105 @@
+import logging
+import os
+import time
+
+from src.orquestrador_functions.Process_Pool.job_queue import (
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JobQueue,
+    JobStore,
+    build_external_call_dict,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _fake_job(payload):
+    store = JobStore(payload['db_path'])
+    store.mark_running(payload['job_id'], os.getpid())
+    if payload['params'].get('crash'):
+        os._exit(9)
+    store.record_progress(payload['job_id'], 'processing', 0.5, 'Valid allocation_cycle')
+    path = os.path.join(payload['results_dir'], f"job-{payload['job_id']}-schedule.csv")
+    os.makedirs(payload['results_dir'], exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('colaborador,data,horario\n1,2025-01-01,M\n')
+    store.finish(payload['job_id'], JOB_COMPLETED, result={'schedule_rows': 1}, schedule_path=path)
+
+
+def _wait_final(store, job_ids, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [store.get_job(job_id) for job_id in job_ids]
+        if all(job['status'] in (JOB_COMPLETED, JOB_FAILED) for job in jobs):
+            return jobs
+        time.sleep(0.1)
+    raise AssertionError(f"Jobs did not finish: {[store.get_job(job_id)['status'] for job_id in job_ids]}")
+
+
+def test_job_store_lifecycle(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    job_id = store.create_job({'process_id': 7, 'start_date': '2025-01-01', 'end_date': '2025-12-31'})
+    assert store.get_job(job_id)['status'] == JOB_QUEUED
+
+    assert [job['job_id'] for job in store.claim_queued(5)] == [job_id]
+    assert store.claim_queued(5) == []
+
+    store.record_progress(job_id, 'data_loading', 0.1, 'Starting data loading raw')
+    store.record_progress(job_id, 'data_loading', substage='load_matrices')
+    progress = store.get_job(job_id)['progress']['data_loading']
+    assert (progress['progress'], progress['message'], progress['substage']) == (0.1, 'Starting data loading raw', 'load_matrices')
+
+    # The claiming process is alive, so the job is not orphaned
+    assert store.fail_orphaned('gone') == 0
+    store.mark_running(job_id, 2 ** 22 + 1)
+    assert store.fail_orphaned('gone') == 1
+    assert store.get_job(job_id)['status'] == JOB_FAILED
+
+
+def test_job_queue_runs_jobs_in_children(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    queue = JobQueue(store, results_dir=str(tmp_path / 'results'), max_workers=2, poll_interval=0.05,
+                     logger=logger, target=_fake_job)
+    queue.start()
+    try:
+        ok_id = queue.submit({'process_id': 1})
+        crash_id = queue.submit({'process_id': 2, 'crash': True})
+        ok_job, crashed_job = _wait_final(store, [ok_id, crash_id])
+    finally:
+        queue.stop(timeout=10)
+
+    assert ok_job['status'] == JOB_COMPLETED
+    assert ok_job['progress']['processing']['progress'] == 0.5
+    assert ok_job['result'] == {'schedule_rows': 1}
+    assert os.path.exists(ok_job['schedule_path'])
+    assert crashed_job['status'] == JOB_FAILED
+    assert 'exit code 9' in crashed_job['error']
+
+
+def test_build_external_call_dict():
+    external = build_external_call_dict(3, {'process_id': '42', 'start_date': '2025-01-01', 'end_date': '2025-03-31', 'colaborador': 99})
+    assert external['current_process_id'] == external['wfm_proc_id'] == 42
+    assert external['api_proc_id'] == 3
+    assert external['wfm_proc_colab'] == '99'
+    assert external['posto_id'] is None
+
+
+def test_cancel_and_solve_events(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    queued_id = store.create_job({'process_id': 1})
+    assert store.request_cancel(queued_id) == JOB_CANCELLED
+    assert store.claim_queued(5) == []
+
+    running_id = store.create_job({'process_id': 2})
+    store.claim_queued(5)
+    assert store.request_cancel(running_id) == 'starting'
+    assert store.is_cancel_requested(running_id) and store.get_job(running_id)['cancel_requested']
+    assert store.request_cancel(12345) is None
+
+    first = store.append_event(running_id, {'type': 'solution', 'solution_index': 1, 'objective': 10.0})
+    store.append_event(running_id, {'type': 'solution', 'solution_index': 2, 'objective': 8.0})
+    assert [event['solution_index'] for event in store.events_since(running_id)] == [1, 2]
+    assert [event['objective'] for event in store.events_since(running_id, first)] == [8.0]
+    assert store.events_since(queued_id) == []
@@ -0,0 +1,101 @@
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data_models.functions.bound_queries import get_bound_query, load_bound_query
+
+
+class _DBManager:
+    def __init__(self):
+        self.session = sessionmaker(bind=create_engine('sqlite://'))()
+        pd.DataFrame({
+            'process_id': [1, 1, 1, 2],
+            'employee_id': ['10', '20', '30', '10'],
+            'schedule_day': ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-01'],
+        }).to_sql('schedule', self.session.connection(), index=False)
+
+
+def _query_file(tmp_path):
+    path = tmp_path / 'query.sql'
+    path.write_text(
+        "select employee_id, schedule_day from schedule\n"
+        "where process_id = {process_id}\n"
+        "-- and {condition}\n"
+        "and employee_id IN ({colabs_id})\n"
+        "and schedule_day between {start_date} and {end_date}\n"
+        "order by employee_id",
+        encoding='utf-8',
+    )
+    return str(path)
+
+
+def test_placeholders_become_binds(tmp_path):
+    query = get_bound_query(_query_file(tmp_path))
+    assert get_bound_query(query.path) is query
+    assert query.bind_names == ('process_id', 'colabs_id', 'start_date', 'end_date')
+    assert query.list_names == {'colabs_id'}
+
+    list_sizes, values = query.binds({'process_id': 1, 'colabs_id': ['10', '20', '30'],
+                                      'start_date': pd.Timestamp('2025-01-01'), 'end_date': '2025-01-31'})
+    assert list_sizes == {'colabs_id': 4}
+    assert values['colabs_id_3'] == '30' and values['start_date'] == '2025-01-01'
+    sql = query.sql(list_sizes)
+    assert 'IN (:colabs_id_0, :colabs_id_1, :colabs_id_2, :colabs_id_3)' in sql and '-- and {condition}' in sql
+    # Lists of the same bucket share one statement
+    assert query.statement({'colabs_id': 4}) is query.statement(query.binds({'colabs_id': list('abcd'), 'process_id': 1,
+                                                                             'start_date': '', 'end_date': ''})[0])
+
+
+def test_load_bound_query_runs_on_the_session(tmp_path):
+    data_manager = _DBManager()
+    df = load_bound_query(data_manager, 'df_schedule', _query_file(tmp_path), process_id=1,
+                          colabs_id=['10', '30', '40'], start_date='2025-01-01', end_date='2025-01-31')
+    assert df.to_dict('list') == {'employee_id': ['10', '30'], 'schedule_day': ['2025-01-01', '2025-01-03']}
+
+    empty = load_bound_query(data_manager, 'df_schedule', _query_file(tmp_path), process_id=1,
+                             colabs_id=[], start_date='2025-01-01', end_date='2025-01-31')
+    assert empty.empty and list(empty.columns) == ['employee_id', 'schedule_day']
+
+
+def test_oracle_lists_bind_one_collection(tmp_path):
+    class _ListType:
+        def newobject(self, values):
+            return ('ODCIVARCHAR2LIST', values)
+
+    query = get_bound_query(_query_file(tmp_path))
+    ids = [str(i) for i in range(2500)] + [None, ' ']
+    list_sizes, values = query.binds({'process_id': 1, 'colabs_id': ids, 'start_date': '', 'end_date': ''}, _ListType())
+    assert values['colabs_id'] == ('ODCIVARCHAR2LIST', ids[:2500])
+    assert 'IN (SELECT column_value FROM TABLE(:colabs_id))' in query.sql(list_sizes)
+    # One statement whatever the number of ids
+    assert query.statement(list_sizes) is query.statement(query.binds({'process_id': 1, 'colabs_id': ['1'], 'start_date': '',
+                                                                       'end_date': ''}, _ListType())[0])
+
+
+def test_files_written_with_native_binds(tmp_path):
+    path = tmp_path / 'native.sql'
+    path.write_text(
+        "select employee_id, schedule_day, to_char(sysdate, 'HH24:MI') as hora from schedule\n"
+        "where process_id = :process_id\n"
+        "and employee_id IN (:colabs_id)\n"
+        "and schedule_day between :start_date and :end_date and ':literal' is not null\n"
+        "order by employee_id",
+        encoding='utf-8',
+    )
+    query = get_bound_query(str(path))
+    assert query.bind_names == ('process_id', 'colabs_id', 'start_date', 'end_date')
+    assert query.list_names == {'colabs_id'}
+    sql = query.sql({'colabs_id': 2})
+    assert 'IN (:colabs_id_0, :colabs_id_1)' in sql and "'HH24:MI'" in sql and "':literal'" in sql
+
+    # Takes the same params as the {name} form
+    runnable = tmp_path / 'native_run.sql'
+    runnable.write_text(
+        "select employee_id, schedule_day from schedule\n"
+        "where process_id = :process_id and employee_id IN (:colabs_id)\n"
+        "and schedule_day between :start_date and :end_date order by employee_id",
+        encoding='utf-8',
+    )
+    df = load_bound_query(_DBManager(), 'df_schedule', str(runnable), process_id=1,
+                          colabs_id=['10', '30', '40'], start_date='2025-01-01', end_date='2025-01-31')
+    assert df.to_dict('list') == {'employee_id': ['10', '30'], 'schedule_day': ['2025-01-01', '2025-01-03']}
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+from src.data_models.functions.calendar_store import CalendarStore
+
+
+def _store():
+    days = pd.date_range('2025-01-06', '2025-01-08')
+    return CalendarStore.create({102: '8002', 101: '8001'}, days, closed_days=[pd.Timestamp('2025-01-07')])
+
+
+def _horario(frame, employee_id, day):
+    rows = frame[(frame['employee_id'] == employee_id) & (frame['schedule_day'] == day)]
+    return rows.set_index('tipo_turno')['horario'].to_dict()
+
+
+def test_create_grid_is_sorted_and_prefills_closed_days():
+    frame = _store().to_frame()
+    assert len(frame) == 2 * 3 * 2
+    assert frame['employee_id'].tolist()[:6] == ['101'] * 6
+    assert frame[['schedule_day', 'tipo_turno']].head(2).values.tolist() == [['2025-01-06', 'M'], ['2025-01-06', 'T']]
+    assert set(frame.loc[frame['schedule_day'] == '2025-01-07', 'horario']) == {'F'}
+    assert frame['wd'].tolist()[:2] == [1, 1]
+
+
+def test_layers_respect_precedence():
+    store = _store()
+    # Integer ids and Timestamps in sources join on the same codes as str / '%Y-%m-%d'
+    ausencias = pd.DataFrame({'employee_id': [101, 101], 'data': ['2025-01-06', '2025-01-07'], 'tipo_ausencia': ['V', 'A']})
+    assert store.apply_ausencias_ferias(ausencias) == (4, 2)
+
+    ciclos = pd.DataFrame({
+        'employee_id': ['101', '101', '102', '102'],
+        'schedule_day': pd.to_datetime(['2025-01-06', '2025-01-08', '2025-01-06', '2025-01-07']),
+        'horario': ['-', 'NLT', 'M', 'M'],
+    })
+    counts = store.apply_ciclos_completos(ciclos, 'horario')
+    assert (counts['-'], counts['shift']) == (2, 4)
+
+    passado = pd.DataFrame({'employee_id': ['102'], 'schedule_day': ['2025-01-08'], 'horario': ['L']})
+    assert store.apply_calendario_passado(passado)['filled'] == 2
+
+    frame = store.to_frame()
+    assert _horario(frame, '101', '2025-01-06') == {'M': 'V-', 'T': 'V-'}
+    assert _horario(frame, '101', '2025-01-07') == {'M': 'F', 'T': 'F'}
+    assert _horario(frame, '101', '2025-01-08') == {'M': '0', 'T': 'NLT'}
+    assert _horario(frame, '102', '2025-01-06') == {'M': 'M', 'T': '0'}
+    assert _horario(frame, '102', '2025-01-08') == {'M': 'L', 'T': 'L'}
+    assert frame['fixed'].sum() == 2
+
+
+def test_write_with_preserve_and_duplicate_keys():
+    store = _store()
+    mask = np.ones(len(store), dtype=bool)
+    assert store.write(mask, 'MoT', preserve=('F',)) == 8
+    assert store.horario_counts() == {'MoT': 8, 'F': 4}
+
+    # Duplicated (employee, day) keys keep the first source row
+    source = pd.DataFrame({'employee_id': ['101', '101'], 'schedule_day': ['2025-01-06', '2025-01-06'], 'tipo_dia': ['L', '-']})
+    assert store.apply_folgas_ciclos(source)['L'] == 2
+
+
+# Reference: the pandas implementations of the layers before CalendarStore (unique source keys)
+def _old_shift_info(df, ciclos):
+    df = df.copy()
+    ciclos = ciclos[['employee_id', 'schedule_day', 'work_shift']].copy()
+    ciclos['employee_id'] = ciclos['employee_id'].astype(str)
+    ciclos['schedule_day'] = pd.to_datetime(ciclos['schedule_day']).dt.normalize()
+    lookup = ciclos.set_index(['employee_id', 'schedule_day'])['work_shift']
+    df['employee_id'] = df['employee_id'].astype(str)
+    df['schedule_day'] = pd.to_datetime(df['schedule_day']).dt.normalize()
+    work_shift = pd.Series(lookup.reindex(pd.MultiIndex.from_arrays([df['employee_id'], df['schedule_day']])).values, index=df.index)
+    has_shift = work_shift.notna()
+    upper = work_shift.str.upper().fillna('')
+    turno = df['tipo_turno']
+    prefilled = df['horario'].isin(['F', 'V', 'L', 'LD', 'LQ', 'L_DOM', 'NL', 'NLM', 'NLT', 'A', 'P'])
+    conditions = [
+        has_shift & upper.isin(['A', '']) & ~prefilled,
+        has_shift & (upper == 'M') & (turno == 'M') & ~prefilled,
+        has_shift & (upper == 'M') & (turno == 'T') & ~prefilled,
+        has_shift & (upper == 'T') & (turno == 'T') & ~prefilled,
+        has_shift & (upper == 'T') & (turno == 'M') & ~prefilled,
+    ]
+    df.loc[~prefilled & has_shift, 'horario'] = np.select(
+        conditions, ['MoT', 'M', '0', 'T', '0'], default=df['horario'])[~prefilled & has_shift]
+    return df
+
+
+def _old_ausencias(df, ausencias):
+    df = df.copy()
+    ausencias = ausencias.copy()
+    ausencias['employee_id'] = ausencias['employee_id'].astype(str)
+    ausencias['_day'] = pd.to_datetime(ausencias['data']).dt.strftime('%Y-%m-%d')
+    lookup = ausencias.set_index(['employee_id', '_day'])['tipo_ausencia']
+    index = pd.MultiIndex.from_arrays([df['employee_id'].astype(str), pd.to_datetime(df['schedule_day']).dt.strftime('%Y-%m-%d')])
+    mapped = index.map(lookup)
+    fill = mapped.notna() & (mapped != '') & (mapped != '-') & ~(df['horario'] == 'F').to_numpy()
+    df.loc[fill, 'horario'] = mapped[fill]
+    return df
+
+
+def _old_ciclos_completos(df, ciclos):
+    df = df.copy()
+    ciclos = ciclos.copy()
+    df['employee_id'] = df['employee_id'].astype(str)
+    ciclos['employee_id'] = ciclos['employee_id'].astype(str)
+    if df['schedule_day'].dtype != 'object':
+        df['schedule_day'] = pd.to_datetime(df['schedule_day']).dt.strftime('%Y-%m-%d')
+    if ciclos['schedule_day'].dtype != 'object':
+        ciclos['schedule_day'] = pd.to_datetime(ciclos['schedule_day']).dt.strftime('%Y-%m-%d')
+    lookup = ciclos.set_index(['employee_id', 'schedule_day'])['horario']
+    mapped = pd.Series(df.set_index(['employee_id', 'schedule_day']).index.map(lookup), index=df.index)
+    valid = mapped.notna() & (mapped != '')
+    preserve_f = df['horario'] == 'F'
+    preserve_av = df['horario'].isin(['A', 'V'])
+    dash = valid & ~preserve_f & (mapped == '-')
+    current = df.loc[dash, 'horario']
+    df.loc[dash, 'horario'] = np.where(current == 'A', 'A-', np.where(current == 'V', 'V-', '-'))
+    df.loc[valid & ~preserve_f & (mapped == 'L'), 'horario'] = 'L'
+    shift_codes = ['M', 'T', 'MoT', 'NLM', 'NLT']
+    shift_rows = valid & ~preserve_f & ~preserve_av & mapped.isin(shift_codes)
+    df.loc[shift_rows & (mapped == 'MoT'), 'horario'] = 'MoT'
+    for code, own in (('M', 'M'), ('T', 'T'), ('NLM', 'M'), ('NLT', 'T')):
+        rows = shift_rows & (mapped == code)
+        df.loc[rows & (df['tipo_turno'] == own), 'horario'] = code
+        df.loc[rows & (df['tipo_turno'] != own), 'horario'] = '0'
+    other = valid & ~preserve_f & ~preserve_av & (mapped != '-') & (mapped != 'L') & ~mapped.isin(shift_codes)
+    df.loc[other, 'horario'] = mapped[other]
+    return df
+
+
+def _old_passado(df, passado):
+    df = df.copy()
+    passado = passado.copy()
+    df['employee_id'] = df['employee_id'].astype(str)
+    passado['employee_id'] = passado['employee_id'].astype(str)
+    lookup = passado.set_index(['employee_id', 'schedule_day'])['horario']
+    mapped = df.set_index(['employee_id', 'schedule_day']).index.map(lookup)
+    fill = mapped.notna() & (mapped != '') & ~df['horario'].isin(['F', 'V']).to_numpy()
+    df.loc[fill, 'horario'] = mapped[fill]
+    df.loc[fill, 'fixed'] = True
+    return df
+
+
+def _source(rng, frame, n_rows, codes, value_col, day_col='schedule_day'):
+    keys = frame[['employee_id', 'schedule_day']].drop_duplicates()
+    keys = keys.iloc[rng.choice(len(keys), size=min(n_rows, len(keys)), replace=False)]
+    return pd.DataFrame({
+        'employee_id': keys['employee_id'].astype(int).to_numpy(),
+        day_col: pd.to_datetime(keys['schedule_day']).to_numpy(),
+        value_col: rng.choice(codes, size=len(keys)),
+    })
+
+
+def test_layers_match_the_previous_pandas_implementation():
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        days = pd.date_range('2025-03-01', periods=int(rng.integers(5, 20)))
+        employees = {int(e): f'9{e}' for e in rng.choice(np.arange(100, 200), size=int(rng.integers(2, 8)), replace=False)}
+        base = CalendarStore.create(employees, days, closed_days=list(rng.choice(days, size=2, replace=False))).to_frame()
+        prefill = rng.random(len(base)) < 0.2
+        base.loc[prefill, 'horario'] = rng.choice(['V', 'A', 'L', 'P', '0'], size=int(prefill.sum()))
+
+        ciclos = _source(rng, base, 40, ['M', 'T', 'A', '', 'm', 't'], 'work_shift')
+        ausencias = _source(rng, base, 15, ['V', 'A', '-', '', 'L'], 'tipo_ausencia', day_col='data')
+        completos = _source(rng, base, 40, ['-', 'L', 'M', 'T', 'MoT', 'NLM', 'NLT', 'P', 'NL', '', 'LD'], 'horario')
+        completos['schedule_day'] = completos['schedule_day'].dt.strftime('%Y-%m-%d')
+        passado = _source(rng, base, 20, ['L', '-', 'M', '', 'NL'], 'horario')
+        passado['schedule_day'] = passado['schedule_day'].dt.strftime('%Y-%m-%d')
+
+        expected = _old_passado(_old_ciclos_completos(_old_ausencias(_old_shift_info(base, ciclos), ausencias), completos), passado)
+
+        # The adapters' path: one frame owned by the pipeline, updated in place by every layer
+        frame = base.copy()
+        store = CalendarStore.from_frame(frame, copy=False)
+        store.apply_shift_info(ciclos)
+        store.set_key_formats(schedule_day='datetime')
+        frame = store.to_frame()
+        store = CalendarStore.from_frame(frame, copy=False)
+        store.apply_ausencias_ferias(ausencias)
+        frame = store.to_frame()
+        store = CalendarStore.from_frame(frame, copy=False)
+        store.apply_ciclos_completos(completos, 'horario')
+        store.set_key_formats(schedule_day='str')
+        frame = store.to_frame()
+        store = CalendarStore.from_frame(frame, copy=False)
+        store.apply_calendario_passado(passado)
+        store.set_key_formats(schedule_day='str')
+        result = store.to_frame()
+
+        columns = ['employee_id', 'schedule_day', 'tipo_turno', 'horario', 'fixed']
+        pd.testing.assert_frame_equal(result[columns].reset_index(drop=True), expected[columns].reset_index(drop=True),
+                                      check_dtype=False, obj=f'seed {seed}')
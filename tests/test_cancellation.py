@@ -0,0 +1,58 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from src.cancellation import (
+    CancellationToken,
+    ProcessCancelled,
+    compute_process_deadline,
+    get_cancellation_token,
+    set_cancellation_token,
+)
+
+
+def test_cancel_runs_callbacks_once_and_check_raises():
+    token = CancellationToken(label='process 1')
+    reasons = []
+    token.on_cancel(reasons.append)
+    token.on_cancel(reasons.append)
+    token.check('load_matrices')
+
+    token.cancel('stop requested')
+    token.cancel('again')
+    assert reasons == ['stop requested']
+    with pytest.raises(ProcessCancelled, match='stop requested \\(before allocation_cycle\\)'):
+        token.check('allocation_cycle')
+
+    # Late subscribers are called straight away
+    token.on_cancel(reasons.append)
+    assert reasons == ['stop requested', 'stop requested']
+
+
+def test_deadline_expires_token():
+    assert CancellationToken().remaining() is None
+    token = CancellationToken.with_timeout(0.05)
+    assert 0 < token.remaining() <= 0.05 and not token.cancelled
+    time.sleep(0.06)
+    assert token.remaining() == 0.0
+    with pytest.raises(ProcessCancelled, match='Deadline'):
+        token.check()
+
+
+def test_compute_process_deadline():
+    now = datetime(2025, 3, 10, 22, 0)
+    assert compute_process_deadline(now=now) is None
+    assert compute_process_deadline(max_seconds=3600, now=now) == datetime(2025, 3, 10, 23, 0).timestamp()
+    # Next 07:00 is tomorrow, earlier than 12 hours from now
+    assert compute_process_deadline(12 * 3600, '07:00', now=now) == datetime(2025, 3, 11, 7, 0).timestamp()
+    assert compute_process_deadline(3600, '07:00', now=now) == datetime(2025, 3, 10, 23, 0).timestamp()
+
+
+def test_process_token_is_replaceable():
+    token = CancellationToken(label='job')
+    try:
+        assert set_cancellation_token(token) is get_cancellation_token() is token
+    finally:
+        set_cancellation_token(None)
+    assert get_cancellation_token() is not token and not get_cancellation_token().cancelled
@@ -0,0 +1,187 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_models.functions.data_treatment_functions import apply_compensatory_sched_types
+
+_logger = logging.getLogger(__name__)
+
+
+def _row_loop_apply_compensatory_sched_types(
+    final_df: pd.DataFrame,
+    compensatory_dict: Dict,
+    df_process_rules: pd.DataFrame,
+    df_pro_emp_mov: Optional[pd.DataFrame] = None,
+    employee_col: str = 'colaborador',
+    date_col: str = 'data',
+) -> pd.DataFrame:
+    """Row-loop implementation the vectorised version replaced."""
+    try:
+        if not compensatory_dict:
+            _logger.info("apply_compensatory_sched_types: no compensatory data - skipping")
+            return final_df
+
+        if 'sched_type' not in final_df.columns or 'sched_subtype' not in final_df.columns:
+            _logger.warning("apply_compensatory_sched_types: sched_type/sched_subtype not in final_df - skipping")
+            return final_df
+
+        rule_code_map = {
+            'feriados': 'ld_holiday',
+            'domingos': 'ld_sunday',
+        }
+
+        # Day-level lookup: (employee_id, rule_code, day) -> (REST_DAY_TYPE, REST_DAY_SUBTYPE)
+        # Employee-level fallback when day is missing from merged rules.
+        type_lookup_by_day = {}
+        type_lookup_employee = {}
+        if df_process_rules is not None and not df_process_rules.empty:
+            rules_normalized = df_process_rules.copy()
+            rules_normalized.columns = [str(col).strip().lower() for col in rules_normalized.columns]
+            if (
+                'employee_id' in rules_normalized.columns
+                and 'rule_code' in rules_normalized.columns
+                and 'rest_day_type' in rules_normalized.columns
+                and 'rest_day_subtype' in rules_normalized.columns
+            ):
+                rules_normalized['employee_id'] = pd.to_numeric(
+                    rules_normalized['employee_id'], errors='coerce'
+                )
+                dedupe_cols = ['employee_id', 'rule_code']
+                if 'schedule_day' in rules_normalized.columns:
+                    rules_normalized['schedule_day'] = pd.to_datetime(
+                        rules_normalized['schedule_day'], errors='coerce'
+                    ).dt.normalize()
+                    dedupe_cols.append('schedule_day')
+                for _, row in rules_normalized.drop_duplicates(subset=dedupe_cols).iterrows():
+                    emp_key = int(row['employee_id'])
+                    rule_code = row['rule_code']
+                    types = (row['rest_day_type'], row['rest_day_subtype'])
+                    if 'schedule_day' in dedupe_cols and pd.notna(row['schedule_day']):
+                        type_lookup_by_day[(emp_key, rule_code, row['schedule_day'])] = types
+                    if (emp_key, rule_code) not in type_lookup_employee:
+                        type_lookup_employee[(emp_key, rule_code)] = types
+
+        # If merged employee-day rules are empty, adapt equivalent info from pending
+        # movements (already enriched with rule params) to preserve prior behavior.
+        if not type_lookup_by_day and not type_lookup_employee and df_pro_emp_mov is not None and not df_pro_emp_mov.empty:
+            mov_rules = df_pro_emp_mov.copy()
+            mov_rules.columns = [str(col).strip().lower() for col in mov_rules.columns]
+            if (
+                'employee_id' in mov_rules.columns
+                and 'rule_code' in mov_rules.columns
+                and 'rest_day_type' in mov_rules.columns
+                and 'rest_day_subtype' in mov_rules.columns
+            ):
+                mov_rules = mov_rules.dropna(subset=['rest_day_type', 'rest_day_subtype'])
+                mov_rules['employee_id'] = pd.to_numeric(mov_rules['employee_id'], errors='coerce')
+                dedupe_cols = ['employee_id', 'rule_code']
+                if 'schedule_day' in mov_rules.columns:
+                    mov_rules['schedule_day'] = pd.to_datetime(
+                        mov_rules['schedule_day'], errors='coerce'
+                    ).dt.normalize()
+                    dedupe_cols.append('schedule_day')
+                for _, row in mov_rules.drop_duplicates(subset=dedupe_cols).iterrows():
+                    emp_key = int(row['employee_id'])
+                    rule_code = row['rule_code']
+                    types = (row['rest_day_type'], row['rest_day_subtype'])
+                    if 'schedule_day' in dedupe_cols and pd.notna(row['schedule_day']):
+                        type_lookup_by_day[(emp_key, rule_code, row['schedule_day'])] = types
+                    if (emp_key, rule_code) not in type_lookup_employee:
+                        type_lookup_employee[(emp_key, rule_code)] = types
+
+        if not type_lookup_by_day and not type_lookup_employee:
+            _logger.warning("apply_compensatory_sched_types: no type lookup available - skipping")
+            return final_df
+
+        # Build set of compensatory day-off targets: (employee_id, day_off_date) -> (REST_DAY_TYPE, REST_DAY_SUBTYPE)
+        overrides = {}
+        for worker_id, groups in compensatory_dict.items():
+            worker_int = int(worker_id)
+            for group_key, rule_code in rule_code_map.items():
+                group_data = groups.get(group_key, {})
+
+                for worked_day, day_off in group_data.get('ld_given', []):
+                    if day_off is not None:
+                        day_off_normalized = pd.Timestamp(day_off).normalize()
+                        rule_types = type_lookup_by_day.get((worker_int, rule_code, day_off_normalized))
+                        if not rule_types:
+                            rule_types = type_lookup_employee.get((worker_int, rule_code))
+                        if not rule_types:
+                            continue
+                        overrides[(worker_int, day_off_normalized)] = rule_types
+
+        if not overrides:
+            _logger.info("apply_compensatory_sched_types: no compensatory day-off rows to override")
+            return final_df
+
+        # Apply overrides to final_df
+        df_result = final_df.copy()
+        df_result[date_col] = pd.to_datetime(df_result[date_col]).dt.normalize()
+        df_result[employee_col] = df_result[employee_col].astype(int)
+
+        override_count = 0
+        for idx, row in df_result.iterrows():
+            key = (row[employee_col], row[date_col])
+            if key in overrides:
+                rest_day_type, rest_day_subtype = overrides[key]
+                df_result.at[idx, 'sched_type'] = rest_day_type
+                df_result.at[idx, 'sched_subtype'] = rest_day_subtype
+                override_count += 1
+
+        _logger.info(f"apply_compensatory_sched_types: overrode {override_count} rows with rule-specific types")
+        return df_result
+
+    except Exception as e:
+        _logger.error(f"Error in apply_compensatory_sched_types: {str(e)}", exc_info=True)
+        return final_df
+
+
+def _inputs(seed, with_days=True):
+    rng = np.random.default_rng(seed)
+    workers = [101, 102, 103, 104]
+    days = pd.date_range('2025-01-01', periods=40, freq='D')
+    final_df = pd.DataFrame(
+        [(str(w), d.strftime('%Y-%m-%d'), 'F', 'D') for w in workers for d in days],
+        columns=['colaborador', 'data', 'sched_type', 'sched_subtype'],
+    )
+    rules = []
+    for w in workers[:3]:
+        for rule_code in ('ld_holiday', 'ld_sunday'):
+            for d in rng.choice(days, size=8, replace=True):
+                rules.append((float(w), rule_code, pd.Timestamp(d) + pd.Timedelta(hours=9),
+                              rng.choice(['F', 'C', None]), rng.choice(['D', 'H'])))
+    df_rules = pd.DataFrame(rules, columns=['EMPLOYEE_ID', 'RULE_CODE', 'SCHEDULE_DAY', 'REST_DAY_TYPE', 'REST_DAY_SUBTYPE'])
+    if not with_days:
+        df_rules = df_rules.drop(columns=['SCHEDULE_DAY'])
+    compensatory = {}
+    for w in workers:
+        pairs = [(days[i], days[j]) for i, j in rng.integers(0, len(days), size=(12, 2))]
+        compensatory[str(w)] = {
+            'feriados': {'ld_given': pairs[:6] + [(days[0], None)]},
+            'domingos': {'ld_given': pairs[6:]},
+        }
+    return final_df, compensatory, df_rules
+
+
+def test_matches_row_loop_with_day_and_employee_rules():
+    for seed in range(5):
+        for with_days in (True, False):
+            final_df, compensatory, df_rules = _inputs(seed, with_days)
+            expected = _row_loop_apply_compensatory_sched_types(final_df, compensatory, df_rules)
+            result = apply_compensatory_sched_types(final_df, compensatory, df_rules)
+            assert (expected['sched_type'] != 'F').any()
+            pd.testing.assert_frame_equal(result, expected)
+
+
+def test_matches_row_loop_with_pending_movements_fallback():
+    final_df, compensatory, df_rules = _inputs(7)
+    df_pro_emp_mov = df_rules.rename(columns=str.lower)
+    df_pro_emp_mov.loc[::3, 'rest_day_type'] = None
+    empty_rules = df_rules.iloc[:0]
+    expected = _row_loop_apply_compensatory_sched_types(final_df, compensatory, empty_rules, df_pro_emp_mov)
+    result = apply_compensatory_sched_types(final_df, compensatory, empty_rules, df_pro_emp_mov)
+    pd.testing.assert_frame_equal(result, expected)
+    # Nothing to resolve: the input frame is returned untouched
+    assert apply_compensatory_sched_types(final_df, compensatory, None) is final_df
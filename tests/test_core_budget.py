@@ -0,0 +1,78 @@
+import json
+import os
+
+from src.algorithms.solver.core_budget import CoreBudget
+
+
+def test_concurrent_solves_share_the_host(tmp_path):
+    budget = CoreBudget(str(tmp_path), total_cores=16)
+
+    first = budget.acquire(requested_workers=8, label='proc-1')
+    second = budget.acquire(requested_workers=8, label='proc-2')
+    third = budget.acquire(requested_workers=8, label='proc-3')
+    # The first two hold every core, the third only gets the minimum
+    assert (first.workers, second.workers, third.workers) == (8, 8, 1)
+    assert third.active_solves == 3
+
+    budget.release(first)
+    budget.release(second)
+    # A solve starting after others finished grows back to the requested workers
+    fourth = budget.acquire(requested_workers=8, label='proc-1-posto-2')
+    assert fourth.workers == 8
+
+    budget.release(third)
+    budget.release(fourth)
+    assert budget.active_leases() == []
+
+    with open(os.path.join(str(tmp_path), 'allocations.jsonl'), 'r', encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert [e['event'] for e in events].count('acquire') == 4
+    assert [e['event'] for e in events].count('release') == 4
+
+
+def test_saturated_host_keeps_min_workers(tmp_path):
+    budget = CoreBudget(str(tmp_path), total_cores=2, min_workers=1)
+    leases = [budget.acquire(requested_workers=8) for _ in range(4)]
+    assert [lease.workers for lease in leases] == [2, 1, 1, 1]
+
+
+def test_grant_never_exceeds_free_cores(tmp_path):
+    budget = CoreBudget(str(tmp_path), total_cores=16)
+    first = budget.acquire(requested_workers=12)
+    # Fair share would be 8, only 4 cores are free
+    assert first.workers == 12 and budget.acquire(requested_workers=8).workers == 4
+
+
+def test_stale_leases_are_ignored(tmp_path):
+    budget = CoreBudget(str(tmp_path), total_cores=8)
+    with open(os.path.join(str(tmp_path), 'dead.lease'), 'w', encoding='utf-8') as f:
+        json.dump({'workers': 8, 'hostname': budget.hostname, 'pid': 2 ** 22 + 1, 'expires_at': 1e12}, f)
+    with open(os.path.join(str(tmp_path), 'expired.lease'), 'w', encoding='utf-8') as f:
+        json.dump({'workers': 8, 'hostname': 'other-host', 'pid': 1, 'expires_at': 0}, f)
+
+    with budget.lease(requested_workers=8) as lease:
+        assert lease.workers == 8
+        assert lease.active_solves == 1
+
+
+def test_disabled_budget_grants_requested_workers(tmp_path):
+    budget = CoreBudget(str(tmp_path), total_cores=2, enabled=False)
+    with budget.lease(requested_workers=8) as lease:
+        assert lease.workers == 8
+    assert not os.path.exists(os.path.join(str(tmp_path), 'allocations.jsonl'))
+
+
+def test_allocation_log_is_rotated_past_its_size(tmp_path):
+    log_path = os.path.join(str(tmp_path), 'allocations.jsonl')
+    budget = CoreBudget(str(tmp_path), total_cores=8, allocation_log_max_bytes=1024)
+    for _ in range(50):
+        with budget.lease(requested_workers=2):
+            pass
+    # One acquire record is a few hundred bytes: the current file stays around the limit
+    assert os.path.getsize(log_path) < 2048 and os.path.exists(log_path + '.1')
+    assert os.path.getsize(log_path + '.1') < 2048
+
+    quiet = CoreBudget(str(tmp_path / 'quiet'), total_cores=8, allocation_log_max_bytes=0)
+    with quiet.lease(requested_workers=2):
+        pass
+    assert not os.path.exists(os.path.join(str(tmp_path / 'quiet'), 'allocations.jsonl'))
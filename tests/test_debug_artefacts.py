@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.debug_artefacts import DebugArtefactWriter
+
+
+def test_csv_artefact_written_in_background(tmp_path):
+    writer = DebugArtefactWriter(mode='csv')
+    df = pd.DataFrame({'Worker': [1, 2], 'Day_1': ['M', 'L']})
+
+    path = writer.submit(df, os.path.join(str(tmp_path), 'salsa_schedule_1.xlsx'))
+    # The caller may keep mutating its DataFrame after submitting
+    df.loc[0, 'Day_1'] = 'T'
+    assert writer.flush(timeout=10)
+
+    assert path.endswith('salsa_schedule_1.csv')
+    assert pd.read_csv(path)['Day_1'].tolist() == ['M', 'L']
+
+
+def test_off_mode_writes_nothing(tmp_path):
+    writer = DebugArtefactWriter(mode='off')
+    assert not writer.enabled
+    assert writer.submit(pd.DataFrame({'a': [1]}), os.path.join(str(tmp_path), 'df.csv')) is None
+    assert writer.flush(timeout=1)
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_excel_mode_keeps_xlsx(tmp_path):
+    writer = DebugArtefactWriter(mode='excel')
+    path = writer.submit(pd.DataFrame({'a': [1]}), os.path.join(str(tmp_path), 'df_results-1-2.csv'))
+    assert writer.flush(timeout=30)
+    assert path.endswith('.xlsx') and os.path.exists(path)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        DebugArtefactWriter(mode='xml')
+
+
+def _child_submits_and_exits(path):
+    import src.debug_artefacts as debug_artefacts
+
+    debug_artefacts._debug_writer = DebugArtefactWriter(mode='csv')
+    debug_artefacts._debug_writer.submit(pd.DataFrame({'a': [1, 2]}), path)
+    # What the process entry points do before multiprocessing ends the child with os._exit()
+    debug_artefacts.flush_debug_writer(timeout=10)
+
+
+def test_flush_before_child_exit_writes_queued_artefacts(tmp_path):
+    import multiprocessing
+
+    path = os.path.join(str(tmp_path), 'df_child.csv')
+    process = multiprocessing.get_context('fork').Process(target=_child_submits_and_exits, args=(path,))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert pd.read_csv(path)['a'].tolist() == [1, 2]
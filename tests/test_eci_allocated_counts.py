@@ -0,0 +1,25 @@
+import pandas as pd
+
+from src.data_models.functions.data_treatment_functions import count_allocated_employees
+
+
+def _results():
+    return pd.DataFrame({
+        'employee_id': ['11', '12', '13', '11', '12', '11'],
+        'schedule_day': ['2025-01-01', '2025-01-01', '2025-01-01', '2025-01-02', '2025-01-02', '2025-01-01'],
+        'type': ['T', 't', 'F', 'N', 'T', 'T'],
+    })
+
+
+def test_counts_distinct_working_employees_per_day():
+    df_results = _results()
+    counts = count_allocated_employees(df_results)
+    assert counts['allocated_employees_count'].tolist() == [2, 1]
+    assert [str(d) for d in counts['schedule_day']] == ['2025-01-01', '2025-01-02']
+    # The sibling schedule is left as loaded
+    assert df_results.equals(_results())
+
+
+def test_no_results_gives_empty_counts():
+    assert count_allocated_employees(pd.DataFrame()).empty
+    assert list(count_allocated_employees(None).columns) == ['schedule_day', 'allocated_employees_count']
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from src.algorithms.helpers_algorithm import _postprocess_schedule
+
+
+def _schedule():
+    return pd.DataFrame({
+        'Worker': [1, 2],
+        '2025-01-01': ['M', 'L'],
+        '2025-01-02': ['M', 'LQ'],
+        '2025-01-03': ['M', None],
+        '2025-01-04': ['T', 'LQ'],
+        '2025-01-05': ['M', '-'],
+        '2025-01-06': [None, 'T'],
+        '2025-01-07': ['T', 'M'],
+        '2025-01-08': ['L', 'N'],
+    })
+
+
+def test_postprocess_schedule_stats_and_metrics():
+    result = _postprocess_schedule(_schedule(), '2025-01-01', '2025-01-08')
+
+    shifts = result['stats']['shifts']
+    assert shifts['shift_distribution'] == {'M': 5, 'T': 3, 'L': 2, 'LQ': 2, '-': 1, 'N': 1}
+    assert shifts['total_assignments'] == 14
+    assert shifts['unassigned_slots'] == 2
+    assert result['stats']['workers']['worker_list'] == ['1', '2']
+    assert result['stats']['time_coverage']['total_days'] == 8
+
+    # Missing cells do not break the run: worker 1 works 6 days in a row
+    continuous = result['constraint_validation']['continuous_working_days']
+    assert continuous['violations'] == ['Worker 1: 6 consecutive working days']
+    assert result['constraint_validation']['salsa_specific']['quality_weekends']['violations'] == [
+        'Worker 1: No quality weekends assigned'
+    ]
+    assert result['constraint_validation']['overall_satisfaction'] == 70
+
+    assert result['quality_metrics']['salsa_specific_metrics'] == {
+        'two_day_quality_weekends': 2,
+        'consecutive_free_days_achieved': 1,
+        'saturday_L_assignments': 2,
+    }
+
+    assert result['validation']['is_valid_solution']
+    assert result['validation']['warnings'] == ['Found 2 unassigned shifts', 'Found 2 missing shift assignments']
+
+
+def test_postprocess_schedule_long_format_matches_melt():
+    schedule = _schedule()
+    day_columns = [col for col in schedule.columns if col != 'Worker']
+    expected = pd.melt(schedule, id_vars=['Worker'], value_vars=day_columns, var_name='data', value_name='horario')
+    expected = expected.rename(columns={'Worker': 'colaborador'})
+
+    database_format = _postprocess_schedule(schedule, '2025-01-01', '2025-01-08')['formatted_schedules']['database_format']
+    pd.testing.assert_frame_equal(database_format, expected, check_dtype=False)
+
+
+def test_postprocess_schedule_empty():
+    result = _postprocess_schedule(pd.DataFrame(), '', '')
+    assert result['formatted_schedules']['database_format'].empty
+    assert result['constraint_validation']['overall_satisfaction'] == 0
+    assert not result['validation']['is_valid_solution']
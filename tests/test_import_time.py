@@ -0,0 +1,52 @@
+"""Startup-time checks: `python -X importtime` summary of the modules each child imports first."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('matplotlib', 'openpyxl')
+
+
+def _importtime(module: str):
+    """Return {module: cumulative microseconds} for a fresh `import module`."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def _summary(timings, top: int = 10) -> str:
+    ranked = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:top]
+    return '\n'.join(f"{us / 1000:9.1f} ms  {name}" for name, us in ranked)
+
+
+def test_algorithm_factory_imports_algorithms_lazily():
+    pytest.importorskip('base_data_project')
+    timings = _importtime('src.algorithms.factory')
+    print(f"\nsrc.algorithms.factory import time:\n{_summary(timings)}")
+
+    imported = set(timings)
+    assert 'src.algorithms.salsaAlgorithm' not in imported
+    assert 'src.algorithms.alcampoAlgorithm' not in imported
+    assert not any(name.split('.')[0] in HEAVY_MODULES + ('ortools',) for name in imported)
+
+
+def test_solver_does_not_import_plotting_or_excel():
+    pytest.importorskip('base_data_project')
+    pytest.importorskip('ortools')
+    timings = _importtime('src.algorithms.solver.solver')
+    print(f"\nsrc.algorithms.solver.solver import time:\n{_summary(timings)}")
+
+    assert not any(name.split('.')[0] in HEAVY_MODULES for name in timings)
@@ -0,0 +1,70 @@
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.infeasibility import ConstraintFamilies, diagnose_infeasibility
+
+WORKERS = [1, 2, 3]
+DAYS = list(range(1, 8))
+
+
+def _infeasible_model(worker_cap=True):
+    """Three workers cannot cover two morning shifts a day when worker 2 works at most three days."""
+    model = cp_model.CpModel()
+    shift = {(w, d, s): model.NewBoolVar(f'{w}_{d}_{s}') for w in WORKERS for d in DAYS for s in ('M', 'L')}
+    families = ConstraintFamilies(model)
+    families.start('shift_day_constraint')
+    for w in WORKERS:
+        for d in DAYS:
+            model.AddExactlyOne(shift[(w, d, s)] for s in ('M', 'L'))
+    families.start('free_days')
+    for w in WORKERS:
+        model.Add(sum(shift[(w, d, 'L')] for d in DAYS) >= 2)
+    families.start('empty_family')
+    families.start('min_coverage')
+    for d in DAYS:
+        model.Add(sum(shift[(w, d, 'M')] for w in WORKERS) >= 2)
+    families.start('worker_cap')
+    if worker_cap:
+        model.Add(sum(shift[(2, d, 'M')] for d in DAYS) <= 3)
+    families.start('unrelated')
+    model.AddBoolOr([shift[(1, 1, 'M')], shift[(1, 1, 'L')]])
+    families.finish()
+    model.Minimize(sum(shift[(w, d, 'L')] for w in WORKERS for d in DAYS))
+    return model, shift, families
+
+
+def test_minimal_conflict_maps_to_families_workers_and_days():
+    model, shift, families = _infeasible_model()
+    assert families.names() == ['shift_day_constraint', 'free_days', 'min_coverage', 'worker_cap', 'unrelated']
+    n_constraints = len(model.Proto().constraints)
+
+    diagnosis = diagnose_infeasibility(model, families, shift, max_time_seconds=30, num_workers=1)
+    assert diagnosis.status == 'INFEASIBLE' and diagnosis.minimal
+    assert diagnosis.families == ['shift_day_constraint', 'free_days', 'min_coverage', 'worker_cap']
+    conflicts = {conflict.family: conflict for conflict in diagnosis.conflicts}
+    # Workers 1 and 3 can give at most 10 mornings, worker 2 adds 3, coverage needs 14
+    assert conflicts['free_days'].workers == [1, 3] and conflicts['worker_cap'].workers == [2]
+    assert conflicts['min_coverage'].workers == [] and conflicts['min_coverage'].days == DAYS
+
+    events = diagnosis.events({d: f'2026-01-0{d}' for d in DAYS})
+    cap = [event for event in events if event['constraint'] == 'worker_cap']
+    assert cap == [{'constraint': 'worker_cap', 'employee_id': 2, 'days': [f'2026-01-0{d}' for d in DAYS],
+                    'period_begin': '2026-01-01', 'period_end': '2026-01-07', 'minimal': True}]
+
+    # The diagnosed model itself is left untouched
+    proto = model.Proto()
+    assert len(proto.constraints) == n_constraints and not proto.assumptions and proto.HasField('objective')
+    assert all(not constraint.enforcement_literal for constraint in proto.constraints)
+
+
+def test_unrecorded_constraints_stay_in_the_background():
+    model, shift, families = _infeasible_model()
+    families.ranges = [r for r in families.ranges if r[0] != 'worker_cap']
+    # The cap is no longer guarded, so it holds in every diagnosis solve and is never reported
+    diagnosis = diagnose_infeasibility(model, families, shift, max_time_seconds=30, num_workers=1)
+    assert diagnosis.families == ['shift_day_constraint', 'free_days', 'min_coverage']
+
+
+def test_feasible_model_has_no_conflict():
+    model, shift, families = _infeasible_model(worker_cap=False)
+    diagnosis = diagnose_infeasibility(model, families, shift, max_time_seconds=30, num_workers=1)
+    assert diagnosis.status in ('OPTIMAL', 'FEASIBLE') and not diagnosis.conflicts and not diagnosis.minimal
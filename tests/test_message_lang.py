@@ -1,8 +1,11 @@
 import pandas as pd
 
 from src.orquestrador_functions.Logs.message_loader import (
+    MessageTemplate,
     apply_unit_message_lang_from_estrutura,
+    get_message_catalog,
     get_message_lang,
+    load_df_messages,
     resolve_message_lang_from_unit,
     set_messages,
     set_runtime_message_lang,
@@ -40,3 +43,33 @@ def test_set_messages_uses_en_for_france():
         pd.DataFrame([{'fk_pais': 1, 'nome_pais': 'France'}])
     )
     assert set_messages(df, 'ERR_MAX_CONSECUTIVE_WORKING_DAYS', {'1': '1'}) == 'EN template 1'
+
+
+def test_message_catalog_resolves_fallbacks_and_placeholders():
+    df = pd.DataFrame([
+        {'VAR': 'both', 'ES': 'ES {1} de {2}', 'PT': None, 'EN': 'EN {1} of {2}', 'DESC': 'desc'},
+        {'VAR': 'only_pt', 'ES': '', 'PT': 'PT {1}', 'EN': None, 'DESC': None},
+        {'VAR': 'only_desc', 'ES': None, 'PT': None, 'EN': None, 'DESC': 'DESC {x}'},
+        {'VAR': 'both', 'ES': 'duplicate', 'PT': 'duplicate', 'EN': 'duplicate', 'DESC': None},
+    ])
+    catalog = get_message_catalog(df)
+    assert get_message_catalog(df) is catalog
+
+    assert set_messages(df, 'both', {1: 'A', '2': 3}, lang='ES') == 'ES A de 3'
+    assert set_messages(df, 'both', {'1': 'A'}, lang='PT') == 'EN A of {2}'
+    assert set_messages(df, 'both', {}, lang='FR') == 'EN {1} of {2}'
+    assert set_messages(df, 'only_pt', {'1': 'x'}, lang='EN') == 'PT x'
+    assert set_messages(df, 'only_desc', {'x': 1}, lang='ES') == 'DESC 1'
+    assert set_messages(df, 'missing', {}, lang='ES') == ''
+    assert MessageTemplate('no placeholders').render({'1': 2}) == 'no placeholders'
+
+
+def test_load_df_messages_reads_file_once(tmp_path, monkeypatch):
+    path = tmp_path / 'df_messages.csv'
+    path.write_text('var,ES,PT,EN\niniProc,Inicio {1},Inicio {1},Start {1}\n', encoding='utf-8')
+    monkeypatch.setattr(
+        'src.orquestrador_functions.Logs.message_loader.get_df_messages_path', lambda root=None: str(path)
+    )
+    first = load_df_messages()
+    assert load_df_messages() is first
+    assert set_messages(first, 'iniProc', {'1': 7}, lang='EN') == 'Start 7'
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.model_capture import (
+    CAPTURE_EXTENSION,
+    capture_model,
+    capture_path,
+    load_captured_model,
+    main,
+    prune_captures,
+    replay,
+)
+
+
+def _model():
+    model = cp_model.CpModel()
+    x = [model.NewBoolVar(f'x{i}') for i in range(6)]
+    model.Add(sum(x) >= 3)
+    model.Minimize(sum((i + 1) * v for i, v in enumerate(x)))
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 5
+    solver.parameters.num_search_workers = 1
+    solver.parameters.symmetry_level = 4
+    return model, solver.parameters
+
+
+def test_capture_round_trip_and_replay(tmp_path):
+    model, parameters = _model()
+    path = capture_model(model, parameters, str(tmp_path / f'posto{CAPTURE_EXTENSION}'), {'posto_id': 121, 'label': 'salsa_schedule_7'})
+
+    captured = load_captured_model(path)
+    assert captured.model.Proto() == model.Proto()
+    assert captured.parameters.symmetry_level == 4 and captured.parameters.max_time_in_seconds == 5
+    assert captured.metadata['posto_id'] == 121 and captured.metadata['variables'] == 6
+
+    result = replay(captured, max_time_seconds=2, parameter_overrides=['symmetry_level: 0'])
+    assert result['status'] == 'OPTIMAL' and result['objective'] == 6
+    assert result['max_time_seconds'] == 2 and result['label'] == 'salsa_schedule_7'
+    (tmp_path / 'other.zip').write_bytes(b'not a capture')
+    with pytest.raises(ValueError):
+        load_captured_model(str(tmp_path / 'other.zip'))
+
+
+def test_replay_entrypoint_and_pruning(tmp_path, capsys):
+    model, parameters = _model()
+    for label in ('a', 'b', 'c'):
+        capture_model(model, parameters, capture_path(str(tmp_path), f'salsa {label}/posto'))
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(CAPTURE_EXTENSION)]) == 3
+
+    assert main([str(tmp_path), '--workers', '1']) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['status'] for line in lines] == ['OPTIMAL'] * 3 and all(line['num_workers'] == 1 for line in lines)
+
+    prune_captures(str(tmp_path), 1)
+    assert len(os.listdir(tmp_path)) == 1
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from src.orquestrador_functions.Process_Pool.scheduler import (
+    BaseScheduler,
+    CostEstimator,
+    SolveHistory,
+    create_scheduler,
+)
+
+
+def _queue_row(codigo, days):
+    return pd.Series({
+        'CODIGO': codigo,
+        'DATA_INI': pd.Timestamp('2025-01-01'),
+        'DATA_FIM': pd.Timestamp('2025-01-01') + pd.Timedelta(days=days - 1),
+    })
+
+
+def _valid_emp(sizes):
+    def loader(process_id):
+        n_employees, secao = sizes[process_id]
+        return pd.DataFrame({
+            'FK_UNIDADE': [10] * n_employees,
+            'FK_SECAO': [secao] * n_employees,
+            'FK_TIPO_POSTO': [1] * n_employees,
+            'FK_COLABORADOR': list(range(n_employees)),
+        })
+    return loader
+
+
+def test_estimator_uses_heuristic_then_history(tmp_path):
+    history = SolveHistory(str(tmp_path / 'history.json'))
+    estimator = CostEstimator(history, _valid_emp({1: (20, 5)}), base_seconds=10, seconds_per_unit=1.0)
+
+    estimate = estimator.estimate(_queue_row(1, days=30))
+    assert (estimate.section_key, estimate.n_employees, estimate.n_days) == ('10-5', 20, 30)
+    assert estimate.source == 'heuristic'
+    assert estimate.estimated_seconds == pytest.approx(10 + 600)
+
+    history.record('10-5', elapsed_seconds=120, size=600)
+    estimate = estimator.estimate(_queue_row(1, days=30))
+    assert estimate.source == 'history'
+    assert estimate.estimated_seconds == pytest.approx(120)
+
+    # History survives a restart of the orchestrator
+    assert SolveHistory(str(tmp_path / 'history.json')).seconds_per_unit('10-5') == pytest.approx(0.2)
+
+
+def test_shortest_expected_first_orders_small_sections_first():
+    estimator = CostEstimator(SolveHistory(), _valid_emp({1: (200, 1), 2: (5, 2), 3: (40, 3)}))
+    estimates = [estimator.estimate(_queue_row(codigo, days=30)) for codigo in (1, 2, 3)]
+
+    assert [e.wfm_proc_id for e in create_scheduler('fifo').order(estimates)] == [1, 2, 3]
+    assert [e.wfm_proc_id for e in create_scheduler('shortest_expected_first').order(estimates)] == [2, 3, 1]
+
+
+def test_create_scheduler_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        create_scheduler('random')
+
+
+def test_processes_that_left_the_queue_are_pruned():
+    calls = []
+
+    def loader(process_id):
+        calls.append(process_id)
+        return _valid_emp({1: (10, 1), 2: (10, 2), 3: (10, 3)})(process_id)
+
+    estimator = CostEstimator(SolveHistory(), loader)
+    scheduler = create_scheduler('shortest_expected_first')
+    scheduler.order([estimator.estimate(_queue_row(codigo, days=7)) for codigo in (1, 2, 3)])
+
+    # 2 was cancelled while pending
+    estimator.retain({1, 3})
+    scheduler.retain({1, 3})
+    assert sorted(estimator._cache) == [1, 3] and sorted(scheduler._first_seen) == [1, 3]
+    estimator.estimate(_queue_row(1, days=7))
+    assert calls == [1, 2, 3]
+
+
+def test_base_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        BaseScheduler()
@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+
+from src.orquestrador_functions.Process_Pool.worker_pool import (
+    EXIT_PROCESS_FAILED,
+    PoolJob,
+    WorkerPool,
+    classify_exit,
+    compute_available_slots,
+    resolve_orchestrator_params,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _exit_with(payload):
+    os._exit(payload['exit_code'])
+
+
+def _sleep(payload):
+    time.sleep(payload['seconds'])
+
+
+def _reap_until(pool, expected, timeout=30):
+    finished = []
+    deadline = time.monotonic() + timeout
+    while len(finished) < expected and time.monotonic() < deadline:
+        finished.extend(pool.reap())
+        time.sleep(0.05)
+    return finished
+
+
+def test_resolve_orchestrator_params_priority_and_floors():
+    all_params = [
+        {'SYS_P_NAME': 'GLOBAL_MAX_CONCURRENT_PROCESSES', 'NUMBERVALUE': 5},
+        {'SYS_P_NAME': 'LOCAL_MAX_CONCURRENT_PROCESSES', 'NUMBERVALUE': 0},
+    ]
+    params = resolve_orchestrator_params(all_params, environ={'MAX_RETRIES': '4', 'GLOBAL_MAX_CONCURRENT_PROCESSES': '9'})
+    assert params['GLOBAL_MAX_CONCURRENT_PROCESSES'] == 5
+    assert params['LOCAL_MAX_CONCURRENT_PROCESSES'] == 1
+    assert params['MAX_RETRIES'] == 4
+    assert params['RETRY_WAIT_TIME'] == 0
+
+
+def test_resolve_orchestrator_params_handles_error_result():
+    params = resolve_orchestrator_params('Error', environ={'RETRY_WAIT_TIME': 'abc'})
+    assert params['GLOBAL_MAX_CONCURRENT_PROCESSES'] == 3
+    assert params['RETRY_WAIT_TIME'] == 0
+
+
+def test_compute_available_slots():
+    assert compute_available_slots(3, 1, 4, 0, 10) == 2
+    assert compute_available_slots(10, 0, 2, 1, 10) == 1
+    assert compute_available_slots(10, 0, 4, 0, 1) == 1
+    assert compute_available_slots(3, 5, 4, 0, 10) == 0
+
+
+def test_classify_exit():
+    assert classify_exit(0) == 'success'
+    assert classify_exit(EXIT_PROCESS_FAILED) == 'failed'
+    assert classify_exit(1) == 'crashed'
+    assert classify_exit(-9) == 'crashed'
+
+
+def test_worker_pool_reaps_and_retries_crashed_children():
+    pool = WorkerPool(target=_exit_with, max_workers=2, logger=logger)
+    assert pool.submit(PoolJob(1, {'exit_code': 0}))
+    assert pool.submit(PoolJob(2, {'exit_code': 1}))
+    assert not pool.submit(PoolJob(3, {'exit_code': 0}))
+
+    finished = {job.wfm_proc_id: exitcode for job, exitcode, _ in _reap_until(pool, 2)}
+    assert finished == {1: 0, 2: 1}
+    assert pool.capacity == 2
+
+    crashed = PoolJob(2, {'exit_code': 0})
+    pool.schedule_retry(crashed, wait_seconds=0)
+    assert pool.is_tracked(2)
+    due = pool.pop_due_retries(limit=1)
+    assert [job.attempts for job in due] == [1]
+    assert pool.pending_retry_ids == []
+
+
+def test_worker_pool_terminate_all():
+    pool = WorkerPool(target=_sleep, max_workers=1, logger=logger)
+    pool.submit(PoolJob(7, {'seconds': 60}))
+    assert not pool.wait_all(timeout=0.1)
+    terminated = pool.terminate_all(timeout=5)
+    assert [job.wfm_proc_id for job in terminated] == [7]
+    assert pool.running_ids == []
+
+
+def test_worker_pool_terminate_one_child():
+    pool = WorkerPool(target=_sleep, max_workers=2, logger=logger)
+    pool.submit(PoolJob(7, {'seconds': 60, 'deadline': 0}))
+    pool.submit(PoolJob(8, {'seconds': 0.1}))
+    assert [job.wfm_proc_id for job in pool.running_jobs] == [7, 8]
+    assert pool.terminate(7, timeout=5).payload['deadline'] == 0
+    assert pool.terminate(7) is None
+    # The terminated child is not reported as a crash by reap()
+    assert [job.wfm_proc_id for job, _, _ in _reap_until(pool, 1)] == [8]
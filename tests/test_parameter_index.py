@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from src.data_models.functions.parameter_index import (
+    LEVEL_DEFAULT,
+    LEVEL_POSTO,
+    LEVEL_SECAO,
+    LEVEL_UNIDADE,
+    ParameterIndex,
+    get_parameter_index,
+)
+
+
+def _params():
+    rows = [
+        # sys_p_name, fk_tipo_posto, fk_secao, fk_unidade, fk_grupo, charvalue, numbervalue
+        ('NUM_DIAS_CONS', None, None, None, None, None, 6.0),
+        ('NUM_DIAS_CONS', None, None, 20.0, None, None, 5.0),
+        ('NUM_DIAS_CONS', None, '300', 20.0, None, None, 4.0),
+        ('NUM_DIAS_CONS', '4001', '300', 20.0, None, None, 3.0),
+        ('NUM_DIAS_CONS', '4001', '300', 20.0, None, None, 2.0),
+        ('GD_algorithmName', None, None, None, None, 'salsa_algorithm', None),
+        ('GD_algorithmName', '4002', '300', 20.0, None, None, None),
+        ('ld_sunday_param', None, None, None, 'G1', None, 0.5),
+    ]
+    columns = ['sys_p_name', 'fk_tipo_posto', 'fk_secao', 'fk_unidade', 'fk_grupo', 'charvalue', 'numbervalue']
+    df = pd.DataFrame(rows, columns=columns)
+    df['datevalue'] = pd.NaT
+    return df
+
+
+def test_precedence_and_fall_through():
+    index = ParameterIndex.from_frame(_params())
+    # First posto row wins over the later duplicate
+    assert index.lookup('NUM_DIAS_CONS', 4001, 20.0, 300) == (LEVEL_POSTO, 3.0)
+    assert index.lookup('NUM_DIAS_CONS', 4002, 20.0, 300) == (LEVEL_SECAO, 4.0)
+    # fk_unidade is compared as str, like fk_unidade.astype(str) did
+    assert index.lookup('NUM_DIAS_CONS', 4002, 20.0, 301) == (LEVEL_UNIDADE, 5.0)
+    assert index.lookup('NUM_DIAS_CONS', 4002, 20, 301) == (LEVEL_DEFAULT, 6.0)
+    # A null value at the posto level falls through to the default
+    assert index.lookup('GD_algorithmName', 4002, 20.0, 300) == (LEVEL_DEFAULT, 'salsa_algorithm')
+    # Group rows are never defaults
+    assert index.lookup('ld_sunday_param', 4001, 20.0, 300) == (None, None)
+
+
+def test_resolve_postos_and_cache():
+    df = _params()
+    index = get_parameter_index(df)
+    assert get_parameter_index(df) is index
+    names = ['NUM_DIAS_CONS', 'GD_algorithmName', 'ld_sunday_param']
+    resolved = index.resolve_postos([4001, 4002], unit_id=20.0, secao_id=300, params_names_list=names)
+    assert resolved == {
+        4001: {'NUM_DIAS_CONS': 3.0, 'GD_algorithmName': 'salsa_algorithm'},
+        4002: {'NUM_DIAS_CONS': 4.0, 'GD_algorithmName': 'salsa_algorithm'},
+    }
+    assert isinstance(resolved[4001]['NUM_DIAS_CONS'], (float, np.floating))
@@ -0,0 +1,110 @@
+import logging
+
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.solve_events import EVENT_SOLUTION, SolveEventBus
+from src.algorithms.solver.solver_callback import SolutionCallback
+
+logger = logging.getLogger(__name__)
+
+
+def _model():
+    # Many improving solutions: maximise a weighted sum under a knapsack constraint
+    model = cp_model.CpModel()
+    x = {(w, d, 'M'): model.NewBoolVar(f'x_{w}_{d}') for w in range(30) for d in range(30)}
+    model.Add(sum(x.values()) <= 400)
+    model.Maximize(sum(((w * 7 + d * 13) % 17 + 1) * var for (w, d, _), var in x.items()))
+    return model, x
+
+
+def test_publish_fans_out_and_survives_failing_subscriber():
+    bus = SolveEventBus(logger)
+    received = []
+
+    def failing(event):
+        raise RuntimeError('subscriber bug')
+
+    bus.subscribe(failing)
+    unsubscribe = bus.subscribe(received.append)
+    first = bus.publish('solve_started', label='posto_1')
+    unsubscribe()
+    bus.publish('solve_finished', label='posto_1')
+
+    assert [event['type'] for event in received] == ['solve_started']
+    assert received[0] is first and first['seq'] == 1
+
+
+def test_cancel_flag_stops_search_from_callback():
+    bus = SolveEventBus(logger)
+    solutions = []
+
+    def on_event(event):
+        if event['type'] == EVENT_SOLUTION:
+            solutions.append(event)
+            bus.request_cancel('good enough')
+
+    bus.subscribe(on_event)
+    model, x = _model()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 1
+    solver.parameters.max_time_in_seconds = 60
+    callback = SolutionCallback(logger, x, list(range(30)), list(range(30)), events=bus, label='posto_1')
+
+    bus.register_solver(solver)
+    status = solver.Solve(model, callback)
+    bus.unregister_solver(solver)
+
+    assert status in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+    assert callback.solution_count == len(solutions) == 1
+    event = solutions[0]
+    assert event['label'] == 'posto_1' and event['solution_index'] == 1
+    assert {'objective', 'best_bound', 'gap_percent', 'elapsed_seconds', 'branches', 'conflicts'} <= set(event)
+    assert solver.WallTime() < 30
+
+
+def test_solver_registered_after_cancel_stops_immediately():
+    bus = SolveEventBus(logger)
+    bus.request_cancel('job cancelled')
+    model, x = _model()
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 60
+    bus.register_solver(solver)
+    solver.Solve(model, SolutionCallback(logger, x, [], [], events=bus))
+    assert solver.WallTime() < 30
+
+    bus.clear_cancel()
+    assert not bus.cancel_requested and bus.cancel_reason is None
+
+
+def test_cancel_of_one_run_does_not_stop_the_next():
+    from src.algorithms.solver.solve_events import get_solve_events
+    from src.cancellation import CancellationToken, set_cancellation_token
+
+    bus = get_solve_events()
+    model, x = _model()
+    objectives = []
+    try:
+        for run in range(2):
+            token = set_cancellation_token(CancellationToken(label=f'run {run}'))
+            # What solve() wires for every search
+            token.on_cancel(bus.request_cancel)
+            solver = cp_model.CpSolver()
+            solver.parameters.num_search_workers = 1
+            solver.parameters.max_time_in_seconds = 60
+            callback = SolutionCallback(logger, x, list(range(30)), list(range(30)), events=bus)
+            bus.register_solver(solver)
+            status = solver.Solve(model, callback)
+            bus.unregister_solver(solver)
+            objectives.append(solver.ObjectiveValue())
+            if run == 0:
+                # The first run is left with a cancelled token, as after a deadline or an API cancel
+                assert status == cp_model.OPTIMAL and not bus.cancel_requested
+                token.cancel('deadline reached')
+                assert bus.cancel_requested
+            else:
+                # A fresh token clears the flag: the search is not stopped and reaches the same optimum
+                assert not bus.cancel_requested
+                assert status == cp_model.OPTIMAL and objectives[1] == objectives[0]
+    finally:
+        set_cancellation_token(None)
+    assert not bus.cancel_requested
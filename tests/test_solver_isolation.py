@@ -0,0 +1,51 @@
+import time
+
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.isolation import STOP_MEMORY_LIMIT, solve_isolated
+from src.algorithms.solver.portfolio import load_solution
+
+
+def _knapsack():
+    model = cp_model.CpModel()
+    items = [model.NewBoolVar(f'x{i}') for i in range(12)]
+    weights = [3, 5, 7, 2, 9, 4, 6, 8, 1, 5, 3, 7]
+    model.Add(sum(w * x for w, x in zip(weights, items)) <= 25)
+    model.Maximize(sum((w + i % 3) * x for i, (w, x) in enumerate(zip(weights, items))))
+    return model, items
+
+
+def _hard_model():
+    """Pigeonhole with 13 pigeons in 12 holes: infeasible, but far beyond a short time limit to prove."""
+    model = cp_model.CpModel()
+    x = {(p, h): model.NewBoolVar(f'{p}_{h}') for p in range(13) for h in range(12)}
+    for p in range(13):
+        model.AddBoolOr([x[p, h] for h in range(12)])
+    for h in range(12):
+        model.AddAtMostOne(x[p, h] for p in range(13))
+    return model
+
+
+def test_isolated_solution_loads_into_caller_solver():
+    model, items = _knapsack()
+    parameters = sat_parameters_pb2.SatParameters(max_time_in_seconds=10, num_search_workers=1)
+    result = solve_isolated(model, parameters, max_rss_mb=None)
+    assert result.status == cp_model.OPTIMAL and result.stop_reason is None and result.error is None
+    assert result.solutions >= 1 and result.wall_time > 0
+
+    solver = cp_model.CpSolver()
+    assert load_solution(model, solver, result.solution) == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == result.objective
+    assert [solver.Value(x) for x in items] == result.solution[:len(items)]
+
+
+def test_memory_ceiling_stops_the_search_and_reports_it():
+    parameters = sat_parameters_pb2.SatParameters(max_time_in_seconds=120, num_search_workers=1,
+                                                  cp_model_presolve=False, symmetry_level=0)
+    start = time.monotonic()
+    # Any running CP-SAT process is over 1 MB, the first sample stops it
+    result = solve_isolated(_hard_model(), parameters, max_rss_mb=1, sample_seconds=0.2)
+    assert time.monotonic() - start < 60
+    assert result.stop_reason == STOP_MEMORY_LIMIT and result.status == cp_model.UNKNOWN
+    assert result.peak_rss_mb > 1 and result.solution is None
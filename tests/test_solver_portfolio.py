@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+
+import pytest
+
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.algorithms.solver.portfolio import (
+    DEFAULT_PROFILE, SOLVER_PROFILES, ProfileHistory, ProfileResult, apply_profile, load_solution, race, size_bucket,
+)
+
+
+def _knapsack():
+    model = cp_model.CpModel()
+    items = [model.NewBoolVar(f'x{i}') for i in range(12)]
+    weights = [3, 5, 7, 2, 9, 4, 6, 8, 1, 5, 3, 7]
+    model.Add(sum(w * x for w, x in zip(weights, items)) <= 25)
+    model.Maximize(sum((w + i % 3) * x for i, (w, x) in enumerate(zip(weights, items))))
+    return model, items
+
+
+def test_history_prefers_most_frequent_winner(tmp_path):
+    path = tmp_path / 'history.json'
+    history = ProfileHistory(str(path))
+    assert history.preferred('salsa', 10) == DEFAULT_PROFILE
+    history.record('salsa', 10, 'core')
+    history.record('salsa', 12, 'core')
+    history.record('salsa', 9, 'lns')
+    # 9, 10 and 12 workers share the 16 bucket, other sizes and algorithms do not
+    assert size_bucket(9) == size_bucket(16) == 16 and size_bucket(17) == 32
+    assert history.preferred('salsa', 16) == 'core'
+    assert history.preferred('salsa', 40) == DEFAULT_PROFILE and history.preferred('other', 10) == DEFAULT_PROFILE
+    assert history.order(['default', 'core', 'lns'], 'salsa', 10) == ['core', 'default', 'lns']
+
+    reloaded = ProfileHistory(str(path))
+    assert reloaded.preferred('salsa', 10) == 'core'
+    path.write_text('not json')
+    assert ProfileHistory(str(path)).preferred('salsa', 10) == DEFAULT_PROFILE
+
+
+def test_history_keeps_the_wins_of_every_writer(tmp_path):
+    path = tmp_path / 'history.json'
+    # One instance per worker process, each loaded before the others wrote
+    writers = [ProfileHistory(str(path)) for _ in range(4)]
+
+    def record(history, profile):
+        for _ in range(10):
+            history.record('salsa', 10, profile)
+
+    threads = [threading.Thread(target=record, args=(history, profile))
+               for history, profile in zip(writers, ['core', 'core', 'lns', 'default'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entry = json.loads(path.read_text())[ProfileHistory.key('salsa', 10)]
+    assert entry['runs'] == 40 and entry['wins'] == {'core': 20, 'lns': 10, 'default': 10}
+    assert ProfileHistory(str(path)).preferred('salsa', 10) == 'core'
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_apply_profile_sets_profile_fields():
+    parameters = sat_parameters_pb2.SatParameters()
+    apply_profile(parameters, 'core')
+    assert parameters.optimize_with_core and parameters.cp_model_probing_level == 2
+    apply_profile(parameters, 'unknown')
+    assert parameters.cp_model_probing_level == SOLVER_PROFILES[DEFAULT_PROFILE]['cp_model_probing_level']
+
+
+def test_race_winner_loads_into_caller_solver():
+    model, items = _knapsack()
+    parameters = sat_parameters_pb2.SatParameters(max_time_in_seconds=10)
+    winner, outcomes = race(model, parameters, ['default', 'lns'], workers_per_profile=1)
+    assert winner.status == cp_model.OPTIMAL and winner.profile in ('default', 'lns')
+    # Search statistics are the racer's, not those of the load below
+    assert winner.solutions >= 1 and winner.wall_time > 0
+    assert {outcome.profile for outcome in outcomes} <= {'default', 'lns'} and winner in outcomes
+
+    solver = cp_model.CpSolver()
+    assert load_solution(model, solver, winner.solution) == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == winner.objective
+    assert [solver.Value(x) for x in items] == winner.solution[:len(items)]
+    # The caller's model keeps no hints from the load
+    assert not model.Proto().HasField('solution_hint')
+
+
+def test_failed_load_restores_the_caller_parameters():
+    model, items = _knapsack()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 6
+    # Every item taken is over the weight limit
+    assert load_solution(model, solver, [1] * len(items)) != cp_model.OPTIMAL
+    assert solver.parameters.num_search_workers == 6
+    assert not solver.parameters.fix_variables_to_their_hinted_value
+
+
+def test_fallback_after_failed_load_keeps_workers_and_remaining_time(monkeypatch, tmp_path):
+    pytest.importorskip('base_data_project')
+    from src.algorithms.solver import solver as solver_module
+
+    class RecordingSolver(cp_model.CpSolver):
+        def __init__(self):
+            super().__init__()
+            self.solves = []
+
+        def Solve(self, model, solution_callback=None):
+            self.solves.append((self.parameters.num_search_workers, self.parameters.max_time_in_seconds,
+                                self.parameters.fix_variables_to_their_hinted_value))
+            return super().Solve(model, solution_callback)
+
+    def slow_race(model, parameters, profiles, workers_per_profile, **kwargs):
+        time.sleep(1.5)
+        winner = ProfileResult(profile=profiles[0], status=cp_model.FEASIBLE, solution=[1] * len(items))
+        return winner, [winner]
+
+    monkeypatch.setattr(solver_module, 'get_portfolio_config',
+                        lambda: {'enabled': True, 'profiles': ['default', 'lns'], 'max_parallel': 2})
+    monkeypatch.setattr(solver_module, 'get_profile_history', lambda: ProfileHistory(str(tmp_path / 'history.json')))
+    monkeypatch.setattr(solver_module, '_isolation_config', lambda: {})
+    monkeypatch.setattr(solver_module, 'race', slow_race)
+
+    model, items = _knapsack()
+    solver = RecordingSolver()
+    solver.parameters.num_search_workers = 4
+    solver.parameters.max_time_in_seconds = 30
+    status, race_result = solver_module._solve_with_fallback(
+        model, solver, None, 4, 'salsa', 10, solver_module.get_solve_events())
+
+    assert race_result is None and status == cp_model.OPTIMAL
+    # The failed load, then the in-process solve with the caller's workers and the time the race left
+    (_, _, load_fixed), (workers, time_limit, fixed) = solver.solves
+    assert load_fixed and not fixed and workers == 4
+    assert time_limit <= 30 - 1.5
@@ -0,0 +1,56 @@
+import json
+import logging
+
+import pandas as pd
+
+from src.settings.log_parameters import log_parameters
+from src.structured_logging import (
+    JsonLinesHandler,
+    configure_logging,
+    get_module_logger,
+    lazy,
+    summarize,
+)
+
+
+def test_summarize_caps_dataframes_and_containers():
+    df = pd.DataFrame({f'col_{i}': range(100) for i in range(20)})
+    text = str(summarize(df, max_rows=3, max_cols=4))
+    assert text.startswith('DataFrame rows=100 cols=20 [col_0:int64, col_1:int64, col_2:int64, col_3:int64, ... (+16 columns)]')
+    assert '... (97 more rows)' in text
+    assert len(text.splitlines()) == 6
+
+    assert str(summarize(set(range(50)), max_items=3)) == 'set len=50 {0, 1, 2, ...}'
+    assert str(summarize(df['col_0'], max_rows=2)).startswith("Series name='col_0' len=100 dtype=int64")
+
+
+def test_disabled_records_are_never_formatted():
+    calls = []
+    logger = get_module_logger('tests.structured_logging.disabled')
+    logger.setLevel(logging.INFO)
+    logger.debug("value: %s", lazy(lambda: calls.append('formatted')))
+    assert calls == []
+    logger.info("value: %s", lazy(lambda: calls.append('formatted')))
+    assert calls
+
+
+def test_module_levels_and_json_lines_sink(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    project = log_parameters['project_name']
+    params = dict(log_parameters, module_levels={'tests.structured_logging': 'WARNING'}, json_lines=str(path))
+    try:
+        configure_logging(params, force=True)
+        logger = get_module_logger('src.tests.structured_logging.sink')
+        assert logger.name == f'{project}.tests.structured_logging.sink'
+        assert logger.getEffectiveLevel() == logging.WARNING
+
+        logger.info("dropped")
+        logger.warning("kept %s", summarize({'a': 1}), extra={'fields': {'posto_id': 7}})
+    finally:
+        configure_logging(log_parameters, force=True)
+        logging.getLogger(f'{project}.tests.structured_logging').setLevel(logging.NOTSET)
+
+    assert not any(isinstance(h, JsonLinesHandler) for h in logging.getLogger(project).handlers)
+    entries = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [entry['message'] for entry in entries] == ["kept dict len=1 {'a': 1}"]
+    assert entries[0]['level'] == 'WARNING' and entries[0]['fields'] == {'posto_id': 7}
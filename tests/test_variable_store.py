@@ -0,0 +1,107 @@
+import pytest
+
+from src.algorithms.model_salsa.variable_store import ShiftVarStore
+
+
+def _store():
+    store = ShiftVarStore(workers=[10, 20], shifts=['M', 'T', 'L'], first_day=5, last_day=8)
+    for w in (10, 20):
+        for d in range(5, 9):
+            for s in ('M', 'T'):
+                store[(w, d, s)] = f'{w}_{d}_{s}'
+    store[(20, 6, 'L')] = '20_6_L'
+    return store
+
+
+def test_mapping_semantics_and_growth():
+    store = _store()
+    assert len(store) == 17
+    assert store[(10, 5, 'M')] == '10_5_M'
+    assert (10, 5, 'L') not in store and (30, 5, 'M') not in store and (10, 99, 'M') not in store
+    assert store.get((10, 4, 'M')) is None
+    with pytest.raises(KeyError):
+        store[(10, 5, 'X')]
+
+    # New workers, shifts and days outside the initial axis grow the array
+    store[(30, 2, 'LD')] = '30_2_LD'
+    store[(10, 400, 'LD')] = '10_400_LD'
+    assert store[(30, 2, 'LD')] == '30_2_LD' and store[(10, 400, 'LD')] == '10_400_LD'
+    assert store[(20, 8, 'T')] == '20_8_T'
+    assert len(store) == 19 and len(list(store)) == 19
+
+    store[(10, 5, 'M')] = 'replaced'
+    assert store[(10, 5, 'M')] == 'replaced' and len(store) == 19
+    del store[(10, 5, 'M')]
+    assert (10, 5, 'M') not in store and len(store) == 18
+    with pytest.raises(KeyError):
+        del store[(10, 5, 'M')]
+
+
+def test_slicing_matches_membership_filter():
+    store = _store()
+    store[(10, 300, 'LD')] = '10_300_LD'
+    workers, days, shifts = [20, 10, 99], [8, 6, 100], ['L', 'M', 'X']
+    expected = [store[(w, d, s)] for w in workers for d in days for s in shifts if (w, d, s) in store]
+    assert store.vars(workers, days, shifts) == expected
+    assert store.select(20, 6, 'L') == [((20, 6, 'L'), '20_6_L')]
+
+    assert store.worker_vars(10, range(5, 500), 'LD') == ['10_300_LD']
+    assert store.worker_vars(10, range(7, 9)) == ['10_7_M', '10_7_T', '10_8_M', '10_8_T']
+    assert store.day_vars(6, ['L', 'T']) == ['10_6_T', '20_6_L', '20_6_T']
+    assert store.vars([], None, None) == []
+    assert store.count_cells() == 9
+
+
+def test_fixed_cells_fold_into_constants():
+    from ortools.sat.python import cp_model
+
+    from src.algorithms.model_salsa.variables import decision_variables
+
+    model = cp_model.CpModel()
+    shifts = ['M', 'T', 'L', 'LQ', 'LD', 'A', 'V', 'F', '-']
+    w = 7
+    shift = decision_variables(
+        model, [w], list(shifts), {w: 1}, {w: 7}, absences={w: {2}}, vacation_days={w: {3, 4}},
+        empty_days={w: set()}, closed_holidays=set(), fixed_days_off={w: set()}, fixed_LQs={w: set()},
+        shift_M={w: {1, 5, 6, 7}}, shift_T={w: {1, 5, 6, 7}}, past_workers=[], fixed_compensation_days={w: set()},
+        locked_days={w: set()}, forced_work_days={w: set()}, contract_type={w: 6}, dynamic_empty={},
+        complete_cycle_days={w: set()},
+    )
+    # Absence and vacation days hold the shared constant and have no alternatives
+    assert shift.fixed_count() == 3 and shift.is_fixed((w, 3, 'V')) and not shift.is_fixed((w, 5, 'M'))
+    assert shift.vars(w, 2)[0] is shift[(w, 2, 'A')] and shift.split(w, 2) == ([], 1)
+    assert len(model.Proto().constraints) == 0
+
+    free, n_fixed = shift.split(w, range(1, 8), ['A', 'V', 'M'])
+    assert n_fixed == 3 and len(free) == 4
+    assert [(key, len(cell_vars), n) for key, cell_vars, n in shift.cells(w, [2, 5])] == [((w, 2), 0, 1), ((w, 5), 4, 0)]
+
+    model.Add(shift.total(w, range(1, 8), ['A', 'V', 'L']) == 4)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.Value(shift[(w, 4, 'V')]) == 1
+    assert sum(solver.Value(v) for v in shift.vars(w, None, 'L')) == 1
+
+
+def test_weighted_total_folds_fixed_cells():
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    one = model.NewConstant(1)
+    store = ShiftVarStore(workers=[1, 2, 3], shifts=['M', 'T'], first_day=1, last_day=3)
+    free = {w: model.NewBoolVar(f'{w}_M') for w in (1, 2)}
+    for w, var in free.items():
+        store[(w, 1, 'M')] = var
+    # Worker 3 is frozen on its published shift
+    store.fix((3, 1, 'M'), one)
+    hours = {1: 8, 2: 6, 3: 4}
+
+    model.Add(store.weighted_total(None, 1, 'M', weight=lambda key: hours[key[0]]) == 10)
+    # The frozen cell is a constant offset, not a term of the constraint
+    assert sorted(model.Proto().constraints[-1].linear.vars) == sorted(v.Index() for v in free.values())
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert (solver.Value(free[1]), solver.Value(free[2])) == (0, 1)
+
+    assert store.weighted_total(3, 1, 'M', weight=lambda key: hours[key[0]]) == 4
+    assert store.weighted_total(3, 2, 'M', weight=lambda key: 1) == 0